@@ -0,0 +1,73 @@
+# Copyright 2019-2024 ETH Zurich and the DaCe authors. All rights reserved.
+""" Polybench-style kernels for the ``dacebench`` benchmark suite. """
+import dace
+import numpy as np
+
+M, N, K = (dace.symbol(s) for s in ('M', 'N', 'K'))
+
+
+@dace.program
+def gemm(alpha: dace.float64, beta: dace.float64, C: dace.float64[M, N], A: dace.float64[M, K],
+         B: dace.float64[K, N]):
+    C[:] = alpha * A @ B + beta * C
+
+
+@dace.program
+def atax(A: dace.float64[M, N], x: dace.float64[N]):
+    return (A @ x) @ A
+
+
+@dace.program
+def gesummv(alpha: dace.float64, beta: dace.float64, A: dace.float64[N, N], B: dace.float64[N, N],
+            x: dace.float64[N]):
+    return alpha * A @ x + beta * B @ x
+
+
+@dace.program
+def jacobi_2d(TSTEPS: dace.int64, A: dace.float64[N, N], B: dace.float64[N, N]):
+    for t in range(1, TSTEPS):
+        B[1:-1, 1:-1] = 0.2 * (A[1:-1, 1:-1] + A[1:-1, :-2] + A[1:-1, 2:] + A[2:, 1:-1] + A[:-2, 1:-1])
+        A[1:-1, 1:-1] = 0.2 * (B[1:-1, 1:-1] + B[1:-1, :-2] + B[1:-1, 2:] + B[2:, 1:-1] + B[:-2, 1:-1])
+
+
+@dace.program
+def heat_3d(TSTEPS: dace.int64, A: dace.float64[N, N, N], B: dace.float64[N, N, N]):
+    for t in range(1, TSTEPS):
+        B[1:-1, 1:-1, 1:-1] = (0.125 * (A[2:, 1:-1, 1:-1] - 2.0 * A[1:-1, 1:-1, 1:-1] + A[:-2, 1:-1, 1:-1]) + 0.125 *
+                               (A[1:-1, 2:, 1:-1] - 2.0 * A[1:-1, 1:-1, 1:-1] + A[1:-1, :-2, 1:-1]) + 0.125 *
+                               (A[1:-1, 1:-1, 2:] - 2.0 * A[1:-1, 1:-1, 1:-1] + A[1:-1, 1:-1, :-2]) +
+                               A[1:-1, 1:-1, 1:-1])
+        A[1:-1, 1:-1, 1:-1] = (0.125 * (B[2:, 1:-1, 1:-1] - 2.0 * B[1:-1, 1:-1, 1:-1] + B[:-2, 1:-1, 1:-1]) + 0.125 *
+                               (B[1:-1, 2:, 1:-1] - 2.0 * B[1:-1, 1:-1, 1:-1] + B[1:-1, :-2, 1:-1]) + 0.125 *
+                               (B[1:-1, 1:-1, 2:] - 2.0 * B[1:-1, 1:-1, 1:-1] + B[1:-1, 1:-1, :-2]) +
+                               B[1:-1, 1:-1, 1:-1])
+
+
+def bench_gemm():
+    rng = np.random.default_rng(42)
+    return gemm, dict(alpha=1.5,
+                      beta=1.2,
+                      C=rng.random((1000, 1100)),
+                      A=rng.random((1000, 1200)),
+                      B=rng.random((1200, 1100)))
+
+
+def bench_atax():
+    rng = np.random.default_rng(42)
+    return atax, dict(A=rng.random((1800, 2200)), x=rng.random(2200))
+
+
+def bench_gesummv():
+    rng = np.random.default_rng(42)
+    return gesummv, dict(alpha=1.5, beta=1.2, A=rng.random((2000, 2000)), B=rng.random((2000, 2000)),
+                         x=rng.random(2000))
+
+
+def bench_jacobi_2d():
+    rng = np.random.default_rng(42)
+    return jacobi_2d, dict(TSTEPS=100, A=rng.random((1000, 1000)), B=rng.random((1000, 1000)))
+
+
+def bench_heat_3d():
+    rng = np.random.default_rng(42)
+    return heat_3d, dict(TSTEPS=50, A=rng.random((100, 100, 100)), B=rng.random((100, 100, 100)))
@@ -0,0 +1,29 @@
+# Copyright 2019-2024 ETH Zurich and the DaCe authors. All rights reserved.
+""" Benchmarks of the programs in ``samples/simple`` for the ``dacebench`` benchmark suite. """
+import importlib.util
+import os
+
+import numpy as np
+
+SAMPLES = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'samples', 'simple')
+
+
+def _load_sample(name: str):
+    spec = importlib.util.spec_from_file_location(f'sample_{name}', os.path.join(SAMPLES, f'{name}.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def bench_axpy():
+    rng = np.random.default_rng(42)
+    return _load_sample('axpy').axpy, dict(a=rng.random(), x=rng.random(10000000), y=rng.random(10000000))
+
+
+def bench_laplace():
+    rng = np.random.default_rng(42)
+    return _load_sample('laplace').laplace, dict(A=rng.random(100000), T=100)
+
+
+def bench_mandelbrot():
+    return _load_sample('mandelbrot').mandelbrot, dict(output=np.zeros((256, 512), dtype=np.uint16), maxiter=100)
@@ -10,6 +10,7 @@ from typing import Any, Callable, List, Optional, Tuple, TYPE_CHECKING, Union
 if TYPE_CHECKING:
     from dace.dtypes import InstrumentationType, DataInstrumentationType
     from dace.codegen.compiled_sdfg import CompiledSDFG
+    from dace.codegen.instrumentation.latency import LatencyRecorder
     from dace.codegen.instrumentation.data.data_report import InstrumentedDataReport
     from dace.sdfg import SDFG
 
@@ -79,6 +80,52 @@ def profile(
     profiler.report.save(filename)
 
 
+@contextmanager
+def latency_histograms(prometheus_file: Optional[str] = None, sub_bucket_bits: int = 7):
+    """
+    Context manager that records the latency of every compiled DaCe program call in histograms, with separate
+    histograms for the time spent marshalling arguments and for the time spent in the generated code. Unlike
+    :func:`profile`, each program is only called once. The histograms are kept by each compiled SDFG and can be
+    queried with ``CompiledSDFG.stats()``.
+
+    Example usage:
+
+    .. code-block:: python
+
+        with dace.latency_histograms(prometheus_file='dace.prom') as recorder:
+            for _ in range(1000):
+                some_program(...)
+
+        stats = recorder.stats[0]
+        print(stats.native.percentile(99))  # 99th percentile of the native time, in nanoseconds
+
+        # Send a summary to a statsd server
+        recorder.send_statsd('127.0.0.1', 8125)
+
+
+    :param prometheus_file: If given, writes the histograms to this file in the Prometheus text format at the end
+                            of the context.
+    :param sub_bucket_bits: Precision of the histograms. Latencies are recorded with a relative error of at most
+                            ``2**-(sub_bucket_bits - 1)``.
+    """
+    from dace.codegen.instrumentation.latency import LatencyRecorder  # Avoid circular import
+    from dace.hooks import on_compiled_sdfg_call, _COMPILED_SDFG_CALL_HOOKS
+
+    # If already recording (e.g., from the configuration), return the existing recorder
+    for hook in _COMPILED_SDFG_CALL_HOOKS:
+        if isinstance(hook, LatencyRecorder):
+            recorder = hook
+            yield recorder
+            break
+    else:
+        recorder = LatencyRecorder(sub_bucket_bits)
+        with on_compiled_sdfg_call(context_manager=recorder):
+            yield recorder
+
+    if prometheus_file is not None:
+        recorder.export_prometheus(prometheus_file)
+
+
 def _make_filter_function(filter: Optional[Union[str, Callable[[Any], bool]]],
                           with_attr: bool = True) -> Callable[[Any], bool]:
     """
@@ -0,0 +1,273 @@
+# Copyright 2019-2024 ETH Zurich and the DaCe authors. All rights reserved.
+"""
+A command-line tool that runs a benchmark suite of DaCe programs, keeps a history of the results, and detects
+performance regressions across commits.
+
+Benchmarks are Python files that contain functions named ``bench_<name>``. Each function takes no arguments and returns
+a tuple of a DaCe program (or a Python function, which is converted to one) and a dictionary of its arguments.
+For every benchmark, the following times are measured (in milliseconds):
+
+  * ``parse``: Python to SDFG conversion, without simplification.
+  * ``optimize``: Simplification and automatic optimization.
+  * ``compile``: Code generation and compilation, into a fresh build folder.
+  * ``runtime``: Median runtime of the generated code.
+"""
+import argparse
+from datetime import datetime
+import fnmatch
+import glob
+import importlib.util
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+import dace
+from dace import dtypes
+from dace.frontend.python.parser import DaceProgram
+from dace.transformation.auto.auto_optimize import auto_optimize
+
+BenchmarkFactory = Callable[[], Tuple[Any, Dict[str, Any]]]
+
+#: Measured metrics of every benchmark, in milliseconds
+METRICS = ('parse', 'optimize', 'compile', 'runtime')
+
+DEFAULT_HISTORY = os.path.join('.dacebench', 'history.json')
+
+
+def discover_benchmarks(paths: List[str], pattern: Optional[str] = None) -> Dict[str, BenchmarkFactory]:
+    """
+    Finds benchmarks in Python files.
+
+    :param paths: Python files or folders that contain them.
+    :param pattern: If given, only returns benchmarks whose name matches this glob pattern.
+    :return: A dictionary mapping benchmark names (``<file name>.<benchmark name>``) to benchmark functions.
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, '*.py'))))
+        elif os.path.isfile(path):
+            files.append(path)
+        else:
+            raise FileNotFoundError(f'Benchmark path "{path}" not found')
+
+    result = {}
+    for file in files:
+        modname = os.path.splitext(os.path.basename(file))[0]
+        spec = importlib.util.spec_from_file_location(f'dacebench_{modname}', file)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        for attr in sorted(dir(module)):
+            if not attr.startswith('bench_') or not callable(getattr(module, attr)):
+                continue
+            name = f'{modname}.{attr[len("bench_"):]}'
+            if pattern is None or fnmatch.fnmatch(name, pattern):
+                result[name] = getattr(module, attr)
+    return result
+
+
+def measure(factory: BenchmarkFactory,
+            repetitions: int = 10,
+            warmup: int = 1,
+            optimize: bool = True,
+            device: dtypes.DeviceType = dtypes.DeviceType.CPU) -> Dict[str, float]:
+    """
+    Measures a benchmark.
+
+    :param factory: The benchmark function, which returns a program and its arguments.
+    :param repetitions: Number of measured runs of the generated code.
+    :param warmup: Number of runs before measuring.
+    :param optimize: If False, does not apply automatic optimization after simplification.
+    :param device: The device to automatically optimize for.
+    :return: A dictionary mapping each metric in ``METRICS`` to its time in milliseconds.
+    """
+    program, args = factory()
+    if not isinstance(program, DaceProgram):
+        program = dace.program(program)
+
+    result = {}
+    start = time.perf_counter()
+    sdfg = program.to_sdfg(**args, simplify=False)
+    result['parse'] = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    sdfg.simplify()
+    if optimize:
+        sdfg = auto_optimize(sdfg, device)
+    result['optimize'] = (time.perf_counter() - start) * 1000
+
+    # Build in a fresh folder, as the program cache would otherwise turn every run after the first into a no-op build
+    with tempfile.TemporaryDirectory(prefix='dacebench_') as build_folder:
+        sdfg.build_folder = build_folder
+        start = time.perf_counter()
+        csdfg = sdfg.compile()
+        result['compile'] = (time.perf_counter() - start) * 1000
+
+        callargs = program._create_sdfg_args(sdfg, (), args)
+        for _ in range(warmup):
+            csdfg(**callargs)
+        times = []
+        for _ in range(repetitions):
+            start = time.perf_counter()
+            csdfg(**callargs)
+            times.append((time.perf_counter() - start) * 1000)
+        result['runtime'] = float(np.median(times))
+
+        # Release the library before its folder is removed
+        csdfg.unload()
+
+    return result
+
+
+def _git_commit() -> Optional[str]:
+    """ Returns the commit of the DaCe source tree, if it is a git repository. """
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'],
+                                       cwd=os.path.dirname(os.path.abspath(dace.__file__)),
+                                       stderr=subprocess.DEVNULL,
+                                       text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_history(filename: str) -> List[Dict[str, Any]]:
+    """
+    Loads the benchmark history.
+
+    :param filename: Path to the history file.
+    :return: A list of runs, oldest first. Each run is a dictionary with the keys ``timestamp``, ``commit``,
+             ``version``, ``host``, and ``results`` (mapping benchmark names to metrics).
+    """
+    if not os.path.isfile(filename):
+        return []
+    with open(filename, 'r') as fp:
+        return json.load(fp)
+
+
+def save_history(filename: str, history: List[Dict[str, Any]]) -> None:
+    """ Stores the benchmark history. """
+    folder = os.path.dirname(filename)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    with open(filename, 'w') as fp:
+        json.dump(history, fp, indent=2)
+
+
+def make_run(results: Dict[str, Dict[str, float]]) -> Dict[str, Any]:
+    """ Creates a history entry from benchmark results. """
+    return dict(timestamp=datetime.now().isoformat(timespec='seconds'),
+                commit=_git_commit(),
+                version=dace.__version__,
+                host=platform.node(),
+                results=results)
+
+
+def detect_regressions(history: List[Dict[str, Any]],
+                       results: Dict[str, Dict[str, float]],
+                       threshold: float = 0.1,
+                       window: int = 5) -> List[Tuple[str, str, float, float]]:
+    """
+    Compares benchmark results with the history. The baseline of each metric is the median of the last runs in the
+    history that measured it.
+
+    :param history: Previous runs (see ``load_history``).
+    :param results: Current results, mapping benchmark names to metrics.
+    :param threshold: Relative slowdown over the baseline that counts as a regression.
+    :param window: Number of previous runs that form the baseline.
+    :return: A list of regressions as (benchmark, metric, baseline, current) tuples.
+    """
+    regressions = []
+    for name, metrics in results.items():
+        for metric, value in metrics.items():
+            previous = [run['results'][name][metric] for run in history if metric in run['results'].get(name, {})]
+            if not previous:
+                continue
+            baseline = float(np.median(previous[-window:]))
+            if baseline > 0 and value > baseline * (1 + threshold):
+                regressions.append((name, metric, baseline, value))
+    return regressions
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser('dacebench',
+                                     formatter_class=argparse.RawDescriptionHelpFormatter,
+                                     description='''
+dacebench - DaCe Benchmark Suite
+
+Measures the parsing, optimization, compilation, and runtime of benchmark
+programs, appends the results to a history file, and reports regressions
+compared to previous runs. Exits with code 1 if a regression was detected.
+''')
+    parser.add_argument('paths',
+                        nargs='*',
+                        default=['benchmarks'],
+                        help='Benchmark files or folders (default: "benchmarks")')
+    parser.add_argument('--filter', '-f', help='Run only benchmarks that match a glob pattern (e.g., "polybench.*")')
+    parser.add_argument('--list', '-l', help='List benchmarks and exit', action='store_true')
+    parser.add_argument('--repetitions', '-r', help='Number of measured runs of each program', type=int, default=10)
+    parser.add_argument('--warmup', '-w', help='Number of runs before measuring', type=int, default=1)
+    parser.add_argument('--no-optimize', help='Do not apply automatic optimization', action='store_true')
+    parser.add_argument('--history',
+                        help=f'Path to the history file (default: {DEFAULT_HISTORY})',
+                        default=DEFAULT_HISTORY)
+    parser.add_argument('--no-save', help='Do not append the results to the history', action='store_true')
+    parser.add_argument('--threshold',
+                        '-t',
+                        help='Relative slowdown that counts as a regression (default: 0.1)',
+                        type=float,
+                        default=0.1)
+    parser.add_argument('--window',
+                        help='Number of previous runs that form the baseline (default: 5)',
+                        type=int,
+                        default=5)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+
+    benchmarks = discover_benchmarks(args.paths, args.filter)
+    if args.list:
+        for name in benchmarks:
+            print(name)
+        return
+    if not benchmarks:
+        print('dacebench: No benchmarks found')
+        exit(2)
+
+    history = load_history(args.history)
+    results = {}
+    print(f'{"Benchmark":<30}' + ''.join(f'{m + " (ms)":>16}' for m in METRICS))
+    for name, factory in benchmarks.items():
+        try:
+            results[name] = measure(factory, args.repetitions, args.warmup, not args.no_optimize)
+        except Exception as ex:
+            print(f'{name:<30}  FAILED: {type(ex).__name__}: {ex}')
+            continue
+        print(f'{name:<30}' + ''.join(f'{results[name][m]:>16.3f}' for m in METRICS))
+
+    # Only compare with runs on the same machine
+    baseline_runs = [run for run in history if run.get('host') == platform.node()]
+    regressions = detect_regressions(baseline_runs, results, args.threshold, args.window)
+    if not args.no_save:
+        history.append(make_run(results))
+        save_history(args.history, history)
+        print('dacebench: Results saved to', os.path.abspath(args.history))
+
+    if regressions:
+        print('dacebench: Regressions detected:')
+        for name, metric, baseline, value in regressions:
+            print(f'  {name} {metric}: {baseline:.3f} ms -> {value:.3f} ms (+{(value / baseline - 1) * 100:.1f}%)')
+        exit(1)
+    if len(results) < len(benchmarks):
+        exit(2)
+
+
+if __name__ == '__main__':
+    main()
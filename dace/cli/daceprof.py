@@ -9,11 +9,12 @@ import runpy
 import sys
 import os
 import shutil
-from typing import Callable, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 import warnings
 
 import dace
 from dace.codegen.instrumentation.report import InstrumentationReport
+from dace.sdfg.performance_evaluation.roofline import call_symbols, format_roofline, roofline
 from dace import dtypes
 
 ExitCode = Union[int, str]
@@ -75,6 +76,16 @@ or to print an existing report:
                        'types from the following: map, tasklet, state, sdfg',
                        default='map')
     group.add_argument('--sequential', help='Disable CPU multi-threading in code generation', action='store_true')
+    group.add_argument('--roofline',
+                       help='Rate instrumented maps against the machine roofline, using the static operation and '
+                       'data movement counts of each map with the symbol values of the call (implies --type Timer)',
+                       action='store_true')
+    group.add_argument('--peak-gflops',
+                       help='Peak machine performance in GFLOP/s for roofline mode (default: from configuration)',
+                       type=float)
+    group.add_argument('--peak-bandwidth',
+                       help='Peak machine memory bandwidth in GB/s for roofline mode (default: from configuration)',
+                       type=float)
 
     # Data instrumentation
     group = parser.add_argument_group('data instrumentation arguments')
@@ -128,6 +139,10 @@ def validate_arguments(args: argparse.Namespace) -> Optional[str]:
         return 'Cannot load and save a report at the same time.'
     if args.save_data and args.restore_data:
         return 'Choose either saving data containers or restoring them.'
+    if args.roofline and args.input:
+        return 'Roofline mode requires running a script or module.'
+    if args.roofline and args.type not in (None, 'Timer'):
+        return 'Roofline mode requires Timer instrumentation.'
     if args.type and (args.warmup or args.repetitions != DEFAULT_REPETITIONS):
         warnings.warn('Instrumentation mode is enabled, repetitions and warmup will be ignored.')
     for inst in args.instrument:
@@ -143,11 +158,15 @@ def _nop(*args, **kwargs):
     yield
 
 
-def run_script_or_module(args: argparse.Namespace) -> Tuple[Optional[InstrumentationReport], Optional[str], ExitCode]:
+def run_script_or_module(
+        args: argparse.Namespace,
+        calls: Optional[List[Tuple[dace.SDFG, Dict[str, Any]]]] = None
+) -> Tuple[Optional[InstrumentationReport], Optional[str], ExitCode]:
     """
     Runs the script or module and returns the report file.
 
     :param args: The arguments with which ``daceprof`` was called.
+    :param calls: If given, appends the compiled SDFG and its symbol values to this list on every program call.
     :return: A tuple of (report file name if created, exit code of original program)
     """
     # Modify argument list
@@ -156,6 +175,9 @@ def run_script_or_module(args: argparse.Namespace) -> Tuple[Optional[Instrumenta
 
     # Enable relevant call hooks
     hooks = enable_hooks(args)
+    if calls is not None:
+        call_hook = dace.hooks.register_compiled_sdfg_call_hook(
+            after_hook=lambda csdfg, _: calls.append((csdfg.sdfg, call_symbols(csdfg))))
 
     # Run script or module
     retval = None
@@ -198,6 +220,8 @@ def run_script_or_module(args: argparse.Namespace) -> Tuple[Optional[Instrumenta
     # Unregister hooks
     for hook in hooks:
         dace.hooks.unregister_sdfg_call_hook(hook)
+    if calls is not None:
+        dace.hooks.unregister_compiled_sdfg_call_hook(call_hook)
 
     # Warn if multiple reports were created
     if profiler:
@@ -207,7 +231,7 @@ def run_script_or_module(args: argparse.Namespace) -> Tuple[Optional[Instrumenta
             print('daceprof: Multiple report files created, showing combined report')
 
         # Get instrumentation report file, if filled
-        if profiler.report.events:
+        if profiler.report.events or profiler.report.columns is not None:
             retval = profiler.report
 
     return retval, errcode
@@ -220,9 +244,10 @@ def enable_hooks(args: argparse.Namespace) -> List[int]:
     if args.sequential:
 
         def make_sequential(sdfg: dace.SDFG):
-            # Disable OpenMP sections
+            # Disable OpenMP sections and tasks
             for sd in sdfg.all_sdfgs_recursive():
                 sd.openmp_sections = False
+                sd.openmp_tasks = False
             # Disable OpenMP maps
             for n, _ in sdfg.all_nodes_recursive():
                 if isinstance(n, dace.nodes.EntryNode):
@@ -280,6 +305,15 @@ def print_report(args: argparse.Namespace, reportfile: Union[str, Instrumentatio
         print(report)
 
 
+def print_roofline(args: argparse.Namespace, report: InstrumentationReport, sdfg: dace.SDFG, symbols: Dict[str, Any]):
+    entries = roofline(sdfg, report, symbols, peak_gflops=args.peak_gflops, peak_bandwidth=args.peak_bandwidth)
+    if not entries:
+        print('daceprof: No instrumented maps found for roofline.')
+        return
+    print('Roofline:')
+    print(format_roofline(entries))
+
+
 def main():
     parser, args = parse_arguments()
 
@@ -292,7 +326,11 @@ def main():
 
     # Execute program or module
     if not args.input:
-        report, errcode = run_script_or_module(args)
+        calls = None
+        if args.roofline:
+            args.type = 'Timer'
+            calls = []
+        report, errcode = run_script_or_module(args, calls)
 
         if report is None:
             if not args.save_data and not args.restore_data:
@@ -307,6 +345,8 @@ def main():
                 if report:
                     print('daceprof: Report file saved at', os.path.abspath(report.filepath))
                 print_report(args, report)
+            if calls:
+                print_roofline(args, report, *calls[-1])
 
         # Forward error code from internal application
         if errcode:
@@ -1,12 +1,13 @@
 # Copyright 2019-2021 ETH Zurich and the DaCe authors. All rights reserved.
 """ SDFG visualizer that uses Jinja, HTML5, and Javascript. """
 
+import argparse
 import json
 import tempfile
 import sys
 import os
 import platform
-from typing import Optional, Union
+from typing import Any, Dict, Optional, Union
 import functools
 import http.server
 import threading
@@ -14,6 +15,7 @@ import threading
 import dace
 import tempfile
 import jinja2
+from dace.codegen.instrumentation.report import MEMORY_COUNTERS, InstrumentationReport
 
 
 def partialclass(cls, *args, **kwds):
@@ -23,7 +25,10 @@ def partialclass(cls, *args, **kwds):
     return NewCls
 
 
-def view(sdfg: dace.SDFG, filename: Optional[Union[str, int]] = None, verbose: bool = True):
+def view(sdfg: dace.SDFG,
+         filename: Optional[Union[str, int]] = None,
+         verbose: bool = True,
+         overlay: Optional[Dict[str, Any]] = None):
     """
     View an sdfg in the system's HTML viewer
 
@@ -34,9 +39,12 @@ def view(sdfg: dace.SDFG, filename: Optional[Union[str, int]] = None, verbose: b
                     served using a basic web server on that port,
                     blocking the current thread.
     :param verbose: Be verbose.
+    :param overlay: An instrumentation report (as a Chrome Tracing JSON
+                    object) to show as a heatmap over the SDFG, e.g., the
+                    output of ``InstrumentationReport.memory_overlay``.
     """
     # If vscode is open, try to open it inside vscode
-    if filename is None:
+    if filename is None and overlay is None:
         if (
             'VSCODE_IPC_HOOK' in os.environ
             or 'VSCODE_IPC_HOOK_CLI' in os.environ
@@ -67,7 +75,9 @@ def view(sdfg: dace.SDFG, filename: Optional[Union[str, int]] = None, verbose: b
     template = template_env.get_template('sdfv.html')
 
     # if we are serving, the base path should just be root
-    html = template.render(sdfg=json.dumps(sdfg), dir="/" if isinstance(filename, int) else (basepath + '/'))
+    html = template.render(sdfg=json.dumps(sdfg),
+                           overlay=json.dumps(overlay) if overlay is not None else None,
+                           dir="/" if isinstance(filename, int) else (basepath + '/'))
 
     with open(html_filename, "w") as f:
         f.write(html)
@@ -115,18 +125,33 @@ def view(sdfg: dace.SDFG, filename: Optional[Union[str, int]] = None, verbose: b
 
 
 def main():
-    if len(sys.argv) != 2:
-        print('USAGE: sdfv <PATH TO SDFG FILE>')
-        exit(1)
-    if os.path.isdir(sys.argv[1]):
-        filename = os.path.join(sys.argv[1], 'program.sdfg')
+    parser = argparse.ArgumentParser(description='SDFG viewer')
+    parser.add_argument('filename', help='Path to an SDFG file, or a folder containing "program.sdfg"')
+    parser.add_argument('--memory-report',
+                        help='Path to an instrumentation report with memory usage counters, which is shown as a '
+                        'heatmap over the SDFG')
+    parser.add_argument('--metric',
+                        default='peak_bytes',
+                        choices=MEMORY_COUNTERS,
+                        help='Memory usage counter to show (default: peak_bytes)')
+    args = parser.parse_args()
+
+    if os.path.isdir(args.filename):
+        filename = os.path.join(args.filename, 'program.sdfg')
     else:
-        filename = sys.argv[1]
+        filename = args.filename
 
     if not os.path.isfile(filename):
         print('SDFG file', filename, 'not found')
         exit(2)
 
+    overlay = None
+    if args.memory_report is not None:
+        if not os.path.isfile(args.memory_report):
+            print('Instrumentation report', args.memory_report, 'not found')
+            exit(2)
+        overlay = InstrumentationReport(args.memory_report).memory_overlay(args.metric)
+
     sdfg_json = None
 
     # Open JSON file directly
@@ -139,9 +164,9 @@ def main():
     # Load SDFG
     if sdfg_json is None:
         sdfg = dace.SDFG.from_file(filename)
-        view(sdfg, filename)
+        view(sdfg, filename, overlay=overlay)
     else:
-        view(sdfg_json, filename)
+        view(sdfg_json, filename, overlay=overlay)
 
 
 if __name__ == '__main__':
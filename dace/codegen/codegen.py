@@ -241,6 +241,15 @@ def generate_code(sdfg: SDFG, validate=True) -> List[CodeObject]:
                    sdfg=sdfg)
     ]
 
+    # Functions moved to other translation units share a header with the frame code
+    if frame.shared_header is not None:
+        target_objects.append(
+            CodeObject(sdfg.name + '_shared', frame.shared_header, 'h', cpu.CPUCodeGen, 'SharedHeader', linkable=False))
+        for i, unit in enumerate(frame.split_units):
+            target_objects.append(
+                CodeObject(f'{sdfg.name}_{i}', f'#include "{sdfg.name}_shared.h"\n\n{unit}', 'cpp', cpu.CPUCodeGen,
+                           'Frame'))
+
     # Create code objects for each target
     for tgt in used_targets:
         target_objects.extend(tgt.get_generated_codeobjects())
@@ -5,7 +5,8 @@ import os
 import re
 import shutil
 import subprocess
-from typing import Any, Callable, Dict, List, Tuple, Optional, Type, Union
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Tuple, Optional, Type, Union
 import warnings
 
 import numpy as np
@@ -16,6 +17,10 @@ from dace.codegen import exceptions as cgx
 from dace.config import Config
 from dace.frontend import operations
 
+if TYPE_CHECKING:
+    from dace.codegen.instrumentation.latency import LatencyStats
+    from dace.codegen.specialization import SymbolSpecializer
+
 
 class ReloadableDLL(object):
     """
@@ -204,6 +209,10 @@ class CompiledSDFG(object):
         self._return_arrays: List[np.ndarray] = []
         self._callback_retval_references: List[Any] = []  # Avoids garbage-collecting callback return values
 
+        # Call latency statistics (see ``dace.codegen.instrumentation.latency``)
+        self._latency: Optional['LatencyStats'] = None
+        self._marshal_time: Optional[int] = None  # Argument marshalling time of the current call (in nanoseconds)
+
         # Cache SDFG argument properties
         self._typedict = self._sdfg.arglist()
         self._sig = self._sdfg.signature_arglist(with_types=False, arglist=self._typedict)
@@ -224,6 +233,10 @@ class CompiledSDFG(object):
                     self.has_gpu_code = True
                     break
 
+        self._specializer = None
+        if Config.get_bool('compiler', 'jit_specialization'):
+            self.specialize_symbols()
+
     def get_exported_function(self, name: str, restype=None) -> Optional[Callable[..., Any]]:
         """
         Tries to find a symbol by name in the compiled SDFG, and convert it to a callable function
@@ -323,6 +336,52 @@ class CompiledSDFG(object):
         ptr = _array_interface_ptr(workspace, storage)
         func(self._libhandle, ctypes.c_void_p(ptr), *self._lastargs[1])
 
+    def specialize_symbols(self,
+                           symbols: Optional[List[str]] = None,
+                           cache_size: Optional[int] = None,
+                           background: bool = True) -> Optional['SymbolSpecializer']:
+        """
+        Enables just-in-time specialization of this compiled SDFG. Calls with new symbol values compile a variant
+        of the SDFG in which these symbols are constants, and subsequent calls with the same values are dispatched
+        to that variant. Calls made through ``fast_call`` always use the generic program.
+
+        :param symbols: The symbols to specialize. If None, specializes all integer free symbols.
+        :param cache_size: Maximal number of loaded variants (least recently used ones are unloaded). If None, uses
+                           the ``compiler.jit_specialization_cache_size`` configuration entry.
+        :param background: If True, calls use the generic program while variants compile in the background.
+                           Otherwise, the first call with new symbol values waits for its variant to compile.
+        :return: The symbol specializer, or None if there are no symbols to specialize.
+        """
+        from dace.codegen.specialization import SymbolSpecializer, specializable_symbols  # Avoid import loop
+
+        if self._specializer is not None:
+            self._specializer.close()
+            self._specializer = None
+
+        if symbols is None:
+            symbols = specializable_symbols(self._sdfg)
+        if not symbols:
+            return None
+        if cache_size is None:
+            cache_size = Config.get('compiler', 'jit_specialization_cache_size')
+        self._specializer = SymbolSpecializer(self._sdfg, symbols, cache_size, background)
+        return self._specializer
+
+    @property
+    def specializer(self) -> Optional['SymbolSpecializer']:
+        """ The symbol specializer of this compiled SDFG, if specialization is enabled. """
+        return self._specializer
+
+    def stats(self) -> Optional['LatencyStats']:
+        """
+        Returns the latency histograms of the calls to this compiled SDFG, which are recorded while the
+        :func:`~dace.builtin_hooks.latency_histograms` hook is active (or if ``profiling_latency`` is enabled in the
+        configuration).
+
+        :return: The latency statistics, or None if no call was recorded.
+        """
+        return self._latency
+
     @property
     def filename(self):
         return self._lib._library_filename
@@ -404,7 +463,13 @@ class CompiledSDFG(object):
                 # `_construct_args` will handle all of its arguments as kwargs.
                 {aname: arg
                  for aname, arg in zip(self.argnames, args)})
+        if self._specializer is not None:
+            variant = self._specializer.lookup(kwargs)
+            if variant is not None:
+                return variant(**kwargs)
+        start = time.perf_counter_ns()
         argtuple, initargtuple = self._construct_args(kwargs)  # Missing arguments will be detected here.
+        self._marshal_time = time.perf_counter_ns() - start
         # Return values are cached in `self._lastargs`.
         return self.fast_call(argtuple, initargtuple, do_gpu_check=True)
 
@@ -457,13 +522,20 @@ class CompiledSDFG(object):
             self._lib.unload()
             raise
 
-    def __del__(self):
+    def unload(self):
+        """ Finalizes the compiled SDFG (if initialized) and unloads its library. """
+        if getattr(self, '_specializer', None) is not None:
+            self._specializer.close()
+            self._specializer = None
         if self._initialized is True:
             self.finalize()
             self._initialized = False
             self._libhandle = ctypes.c_void_p(0)
         self._lib.unload()
 
+    def __del__(self):
+        self.unload()
+
     def _construct_args(self, kwargs) -> Tuple[Tuple[Any], Tuple[Any]]:
         """
         Main function that controls argument construction for calling
@@ -12,7 +12,10 @@ import shutil
 import shlex
 import subprocess
 import re
-from typing import Any, Callable, Dict, List, Set, Tuple, TypeVar, Union
+import warnings
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Set, Tuple, TypeVar, Union
+
+import numpy as np
 
 import dace
 from dace.config import Config
@@ -22,6 +25,9 @@ from dace.codegen.codeobject import CodeObject
 from dace.codegen import compiled_sdfg as csd
 from dace.codegen.targets.target import make_absolute
 
+if TYPE_CHECKING:
+    from dace.codegen.instrumentation.data.data_report import InstrumentedDataReport
+
 T = TypeVar('T')
 
 
@@ -97,7 +103,10 @@ def generate_program_folder(sdfg, code_objects: List[CodeObject], out_path: str,
     return out_path
 
 
-def configure_and_compile(program_folder, program_name=None, output_stream=None):
+def configure_and_compile(program_folder,
+                          program_name=None,
+                          output_stream=None,
+                          pgo: Optional[Union[Callable[['csd.CompiledSDFG'], Any], 'InstrumentedDataReport']] = None):
     """ Configures and compiles a DaCe program in the specified folder into a
         shared library file.
 
@@ -106,6 +115,120 @@ def configure_and_compile(program_folder, program_name=None, output_stream=None)
                                `generate_program_folder`.
         :param output_stream: Additional output stream to write to (used for
                               other clients such as the vscode extension).
+        :param pgo: If given, builds the program with profile-guided
+                    optimization in two phases: the program is first built
+                    with instrumentation and invoked on a representative
+                    input, then rebuilt using the recorded profile. The
+                    invocation is either a callable that receives the
+                    instrumented ``CompiledSDFG``, or a data report (see
+                    ``DataInstrumentationType.Save``) whose saved arguments
+                    are replayed. Profiles are stored in the build folder by
+                    SDFG hash, and reused in subsequent builds of the same SDFG.
+        :return: Path to the compiled shared library file.
+    """
+    if pgo is None:
+        return _configure_and_compile(program_folder, program_name, output_stream)
+
+    profile_folder = get_pgo_profile_folder(program_folder)
+    if not _has_pgo_profile(profile_folder):
+        # Phase 1: Build instrumented program and record a profile
+        shutil.rmtree(profile_folder, ignore_errors=True)
+        os.makedirs(profile_folder)
+        library = _configure_and_compile(program_folder, program_name, output_stream, pgo_mode='generate')
+        _record_pgo_profile(program_folder, library, pgo)
+        if not _has_pgo_profile(profile_folder):
+            warnings.warn('No profile was recorded by the instrumented program, profile-guided optimization '
+                          'will have no effect. Ensure that the compiler supports it (GCC or Clang).')
+
+    # Phase 2: Build the program using the recorded profile
+    return _configure_and_compile(program_folder, program_name, output_stream, pgo_mode='use')
+
+
+def get_pgo_profile_folder(program_folder: str) -> str:
+    """ Returns the folder in which the profile-guided optimization profile of
+        the program in the given folder is stored. Profiles are keyed by the
+        hash of the SDFG, such that changes to the program invalidate them.
+
+        :param program_folder: Folder containing the generated program.
+        :return: Path to the profile folder.
+    """
+    sdfg_hash = 'default'
+    hash_file = os.path.join(program_folder, 'include', 'hash.h')
+    if os.path.isfile(hash_file):
+        with open(hash_file, 'r') as fp:
+            match = re.search(r'"([0-9a-fA-F]+)"', fp.read())
+        if match:
+            sdfg_hash = match.group(1)
+    return os.path.join(os.path.abspath(program_folder), 'build', 'pgo', sdfg_hash)
+
+
+def _has_pgo_profile(profile_folder: str) -> bool:
+    """ Returns True if the given folder contains a recorded profile. """
+    for _, _, files in os.walk(profile_folder):
+        if any(f.endswith(('.gcda', '.profraw', '.profdata')) for f in files):
+            return True
+    return False
+
+
+def _record_pgo_profile(program_folder: str, library_path: str, pgo) -> None:
+    """ Invokes an instrumented program to record its profile. """
+    from dace.sdfg import SDFG  # Avoid import loop
+
+    sdfg = SDFG.from_file(os.path.join(program_folder, 'program.sdfg'))
+    compiled = get_program_handle(library_path, sdfg)
+    try:
+        if callable(pgo):
+            pgo(compiled)
+        else:
+            arguments = _pgo_replay_arguments(sdfg, pgo)
+            # Arrays with padded layouts can only be replayed as views
+            with dace.config.set_temporary('compiler', 'allow_view_arguments', value=True):
+                compiled(**arguments)
+    finally:
+        # Profiles are written when the library is unloaded
+        compiled.unload()
+
+
+def _pgo_replay_arguments(sdfg, dreport: 'InstrumentedDataReport') -> Dict[str, Any]:
+    """ Creates the arguments of an SDFG invocation from the first saved version of each argument in a data report. """
+    arguments = {}
+    available = dreport.keys()
+    arglist = sdfg.arglist()
+
+    # Symbols first, as they may define array sizes
+    for name in sorted(arglist.keys(), key=lambda n: n in sdfg.arrays):
+        if name not in sdfg.arrays:
+            if name not in available:
+                raise ValueError(f'Symbol "{name}" of SDFG "{sdfg.name}" was not saved in the data report and cannot '
+                                 'be replayed for profile-guided optimization')
+            arguments[name] = dreport.get_first_version(name)
+            continue
+
+        desc = sdfg.arrays[name]
+        value = dreport.get_first_version(name) if name in available else None
+        if isinstance(desc, dace.data.Scalar):
+            arguments[name] = desc.dtype.type(np.asarray(value).flat[0] if value is not None else 0)
+        else:
+            # Arrays that were not saved (e.g., outputs) are replayed uninitialized
+            symbols = {k: v for k, v in arguments.items() if k not in sdfg.arrays}
+            array = dace.data.make_array_from_descriptor(desc, value, symbols)
+            # Compiled SDFGs reject views, so copy the array into one that owns its data (unless its layout is padded)
+            if isinstance(array, np.ndarray):
+                owned = np.copy(array, order='K')
+                if owned.strides == array.strides:
+                    array = owned
+            arguments[name] = array
+    return arguments
+
+
+def _configure_and_compile(program_folder, program_name=None, output_stream=None, pgo_mode: Optional[str] = None):
+    """ Configures and compiles a DaCe program in the specified folder into a
+        shared library file.
+
+        :param program_folder: Folder containing all files necessary to build.
+        :param output_stream: Additional output stream to write to.
+        :param pgo_mode: Profile-guided optimization mode (``'generate'`` or
+                         ``'use'``), or None to build without profiles.
         :return: Path to the compiled shared library file.
     """
 
@@ -188,6 +311,12 @@ def configure_and_compile(program_folder, program_name=None, output_stream=None)
 
     cmake_command.append(f"-DCMAKE_BUILD_TYPE={Config.get('compiler', 'build_type')}")
 
+    # Profile-guided optimization (mode is always set to avoid stale values in the CMake cache)
+    cmake_command.append(f'-DDACE_PGO_MODE="{pgo_mode or ""}"')
+    if pgo_mode is not None:
+        pgo_folder = get_pgo_profile_folder(program_folder).replace('\\', '/')
+        cmake_command.append(f'-DDACE_PGO_DIR="{pgo_folder}"')
+
     # Set linker and linker arguments, iff they have been specified
     cmake_linker = Config.get('compiler', 'linker', 'executable') or ''
     cmake_linker = cmake_linker.strip()
@@ -228,8 +357,9 @@ def configure_and_compile(program_folder, program_name=None, output_stream=None)
         fp.write(cmake_command)
 
     # Compile and link
+    build_jobs = Config.get('compiler', 'build_jobs') or os.cpu_count() or 1
     try:
-        _run_liveoutput("cmake --build . --config %s" % (Config.get('compiler', 'build_type')),
+        _run_liveoutput("cmake --build . --config %s --parallel %d" % (Config.get('compiler', 'build_type'), build_jobs),
                         shell=True,
                         cwd=build_folder,
                         output_stream=output_stream)
@@ -61,6 +61,7 @@ from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Sequence, Set,
 import networkx as nx
 import sympy as sp
 from dace import dtypes
+from dace.sdfg import utils
 from dace.sdfg.analysis import cfg as cfg_analysis
 from dace.sdfg.state import (BreakBlock, ConditionalBlock, ContinueBlock, ControlFlowBlock, ControlFlowRegion, LoopRegion,
                              ReturnBlock, SDFGState)
@@ -269,10 +270,78 @@ class GeneralBlock(RegionBlock):
     # True if control flow is sequential between elements, or False if contains irreducible control flow
     sequential: bool
 
+    def _openmp_task_sequences(self, codegen: 'DaCeCodeGenerator') -> Dict[int, int]:
+        """
+        Finds sequences of states in this block that can execute as a single OpenMP task graph (see
+        ``SDFG.openmp_tasks``), i.e., consecutive states that are only connected by unconditional transitions without
+        assignments, such that no state is jumped into from outside the sequence and no state jumps out of it.
+
+        :return: A dictionary mapping the index of the first element of each sequence to the index of its last one.
+        """
+        if codegen.openmp_task_region:  # Already within a task region (e.g., in a nested SDFG)
+            return {}
+
+        def enabled(elem: ControlFlow) -> bool:
+            if not isinstance(elem, BasicCFBlock):
+                return False
+            cfg = elem.state.parent_graph
+            sdfg = cfg if isinstance(cfg, SDFG) else cfg.sdfg
+            return sdfg.openmp_tasks
+
+        def chained(prev: BasicCFBlock, elem: BasicCFBlock) -> bool:
+            cfg = prev.state.parent_graph
+            out_edges = cfg.out_edges(prev.state)
+            if len(out_edges) != 1 or elem.state.parent_graph is not cfg or cfg.in_degree(elem.state) != 1:
+                return False
+            e = out_edges[0]
+            return (e.dst is elem.state and e.data.is_unconditional() and len(e.data.assignments) == 0
+                    and e not in self.gotos_to_ignore)
+
+        def may_end(elem: BasicCFBlock) -> bool:
+            # A state without successors jumps to the exit of the SDFG unless it is the last block
+            return elem.last_block or elem.state.parent_graph.out_degree(elem.state) > 0
+
+        sequences: Dict[int, int] = {}
+        i = 0
+        while i < len(self.elements):
+            if not enabled(self.elements[i]):
+                i += 1
+                continue
+            end = i
+            while (end + 1 < len(self.elements) and enabled(self.elements[end + 1])
+                   and chained(self.elements[end], self.elements[end + 1])):
+                end += 1
+            last = end
+            while last >= i and not may_end(self.elements[last]):
+                last -= 1
+
+            # Only create tasks if there is more than one unit of work
+            if last > i or (last == i and len(utils.concurrent_subgraphs(self.elements[i].state)) > 1):
+                sequences[i] = last
+            i = end + 1
+
+        return sequences
+
     def as_cpp(self, codegen, symbols) -> str:
         expr = ''
+        task_sequences = self._openmp_task_sequences(codegen)
+        sequence_end = None
         for i, elem in enumerate(self.elements):
-            expr += elem.as_cpp(codegen, symbols)
+            if i in task_sequences:
+                # Open a task region after the label of the first state, since it may be the target of a jump
+                sequence_end = task_sequences[i]
+                codegen.openmp_task_region = True
+                codegen.openmp_task_states = {self.elements[j].state for j in range(i, sequence_end + 1)}
+                label, body = elem.as_cpp(codegen, symbols).split('\n', 1)
+                expr += label + '\n#pragma omp parallel\n#pragma omp single\n{\n' + body
+            else:
+                expr += elem.as_cpp(codegen, symbols)
+            if i == sequence_end:
+                expr += '} // End omp single\n'
+                codegen.openmp_task_region = False
+                codegen.openmp_task_states = set()
+                sequence_end = None
+
             # In a general block, emit transitions and assignments after each individual block or region.
             if isinstance(elem, BasicCFBlock) or (isinstance(elem, RegionBlock) and elem.region):
                 if isinstance(elem, BasicCFBlock):
@@ -7,5 +7,7 @@ from .likwid import LIKWIDInstrumentationCPU, LIKWIDInstrumentationGPU
 from .timer import TimerProvider
 from .gpu_events import GPUEventProvider
 from .fpga import FPGAInstrumentationProvider
+from .perf_event import PerfEventInstrumentation
+from .memory import MemoryUsageProvider
 
 from .data.data_dump import SaveProvider, RestoreProvider
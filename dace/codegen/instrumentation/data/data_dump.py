@@ -1,5 +1,5 @@
 # Copyright 2019-2022 ETH Zurich and the DaCe authors. All rights reserved.
-from dace import config, data as dt, dtypes, registry, SDFG
+from dace import config, data as dt, dtypes, library, registry, SDFG
 from dace.sdfg import nodes, is_devicelevel_gpu
 from dace.codegen.prettycode import CodeIOStream
 from dace.codegen.instrumentation.provider import InstrumentationProvider
@@ -17,8 +17,60 @@ if TYPE_CHECKING:
     from dace.codegen.targets.framecode import DaCeCodeGenerator
 
 
+@library.environment
+class ZLIB:
+    """
+    An environment for zlib, which compresses chunked data instrumentation files.
+    """
+
+    cmake_minimum_version = None
+    cmake_packages = ["ZLIB"]
+    cmake_variables = {}
+    cmake_includes = []
+    cmake_libraries = ["ZLIB::ZLIB"]
+    cmake_compile_flags = ["-DDACE_WITH_ZLIB"]
+    cmake_link_flags = []
+    cmake_files = []
+
+    headers = []
+    state_fields = []
+    init_code = ""
+    finalize_code = ""
+    dependencies = []
+
+
 class DataInstrumentationProviderMixin:
 
+    def _setup_data_format(self, codegen: 'DaCeCodeGenerator') -> str:
+        """
+        Returns code that configures the serializer to the data file format and saving mode set in the configuration,
+        and adds zlib to the program if compression is enabled.
+        """
+        compression = config.Config.get('instrumentation', 'data', 'compression')
+        if compression not in ('none', 'zlib'):
+            raise ValueError(f'Unknown data instrumentation compression "{compression}"')
+        if compression == 'zlib':
+            codegen.dispatcher.used_environments.add(ZLIB.full_class_path())
+
+        code = ''
+        data_format = config.Config.get('instrumentation', 'data', 'format')
+        if data_format == 'chunked':
+            chunk_size = config.Config.get('instrumentation', 'data', 'chunk_size')
+            code += (f'__state->serializer->set_chunked({chunk_size}, '
+                     f'dace::DataCompression::{compression.capitalize()});\n')
+        elif data_format != 'raw':
+            raise ValueError(f'Unknown data instrumentation file format "{data_format}"')
+
+        if config.Config.get_bool('instrumentation', 'data', 'asynchronous'):
+            policy = config.Config.get('instrumentation', 'data', 'backpressure')
+            if policy not in ('block', 'drop', 'sample'):
+                raise ValueError(f'Unknown data instrumentation backpressure policy "{policy}"')
+            capacity = config.Config.get('instrumentation', 'data', 'staging_buffer_size')
+            interval = config.Config.get('instrumentation', 'data', 'sample_interval')
+            code += (f'__state->serializer->set_async({capacity}, dace::BackpressurePolicy::{policy.capitalize()}, '
+                     f'{interval});\n')
+        return code
+
     def _setup_gpu_runtime(self, sdfg: SDFG, global_stream: CodeIOStream):
         if self.gpu_runtime_init:
             return
@@ -95,6 +147,9 @@ class SaveProvider(InstrumentationProvider, DataInstrumentationProviderMixin):
             path = os.path.abspath(os.path.join(sdfg.build_folder, 'data')).replace('\\', '/')
             codegen.statestruct.append('dace::DataSerializer *serializer;')
             sdfg.append_init_code(f'__state->serializer = new dace::DataSerializer("{path}");\n')
+            format_code = self._setup_data_format(codegen)
+            if format_code:
+                sdfg.append_init_code(format_code)
 
     def on_sdfg_end(self, sdfg: SDFG, local_stream: CodeIOStream, global_stream: CodeIOStream):
         # Teardown serializer versioning object
@@ -207,6 +262,7 @@ class RestoreProvider(InstrumentationProvider, DataInstrumentationProviderMixin)
             self.codegen = codegen
             codegen.statestruct.append('dace::DataSerializer *serializer;')
             sdfg.append_init_code(f'__state->serializer = new dace::DataSerializer("");\n')
+            self._setup_data_format(codegen)  # Restoring compressed files requires zlib
 
             # Add method that controls serializer input
             global_stream.write(self._generate_report_setter(sdfg))
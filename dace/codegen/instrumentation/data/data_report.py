@@ -3,12 +3,19 @@ from dataclasses import dataclass
 import struct
 from typing import Any, Dict, List, Set, Tuple, Union
 import os
+import zlib
 
 from dace import dtypes, SDFG
 from dace.data import ArrayLike, Number  # Type hint
 
 import numpy as np
 
+#: Magic number of chunked data container files
+CHUNKED_MAGIC = b'DACECHK1'
+
+#: Compression types of chunked data container files, in the order of ``dace::DataCompression``
+CHUNKED_COMPRESSION = ('none', 'zlib')
+
 
 @dataclass
 class InstrumentedDataReport:
@@ -25,7 +32,10 @@ class InstrumentedDataReport:
     currently-saved array or symbol (e.g., when an access node is written to multiple times in a loop).
     
     The files themselves are direct binary representations of the whole data (with padding and strides), for complete
-    reproducibility. When accessed from the report, a numpy wrapper shows the user-accessible view of that array.
+    reproducibility. If the ``instrumentation.data.format`` configuration entry is set to ``chunked``, the files are
+    instead containers of (optionally compressed) chunks with an index, which are written and read in parallel.
+    When accessed from the report, a numpy wrapper shows the user-accessible view of that array. Uncompressed data is
+    memory-mapped (copy-on-write), so that arrays are only read from disk when their contents are accessed.
     Example of reading a file::
 
         dreport = sdfg.get_instrumented_data()  # returns a report
@@ -83,18 +93,56 @@ class InstrumentedDataReport:
         :return: A 2-tuple of (original buffer, array view)
         """
         with open(filename, 'rb') as fp:
+            if fp.read(len(CHUNKED_MAGIC)) != CHUNKED_MAGIC:
+                fp.seek(0)
+                fmt = 'i'
+            else:
+                fmt = 'I'
+
             # Recreate runtime shape and strides from buffer
-            ndims, = struct.unpack('i', fp.read(4))
-            shape = struct.unpack('i' * ndims, fp.read(4 * ndims))
-            strides = struct.unpack('i' * ndims, fp.read(4 * ndims))
+            ndims, = struct.unpack(fmt, fp.read(4))
+            shape = struct.unpack(fmt * ndims, fp.read(4 * ndims))
+            strides = struct.unpack(fmt * ndims, fp.read(4 * ndims))
             strides = tuple(s * npdtype.itemsize for s in strides)
 
-            # Make numpy array from data descriptor
-            nparr = np.fromfile(fp, dtype=npdtype)
-            # No need to use ``start_offset`` because the unaligned version is saved
-            view = np.ndarray(shape, npdtype, buffer=nparr, strides=strides)
+            if fmt == 'i':
+                # Raw file: data follows the header
+                offset = fp.tell()
+                nbytes = os.fstat(fp.fileno()).st_size - offset
+                nparr = self._map_array(filename, npdtype, offset, nbytes)
+            else:
+                nparr = self._read_chunks(fp, filename, npdtype)
+
+        # No need to use ``start_offset`` because the unaligned version is saved
+        view = np.ndarray(shape, npdtype, buffer=nparr, strides=strides)
         return nparr, view
 
+    @staticmethod
+    def _map_array(filename: str, npdtype: np.dtype, offset: int, nbytes: int) -> ArrayLike:
+        """ Lazily maps the contents of a file as a copy-on-write array. """
+        if nbytes < npdtype.itemsize:
+            return np.empty([0], dtype=npdtype)
+        return np.memmap(filename, dtype=npdtype, mode='c', offset=offset, shape=(nbytes // npdtype.itemsize, ))
+
+    def _read_chunks(self, fp, filename: str, npdtype: np.dtype) -> ArrayLike:
+        """ Reads the contents of a chunked data container file, after its shape and strides. """
+        _, compression, nbytes, chunk_size, nchunks = struct.unpack('IIQQQ', fp.read(32))
+        index = struct.unpack('QQ' * nchunks, fp.read(16 * nchunks))
+        offsets, sizes = index[0::2], index[1::2]
+
+        if CHUNKED_COMPRESSION[compression] == 'none':
+            # Uncompressed chunks are stored contiguously
+            offset = offsets[0] if nchunks > 0 else 0
+            return self._map_array(filename, npdtype, offset, nbytes)
+
+        buffer = np.empty([nbytes // npdtype.itemsize], dtype=npdtype)
+        flat = buffer.view(np.uint8)
+        for i, (offset, size) in enumerate(zip(offsets, sizes)):
+            fp.seek(offset)
+            chunk = zlib.decompress(fp.read(size))
+            flat[i * chunk_size:i * chunk_size + len(chunk)] = np.frombuffer(chunk, dtype=np.uint8)
+        return buffer
+
     def _read_symbol_file(self, filename: str, npdtype: np.dtype) -> Number:
         with open(filename, 'rb') as fp:
             npclass = getattr(np, str(npdtype))
@@ -157,6 +205,7 @@ class InstrumentedDataReport:
             dtype: dtypes.typeclass = self.sdfg.symbols[item]
             val = self._read_symbol_file(file, dtype.as_numpy_dtype())
             self.loaded_values[item, 0] = val
+            return val
         else:
             raise KeyError(f'Item not found in report: {item}')
 
@@ -170,8 +219,12 @@ class InstrumentedDataReport:
         for (k, i), loaded in self.loaded_values.items():
             if isinstance(loaded, np.ndarray):
                 dtype_bytes = loaded.dtype.itemsize
-                with open(self.files[k][i], 'wb') as fp:
+                # Arrays may be mapped from the original file, which is thus replaced rather than overwritten.
+                # Files are always written in the raw format.
+                filename = self.files[k][i]
+                with open(filename + '.tmp', 'wb') as fp:
                     fp.write(struct.pack('i', loaded.ndim))
                     fp.write(struct.pack('i' * loaded.ndim, *loaded.shape))
                     fp.write(struct.pack('i' * loaded.ndim, *(s // dtype_bytes for s in loaded.strides)))
                     loaded.tofile(fp)
+                os.replace(filename + '.tmp', filename)
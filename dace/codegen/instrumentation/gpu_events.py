@@ -31,6 +31,8 @@ class GPUEventProvider(InstrumentationProvider):
         sdfg.append_global_code('\n#include <chrono>', None)
         sdfg.append_global_code('\n#include <%s>' % header_name, None)
 
+        self._register_sampling(sdfg, 'GPU', codegen)
+
     def _get_sobj(self, node: Union[nodes.EntryNode, nodes.ExitNode]):
         # Get object behind scope
         if hasattr(node, 'consume'):
@@ -67,7 +69,7 @@ class GPUEventProvider(InstrumentationProvider):
 {backend}EventSynchronize(__dace_ev_e{id});
 {backend}EventElapsedTime(&__dace_ms_{id}, __dace_ev_b{id}, __dace_ev_e{id});
 int __dace_micros_{id} = (int) (__dace_ms_{id} * 1000.0);
-unsigned long int __dace_ts_end_{id} = std::chrono::duration_cast<std::chrono::microseconds>(std::chrono::high_resolution_clock::now().time_since_epoch()).count();
+unsigned long int __dace_ts_end_{id} = dace::perf::timestamp_us();
 unsigned long int __dace_ts_start_{id} = __dace_ts_end_{id} - __dace_micros_{id};
 __state->report.add_completion("{timer_name}", "GPU", __dace_ts_start_{id}, __dace_ts_end_{id}, {cfg_id}, {state_id}, {node_id});'''.format(
             id=idstr,
@@ -92,11 +94,11 @@ __state->report.add_completion("{timer_name}", "GPU", __dace_ts_start_{id}, __da
 
         # Create and record a CUDA/HIP event for the entire state
         if state.instrument == dtypes.InstrumentationType.GPU_Events:
-            idstr = 'b' + self._idstr(sdfg, state, None)
-            local_stream.write(self._create_event(idstr), sdfg, state_id)
-            local_stream.write(self._record_event(idstr, 0), sdfg, state_id)
-            idstr = 'e' + self._idstr(sdfg, state, None)
-            local_stream.write(self._create_event(idstr), sdfg, state_id)
+            idstr = self._idstr(sdfg, state, None)
+            local_stream.write(self._create_event('b' + idstr), sdfg, state_id)
+            local_stream.write(self._create_event('e' + idstr), sdfg, state_id)
+            local_stream.write(self._sample_decision(idstr, 'GPU'), sdfg, state_id)
+            local_stream.write(self._sampled(idstr, self._record_event('b' + idstr, 0)), sdfg, state_id)
 
     def on_state_end(self, sdfg: SDFG, state: SDFGState, local_stream: CodeIOStream,
                      global_stream: CodeIOStream) -> None:
@@ -104,8 +106,10 @@ __state->report.add_completion("{timer_name}", "GPU", __dace_ts_start_{id}, __da
         # Record and measure state stream event
         if state.instrument == dtypes.InstrumentationType.GPU_Events:
             idstr = self._idstr(sdfg, state, None)
-            local_stream.write(self._record_event('e' + idstr, 0), sdfg, state_id)
-            local_stream.write(self._report('State %s' % state.label, sdfg, state), sdfg, state_id)
+            local_stream.write(
+                self._sampled(idstr,
+                              self._record_event('e' + idstr, 0) + '\n' + self._report('State %s' % state.label, sdfg, state)),
+                sdfg, state_id)
             local_stream.write(self._destroy_event('b' + idstr), sdfg, state_id)
             local_stream.write(self._destroy_event('e' + idstr), sdfg, state_id)
 
@@ -126,9 +130,10 @@ __state->report.add_completion("{timer_name}", "GPU", __dace_ts_start_{id}, __da
             if s.schedule != dtypes.ScheduleType.GPU_Device:
                 raise TypeError('GPU Event instrumentation only applies to ' 'GPU_Device map scopes')
 
-            idstr = 'b' + self._idstr(sdfg, state, node)
+            idstr = self._idstr(sdfg, state, node)
             stream = getattr(node, '_cuda_stream', -1)
-            outer_stream.write(self._record_event(idstr, stream), sdfg, state_id, node)
+            outer_stream.write(self._sample_decision(idstr, 'GPU'), sdfg, state_id, node)
+            outer_stream.write(self._sampled(idstr, self._record_event('b' + idstr, stream)), sdfg, state_id, node)
 
     def on_scope_exit(self, sdfg: SDFG, state: SDFGState, node: nodes.ExitNode, outer_stream: CodeIOStream,
                       inner_stream: CodeIOStream, global_stream: CodeIOStream) -> None:
@@ -136,11 +141,14 @@ __state->report.add_completion("{timer_name}", "GPU", __dace_ts_start_{id}, __da
         entry_node = state.entry_node(node)
         s = self._get_sobj(node)
         if s.instrument == dtypes.InstrumentationType.GPU_Events:
-            idstr = 'e' + self._idstr(sdfg, state, entry_node)
+            idstr = self._idstr(sdfg, state, entry_node)
             stream = getattr(node, '_cuda_stream', -1)
-            outer_stream.write(self._record_event(idstr, stream), sdfg, state_id, node)
-            outer_stream.write(self._report('%s %s' % (type(s).__name__, s.label), sdfg, state, entry_node), sdfg,
-                               state_id, node)
+            outer_stream.write(
+                self._sampled(
+                    idstr,
+                    self._record_event('e' + idstr, stream) + '\n' +
+                    self._report('%s %s' % (type(s).__name__, s.label), sdfg, state, entry_node)), sdfg, state_id,
+                node)
 
     def on_node_begin(self, sdfg: SDFG, state: SDFGState, node: nodes.Node, outer_stream: CodeIOStream,
                       inner_stream: CodeIOStream, global_stream: CodeIOStream) -> None:
@@ -150,9 +158,10 @@ __state->report.add_completion("{timer_name}", "GPU", __dace_ts_start_{id}, __da
         # TODO(later): Implement "clock64"-based GPU counters
         if node.instrument == dtypes.InstrumentationType.GPU_Events:
             state_id = state.parent_graph.node_id(state)
-            idstr = 'b' + self._idstr(sdfg, state, node)
+            idstr = self._idstr(sdfg, state, node)
             stream = getattr(node, '_cuda_stream', -1)
-            outer_stream.write(self._record_event(idstr, stream), sdfg, state_id, node)
+            outer_stream.write(self._sample_decision(idstr, 'GPU'), sdfg, state_id, node)
+            outer_stream.write(self._sampled(idstr, self._record_event('b' + idstr, stream)), sdfg, state_id, node)
 
     def on_node_end(self, sdfg: SDFG, state: SDFGState, node: nodes.Node, outer_stream: CodeIOStream,
                     inner_stream: CodeIOStream, global_stream: CodeIOStream) -> None:
@@ -162,8 +171,11 @@ __state->report.add_completion("{timer_name}", "GPU", __dace_ts_start_{id}, __da
         # TODO(later): Implement "clock64"-based GPU counters
         if node.instrument == dtypes.InstrumentationType.GPU_Events:
             state_id = state.parent_graph.node_id(state)
-            idstr = 'e' + self._idstr(sdfg, state, node)
+            idstr = self._idstr(sdfg, state, node)
             stream = getattr(node, '_cuda_stream', -1)
-            outer_stream.write(self._record_event(idstr, stream), sdfg, state_id, node)
-            outer_stream.write(self._report('%s %s' % (type(node).__name__, node.label), sdfg, state, node), sdfg,
-                               state_id, node)
+            outer_stream.write(
+                self._sampled(
+                    idstr,
+                    self._record_event('e' + idstr, stream) + '\n' +
+                    self._report('%s %s' % (type(node).__name__, node.label), sdfg, state, node)), sdfg, state_id,
+                node)
@@ -0,0 +1,326 @@
+# Copyright 2019-2024 ETH Zurich and the DaCe authors. All rights reserved.
+"""
+Live per-call latency histograms of compiled SDFGs. The histograms are collected by a compiled SDFG call hook
+(see :func:`~dace.builtin_hooks.latency_histograms`), which separately records the time spent marshalling Python
+arguments and the time spent in the generated code, and can be exported in the Prometheus text format or sent to a
+statsd server.
+"""
+from contextlib import contextmanager
+import math
+import os
+import re
+import socket
+import time
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from dace.codegen.compiled_sdfg import CompiledSDFG
+
+#: Phases of a compiled SDFG call that are measured separately
+PHASES = ('marshal', 'native')
+
+#: Percentiles reported by default
+DEFAULT_PERCENTILES = (50, 90, 99, 99.9)
+
+#: Name of the exported Prometheus metric
+PROMETHEUS_METRIC = 'dace_compiled_sdfg_call_duration_seconds'
+
+
+class LatencyHistogram:
+    """
+    A histogram of latencies (in nanoseconds) with logarithmically-sized buckets, similar to an HDR histogram.
+    Values below ``2**sub_bucket_bits`` are recorded exactly. Larger values are recorded with a relative error of at
+    most ``2**-(sub_bucket_bits - 1)``, using a fixed amount of memory for the entire 64-bit range.
+    """
+
+    def __init__(self, sub_bucket_bits: int = 7):
+        if sub_bucket_bits < 1:
+            raise ValueError('Number of sub-bucket bits must be at least 1')
+        self.sub_bucket_bits = sub_bucket_bits
+        self._half = 1 << (sub_bucket_bits - 1)
+        self.counts: List[int] = [0] * ((64 - sub_bucket_bits + 2) * self._half)
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+
+    def _index(self, value: int) -> int:
+        shift = max(value.bit_length() - self.sub_bucket_bits, 0)
+        return (shift * self._half) + (value >> shift)
+
+    def _bounds(self, index: int) -> Tuple[int, int]:
+        """ Returns the lowest and highest value that is recorded in the given bucket. """
+        if index < 2 * self._half:
+            return index, index
+        shift = index // self._half - 1
+        mantissa = index - shift * self._half
+        return mantissa << shift, ((mantissa + 1) << shift) - 1
+
+    def record(self, value: int) -> None:
+        """
+        Records a latency.
+
+        :param value: The latency in nanoseconds.
+        """
+        value = min(max(int(value), 0), (1 << 64) - 1)
+        self.counts[self._index(value)] += 1
+        if self.count == 0 or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.count += 1
+        self.total += value
+
+    def merge(self, other: 'LatencyHistogram') -> None:
+        """ Adds the recorded values of another histogram with the same precision to this histogram. """
+        if other.sub_bucket_bits != self.sub_bucket_bits:
+            raise ValueError('Cannot merge latency histograms with different precision')
+        if other.count == 0:
+            return
+        for i, c in enumerate(other.counts):
+            if c:
+                self.counts[i] += c
+        self.min = other.min if self.count == 0 else min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.count += other.count
+        self.total += other.total
+
+    def reset(self) -> None:
+        """ Clears all recorded values. """
+        self.counts = [0] * len(self.counts)
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+
+    @property
+    def mean(self) -> float:
+        """ The mean of the recorded values in nanoseconds. """
+        return self.total / self.count if self.count > 0 else 0.0
+
+    def percentile(self, percentile: float) -> int:
+        """
+        Returns the value at the given percentile, i.e., the highest value that is equivalent (within the precision of
+        the histogram) to the latency that ``percentile`` percent of the recorded values are lower than or equal to.
+
+        :param percentile: The percentile (between 0 and 100).
+        :return: The latency in nanoseconds, or 0 if no values were recorded.
+        """
+        if self.count == 0:
+            return 0
+        rank = max(math.ceil(percentile / 100 * self.count), 1)
+        cumulative = 0
+        for i, c in enumerate(self.counts):
+            cumulative += c
+            if cumulative >= rank:
+                return max(min(self._bounds(i)[1], self.max), self.min)
+        return self.max
+
+    def buckets(self) -> Iterator[Tuple[int, int]]:
+        """
+        Iterates over the non-empty buckets of the histogram.
+
+        :return: A generator of (highest value in bucket, count) tuples, in ascending order.
+        """
+        for i, c in enumerate(self.counts):
+            if c:
+                yield self._bounds(i)[1], c
+
+    def summary(self, percentiles: Sequence[float] = DEFAULT_PERCENTILES) -> Dict[str, float]:
+        """
+        Summarizes the histogram.
+
+        :param percentiles: The percentiles to report.
+        :return: A dictionary with the number of recorded values (``count``) and the ``min``, ``max``, ``mean``, and
+                 percentile (e.g., ``p99``) latencies in nanoseconds.
+        """
+        result = dict(count=self.count, min=self.min, max=self.max, mean=self.mean)
+        for p in percentiles:
+            result[f'p{p:g}'] = self.percentile(p)
+        return result
+
+
+class LatencyStats:
+    """ Latency histograms of the calls to one compiled SDFG, with one histogram per phase (see ``PHASES``). """
+
+    def __init__(self, name: str, sub_bucket_bits: int = 7):
+        self.name = name
+        #: Time spent converting Python arguments to the arguments of the generated code
+        self.marshal = LatencyHistogram(sub_bucket_bits)
+        #: Time spent in the generated code
+        self.native = LatencyHistogram(sub_bucket_bits)
+
+    def histograms(self) -> Dict[str, LatencyHistogram]:
+        """ Returns a dictionary that maps each phase to its histogram. """
+        return {phase: getattr(self, phase) for phase in PHASES}
+
+    def reset(self) -> None:
+        """ Clears all recorded values. """
+        for hist in self.histograms().values():
+            hist.reset()
+
+    def summary(self, percentiles: Sequence[float] = DEFAULT_PERCENTILES) -> Dict[str, Dict[str, float]]:
+        """
+        Summarizes the latencies of each phase (see ``LatencyHistogram.summary``).
+
+        :param percentiles: The percentiles to report.
+        :return: A dictionary that maps each phase to its summary.
+        """
+        return {phase: hist.summary(percentiles) for phase, hist in self.histograms().items()}
+
+    def to_prometheus(self) -> str:
+        """ Returns the latency histograms in the Prometheus text exposition format. """
+        return to_prometheus([self])
+
+    def export_prometheus(self, filename: str) -> None:
+        """ Writes the latency histograms to a file in the Prometheus text exposition format. """
+        export_prometheus(filename, [self])
+
+    def send_statsd(self, host: str = '127.0.0.1', port: int = 8125, prefix: str = 'dace') -> None:
+        """ Sends a summary of the latencies to a statsd server (see ``send_statsd``). """
+        send_statsd([self], host, port, prefix)
+
+    def __str__(self) -> str:
+        summary = self.summary()
+        columns = list(summary[PHASES[0]].keys())
+        result = f'Latency of {self.name} (us):\n'
+        result += f'{"Phase":<10}' + ''.join(f'{col:>12}' for col in columns) + '\n'
+        for phase, values in summary.items():
+            result += f'{phase:<10}{values["count"]:>12}'
+            result += ''.join(f'{values[col] / 1e3:>12.3f}' for col in columns[1:]) + '\n'
+        return result
+
+    def __repr__(self) -> str:
+        return f'LatencyStats({self.name}, calls={self.native.count})'
+
+
+def _prometheus_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def to_prometheus(stats: Sequence[LatencyStats]) -> str:
+    """
+    Converts latency histograms to the Prometheus text exposition format. The histograms are reported in seconds, with
+    the ``sdfg`` and ``phase`` labels. Histograms of compiled SDFGs with the same name are merged.
+
+    :param stats: Latency statistics of compiled SDFGs.
+    :return: The metrics as a string.
+    """
+    merged: Dict[Tuple[str, str], LatencyHistogram] = {}
+    for stat in stats:
+        for phase, hist in stat.histograms().items():
+            if (stat.name, phase) not in merged:
+                merged[(stat.name, phase)] = LatencyHistogram(hist.sub_bucket_bits)
+            merged[(stat.name, phase)].merge(hist)
+
+    lines = [
+        f'# HELP {PROMETHEUS_METRIC} Duration of compiled SDFG calls, by phase.',
+        f'# TYPE {PROMETHEUS_METRIC} histogram',
+    ]
+    for (name, phase), hist in merged.items():
+        labels = f'sdfg="{_prometheus_label(name)}",phase="{phase}"'
+        cumulative = 0
+        for upper, count in hist.buckets():
+            cumulative += count
+            lines.append(f'{PROMETHEUS_METRIC}_bucket{{{labels},le="{upper / 1e9:.9g}"}} {cumulative}')
+        lines.append(f'{PROMETHEUS_METRIC}_bucket{{{labels},le="+Inf"}} {hist.count}')
+        lines.append(f'{PROMETHEUS_METRIC}_sum{{{labels}}} {hist.total / 1e9:.9g}')
+        lines.append(f'{PROMETHEUS_METRIC}_count{{{labels}}} {hist.count}')
+    return '\n'.join(lines) + '\n'
+
+
+def export_prometheus(filename: str, stats: Sequence[LatencyStats]) -> None:
+    """
+    Writes latency histograms to a file in the Prometheus text exposition format (see ``to_prometheus``). The file is
+    replaced atomically, so that it can be read concurrently (e.g., by the textfile collector of the node exporter).
+
+    :param filename: Path to the output file.
+    :param stats: Latency statistics of compiled SDFGs.
+    """
+    tmpname = filename + '.tmp'
+    with open(tmpname, 'w') as fp:
+        fp.write(to_prometheus(stats))
+    os.replace(tmpname, filename)
+
+
+def send_statsd(stats: Sequence[LatencyStats],
+                host: str = '127.0.0.1',
+                port: int = 8125,
+                prefix: str = 'dace',
+                percentiles: Sequence[float] = DEFAULT_PERCENTILES) -> None:
+    """
+    Sends a summary of latency histograms to a statsd server over UDP. For every compiled SDFG and phase, the number of
+    calls and the minimum, maximum, mean, and percentile latencies (in milliseconds) are sent as gauges named
+    ``<prefix>.<sdfg>.<phase>.<statistic>``, e.g., ``dace.myprogram.native.p99``.
+
+    :param stats: Latency statistics of compiled SDFGs.
+    :param host: Host name or address of the statsd server.
+    :param port: UDP port of the statsd server.
+    :param prefix: Prefix of the gauge names.
+    :param percentiles: The percentiles to send.
+    """
+    lines = []
+    for stat in stats:
+        name = re.sub(r'[^A-Za-z0-9_\-]', '_', stat.name)
+        for phase, values in stat.summary(percentiles).items():
+            for key, value in values.items():
+                if key != 'count':
+                    value = value / 1e6
+                lines.append(f'{prefix}.{name}.{phase}.{key.replace(".", "_")}:{value:g}|g')
+
+    # Split metrics into packets that fit into a typical network MTU
+    packets = []
+    packet = ''
+    for line in lines:
+        if packet and len(packet) + len(line) + 1 > 1432:
+            packets.append(packet)
+            packet = ''
+        packet = f'{packet}\n{line}' if packet else line
+    if packet:
+        packets.append(packet)
+
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        for packet in packets:
+            sock.sendto(packet.encode('utf-8'), (host, port))
+
+
+class LatencyRecorder:
+    """
+    A compiled SDFG call hook that records the latency of every call in histograms kept by the compiled SDFG (see
+    ``CompiledSDFG.stats``). The time spent marshalling arguments is only recorded for calls through
+    ``CompiledSDFG.__call__``, as ``fast_call`` receives arguments that are already converted.
+    """
+
+    def __init__(self, sub_bucket_bits: int = 7):
+        self.sub_bucket_bits = sub_bucket_bits
+        #: Latency statistics of every compiled SDFG called while recording
+        self.stats: List[LatencyStats] = []
+
+    @contextmanager
+    def __call__(self, compiled_sdfg: 'CompiledSDFG', args: Tuple[Any, ...]):
+        stats = compiled_sdfg._latency
+        if stats is None:
+            stats = LatencyStats(compiled_sdfg.sdfg.name, self.sub_bucket_bits)
+            compiled_sdfg._latency = stats
+        if all(s is not stats for s in self.stats):
+            self.stats.append(stats)
+
+        if compiled_sdfg._marshal_time is not None:
+            stats.marshal.record(compiled_sdfg._marshal_time)
+            compiled_sdfg._marshal_time = None
+
+        start = time.perf_counter_ns()
+        yield
+        stats.native.record(time.perf_counter_ns() - start)
+
+    def to_prometheus(self) -> str:
+        """ Returns the latency histograms of all recorded compiled SDFGs in the Prometheus text format. """
+        return to_prometheus(self.stats)
+
+    def export_prometheus(self, filename: str) -> None:
+        """ Writes the latency histograms of all recorded compiled SDFGs to a Prometheus text file. """
+        export_prometheus(filename, self.stats)
+
+    def send_statsd(self, host: str = '127.0.0.1', port: int = 8125, prefix: str = 'dace') -> None:
+        """ Sends a summary of the latencies of all recorded compiled SDFGs to a statsd server. """
+        send_statsd(self.stats, host, port, prefix)
@@ -0,0 +1,87 @@
+# Copyright 2019-2024 ETH Zurich and the DaCe authors. All rights reserved.
+""" Implements the memory usage instrumentation provider, which tracks the host memory allocated for data containers.
+"""
+from collections import defaultdict
+from typing import Dict, List
+
+from dace import data, dtypes, registry
+from dace.codegen.instrumentation.provider import InstrumentationProvider
+from dace.codegen.prettycode import CodeIOStream
+from dace.sdfg import nodes
+from dace.sdfg.sdfg import SDFG
+from dace.sdfg.state import ControlFlowRegion, SDFGState
+
+
+@registry.autoregister_params(type=dtypes.InstrumentationType.Memory_Usage)
+class MemoryUsageProvider(InstrumentationProvider):
+    """ Instrumentation provider that tracks allocations and deallocations of data containers in host (CPU and
+        pinned) memory. Instrumented SDFGs, states, and scopes report the peak and final live bytes, as well as the
+        number and size of allocations made while they execute.
+    """
+
+    def __init__(self):
+        super().__init__()
+        # Sizes of the allocations emitted for each state before the state begins
+        self._state_allocations: Dict[SDFGState, List[str]] = defaultdict(list)
+
+    def _begin(self, stream: CodeIOStream, sdfg: SDFG, state: SDFGState = None, node: nodes.Node = None,
+               preallocated: List[str] = None) -> None:
+        idstr = self._idstr(sdfg, state, node)
+        preallocated = preallocated or []
+        size = ' + '.join(preallocated) if preallocated else '0'
+        stream.write(f'dace::perf::MemoryRegion __dace_mem_{idstr} = '
+                     f'__state->memory.begin_region({len(preallocated)}, {size});')
+
+    def _end(self, name: str, stream: CodeIOStream, sdfg: SDFG, state: SDFGState = None,
+             node: nodes.Node = None) -> None:
+        idstr = self._idstr(sdfg, state, node)
+        state_id = -1 if state is None else sdfg.node_id(state)
+        node_id = -1 if node is None else state.node_id(node)
+        stream.write(f'__state->memory.end_region(__dace_mem_{idstr}, __state->report, "{name}", {sdfg.cfg_id}, '
+                     f'{state_id}, {node_id});')
+
+    def on_sdfg_begin(self, sdfg: SDFG, local_stream: CodeIOStream, global_stream: CodeIOStream, codegen) -> None:
+        if sdfg.parent is None:
+            codegen.statestruct.append('dace::perf::MemoryTracker memory;')
+        if sdfg.instrument == dtypes.InstrumentationType.Memory_Usage:
+            self._begin(local_stream, sdfg)
+
+    def on_sdfg_end(self, sdfg: SDFG, local_stream: CodeIOStream, global_stream: CodeIOStream) -> None:
+        if sdfg.instrument == dtypes.InstrumentationType.Memory_Usage:
+            self._end(f'SDFG {sdfg.name}', local_stream, sdfg)
+
+    def on_allocate(self, sdfg: SDFG, cfg: ControlFlowRegion, state_id: int, node: nodes.AccessNode,
+                    nodedesc: data.Data, size: str, stream: CodeIOStream) -> None:
+        stream.write(f'__state->memory.allocate({size});')
+        # State-local data is allocated right before the state begins
+        if state_id is not None and nodedesc.lifetime == dtypes.AllocationLifetime.Scope:
+            state = cfg.node(state_id)
+            if node in state.nodes() and state.entry_node(node) is None:
+                self._state_allocations[state].append(size)
+
+    def on_deallocate(self, sdfg: SDFG, cfg: ControlFlowRegion, state_id: int, node: nodes.AccessNode,
+                      nodedesc: data.Data, size: str, stream: CodeIOStream) -> None:
+        stream.write(f'__state->memory.deallocate({size});')
+
+    def on_state_begin(self, sdfg: SDFG, state: SDFGState, local_stream: CodeIOStream,
+                       global_stream: CodeIOStream) -> None:
+        preallocated = self._state_allocations.pop(state, [])
+        if state.instrument == dtypes.InstrumentationType.Memory_Usage:
+            self._begin(local_stream, sdfg, state, preallocated=preallocated)
+
+    def on_state_end(self, sdfg: SDFG, state: SDFGState, local_stream: CodeIOStream,
+                     global_stream: CodeIOStream) -> None:
+        if state.instrument == dtypes.InstrumentationType.Memory_Usage:
+            self._end(f'State {state.label}', local_stream, sdfg, state)
+
+    def on_scope_entry(self, sdfg: SDFG, state: SDFGState, node: nodes.EntryNode, outer_stream: CodeIOStream,
+                       inner_stream: CodeIOStream, global_stream: CodeIOStream) -> None:
+        if node.instrument == dtypes.InstrumentationType.Memory_Usage:
+            self._begin(outer_stream, sdfg, state, node)
+
+    def on_scope_exit(self, sdfg: SDFG, state: SDFGState, node: nodes.ExitNode, outer_stream: CodeIOStream,
+                      inner_stream: CodeIOStream, global_stream: CodeIOStream) -> None:
+        entry_node = state.entry_node(node)
+        if entry_node.instrument == dtypes.InstrumentationType.Memory_Usage:
+            s = entry_node.consume if hasattr(entry_node, 'consume') else entry_node.map
+            self._end(f'{type(s).__name__} {s.label}', outer_stream, sdfg, state, entry_node)
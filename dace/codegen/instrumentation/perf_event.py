@@ -0,0 +1,172 @@
+# Copyright 2019-2024 ETH Zurich and the DaCe authors. All rights reserved.
+""" Implements the perf_event counter performance instrumentation provider.
+    Used for collecting CPU performance counters through the Linux kernel, without external libraries.
+"""
+import ast
+from typing import List, Tuple
+
+from dace import dtypes, registry
+from dace.codegen.instrumentation.provider import InstrumentationProvider
+from dace.codegen.prettycode import CodeIOStream
+from dace.config import Config
+from dace.sdfg import nodes
+from dace.sdfg.sdfg import SDFG
+from dace.sdfg.state import SDFGState
+from dace.transformation import helpers as xfh
+
+# Generic events of the ``perf`` tool, mapped to perf_event types and configurations
+PERF_EVENTS = {
+    'cycles': ('PERF_TYPE_HARDWARE', 'PERF_COUNT_HW_CPU_CYCLES'),
+    'instructions': ('PERF_TYPE_HARDWARE', 'PERF_COUNT_HW_INSTRUCTIONS'),
+    'cache-references': ('PERF_TYPE_HARDWARE', 'PERF_COUNT_HW_CACHE_REFERENCES'),
+    'cache-misses': ('PERF_TYPE_HARDWARE', 'PERF_COUNT_HW_CACHE_MISSES'),
+    'branches': ('PERF_TYPE_HARDWARE', 'PERF_COUNT_HW_BRANCH_INSTRUCTIONS'),
+    'branch-misses': ('PERF_TYPE_HARDWARE', 'PERF_COUNT_HW_BRANCH_MISSES'),
+    'bus-cycles': ('PERF_TYPE_HARDWARE', 'PERF_COUNT_HW_BUS_CYCLES'),
+    'stalled-cycles-frontend': ('PERF_TYPE_HARDWARE', 'PERF_COUNT_HW_STALLED_CYCLES_FRONTEND'),
+    'stalled-cycles-backend': ('PERF_TYPE_HARDWARE', 'PERF_COUNT_HW_STALLED_CYCLES_BACKEND'),
+    'ref-cycles': ('PERF_TYPE_HARDWARE', 'PERF_COUNT_HW_REF_CPU_CYCLES'),
+    'task-clock': ('PERF_TYPE_SOFTWARE', 'PERF_COUNT_SW_TASK_CLOCK'),
+    'page-faults': ('PERF_TYPE_SOFTWARE', 'PERF_COUNT_SW_PAGE_FAULTS'),
+    'context-switches': ('PERF_TYPE_SOFTWARE', 'PERF_COUNT_SW_CONTEXT_SWITCHES'),
+    'cpu-migrations': ('PERF_TYPE_SOFTWARE', 'PERF_COUNT_SW_CPU_MIGRATIONS'),
+}
+
+
+def parse_perf_events(counters: List[str]) -> List[Tuple[str, str, str]]:
+    """
+    Converts a list of counter names to perf_event specifications.
+
+    :param counters: Generic ``perf`` event names, or raw events in the form ``r<hex code>``.
+    :return: A list of (type, configuration, name) tuples as C++ expressions.
+    """
+    result = []
+    for name in counters:
+        if name in PERF_EVENTS:
+            result.append((*PERF_EVENTS[name], name))
+        elif name.startswith('r'):
+            try:
+                code = int(name[1:], 16)
+            except ValueError:
+                raise ValueError(f'Invalid raw perf_event counter "{name}"')
+            result.append(('PERF_TYPE_RAW', hex(code), name))
+        else:
+            raise ValueError(f'Unknown perf_event counter "{name}". Supported counters: {", ".join(PERF_EVENTS)}, '
+                             'or raw events in the form "r<hex code>"')
+    if len(result) > 8:
+        raise ValueError('At most 8 perf_event counters can be read as a group')
+    return result
+
+
+@registry.autoregister_params(type=dtypes.InstrumentationType.Perf_Counters)
+class PerfEventInstrumentation(InstrumentationProvider):
+    """ Instrumentation provider that reports CPU performance counters through the
+        Linux ``perf_event_open`` system call. Top-level ``CPU_Multicore`` maps are
+        counted on every thread of the parallel region.
+    """
+
+    perf_whitelist_schedules = [
+        dtypes.ScheduleType.CPU_Multicore, dtypes.ScheduleType.CPU_Persistent, dtypes.ScheduleType.Sequential,
+        dtypes.ScheduleType.Default
+    ]
+
+    def on_sdfg_begin(self, sdfg: SDFG, local_stream: CodeIOStream, global_stream: CodeIOStream, codegen) -> None:
+        global_stream.write('#include <dace/perf/perf_event.h>', sdfg)
+        if sdfg.parent is not None:
+            return
+
+        events = parse_perf_events(ast.literal_eval(Config.get('instrumentation', 'perf_event', 'counters')))
+        specs = ', '.join(f'{{{etype}, {config}, "{name}"}}' for etype, config, name in events)
+        codegen._initcode.write(f'''{{
+    static const dace::perf::PerfEventSpec __dace_perf_events[] = {{ {specs} }};
+    dace::perf::PerfEventGroup::configure(__dace_perf_events, {len(events)});
+}}''', sdfg)
+
+    def _ids(self, sdfg: SDFG, state: SDFGState = None, node: nodes.Node = None) -> str:
+        state_id = -1 if state is None else sdfg.node_id(state)
+        node_id = -1 if node is None else state.node_id(node)
+        return f'{sdfg.cfg_id}, {state_id}, {node_id}'
+
+    def _begin(self, stream: CodeIOStream, sdfg: SDFG, state: SDFGState = None, node: nodes.Node = None) -> None:
+        idstr = self._idstr(sdfg, state, node)
+        stream.write(f'dace::perf::PerfEventValues __dace_perf_start_{idstr} = '
+                     'dace::perf::PerfEventGroup::thread_group().read();')
+
+    def _end(self, name: str, stream: CodeIOStream, sdfg: SDFG, state: SDFGState = None,
+             node: nodes.Node = None) -> None:
+        idstr = self._idstr(sdfg, state, node)
+        stream.write(f'''{{
+    dace::perf::PerfEventGroup& __dace_perf_group = dace::perf::PerfEventGroup::thread_group();
+    __dace_perf_group.report(__state->report, "{name}", __dace_perf_start_{idstr}, __dace_perf_group.read(),
+                             omp_get_thread_num(), {self._ids(sdfg, state, node)});
+}}''')
+
+    def on_state_begin(self, sdfg: SDFG, state: SDFGState, local_stream: CodeIOStream,
+                       global_stream: CodeIOStream) -> None:
+        if state.instrument == dtypes.InstrumentationType.Perf_Counters:
+            self._begin(local_stream, sdfg, state)
+
+    def on_state_end(self, sdfg: SDFG, state: SDFGState, local_stream: CodeIOStream,
+                     global_stream: CodeIOStream) -> None:
+        if state.instrument == dtypes.InstrumentationType.Perf_Counters:
+            self._end(f'State {state.label}', local_stream, sdfg, state)
+
+    @staticmethod
+    def _per_thread(state: SDFGState, node: nodes.EntryNode) -> bool:
+        """ Returns True if the scope opens a parallel region, in which every thread is counted separately. """
+        return (isinstance(node, nodes.MapEntry) and node.map.schedule == dtypes.ScheduleType.CPU_Multicore
+                and xfh.get_parent_map(state, node) is None)
+
+    def on_scope_entry(self, sdfg: SDFG, state: SDFGState, node: nodes.EntryNode, outer_stream: CodeIOStream,
+                       inner_stream: CodeIOStream, global_stream: CodeIOStream) -> None:
+        if node.instrument != dtypes.InstrumentationType.Perf_Counters:
+            return
+        if node.schedule not in PerfEventInstrumentation.perf_whitelist_schedules:
+            raise TypeError('Unsupported schedule on scope')
+
+        if not self._per_thread(state, node):
+            self._begin(outer_stream, sdfg, state, node)
+            return
+
+        # Read the counters of every thread of the upcoming parallel region
+        idstr = self._idstr(sdfg, state, node)
+        outer_stream.write(f'''std::vector<dace::perf::PerfEventValues> __dace_perf_start_{idstr}(omp_get_max_threads());
+#pragma omp parallel
+{{
+    __dace_perf_start_{idstr}[omp_get_thread_num()] = dace::perf::PerfEventGroup::thread_group().read();
+}}''')
+
+    def on_scope_exit(self, sdfg: SDFG, state: SDFGState, node: nodes.ExitNode, outer_stream: CodeIOStream,
+                      inner_stream: CodeIOStream, global_stream: CodeIOStream) -> None:
+        entry_node = state.entry_node(node)
+        if entry_node.instrument != dtypes.InstrumentationType.Perf_Counters:
+            return
+
+        s = entry_node.consume if hasattr(entry_node, 'consume') else entry_node.map
+        name = f'{type(s).__name__} {s.label}'
+        if not self._per_thread(state, entry_node):
+            self._end(name, outer_stream, sdfg, state, entry_node)
+            return
+
+        idstr = self._idstr(sdfg, state, entry_node)
+        outer_stream.write(f'''#pragma omp parallel
+{{
+    dace::perf::PerfEventGroup& __dace_perf_group = dace::perf::PerfEventGroup::thread_group();
+    int __dace_perf_tid = omp_get_thread_num();
+    __dace_perf_group.report(__state->report, "{name}", __dace_perf_start_{idstr}[__dace_perf_tid],
+                             __dace_perf_group.read(), __dace_perf_tid, {self._ids(sdfg, state, entry_node)});
+}}''')
+
+    def on_node_begin(self, sdfg: SDFG, state: SDFGState, node: nodes.Node, outer_stream: CodeIOStream,
+                      inner_stream: CodeIOStream, global_stream: CodeIOStream) -> None:
+        if not isinstance(node, nodes.CodeNode):
+            return
+        if node.instrument == dtypes.InstrumentationType.Perf_Counters:
+            self._begin(outer_stream, sdfg, state, node)
+
+    def on_node_end(self, sdfg: SDFG, state: SDFGState, node: nodes.Node, outer_stream: CodeIOStream,
+                    inner_stream: CodeIOStream, global_stream: CodeIOStream) -> None:
+        if not isinstance(node, nodes.CodeNode):
+            return
+        if node.instrument == dtypes.InstrumentationType.Perf_Counters:
+            self._end(f'{type(node).__name__} {node.label}', outer_stream, sdfg, state, node)
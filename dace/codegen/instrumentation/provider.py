@@ -1,9 +1,12 @@
 # Copyright 2019-2021 ETH Zurich and the DaCe authors. All rights reserved.
+import ast
 from dace.codegen.prettycode import CodeIOStream
+from dace.config import Config
 from dace.dtypes import DataInstrumentationType, InstrumentationType
 from dace.registry import make_registry
-from typing import Dict, Type, Union
+from typing import Dict, Tuple, Type, Union
 
+from dace.data import Data
 from dace.memlet import Memlet
 from dace.sdfg import nodes, SDFG
 from dace.sdfg.graph import MultiConnectorEdge
@@ -41,6 +44,74 @@ class InstrumentationProvider(object):
                 result += '_' + str(state.node_id(node))
         return result
 
+    def sampling_rate(self) -> Tuple[int, float]:
+        """
+        Returns the sampling configuration of this provider as a tuple of (interval, fraction): every
+        ``interval``-th execution of an instrumented element is instrumented with probability ``fraction``.
+        """
+        interval = Config.get('instrumentation', 'sampling', 'interval')
+        fraction = Config.get('instrumentation', 'sampling', 'fraction')
+        overrides = ast.literal_eval(Config.get('instrumentation', 'sampling', 'providers'))
+        itype = InstrumentationProvider.extensions().get(type(self), {}).get('type')
+        if itype is not None and itype.name in overrides:
+            interval = overrides[itype.name].get('interval', interval)
+            fraction = overrides[itype.name].get('fraction', fraction)
+        return max(1, int(interval)), min(1.0, float(fraction))
+
+    def sampling_enabled(self) -> bool:
+        """ Returns True if instrumented elements of this provider are only executed on a subset of executions. """
+        interval, fraction = self.sampling_rate()
+        return interval > 1 or fraction < 1.0 or Config.get('instrumentation', 'sampling', 'budget') > 0
+
+    def _register_sampling(self, sdfg: SDFG, category: str, codegen) -> None:
+        """
+        Stores the sampling weight of this provider in the report on SDFG initialization, such that reported
+        aggregates can be scaled. Categories are also registered if only the sampling budget is set, as executions
+        that are skipped over budget are counted per category.
+
+        :param sdfg: The generated SDFG object.
+        :param category: The event category of this provider.
+        :param codegen: The frame code generator.
+        """
+        if sdfg.parent is not None:  # Only register once, from the top-level SDFG
+            return
+        if not self.sampling_enabled():
+            return
+        interval, fraction = self.sampling_rate()
+        codegen._initcode.write(f'__state->report.set_sampling_weight("{category}", {interval / fraction});')
+
+    def _sample_decision(self, idstr: str, category: str) -> str:
+        """
+        Returns code that decides whether the current execution of an instrumented element is sampled, stored in the
+        variable returned by ``_sampled``.
+
+        :param idstr: Unique identifier of the instrumented element.
+        :param category: The event category of this provider, as given to ``_register_sampling``.
+        """
+        if not self.sampling_enabled():
+            return ''
+        interval, fraction = self.sampling_rate()
+        code = ''
+        conditions = []
+        if interval > 1:
+            code += f'static thread_local unsigned long int __dace_sample_ctr_{idstr} = 0;\n'
+            conditions.append(f'dace::perf::sample_interval(__dace_sample_ctr_{idstr}, {interval})')
+        if fraction < 1.0:
+            conditions.append(f'dace::perf::sample_fraction({fraction})')
+        conditions.append(f'__state->report.within_budget("{category}")')
+        return code + f'const bool __dace_sampled_{idstr} = {" && ".join(conditions)};'
+
+    def _sampled(self, idstr: str, code: str) -> str:
+        """
+        Guards instrumentation code such that it only runs on sampled executions (see ``_sample_decision``).
+
+        :param idstr: Unique identifier of the instrumented element.
+        :param code: The instrumentation code.
+        """
+        if not self.sampling_enabled():
+            return code
+        return f'if (__dace_sampled_{idstr}) {{\n{code}\n}}'
+
     def on_sdfg_begin(self, sdfg: SDFG, local_stream: CodeIOStream, global_stream: CodeIOStream, codegen) -> None:
         """ Event called at the beginning of SDFG code generation.
 
@@ -145,6 +216,36 @@ class InstrumentationProvider(object):
         """
         pass
 
+    def on_allocate(self, sdfg: SDFG, cfg: ControlFlowRegion, state_id: int, node: nodes.AccessNode,
+                    nodedesc: Data, size: str, stream: CodeIOStream) -> None:
+        """ Event called after generating the allocation of a data container in host memory.
+
+            :param sdfg: The generated SDFG object.
+            :param cfg: The control flow region in which the data container is allocated.
+            :param state_id: The ID of the state in which the data container is allocated, or None if allocated
+                             outside of a state.
+            :param node: The access node of the allocated data container.
+            :param nodedesc: The allocated data descriptor.
+            :param size: A C++ expression of the allocated size in bytes.
+            :param stream: Code generator for the allocation code.
+        """
+        pass
+
+    def on_deallocate(self, sdfg: SDFG, cfg: ControlFlowRegion, state_id: int, node: nodes.AccessNode,
+                      nodedesc: Data, size: str, stream: CodeIOStream) -> None:
+        """ Event called after generating the deallocation of a data container in host memory.
+
+            :param sdfg: The generated SDFG object.
+            :param cfg: The control flow region in which the data container is deallocated.
+            :param state_id: The ID of the state in which the data container is deallocated, or None if deallocated
+                             outside of a state.
+            :param node: The access node of the deallocated data container.
+            :param nodedesc: The deallocated data descriptor.
+            :param size: A C++ expression of the deallocated size in bytes.
+            :param stream: Code generator for the deallocation code.
+        """
+        pass
+
     def on_node_begin(self, sdfg: SDFG, state: SDFGState, node: nodes.Node, outer_stream: CodeIOStream,
                       inner_stream: CodeIOStream, global_stream: CodeIOStream) -> None:
         """ Event called at the beginning of generating a node.
@@ -5,13 +5,71 @@ from dataclasses import dataclass
 import json
 import numpy as np
 import re
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Sequence, Tuple, Union
 from io import StringIO
 
 from collections import defaultdict
 
 UUIDType = Tuple[int, int, int]
 
+#: Magic number (including the format version) of binary instrumentation reports
+BINARY_REPORT_MAGIC = b'DACEPRF1'
+
+#: Columns of every event block in binary instrumentation reports, in file order. Names, categories, and counter
+#: names are indices into the string table that precedes the columns in each block.
+BINARY_REPORT_COLUMNS = (
+    ('ph', np.uint8),
+    ('cfg_id', np.int32),
+    ('state_id', np.int32),
+    ('id', np.int32),
+    ('ts', np.uint64),
+    ('dur', np.uint64),
+    ('tid', np.uint64),
+    ('name', np.uint32),
+    ('cat', np.uint32),
+    ('counter', np.uint32),
+    ('value', np.uint64),
+)
+
+#: Counters reported by the memory usage instrumentation provider
+MEMORY_COUNTERS = ('peak_bytes', 'live_bytes', 'allocations', 'deallocations', 'allocated_bytes')
+
+#: Name of the counter event that records executions skipped over the sampling budget, with one counter per category
+SAMPLING_BUDGET_EVENT = 'Sampling budget exceeded'
+
+
+def _read_exact(fp: BinaryIO, size: int) -> bytes:
+    result = fp.read(size)
+    if len(result) != size:
+        raise EOFError('Truncated binary instrumentation report')
+    return result
+
+
+def _read_binary_blocks(fp: BinaryIO) -> Iterator[Tuple[List[str], Dict[str, np.ndarray]]]:
+    """
+    Reads event blocks of a binary instrumentation report one at a time.
+
+    :param fp: The report file, positioned after the header.
+    :return: A generator of (string table, columns) tuples, one per block.
+    """
+    while True:
+        count = fp.read(8)
+        if len(count) == 0:
+            return
+        if len(count) != 8:
+            raise EOFError('Truncated binary instrumentation report')
+        num_events = int(np.frombuffer(count, dtype=np.uint64)[0])
+        num_strings = int(np.frombuffer(_read_exact(fp, 4), dtype=np.uint32)[0])
+        strings = []
+        for _ in range(num_strings):
+            length = int(np.frombuffer(_read_exact(fp, 2), dtype=np.uint16)[0])
+            strings.append(_read_exact(fp, length).decode('utf-8', errors='replace'))
+        columns = {}
+        for name, dtype in BINARY_REPORT_COLUMNS:
+            size = num_events * np.dtype(dtype).itemsize
+            columns[name] = np.frombuffer(_read_exact(fp, size), dtype=dtype)
+        yield strings, columns
+
 
 def _uuid_to_dict(uuid: UUIDType) -> Dict[str, int]:
     result = {}
@@ -107,6 +165,17 @@ class InstrumentationReport(object):
         # UUID -> Name -> Counter -> Thread ID -> Values
         self.counters: Dict[UUIDType, Dict[str, Dict[str, Dict[int, List[float]]]]] = defaultdict(dict)
 
+        # (UUID, Name) -> Event category
+        self.duration_categories: Dict[Tuple[UUIDType, str], str] = {}
+
+        # Event category -> Sampling weight (inverse sampling rate) of sampled providers
+        self.sampling: Dict[str, float] = {}
+
+        # Events of binary reports, stored as columns rather than event objects (see ``BINARY_REPORT_COLUMNS``)
+        self.columns: Optional[Dict[str, np.ndarray]] = None
+        self.strings: List[str] = []
+        self.pid: int = -1
+
         self._sortcat = None
         self._sortdesc = False
         self.sdfg_hash: str = ''
@@ -115,10 +184,14 @@ class InstrumentationReport(object):
             return
 
         # Parse file
-        match = re.match(r'.*report-(\d+)\.json', filename)
+        match = re.match(r'.*report-(\d+)\.(json|dacereport)', filename)
         self.name = match.groups()[0] if match is not None else 'N/A'
         self.filepath = filename
 
+        if filename.endswith('.dacereport'):
+            self._load_binary(filename)
+            return
+
         with open(filename, 'r') as fp:
             report = json.load(fp)
 
@@ -128,6 +201,7 @@ class InstrumentationReport(object):
 
             # Parse events from file
             self.sdfg_hash: str = report['sdfgHash']
+            self.sampling = report.get('sampling', {})
             for event in report['traceEvents']:
                 if "ph" not in event:
                     continue
@@ -161,6 +235,7 @@ class InstrumentationReport(object):
                     self.durations[uuid][name] = defaultdict(list)
 
                 self.durations[uuid][name][tid].append(event.duration / 1000)
+                self.duration_categories[(uuid, name)] = event.category
 
             elif isinstance(event, CounterEvent):
                 # Counter
@@ -176,9 +251,276 @@ class InstrumentationReport(object):
 
                     self.counters[uuid][name][counter][tid].append(value)
 
+    def _load_binary(self, filename: str):
+        """
+        Loads a binary instrumentation report block by block, keeping events only as compact columns.
+
+        :param filename: The report file.
+        """
+        string_ids: Dict[str, int] = {}
+        blocks: Dict[str, List[np.ndarray]] = defaultdict(list)
+        with open(filename, 'rb') as fp:
+            if fp.read(len(BINARY_REPORT_MAGIC)) != BINARY_REPORT_MAGIC:
+                print(filename, 'is not a valid SDFG instrumentation report!')
+                return
+            hash_len = int(np.frombuffer(_read_exact(fp, 4), dtype=np.uint32)[0])
+            self.sdfg_hash = _read_exact(fp, hash_len).decode('utf-8')
+            self.pid = int(np.frombuffer(_read_exact(fp, 4), dtype=np.int32)[0])
+            num_weights = int(np.frombuffer(_read_exact(fp, 4), dtype=np.uint32)[0])
+            for _ in range(num_weights):
+                length = int(np.frombuffer(_read_exact(fp, 2), dtype=np.uint16)[0])
+                category = _read_exact(fp, length).decode('utf-8')
+                self.sampling[category] = float(np.frombuffer(_read_exact(fp, 8), dtype=np.float64)[0])
+
+            for strings, columns in _read_binary_blocks(fp):
+                # Translate block-local string indices to report-wide indices
+                mapping = np.array([string_ids.setdefault(string, len(string_ids)) for string in strings],
+                                   dtype=np.uint32)
+                for name, column in columns.items():
+                    if name in ('name', 'cat', 'counter') and len(mapping) > 0:
+                        column = mapping[column]
+                    blocks[name].append(column)
+
+        self.strings = list(string_ids.keys())
+        self.columns = {
+            name: (np.concatenate(blocks[name]) if blocks[name] else np.empty(0, dtype=dtype))
+            for name, dtype in BINARY_REPORT_COLUMNS
+        }
+        self._summarize_columns()
+
+    @staticmethod
+    def _group_boundaries(keys: Sequence[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Sorts events by the given keys and finds the groups of events with equal keys.
+
+        :return: A tuple of (sorting permutation, start index of every group in the sorted order).
+        """
+        order = np.lexsort(tuple(reversed(keys)))
+        change = np.zeros(len(order), dtype=bool)
+        if len(order) > 0:
+            change[0] = True
+        for key in keys:
+            sorted_key = key[order]
+            change[1:] |= sorted_key[1:] != sorted_key[:-1]
+        return order, np.flatnonzero(change)
+
+    def _summarize_columns(self):
+        """
+        Summarizes the events of a binary report into dictionaries, with one array of values per element, name,
+        (counter,) and thread.
+        """
+        cols = self.columns
+        for phase, keynames in ((ord('X'), ('cfg_id', 'state_id', 'id', 'name', 'tid')),
+                                (ord('C'), ('cfg_id', 'state_id', 'id', 'name', 'counter', 'tid'))):
+            mask = cols['ph'] == phase
+            if not np.any(mask):
+                continue
+            keys = [cols[k][mask] for k in keynames]
+            categories = cols['cat'][mask]
+            order, starts = self._group_boundaries(keys)
+            if phase == ord('X'):
+                values = cols['dur'][mask][order] / 1000
+            else:
+                values = cols['value'][mask][order]
+            ends = np.append(starts[1:], len(order))
+            for start, end in zip(starts, ends):
+                first = order[start]
+                uuid = (int(keys[0][first]), int(keys[1][first]), int(keys[2][first]))
+                name = self.strings[keys[3][first]]
+                tid = int(keys[-1][first])
+                if phase == ord('X'):
+                    self.durations[uuid][name][tid] = values[start:end]
+                    self.duration_categories[(uuid, name)] = self.strings[categories[first]]
+                else:
+                    counter = self.strings[keys[4][first]]
+                    if name not in self.counters[uuid]:
+                        self.counters[uuid][name] = {}
+                    if counter not in self.counters[uuid][name]:
+                        self.counters[uuid][name][counter] = defaultdict(list)
+                    self.counters[uuid][name][counter][tid] = values[start:end]
+
     def __repr__(self):
         return 'InstrumentationReport(name=%s)' % self.name
 
+    def sampling_weights(self) -> Dict[str, float]:
+        """
+        Returns the factor by which sampled durations of every event category are scaled to estimate totals. If
+        executions were skipped because the sampling budget of a call was exhausted, the sampling weight of the
+        provider is further scaled by the ratio of eligible to recorded executions of the category. As the budget is
+        shared by all elements, this correction is averaged over the elements of a category.
+        """
+        weights = {category: float(weight) for category, weight in self.sampling.items()}
+
+        skipped: Dict[str, float] = defaultdict(float)
+        for events in self.counters.values():
+            for category, values in events.get(SAMPLING_BUDGET_EVENT, {}).items():
+                if category in weights:
+                    skipped[category] += sum(float(np.sum(tvalues)) for tvalues in values.values())
+        if not skipped:
+            return weights
+
+        recorded: Dict[str, int] = defaultdict(int)
+        for (uuid, name), category in self.duration_categories.items():
+            if category in skipped:
+                recorded[category] += sum(len(times) for times in self.durations[uuid][name].values())
+        for category, count in skipped.items():
+            if recorded[category] > 0:
+                weights[category] *= (recorded[category] + count) / recorded[category]
+        return weights
+
+    def sampling_weight(self, uuid: UUIDType, name: str) -> float:
+        """
+        Returns the factor by which sampled durations of an element are scaled to estimate totals, or 1 if the element
+        was not sampled (see ``sampling_weights``).
+        """
+        category = self.duration_categories.get((uuid, name))
+        return self.sampling_weights().get(category, 1.0)
+
+    def summary(self,
+                percentiles: Sequence[float] = (50, 90, 99)) -> Dict[Tuple[UUIDType, str, int], Dict[str, float]]:
+        """
+        Summarizes the durations in the report. For sampled providers, the number of executions and the total time
+        are estimated by scaling the sampled values with the sampling weight of the provider, including executions
+        that were skipped over the sampling budget (see ``sampling_weights``).
+
+        :param percentiles: The percentiles to compute for every element.
+        :return: A dictionary mapping (element UUID, event name, thread ID) to a dictionary of statistics in
+                 milliseconds, with the keys ``count``, ``min``, ``mean``, ``median``, ``max``, ``p<percentile>``,
+                 ``weight`` (the sampling weight), ``estimated_count``, and ``estimated_total``.
+        """
+        result = {}
+        weights = self.sampling_weights()
+        for uuid, events in self.durations.items():
+            for name, times in events.items():
+                for tid, runtimes in times.items():
+                    values = np.asarray(runtimes)
+                    if len(values) == 0:
+                        continue
+                    stats = dict(count=len(values),
+                                 min=float(np.min(values)),
+                                 mean=float(np.mean(values)),
+                                 median=float(np.median(values)),
+                                 max=float(np.max(values)))
+                    for percentile, value in zip(percentiles, np.percentile(values, percentiles)):
+                        stats[f'p{percentile:g}'] = float(value)
+                    weight = weights.get(self.duration_categories.get((uuid, name)), 1.0)
+                    stats['weight'] = weight
+                    stats['estimated_count'] = len(values) * weight
+                    stats['estimated_total'] = float(np.sum(values)) * weight
+                    result[(uuid, name, tid)] = stats
+        return result
+
+    def memory_usage(self) -> Dict[UUIDType, Dict[str, Dict[str, int]]]:
+        """
+        Summarizes the counters of the memory usage instrumentation. Every counter is reduced to its maximum over all
+        threads and executions of the element.
+
+        :return: A dictionary mapping element UUIDs to event names, and those to a dictionary with the keys
+                 ``peak_bytes``, ``live_bytes``, ``allocations``, ``deallocations``, and ``allocated_bytes``.
+        """
+        result = {}
+        for uuid, events in self.counters.items():
+            for name, counters in events.items():
+                if not all(counter in counters for counter in MEMORY_COUNTERS):
+                    continue
+                result.setdefault(uuid, {})[name] = {
+                    counter: int(max(max(values) for values in counters[counter].values() if len(values) > 0))
+                    for counter in MEMORY_COUNTERS
+                }
+        return result
+
+    def memory_overlay(self, metric: str = 'peak_bytes') -> Dict[str, Any]:
+        """
+        Returns a memory usage counter as a report in the Chrome Tracing JSON format, in which the duration of every
+        element is replaced by the counter value. Loading it as an instrumentation report in the SDFG viewer shows the
+        counter as a heatmap.
+
+        :param metric: The memory counter to use (see ``MEMORY_COUNTERS``).
+        :return: The report as a JSON-serializable dictionary.
+        """
+        if metric not in MEMORY_COUNTERS:
+            raise ValueError(f'Unknown memory counter "{metric}". Supported counters: {", ".join(MEMORY_COUNTERS)}')
+        events = []
+        for uuid, usage in self.memory_usage().items():
+            for name, counters in usage.items():
+                events.append(
+                    DurationEvent(name, 'memory', uuid, 0, counters[metric], self.pid, 0, {metric: counters[metric]}))
+        report_json = {}
+        report_json['sdfgHash'] = self.sdfg_hash
+        report_json['traceEvents'] = [ev.save() for ev in events]
+        return report_json
+
+    def export_memory_overlay(self, filename: str, metric: str = 'peak_bytes') -> None:
+        """
+        Stores a memory usage counter as a heatmap report for the SDFG viewer (see ``memory_overlay``).
+
+        :param filename: The file name to store.
+        :param metric: The memory counter to use (see ``MEMORY_COUNTERS``).
+        """
+        with open(filename, 'w') as fp:
+            json.dump(self.memory_overlay(metric), fp)
+
+    def events_in_window(self,
+                         start: Optional[int] = None,
+                         end: Optional[int] = None) -> List[Union[DurationEvent, CounterEvent]]:
+        """
+        Returns the events that begin within a time window.
+
+        :param start: Beginning of the window (in microseconds, inclusive), or None for the beginning of the report.
+        :param end: End of the window (in microseconds, exclusive), or None for the end of the report.
+        :return: A list of events ordered by timestamp.
+        """
+        if self.columns is None:
+            events = [
+                ev for ev in self.events
+                if (start is None or ev.timestamp >= start) and (end is None or ev.timestamp < end)
+            ]
+            return sorted(events, key=lambda ev: ev.timestamp)
+
+        cols = self.columns
+        mask = np.ones(len(cols['ts']), dtype=bool)
+        if start is not None:
+            mask &= cols['ts'] >= start
+        if end is not None:
+            mask &= cols['ts'] < end
+        indices = np.flatnonzero(mask)
+        indices = indices[np.argsort(cols['ts'][indices], kind='stable')]
+
+        result = []
+        for i in indices:
+            uuid = (int(cols['cfg_id'][i]), int(cols['state_id'][i]), int(cols['id'][i]))
+            name, cat = self.strings[cols['name'][i]], self.strings[cols['cat'][i]]
+            timestamp, tid = int(cols['ts'][i]), int(cols['tid'][i])
+            if cols['ph'][i] == ord('X'):
+                result.append(DurationEvent(name, cat, uuid, timestamp, int(cols['dur'][i]), self.pid, tid))
+            else:
+                counters = {self.strings[cols['counter'][i]]: int(cols['value'][i])}
+                result.append(CounterEvent(name, cat, uuid, timestamp, counters, self.pid, tid))
+        return result
+
+    def export_chrome_trace(self,
+                            filename: str,
+                            start: Optional[int] = None,
+                            end: Optional[int] = None,
+                            max_events: int = 1000000) -> None:
+        """
+        Exports the events of a time window to a file in the Chrome Tracing JSON format.
+
+        :param filename: The file name to store.
+        :param start: Beginning of the window (in microseconds, inclusive), or None for the beginning of the report.
+        :param end: End of the window (in microseconds, exclusive), or None for the end of the report.
+        :param max_events: Maximal number of events to export. Use a smaller window for larger reports.
+        """
+        events = self.events_in_window(start, end)
+        if len(events) > max_events:
+            raise ValueError(f'Time window contains {len(events)} events, which exceeds the maximum of {max_events}. '
+                             'Export a smaller window.')
+        report_json = {}
+        report_json['sdfgHash'] = self.sdfg_hash
+        report_json['traceEvents'] = [ev.save() for ev in events]
+        with open(filename, 'w') as fp:
+            json.dump(report_json, fp)
+
     def sortby(self, column: str, ascending: bool = False):
         if (column and column.lower() not in ('counter', 'value', 'min', 'max', 'mean', 'median')):
             raise ValueError('Only Counter, Value, Min, Max, Mean, Median are supported')
@@ -326,6 +668,9 @@ class InstrumentationReport(object):
 
         string = 'Instrumentation report\n'
         string += 'SDFG Hash: ' + self.sdfg_hash + '\n'
+        for category, weight in self.sampling_weights().items():
+            if weight != 1:
+                string += f'Sampled: {category} events (1 in {weight:g} executions)\n'
 
         if len(self.durations) > 0:
             string += ('-' * (COLW * 5)) + '\n'
@@ -439,6 +784,7 @@ class InstrumentationReport(object):
 
         report_json = {}
         report_json['sdfgHash'] = self.sdfg_hash
-        report_json['traceEvents'] = [ev.save() for ev in self.events]
+        events = self.events if self.columns is None else self.events_in_window()
+        report_json['traceEvents'] = [ev.save() for ev in events]
         with open(filename, 'w') as fp:
             json.dump(report_json, fp)
@@ -15,6 +15,8 @@ class TimerProvider(InstrumentationProvider):
         # For other file headers
         sdfg.append_global_code('\n#include <chrono>', None)
 
+        self._register_sampling(sdfg, 'Timer', codegen)
+
         if sdfg.instrument == dtypes.InstrumentationType.Timer:
             self.on_tbegin(local_stream, sdfg)
 
@@ -25,7 +27,12 @@ class TimerProvider(InstrumentationProvider):
     def on_tbegin(self, stream: CodeIOStream, sdfg=None, state=None, node=None):
         idstr = self._idstr(sdfg, state, node)
 
-        stream.write('auto __dace_tbegin_%s = std::chrono::high_resolution_clock::now();' % idstr)
+        if self.sampling_enabled():
+            stream.write(self._sample_decision(idstr, 'Timer'))
+            stream.write('unsigned long int __dace_ts_start_%s = __dace_sampled_%s ? dace::perf::timestamp_us() : 0;' %
+                         (idstr, idstr))
+        else:
+            stream.write('unsigned long int __dace_ts_start_%s = dace::perf::timestamp_us();' % idstr)
 
     def on_tend(self, timer_name: str, stream: CodeIOStream, sdfg=None, state=None, node=None):
         idstr = self._idstr(sdfg, state, node)
@@ -37,11 +44,11 @@ class TimerProvider(InstrumentationProvider):
             if node is not None:
                 node_id = state.node_id(node)
 
-        stream.write('''auto __dace_tend_{id} = std::chrono::high_resolution_clock::now();
-unsigned long int __dace_ts_start_{id} = std::chrono::duration_cast<std::chrono::microseconds>(__dace_tbegin_{id}.time_since_epoch()).count();
-unsigned long int __dace_ts_end_{id} = std::chrono::duration_cast<std::chrono::microseconds>(__dace_tend_{id}.time_since_epoch()).count();
+        stream.write(
+            self._sampled(
+                idstr, '''unsigned long int __dace_ts_end_{id} = dace::perf::timestamp_us();
 __state->report.add_completion("{timer_name}", "Timer", __dace_ts_start_{id}, __dace_ts_end_{id}, {cfg_id}, {state_id}, {node_id});'''
-                     .format(timer_name=timer_name, id=idstr, cfg_id=sdfg.cfg_id, state_id=state_id, node_id=node_id))
+                .format(timer_name=timer_name, id=idstr, cfg_id=sdfg.cfg_id, state_id=state_id, node_id=node_id)))
 
     # Code generation hooks
     def on_state_begin(self, sdfg, state, local_stream, global_stream):
@@ -0,0 +1,163 @@
+# Copyright 2019-2024 ETH Zurich and the DaCe authors. All rights reserved.
+""" Just-in-time specialization of compiled SDFGs to the symbol values they are called with. """
+import collections
+import concurrent.futures
+import copy
+import hashlib
+import os
+import threading
+from typing import TYPE_CHECKING, Any, Dict, Optional, Sequence, Set, Tuple
+import warnings
+
+from dace import dtypes, symbolic
+
+if TYPE_CHECKING:
+    from dace.codegen.compiled_sdfg import CompiledSDFG
+    from dace.sdfg import SDFG
+
+SymbolKey = Tuple[int, ...]
+
+
+def specializable_symbols(sdfg: 'SDFG') -> Set[str]:
+    """ Returns the free symbols of an SDFG that can be specialized (i.e., symbols of integer type). """
+    result = set()
+    for name in sdfg.free_symbols:
+        if name in sdfg.constants:
+            continue
+        stype = sdfg.symbols.get(name, dtypes.int64)
+        if stype in dtypes.INTEGER_TYPES:
+            result.add(name)
+    return result
+
+
+class SymbolSpecializer:
+    """
+    Dispatches calls of a compiled SDFG to variants that are compiled with the symbol values of the call folded as
+    constants, such that inner loops have constant trip counts and strides.
+
+    Variants are cached by the tuple of symbol values, keeping at most ``cache_size`` variants loaded (least recently
+    used variants are unloaded first). With ``background`` set, variants are compiled on a worker thread, and calls
+    return ``None`` from ``lookup`` (i.e., use the generic program) until their variant is ready.
+    """
+
+    def __init__(self,
+                 sdfg: 'SDFG',
+                 symbols: Optional[Sequence[str]] = None,
+                 cache_size: int = 8,
+                 background: bool = True) -> None:
+        """
+        Creates a symbol specializer.
+
+        :param sdfg: The (generic) SDFG to specialize.
+        :param symbols: The symbols to specialize. If None, specializes all integer free symbols.
+        :param cache_size: Maximal number of loaded variants.
+        :param background: If True, compiles variants in the background, otherwise compiles them on first call.
+        """
+        self.sdfg = sdfg
+        self.symbols = sorted(symbols if symbols is not None else specializable_symbols(sdfg))
+        self.cache_size = max(1, cache_size)
+        self.background = background
+
+        self._variants: 'collections.OrderedDict[SymbolKey, CompiledSDFG]' = collections.OrderedDict()
+        self._pending: Dict[SymbolKey, concurrent.futures.Future] = {}
+        self._failed: Set[SymbolKey] = set()
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def key(self, kwargs: Dict[str, Any]) -> Optional[SymbolKey]:
+        """ Returns the cache key of a call with the given arguments, or None if not all symbols are given. """
+        values = []
+        for name in self.symbols:
+            if name not in kwargs:
+                return None
+            value = kwargs[name]
+            if isinstance(value, symbolic.symbol):
+                value = value.get()
+            try:
+                values.append(int(value))
+            except (TypeError, ValueError):
+                return None
+        return tuple(values)
+
+    def lookup(self, kwargs: Dict[str, Any]) -> Optional['CompiledSDFG']:
+        """
+        Returns the specialized variant for a call with the given arguments. If the variant does not exist yet,
+        starts compiling it.
+
+        :param kwargs: The (keyword) arguments of the call.
+        :return: The compiled variant, or None if the call should use the generic program.
+        """
+        key = self.key(kwargs)
+        if key is None or key in self._failed:
+            return None
+
+        with self._lock:
+            if key in self._variants:
+                self._variants.move_to_end(key)
+                return self._variants[key]
+
+            if key not in self._pending:
+                specialized = self._specialize(key)
+                if not self.background:
+                    return self._insert(key, self._compile(specialized, key))
+                if self._executor is None:
+                    self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1,
+                                                                           thread_name_prefix='dace_specialize')
+                self._pending[key] = self._executor.submit(self._compile, specialized, key)
+                return None
+
+            future = self._pending[key]
+            if not future.done():
+                return None
+            del self._pending[key]
+            return self._insert(key, future.result())
+
+    def wait(self) -> None:
+        """ Waits for all variants that are currently being compiled. """
+        with self._lock:
+            futures = list(self._pending.values())
+        concurrent.futures.wait(futures)
+
+    def close(self) -> None:
+        """ Cancels pending compilations and unloads all variants. """
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+            self._pending.clear()
+            for variant in self._variants.values():
+                variant.unload()
+            self._variants.clear()
+
+    @property
+    def variants(self) -> Dict[SymbolKey, 'CompiledSDFG']:
+        """ The currently loaded variants, from least to most recently used. """
+        return dict(self._variants)
+
+    def _specialize(self, key: SymbolKey) -> 'SDFG':
+        """ Creates a copy of the SDFG in which the given symbol values are constants. """
+        sdfg = copy.deepcopy(self.sdfg)
+        suffix = hashlib.md5(repr(key).encode('utf-8')).hexdigest()[:8]
+        sdfg.name = f'{self.sdfg.name}_spec_{suffix}'
+        sdfg.build_folder = os.path.join(os.path.dirname(self.sdfg.build_folder), sdfg.name)
+        sdfg.specialize(dict(zip(self.symbols, key)))
+        return sdfg
+
+    def _compile(self, sdfg: 'SDFG', key: SymbolKey) -> Optional['CompiledSDFG']:
+        try:
+            return sdfg.compile()
+        except Exception as ex:
+            warnings.warn(f'Could not compile variant of "{self.sdfg.name}" specialized to '
+                          f'{dict(zip(self.symbols, key))}, using generic program: {ex}')
+            return None
+
+    def _insert(self, key: SymbolKey, variant: Optional['CompiledSDFG']) -> Optional['CompiledSDFG']:
+        """ Adds a compiled variant to the cache, evicting the least recently used variant if necessary. """
+        if variant is None:
+            self._failed.add(key)
+            return None
+        self._variants[key] = variant
+        while len(self._variants) > self.cache_size:
+            _, evicted = self._variants.popitem(last=False)
+            evicted.unload()
+        return variant
@@ -1,10 +1,14 @@
 # Copyright 2019-2021 ETH Zurich and the DaCe authors. All rights reserved.
+import ast
 from copy import deepcopy
 from dace.sdfg.graph import MultiConnectorEdge
 from dace.sdfg.state import ControlFlowRegion, SDFGState, StateSubgraphView
 import functools
+import hashlib
 import itertools
+import operator
 import warnings
+from io import StringIO
 
 from dace import data, dtypes, registry, memlet as mmlt, subsets, symbolic, Config
 from dace.codegen import cppunparse, exceptions as cgx
@@ -19,7 +23,8 @@ from dace.sdfg import (ScopeSubgraphView, SDFG, scope_contains_scope, is_array_s
                        dynamic_map_inputs)
 from dace.sdfg.scope import is_devicelevel_gpu, is_in_scope
 from dace.sdfg.validation import validate_memlet_data
-from typing import TYPE_CHECKING, Optional, Tuple, Union
+from dace.transformation.passes.memory_planning import get_arena_size
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Union
 from dace.codegen.targets import fpga
 
 
@@ -94,6 +99,10 @@ class CPUCodeGen(TargetCodeGenerator):
         # Keep nested SDFG schedule when descending into it
         self._toplevel_schedule = None
 
+        # Private accumulators of horizontal reductions in explicitly vectorized maps
+        self._simd_accumulators: Dict[int, str] = {}
+        self._simd_writebacks: Dict[nodes.Map, List[Tuple[MultiConnectorEdge[mmlt.Memlet], str]]] = {}
+
         # FIXME: this allows other code generators to change the CPU
         # behavior to assume that arrays point to packed types, thus dividing
         # all addresess by the vector length.
@@ -105,10 +114,26 @@ class CPUCodeGen(TargetCodeGenerator):
         # Keep track of generated NestedSDG, and the name of the assigned function
         self._generated_nested_sdfg = dict()
 
+        # Keep track of outlined tasklet functions (code hash -> function name)
+        self._outlined_tasklets: Dict[str, str] = {}
+
         # Keeps track of generated connectors, so we know how to access them in nested scopes
         arglist = dict(self._frame.arglist)
         self._define_sdfg_arguments(sdfg, arglist)
 
+        # Use a host memory pool (in the state struct, to reuse memory across calls) if any array is pooled
+        if any(self._is_pooled(desc) for sd in sdfg.all_sdfgs_recursive() for desc in sd.arrays.values()):
+            threshold = Config.get('compiler', 'cpu', 'mempool_hugepage_threshold')
+            self._frame.statestruct.append(f'dace::MemoryPool mempool{{{threshold}}};')
+
+        # Allocate the memory arena of statically-planned arrays (see ``MemoryPlanning``) at initialization
+        arena_size = get_arena_size(sdfg, dtypes.AllocationLifetime.Persistent)
+        if arena_size != 0:
+            self._frame.statestruct.append('char *__dace_memory_arena;')
+            self._frame._initcode.write(
+                f'__state->__dace_memory_arena = new char DACE_ALIGN(64)[{cpp.sym2cpp(arena_size)}];\n', sdfg)
+            self._frame._exitcode.write('delete[] __state->__dace_memory_arena;\n', sdfg)
+
         # Register dispatchers
         dispatcher.register_node_dispatcher(self)
         dispatcher.register_map_dispatcher(
@@ -136,6 +161,177 @@ class CPUCodeGen(TargetCodeGenerator):
 
         return options
 
+    @staticmethod
+    def _is_pooled(desc: data.Data) -> bool:
+        """ Returns True if the given data descriptor is allocated through the host memory pool. """
+        return (isinstance(desc, data.Array) and not isinstance(desc, (data.View, data.Reference))
+                and desc.transient and getattr(desc, 'pool', False) is True
+                and desc.storage == dtypes.StorageType.CPU_Heap and desc.lifetime
+                in (dtypes.AllocationLifetime.Scope, dtypes.AllocationLifetime.State, dtypes.AllocationLifetime.SDFG))
+
+    @staticmethod
+    def _in_arena(desc: data.Data) -> bool:
+        """ Returns True if the given data descriptor resides in the memory arena allocated by the CPU target. """
+        return (getattr(desc, 'arena_offset', None) is not None and desc.storage == dtypes.StorageType.CPU_Heap
+                and desc.lifetime == dtypes.AllocationLifetime.Persistent)
+
+    @staticmethod
+    def _numa_policy(desc: data.Data) -> dtypes.NUMAPolicy:
+        """ Returns the NUMA placement policy of the given data descriptor, if allocated on the host heap. """
+        if desc.storage != dtypes.StorageType.CPU_Heap:
+            return dtypes.NUMAPolicy.Default
+        return getattr(desc, 'numa_policy', dtypes.NUMAPolicy.Default)
+
+    @staticmethod
+    def _omp_clauses(omap: nodes.Map) -> str:
+        """ Returns the OpenMP thread count and affinity clauses of a map. """
+        clauses = ''
+        if omap.omp_num_threads > 0:
+            clauses += f' num_threads({omap.omp_num_threads})'
+        if omap.omp_proc_bind != dtypes.OMPProcBindType.Default:
+            clauses += f' proc_bind({omap.omp_proc_bind.name.lower()})'
+        return clauses
+
+    def _is_work_stealing(self, sdfg: SDFG, state: SDFGState, node: nodes.MapEntry) -> bool:
+        """ Returns True if a map is executed by the work-stealing runtime (``dace/worksteal.h``). """
+        return (node.map.schedule == dtypes.ScheduleType.CPU_Multicore
+                and node.map.omp_schedule == dtypes.OMPScheduleType.WorkStealing
+                and not self._frame.openmp_task_region
+                and not is_in_scope(sdfg, state, node, [dtypes.ScheduleType.CPU_Persistent]))
+
+    #: OpenMP reduction operators and their identities for write-conflict resolution in explicitly vectorized maps
+    _SIMD_REDUCTIONS = {
+        dtypes.ReductionType.Max: ('max', 'std::numeric_limits<{T}>::lowest()'),
+        dtypes.ReductionType.Min: ('min', 'std::numeric_limits<{T}>::max()'),
+        dtypes.ReductionType.Sum: ('+', '{T}(0)'),
+        dtypes.ReductionType.Product: ('*', '{T}(1)'),
+        dtypes.ReductionType.Bitwise_And: ('&', '{T}(~{T}(0))'),
+        dtypes.ReductionType.Logical_And: ('&&', '{T}(1)'),
+        dtypes.ReductionType.Bitwise_Or: ('|', '{T}(0)'),
+        dtypes.ReductionType.Logical_Or: ('||', '{T}(0)'),
+        dtypes.ReductionType.Bitwise_Xor: ('^', '{T}(0)'),
+    }
+
+    def _simd_reductions(self, sdfg: SDFG, state: SDFGState,
+                         node: nodes.MapEntry) -> Optional[List[MultiConnectorEdge[mmlt.Memlet]]]:
+        """
+        Checks whether the innermost dimension of a map can be vectorized explicitly, i.e., whether SIMD lanes never
+        write to the same element, except through supported write-conflict resolution (which becomes a horizontal
+        reduction across lanes).
+
+        :return: A list of the map exit's inner edges to reduce across lanes, or None if the map should not (or cannot
+                 safely) be vectorized.
+        """
+        if not node.map.simd:
+            return None
+        if node.map.schedule not in (dtypes.ScheduleType.Sequential, dtypes.ScheduleType.CPU_Multicore):
+            warnings.warn(f'Map "{node.map.label}" with schedule {node.map.schedule} cannot be vectorized')
+            return None
+
+        param = node.map.params[-1]
+        # If all dimensions are vectorized in one loop nest, the reduction accumulators are shared by all of them
+        collapsed = (node.map.schedule == dtypes.ScheduleType.CPU_Multicore
+                     and len(node.map.range) <= max(node.map.collapse, 1))
+
+        def injective(subset: subsets.Subset) -> bool:
+            # Every lane accesses a different element if one index is an affine function of the parameter
+            for begin, end, _ in subset.ndrange():
+                begin = symbolic.pystr_to_symbolic(begin)
+                pvar = next((s for s in begin.free_symbols if str(s) == param), None)
+                if pvar is None or begin != symbolic.pystr_to_symbolic(end):
+                    continue
+                derivative = begin.diff(pvar)
+                if derivative.is_Number and derivative != 0:
+                    return True
+            return False
+
+        reductions = []
+        for e in state.in_edges(state.exit_node(node)):
+            if e.data.is_empty():
+                continue
+            subset = e.data.dst_subset if e.data.dst_subset is not None else e.data.subset
+            if param in map(str, subset.free_symbols):
+                if injective(subset):
+                    continue
+                warnings.warn(f'Map "{node.map.label}" cannot be vectorized: lanes may write to the same element '
+                              f'of "{e.data.data}"')
+                return None
+
+            # Outputs that do not depend on the innermost parameter must be reductions computed by a tasklet
+            redtype = operations.detect_reduction_type(e.data.wcr) if e.data.wcr is not None else None
+            if (redtype not in self._SIMD_REDUCTIONS or subset.num_elements() != 1 or e.data.dynamic
+                    or (collapsed and set(map(str, subset.free_symbols)) & set(node.map.params))
+                    or not isinstance(e.src, nodes.Tasklet)
+                    or isinstance(e.src.out_connectors[e.src_conn], dtypes.pointer)):
+                warnings.warn(f'Map "{node.map.label}" cannot be vectorized: output "{e.data.data}" does not depend '
+                              'on the innermost map parameter and is not a supported reduction')
+                return None
+            reductions.append(e)
+
+        return reductions
+
+    def _generate_simd_directive(self, sdfg: SDFG, cfg: ControlFlowRegion, state_id: int, node: nodes.MapEntry,
+                                 reductions: List[MultiConnectorEdge[mmlt.Memlet]], stream: CodeIOStream) -> str:
+        """
+        Declares private accumulators for the horizontal reductions of an explicitly vectorized map, and returns the
+        clauses of its OpenMP ``simd`` directive. Write-conflict resolution on the reduced outputs is redirected to
+        the accumulators (see ``write_and_resolve_expr``) and written back in ``_generate_MapExit``.
+        """
+        clauses = ''
+        if node.map.simd_length > 0:
+            clauses += f' simdlen({node.map.simd_length})'
+
+        accumulators = []
+        for i, e in enumerate(reductions):
+            ctype = sdfg.arrays[e.data.data].dtype.ctype
+            op, identity = self._SIMD_REDUCTIONS[operations.detect_reduction_type(e.data.wcr)]
+            accname = f'__dace_simd_{node.map.label}_{i}'
+            stream.write(f'{ctype} {accname} = {identity.format(T=ctype)};', cfg, state_id, node)
+            self._simd_accumulators[id(e.data)] = accname
+            accumulators.append((e, accname))
+            clauses += f' reduction({op}: {accname})'
+        self._simd_writebacks[node.map] = accumulators
+
+        return clauses
+
+    def _numa_first_touch(self, sdfg: SDFG, dataname: str, nodedesc: data.Array, alloc_name: str, arrsize,
+                          setzero: bool) -> str:
+        """
+        Generates code that touches the pages of an array in parallel. The thread count and affinity follow the
+        first multi-core map that reads (or otherwise writes) the array, such that with a static schedule, threads
+        touch the pages they later access.
+        """
+        consumer: Optional[nodes.Map] = None
+        writer: Optional[nodes.Map] = None
+        for state in sdfg.states():
+            for anode in state.data_nodes():
+                if anode.data != dataname:
+                    continue
+                for e in state.out_edges(anode):
+                    if (consumer is None and isinstance(e.dst, nodes.MapEntry)
+                            and e.dst.map.schedule == dtypes.ScheduleType.CPU_Multicore):
+                        consumer = e.dst.map
+                for e in state.in_edges(anode):
+                    if (writer is None and isinstance(e.src, nodes.MapExit)
+                            and e.src.map.schedule == dtypes.ScheduleType.CPU_Multicore):
+                        writer = e.src.map
+        omap = consumer or writer
+        clauses = ' schedule(static)' + (self._omp_clauses(omap) if omap is not None else '')
+
+        page = f'reinterpret_cast<char *>({alloc_name}) + __dace_page'
+        if setzero:
+            body = f'memset({page}, 0, (__dace_bytes - __dace_page) < 4096 ? (__dace_bytes - __dace_page) : 4096);'
+        else:
+            body = f'*({page}) = 0;'
+        return f"""{{
+    const size_t __dace_bytes = sizeof({nodedesc.dtype.ctype}) * ({cpp.sym2cpp(arrsize)});
+    #pragma omp parallel for{clauses}
+    for (size_t __dace_page = 0; __dace_page < __dace_bytes; __dace_page += 4096) {{
+        {body}
+    }}
+}}
+"""
+
     def get_generated_codeobjects(self):
         # CPU target generates inline code
         return []
@@ -493,18 +689,42 @@ class CPUCodeGen(TargetCodeGenerator):
 
             if not declared:
                 declaration_stream.write(f'{nodedesc.dtype.ctype} *{name};\n', cfg, state_id, node)
-            allocation_stream.write(
-                "%s = new %s DACE_ALIGN(64)[%s];\n" % (alloc_name, nodedesc.dtype.ctype, cpp.sym2cpp(arrsize)), cfg,
-                state_id, node)
+            if self._in_arena(nodedesc):
+                allocation_stream.write(
+                    f'{alloc_name} = reinterpret_cast<{nodedesc.dtype.ctype} *>(__state->__dace_memory_arena + '
+                    f'{cpp.sym2cpp(nodedesc.arena_offset)});\n', cfg, state_id, node)
+            elif nodedesc.storage == dtypes.StorageType.CPU_Heap and self._is_pooled(nodedesc):
+                allocation_stream.write(
+                    f'{alloc_name} = __state->mempool.allocate<{nodedesc.dtype.ctype}>({cpp.sym2cpp(arrsize)});\n',
+                    cfg, state_id, node)
+            elif self._numa_policy(nodedesc) in (dtypes.NUMAPolicy.Interleave, dtypes.NUMAPolicy.Bind):
+                allocation_stream.write(
+                    f'{alloc_name} = dace::numa::allocate<{nodedesc.dtype.ctype}>({cpp.sym2cpp(arrsize)}, '
+                    f'dace::numa::Policy::{nodedesc.numa_policy.name}, {nodedesc.numa_node});\n', cfg, state_id, node)
+            else:
+                allocation_stream.write(
+                    "%s = new %s DACE_ALIGN(64)[%s];\n" % (alloc_name, nodedesc.dtype.ctype, cpp.sym2cpp(arrsize)),
+                    cfg, state_id, node)
             define_var(name, DefinedType.Pointer, ctypedef)
 
-            if node.setzero:
+            if self._numa_policy(nodedesc) == dtypes.NUMAPolicy.FirstTouch and not self._in_arena(nodedesc):
+                # Touch (and zero, if necessary) pages in parallel, such that they are placed close to their consumers
+                allocation_stream.write(
+                    self._numa_first_touch(sdfg, node.data, nodedesc, alloc_name, arrsize, node.setzero), cfg,
+                    state_id, node)
+            elif node.setzero:
                 allocation_stream.write("memset(%s, 0, sizeof(%s)*%s);" %
                                         (alloc_name, nodedesc.dtype.ctype, cpp.sym2cpp(arrsize)))
             if nodedesc.start_offset != 0:
                 allocation_stream.write(f'{alloc_name} += {cpp.sym2cpp(nodedesc.start_offset)};\n', cfg, state_id,
                                         node)
 
+            # Instrumentation: Allocation
+            size = f'({cpp.sym2cpp(arrsize)}) * sizeof({nodedesc.dtype.ctype})'
+            for instr in self._dispatcher.instrumentation.values():
+                if instr is not None:
+                    instr.on_allocate(sdfg, cfg, state_id, node, nodedesc, size, allocation_stream)
+
             return
         elif (nodedesc.storage == dtypes.StorageType.Register):
             ctypedef = dtypes.pointer(nodedesc.dtype).ctype
@@ -558,6 +778,12 @@ class CPUCodeGen(TargetCodeGenerator):
                 allocation_stream.write(f'{alloc_name} += {cpp.sym2cpp(nodedesc.start_offset)};\n', cfg, state_id,
                                         node)
 
+            # Instrumentation: Allocation (in every thread)
+            size = f'({cpp.sym2cpp(arrsize)}) * sizeof({nodedesc.dtype.ctype})'
+            for instr in self._dispatcher.instrumentation.values():
+                if instr is not None:
+                    instr.on_allocate(sdfg, cfg, state_id, node, nodedesc, size, allocation_stream)
+
             # Close OpenMP parallel section
             allocation_stream.write('}')
             self._dispatcher.defined_vars.add_global(name, DefinedType.Pointer, '%s *' % nodedesc.dtype.ctype)
@@ -581,14 +807,21 @@ class CPUCodeGen(TargetCodeGenerator):
             return
         elif (nodedesc.storage == dtypes.StorageType.CPU_Heap
               or (nodedesc.storage == dtypes.StorageType.Register and symbolic.issymbolic(arrsize, sdfg.constants))):
-            callsite_stream.write("delete[] %s;\n" % alloc_name, cfg, state_id, node)
+            if self._in_arena(nodedesc):
+                pass  # Memory arena is freed at exit
+            elif nodedesc.storage == dtypes.StorageType.CPU_Heap and self._is_pooled(nodedesc):
+                callsite_stream.write(f'__state->mempool.release({alloc_name});\n', cfg, state_id, node)
+            elif self._numa_policy(nodedesc) in (dtypes.NUMAPolicy.Interleave, dtypes.NUMAPolicy.Bind):
+                callsite_stream.write(f'dace::numa::release({alloc_name}, {cpp.sym2cpp(arrsize)});\n', cfg, state_id,
+                                      node)
+            else:
+                callsite_stream.write("delete[] %s;\n" % alloc_name, cfg, state_id, node)
         elif nodedesc.storage is dtypes.StorageType.CPU_ThreadLocal:
             # Deallocate in each OpenMP thread
             callsite_stream.write(
                 """#pragma omp parallel
                 {{
-                    delete[] {name};
-                }}""".format(name=alloc_name),
+                    delete[] {name};""".format(name=alloc_name),
                 cfg,
                 state_id,
                 node,
@@ -596,6 +829,16 @@ class CPUCodeGen(TargetCodeGenerator):
         else:
             return
 
+        # Instrumentation: Deallocation
+        size = f'({cpp.sym2cpp(arrsize)}) * sizeof({nodedesc.dtype.ctype})'
+        for instr in self._dispatcher.instrumentation.values():
+            if instr is not None:
+                instr.on_deallocate(sdfg, cfg, state_id, node, nodedesc, size, callsite_stream)
+
+        if nodedesc.storage is dtypes.StorageType.CPU_ThreadLocal:
+            # Close OpenMP parallel section
+            callsite_stream.write('}')
+
     def copy_memory(
         self,
         sdfg: SDFG,
@@ -925,6 +1168,12 @@ class CPUCodeGen(TargetCodeGenerator):
         """
 
         redtype = operations.detect_reduction_type(memlet.wcr)
+        if id(memlet) in self._simd_accumulators:
+            # Horizontal reduction in an explicitly vectorized map: accumulate privately (see _generate_simd_directive)
+            credtype = "dace::ReductionType::" + str(redtype)[str(redtype).find(".") + 1:]
+            ctype = sdfg.arrays[memlet.data].dtype.ctype
+            return f'dace::wcr_fixed<{credtype}, {ctype}>::reduce(&{self._simd_accumulators[id(memlet)]}, {inname})'
+
         atomic = "_atomic" if not nc else ""
         ptrname = cpp.ptr(memlet.data, sdfg.arrays[memlet.data], sdfg, self._frame)
         defined_type, _ = self._dispatcher.defined_vars.get(ptrname)
@@ -1506,8 +1755,12 @@ class CPUCodeGen(TargetCodeGenerator):
 
         inner_stream.write("\n    ///////////////////\n", cfg, state_id, node)
 
-        codegen.unparse_tasklet(sdfg, cfg, state_id, dfg, node, function_stream, inner_stream, self._locals,
-                                self._ldepth, self._toplevel_schedule)
+        if codegen is self and self._can_outline_tasklet(sdfg, state_dfg, node):
+            funcname, funcargs = self._outline_tasklet(sdfg, node, function_stream)
+            inner_stream.write(f'{funcname}({", ".join(funcargs)});', cfg, state_id, node)
+        else:
+            codegen.unparse_tasklet(sdfg, cfg, state_id, dfg, node, function_stream, inner_stream, self._locals,
+                                    self._ldepth, self._toplevel_schedule)
 
         inner_stream.write("    ///////////////////\n\n", cfg, state_id, node)
 
@@ -1549,6 +1802,88 @@ class CPUCodeGen(TargetCodeGenerator):
         cpp.unparse_tasklet(sdfg, cfg, state_id, dfg, node, function_stream, inner_stream, locals, ldepth,
                             toplevel_schedule, self)
 
+    def _can_outline_tasklet(self, sdfg: SDFG, state_dfg: SDFGState, node: nodes.Tasklet) -> bool:
+        """ Returns True if a tasklet can be generated as a function of its connectors. """
+        if not Config.get_bool('compiler', 'cpu', 'outline_tasklets'):
+            return False
+        if node.language != dtypes.Language.Python or not node.code.code:
+            return False
+        if any(block and block.code for block in (node.code_global, node.code_init, node.code_exit)):
+            return False
+        if node.state_fields or node.has_side_effects(sdfg) or node.free_symbols:
+            return False
+        if node.in_connectors.keys() & node.out_connectors.keys():
+            return False
+
+        # Connectors must be scalars whose memlets are resolved outside of the tasklet code
+        for ctype in itertools.chain(node.in_connectors.values(), node.out_connectors.values()):
+            if ctype is None or isinstance(ctype, dtypes.pointer) or ctype.type is None:
+                return False
+        for edge in state_dfg.all_edges(node):
+            if edge.data.data is None:
+                continue
+            if edge.data.dynamic or isinstance(sdfg.arrays[edge.data.data], data.Stream):
+                return False
+        for stmt in node.code.code:
+            for n in ast.walk(stmt):
+                if (isinstance(n, ast.Subscript) and isinstance(n.value, ast.Name)
+                        and (n.value.id in node.in_connectors or n.value.id in node.out_connectors)):
+                    return False
+        return True
+
+    def _outline_tasklet(self, sdfg: SDFG, node: nodes.Tasklet, function_stream: CodeIOStream) -> Tuple[str, List[str]]:
+        """
+        Generates a tasklet as a function, reusing an existing function if a tasklet with the same code (up to the
+        names of its connectors) was already generated.
+
+        :return: A 2-tuple of the function name and the connectors to call it with.
+        """
+        # Order connectors by their first use in the code, such that identical code yields the same signature
+        order = []
+        for stmt in node.code.code:
+            for n in ast.walk(stmt):
+                if (isinstance(n, ast.Name) and (n.id in node.in_connectors or n.id in node.out_connectors)
+                        and n.id not in order):
+                    order.append(n.id)
+        inputs = [c for c in order if c in node.in_connectors] + sorted(node.in_connectors.keys() - set(order))
+        outputs = [c for c in order if c in node.out_connectors] + sorted(node.out_connectors.keys() - set(order))
+
+        renames = {c: f'__in{i}' for i, c in enumerate(inputs)}
+        renames.update({c: f'__out{i}' for i, c in enumerate(outputs)})
+        conntypes = {renames[c]: node.in_connectors[c] for c in inputs}
+        conntypes.update({renames[c]: node.out_connectors[c] for c in outputs})
+        params = [f'const {conntypes[renames[c]].ctype} {renames[c]}' for c in inputs]
+        params += [f'{conntypes[renames[c]].ctype}& {renames[c]}' for c in outputs]
+
+        # Unparse renamed code in a fresh scope
+        memlets = {name: (None, False, None, ctype) for name, ctype in conntypes.items()}
+        local_vars = cppunparse.CPPLocals()
+        for name, ctype in conntypes.items():
+            local_vars.define(name, -1, 1, ctype.ctype)
+        renamer = _ConnectorRenamer(renames)
+        body = StringIO()
+        for stmt in node.code.code:
+            stmt = renamer.visit(deepcopy(stmt))
+            cpp.StructInitializer(sdfg).visit(stmt)
+            remover = cpp.DaCeKeywordRemover(sdfg, memlets, sdfg.constants, self)
+            rk = remover.visit_TopLevelExpr(stmt) if isinstance(stmt, ast.Expr) else remover.visit(stmt)
+            if rk is not None:
+                cppunparse.CPPUnparser(rk, 1, local_vars, body, defined_symbols=dict(conntypes))
+
+        signature = ', '.join(params)
+        code = body.getvalue()
+        key = hashlib.md5(f'{signature}\n{code}'.encode('utf-8')).hexdigest()
+        if key not in self._outlined_tasklets:
+            funcname = f'__dace_tasklet_{key[:12]}'
+            self._outlined_tasklets[key] = funcname
+            definition = f'inline void {funcname}({signature}) {{\n{code}}}\n\n'
+            if Config.get('compiler', 'split_translation_units') > 0:
+                # Tasklets may be shared between translation units
+                self._frame.split_declarations.append(definition)
+            else:
+                function_stream.write(definition, sdfg)
+        return self._outlined_tasklets[key], inputs + outputs
+
     def define_out_memlet(self, sdfg: SDFG, cfg: ControlFlowRegion, state_dfg: StateSubgraphView, state_id: int,
                           src_node: nodes.Node, dst_node: nodes.Node, edge: MultiConnectorEdge[mmlt.Memlet],
                           function_stream: CodeIOStream, callsite_stream: CodeIOStream) -> None:
@@ -1736,11 +2071,14 @@ class CPUCodeGen(TargetCodeGenerator):
         codegen = self.calling_codegen
         memlet_references = codegen.generate_nsdfg_arguments(sdfg, cfg, dfg, state_dfg, node)
 
+        # Move function to a separate translation unit
+        split = not inline and codegen is self and Config.get('compiler', 'split_translation_units') > 0
+
         if not inline and (not unique_functions or not code_already_generated):
-            nested_stream.write(
-                ('inline ' if codegen is self else '') +
-                codegen.generate_nsdfg_header(sdfg, cfg, state_dfg, state_id, node, memlet_references, sdfg_label),
-                cfg, state_id, node)
+            nsdfg_header = codegen.generate_nsdfg_header(sdfg, cfg, state_dfg, state_id, node, memlet_references,
+                                                         sdfg_label)
+            nested_stream.write(('inline ' if codegen is self and not split else '') + nsdfg_header, cfg, state_id,
+                                node)
 
         #############################
         # Generate function contents
@@ -1812,10 +2150,14 @@ class CPUCodeGen(TargetCodeGenerator):
             ###############################################################
             # Write generated code in the proper places (nested SDFG writes
             # location info)
-            if not unique_functions or not code_already_generated:
-                function_stream.write(global_code)
-            function_stream.write(nested_global_stream.getvalue())
-            function_stream.write(nested_stream.getvalue())
+            if split and (not unique_functions or not code_already_generated):
+                self._frame.add_split_function(nsdfg_header,
+                                               global_code + nested_global_stream.getvalue() + nested_stream.getvalue())
+            else:
+                if not unique_functions or not code_already_generated:
+                    function_stream.write(global_code)
+                function_stream.write(nested_global_stream.getvalue())
+                function_stream.write(nested_stream.getvalue())
 
         self._dispatcher.defined_vars.exit_scope(sdfg)
 
@@ -1856,23 +2198,55 @@ class CPUCodeGen(TargetCodeGenerator):
 
         # TODO: Refactor to generate_scope_preamble once a general code
         #  generator (that CPU inherits from) is implemented
+        # Explicit vectorization of the innermost map dimension, which is either part of the OpenMP loop directive
+        # (if all dimensions are collapsed into it) or a separate SIMD loop
+        simd_reductions = self._simd_reductions(sdfg, state_dfg, node)
+        simd_in_header = False
+        if simd_reductions is not None and node.map.schedule == dtypes.ScheduleType.CPU_Multicore:
+            if len(node.map.range) <= max(node.map.collapse, 1):
+                simd_in_header = True
+                if self._is_work_stealing(sdfg, state_dfg, node):
+                    # No loop remains in the generated code to vectorize
+                    simd_reductions = None
+                    simd_in_header = False
+        if simd_in_header:
+            simd_clauses = self._generate_simd_directive(sdfg, cfg, state_id, node, simd_reductions, result)
+
         if node.map.schedule in (dtypes.ScheduleType.CPU_Multicore, dtypes.ScheduleType.CPU_Persistent):
             # OpenMP header
             in_persistent = False
-            if node.map.schedule == dtypes.ScheduleType.CPU_Multicore:
+            in_tasks = False
+            work_stealing = self._is_work_stealing(sdfg, state_dfg, node)
+            if work_stealing:
+                # Parallelism is provided by the runtime rather than by a pragma
+                pass
+            elif node.map.schedule == dtypes.ScheduleType.CPU_Multicore:
                 in_persistent = is_in_scope(sdfg, state_dfg, node, [dtypes.ScheduleType.CPU_Persistent])
                 if in_persistent:
                     # If already in a #pragma omp parallel, no need to use it twice
                     map_header += "#pragma omp for"
                     # TODO(later): barriers and map_header += " nowait"
+                    if simd_in_header:
+                        map_header += " simd"
+                elif self._frame.openmp_task_region:
+                    # Within OpenMP tasks, create tasks for the existing threads instead of a nested parallel region
+                    in_tasks = True
+                    map_header += "#pragma omp taskloop"
+                    if simd_in_header:
+                        map_header += " simd"
+                    map_header += " default(shared)"
+                    if node.map.omp_chunk_size > 0:
+                        map_header += f" grainsize({node.map.omp_chunk_size})"
                 else:
                     map_header += "#pragma omp parallel for"
+                    if simd_in_header:
+                        map_header += " simd"
 
             elif node.map.schedule == dtypes.ScheduleType.CPU_Persistent:
                 map_header += "#pragma omp parallel"
 
             # OpenMP schedule properties
-            if not in_persistent:
+            if not in_persistent and not in_tasks and not work_stealing:
                 if node.map.omp_schedule != dtypes.OMPScheduleType.Default:
                     schedule = " schedule("
                     if node.map.omp_schedule == dtypes.OMPScheduleType.Static:
@@ -1888,13 +2262,15 @@ class CPUCodeGen(TargetCodeGenerator):
                     schedule += ")"
                     map_header += schedule
 
-                if node.map.omp_num_threads > 0:
-                    map_header += f" num_threads({node.map.omp_num_threads})"
+                map_header += self._omp_clauses(node.map)
 
             # OpenMP nested loop properties
-            if node.map.schedule == dtypes.ScheduleType.CPU_Multicore and node.map.collapse > 1:
+            if node.map.schedule == dtypes.ScheduleType.CPU_Multicore and node.map.collapse > 1 and not work_stealing:
                 map_header += ' collapse(%d)' % node.map.collapse
 
+            if simd_in_header:
+                map_header += simd_clauses
+
         if node.map.unroll:
             if node.map.schedule in (dtypes.ScheduleType.CPU_Multicore, dtypes.ScheduleType.CPU_Persistent):
                 raise ValueError("An OpenMP map cannot be unrolled (" + node.map.label + ")")
@@ -1922,11 +2298,37 @@ class CPUCodeGen(TargetCodeGenerator):
             if ntid_is_used:
                 result.write(f'auto __omp_num_threads = omp_get_num_threads();', cfg, state_id, node)
         else:
+            nparallel = 0
+            if self._is_work_stealing(sdfg, state_dfg, node):
+                # The collapsed dimensions are linearized into one iteration space that is distributed by the runtime
+                nparallel = min(max(node.map.collapse, 1), len(node.map.range))
+                counts = node.map.range.size(for_codegen=True)[:nparallel]
+                result.write(
+                    f'dace::worksteal::parallel_for({cpp.sym2cpp(functools.reduce(operator.mul, counts, 1))}, '
+                    f'{node.map.omp_chunk_size}, {node.map.omp_num_threads}, [&](long long __dace_ws_i) {{', cfg,
+                    state_id, node)
+                for i in range(nparallel):
+                    begin, _, skip = node.map.range[i]
+                    index = '__dace_ws_i'
+                    stride = functools.reduce(operator.mul, counts[i + 1:], 1)
+                    if stride != 1:
+                        index = f'({index} / ({cpp.sym2cpp(stride)}))'
+                    if i > 0:
+                        index = f'({index} % ({cpp.sym2cpp(counts[i])}))'
+                    result.write(f'auto {map_params[i]} = {cpp.sym2cpp(begin)} + {index} * {cpp.sym2cpp(skip)};', cfg,
+                                 state_id, node)
+
             # Emit nested loops
             for i, r in enumerate(node.map.range):
+                if i < nparallel:
+                    continue
                 var = map_params[i]
                 begin, end, skip = r
 
+                if simd_reductions is not None and not simd_in_header and i == len(node.map.range) - 1:
+                    simd_clauses = self._generate_simd_directive(sdfg, cfg, state_id, node, simd_reductions, result)
+                    result.write(f"#pragma omp simd{simd_clauses}", cfg, state_id, node)
+
                 if node.map.unroll:
                     unroll_pragma = "#pragma unroll"
                     if node.map.unroll_factor:
@@ -1970,11 +2372,32 @@ class CPUCodeGen(TargetCodeGenerator):
 
         self.generate_scope_postamble(sdfg, dfg, state_id, function_stream, outer_stream, callsite_stream)
 
+        # Horizontal reductions of an explicitly vectorized map are written back after the SIMD loop
+        simd_writebacks = CodeIOStream()
+        for e, accname in self._simd_writebacks.pop(map_node.map, []):
+            del self._simd_accumulators[id(e.data)]
+            nc = not cpp.is_write_conflicted(dfg, e, sdfg_schedule=self._toplevel_schedule)
+            simd_writebacks.write(
+                self.write_and_resolve_expr(sdfg, e.data, nc, None, accname,
+                                            dtype=sdfg.arrays[e.data.data].dtype) + ';', cfg, state_id, node)
+
         if map_node.map.schedule == dtypes.ScheduleType.CPU_Persistent:
             result.write("}", cfg, state_id, node)
+        elif self._is_work_stealing(sdfg, state_dfg, map_node):
+            for i in range(len(map_node.map.range) - min(max(map_node.map.collapse, 1), len(map_node.map.range))):
+                result.write("}", cfg, state_id, node)
+                if i == 0:
+                    result.write(simd_writebacks.getvalue())
+            result.write("});", cfg, state_id, node)
         else:
-            for _ in map_node.map.range:
+            simd_in_header = len(map_node.map.range) <= max(map_node.map.collapse, 1) and (
+                map_node.map.schedule == dtypes.ScheduleType.CPU_Multicore)
+            for i, _ in enumerate(map_node.map.range):
                 result.write("}", cfg, state_id, node)
+                if i == 0 and not simd_in_header:
+                    result.write(simd_writebacks.getvalue())
+            if simd_in_header:
+                result.write(simd_writebacks.getvalue())
 
         result.write(outer_stream.getvalue())
 
@@ -2281,3 +2704,15 @@ class CPUCodeGen(TargetCodeGenerator):
 
     def make_ptr_vector_cast(self, *args, **kwargs):
         return cpp.make_ptr_vector_cast(*args, **kwargs)
+
+
+class _ConnectorRenamer(ast.NodeTransformer):
+    """ Renames tasklet connectors in a Python AST. """
+
+    def __init__(self, renames: Dict[str, str]):
+        self.renames = renames
+
+    def visit_Name(self, node: ast.Name):
+        if node.id in self.renames:
+            return ast.copy_location(ast.Name(id=self.renames[node.id], ctx=node.ctx), node)
+        return node
@@ -221,9 +221,9 @@ class CUDACodeGen(TargetCodeGenerator):
         # Find release points for every array in every SDFG
         reachability = access_nodes = None
         for sdfg in top_sdfg.all_sdfgs_recursive():
-            # Skip SDFGs without memory pool hints
-            pooled = set(aname for aname, arr in sdfg.arrays.items()
-                         if getattr(arr, 'pool', False) is True and arr.transient)
+            # Skip SDFGs without memory pool hints (pooled host heap arrays are handled by the CPU target)
+            pooled = set(aname for aname, arr in sdfg.arrays.items() if getattr(arr, 'pool', False) is True
+                         and arr.transient and arr.storage != dtypes.StorageType.CPU_Heap)
             if not pooled:
                 continue
             self.has_pool = True
@@ -620,6 +620,11 @@ DACE_EXPORTED void __dace_gpu_set_all_streams({sdfg_state_name} *__state, gpuStr
                 result_alloc.write('memset(%s, 0, %s);\n' % (dataname, arrsize_malloc))
             if nodedesc.start_offset != 0:
                 result_alloc.write(f'{dataname} += {cpp.sym2cpp(nodedesc.start_offset)};\n')
+
+            # Instrumentation: Allocation
+            for instr in self._dispatcher.instrumentation.values():
+                if instr is not None:
+                    instr.on_allocate(sdfg, cfg, state_id, node, nodedesc, arrsize_malloc, result_alloc)
         elif nodedesc.storage == dtypes.StorageType.GPU_Shared:
             if is_dynamically_sized:
                 raise NotImplementedError('Dynamic shared memory unsupported')
@@ -744,6 +749,12 @@ void __dace_alloc_{location}(uint32_t {size}, dace::GPUStream<{type}, {is_pow2}>
                 callsite_stream.write('DACE_GPU_CHECK(%sFree(%s));\n' % (self.backend, dataname), cfg, state_id, node)
         elif nodedesc.storage == dtypes.StorageType.CPU_Pinned:
             callsite_stream.write('DACE_GPU_CHECK(%sFreeHost(%s));\n' % (self.backend, dataname), cfg, state_id, node)
+
+            # Instrumentation: Deallocation
+            size = f'({cpp.sym2cpp(nodedesc.total_size)}) * sizeof({nodedesc.dtype.ctype})'
+            for instr in self._dispatcher.instrumentation.values():
+                if instr is not None:
+                    instr.on_deallocate(sdfg, cfg, state_id, node, nodedesc, size, callsite_stream)
         elif nodedesc.storage == dtypes.StorageType.GPU_Shared or \
              nodedesc.storage == dtypes.StorageType.Register:
             pass  # Do nothing
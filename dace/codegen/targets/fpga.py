@@ -687,7 +687,7 @@ DACE_EXPORTED void {host_function_name}({', '.join(kernel_args_opencl)}) {{""")
 
             if state.instrument == dtypes.InstrumentationType.FPGA:
                 kernel_host_stream.write("""\
-const unsigned long int _dace_fpga_begin_us = std::chrono::duration_cast<std::chrono::microseconds>(std::chrono::high_resolution_clock::now().time_since_epoch()).count();
+const unsigned long int _dace_fpga_begin_us = dace::perf::timestamp_us();
 """)
 
             kernel_host_stream.write(f"""\
@@ -714,7 +714,7 @@ cl_ulong last_end = std::numeric_limits<unsigned long int>::min();""")
 std::cout << std::scientific;""")
                 kernel_host_stream.write(instrumentation_stream.getvalue())
                 kernel_host_stream.write(f"""\
-const unsigned long int _dace_fpga_end_us = std::chrono::duration_cast<std::chrono::microseconds>(std::chrono::high_resolution_clock::now().time_since_epoch()).count();
+const unsigned long int _dace_fpga_end_us = dace::perf::timestamp_us();
 // Convert from nanoseconds (reported by OpenCL) to microseconds (expected by the profiler)
 __state->report.add_completion("Full FPGA kernel runtime for {state.label}", "FPGA", 1e-3 * first_start, 1e-3 * last_end, {sdfg.cfg_id}, {state_id}, -1);
 __state->report.add_completion("Full FPGA state runtime for {state.label}", "FPGA", _dace_fpga_begin_us, _dace_fpga_end_us, {sdfg.cfg_id}, {state_id}, -1);
@@ -23,6 +23,7 @@ from dace.sdfg import utils
 from dace.sdfg.analysis import cfg as cfg_analysis
 from dace.sdfg.state import ControlFlowRegion, LoopRegion
 from dace.transformation.passes.analysis import StateReachability, loop_analysis
+from dace.transformation.passes.memory_planning import get_arena_size
 
 
 def _get_or_eval_sdfg_first_arg(func, sdfg):
@@ -48,6 +49,15 @@ class DaCeCodeGenerator(object):
                                       List[Tuple[SDFG, Optional[SDFGState], Optional[nodes.AccessNode], bool, bool,
                                                  bool]]] = collections.defaultdict(list)
         self.where_allocated: Dict[Tuple[SDFG, str], SDFG] = {}
+        # Set while generating code that executes within OpenMP tasks (see ``SDFG.openmp_tasks``), along with the
+        # states whose tasks may remain outstanding at the end of the state
+        self.openmp_task_region = False
+        self.openmp_task_states: Set[SDFGState] = set()
+        # Functions that are moved to separate translation units (see ``compiler.split_translation_units``): shared
+        # declarations (emitted in a header included by all units), and the code of each unit
+        self.split_declarations: List[str] = []
+        self.split_units: List[str] = []
+        self.shared_header: Optional[str] = None
         self.fsyms: Dict[int, Set[str]] = {}
         self._symbols_and_constants: Dict[int, Set[str]] = {}
         fsyms = self.free_symbols(sdfg)
@@ -125,6 +135,18 @@ class DaCeCodeGenerator(object):
             else:
                 callsite_stream.write("constexpr %s %s = %s;\n" % (csttype.dtype.ctype, cstname, sym2cpp(cstval)), sdfg)
 
+    def add_split_function(self, header: str, code: str):
+        """ Moves a generated function to a separate translation unit, and declares it in the shared header.
+
+            :param header: The function header (up to and including the opening brace).
+            :param code: The full function definition, including global code it depends on.
+        """
+        self.split_declarations.append(header.rstrip().rstrip('{').rstrip() + ';')
+        max_lines = config.Config.get('compiler', 'split_translation_units')
+        if not self.split_units or self.split_units[-1].count('\n') >= max_lines:
+            self.split_units.append('')
+        self.split_units[-1] += code
+
     def generate_fileheader(self, sdfg: SDFG, global_stream: CodeIOStream, backend: str = 'frame'):
         """ Generate a header in every output file that includes custom types
             and constants.
@@ -222,6 +244,13 @@ struct {mangle_dace_state_struct_name(sdfg)} {{
             # Reset report if written every invocation
             if config.Config.get_bool('instrumentation', 'report_each_invocation'):
                 callsite_stream.write('__state->report.reset();', sdfg)
+                if config.Config.get('instrumentation', 'report_format') == 'binary':
+                    callsite_stream.write(
+                        '__state->report.stream("%s/perf", __HASH_%s);' %
+                        (sdfg.build_folder.replace('\\', '/'), sdfg.name), sdfg)
+            # Restart sampling budget
+            if config.Config.get('instrumentation', 'sampling', 'budget') > 0:
+                callsite_stream.write('__state->report.begin_call();', sdfg)
 
         self.generate_fileheader(sdfg, global_stream, 'frame')
 
@@ -307,6 +336,19 @@ DACE_EXPORTED {mangle_dace_state_struct_name(sdfg)} *__dace_init_{sdfg.name}({in
 
         callsite_stream.write(self._initcode.getvalue(), sdfg)
 
+        # Calibrate sampling budget
+        sampling_budget = config.Config.get('instrumentation', 'sampling', 'budget')
+        if sampling_budget > 0 and len(self._dispatcher.instrumentation) > 2:
+            callsite_stream.write(f'__state->report.set_sampling_budget({sampling_budget});', sdfg)
+
+        # Stream instrumentation report from initialization to finalization
+        if (not config.Config.get_bool('instrumentation', 'report_each_invocation')
+                and config.Config.get('instrumentation', 'report_format') == 'binary'
+                and len(self._dispatcher.instrumentation) > 2):
+            callsite_stream.write(
+                '__state->report.stream("%s/perf", __HASH_%s);' % (sdfg.build_folder.replace('\\', '/'), sdfg.name),
+                sdfg)
+
         callsite_stream.write(
             f"""
     if (__result) {{
@@ -377,10 +419,14 @@ DACE_EXPORTED int __dace_exit_{sdfg.name}({mangle_dace_state_struct_name(sdfg)}
         initparams = sdfg.init_signature(free_symbols=self.free_symbols(sdfg))
         initparams_comma = (', ' + initparams) if initparams else ''
 
+        # Statically-planned arrays (see ``MemoryPlanning``) share a memory arena at the beginning of the workspace
+        arena_size = get_arena_size(sdfg, dtypes.AllocationLifetime.External)
+
         for storage, arrays in ext_arrays.items():
-            size = 0
+            size = arena_size if storage == dtypes.StorageType.CPU_Heap else 0
             for subsdfg, aname, arr in arrays:
-                size += arr.total_size * arr.dtype.bytes
+                if getattr(arr, 'arena_offset', None) is None:
+                    size += arr.total_size * arr.dtype.bytes
 
             # Size query functions
             callsite_stream.write(
@@ -397,9 +443,13 @@ DACE_EXPORTED size_t __dace_get_external_memory_size_{storage.name}({mangle_dace
 DACE_EXPORTED void __dace_set_external_memory_{storage.name}({mangle_dace_state_struct_name(sdfg)} *__state, char *ptr{initparams_comma})
 {{''', sdfg)
 
-            offset = 0
+            offset = arena_size if storage == dtypes.StorageType.CPU_Heap else 0
             for subsdfg, aname, arr in arrays:
                 allocname = f'__state->__{subsdfg.cfg_id}_{aname}'
+                if getattr(arr, 'arena_offset', None) is not None:
+                    callsite_stream.write(f'{allocname} = decltype({allocname})(ptr + {sym2cpp(arr.arena_offset)});',
+                                          subsdfg)
+                    continue
                 callsite_stream.write(f'{allocname} = decltype({allocname})(ptr + {sym2cpp(offset)});', subsdfg)
                 offset += arr.total_size * arr.dtype.bytes
 
@@ -433,8 +483,27 @@ DACE_EXPORTED void __dace_set_external_memory_{storage.name}({mangle_dace_state_
         # For different connected components, run them concurrently.
 
         components = dace.sdfg.concurrent_subgraphs(state)
+        as_tasks = self.openmp_task_region and (len(components) > 1 or state in self.openmp_task_states)
 
-        if len(components) <= 1:
+        if as_tasks:
+            for c in components:
+                callsite_stream.write(
+                    f"#pragma omp task default(shared){self._openmp_task_dependencies(sdfg, state, c)}\n{{")
+                self._dispatcher.dispatch_subgraph(sdfg,
+                                                   cfg,
+                                                   c,
+                                                   sid,
+                                                   global_stream,
+                                                   callsite_stream,
+                                                   skip_entry_node=False)
+                callsite_stream.write("} // End omp task")
+
+            # Tasks may only outlive the state if it is part of a task sequence and no state-local data (which is
+            # deallocated or goes out of scope below) or state instrumentation exists
+            if (state not in self.openmp_task_states or len(self.to_allocate[state]) > 0
+                    or state.instrument != dtypes.InstrumentationType.No_Instrumentation):
+                callsite_stream.write("#pragma omp taskwait")
+        elif len(components) <= 1:
             self._dispatcher.dispatch_subgraph(sdfg,
                                                cfg,
                                                state,
@@ -472,6 +541,42 @@ DACE_EXPORTED void __dace_set_external_memory_{storage.name}({mangle_dace_state_
                 if instr is not None:
                     instr.on_state_end(sdfg, state, callsite_stream, global_stream)
 
+    def _openmp_task_dependencies(self, sdfg: SDFG, state: SDFGState, subgraph: sdscope.ScopeSubgraphView) -> str:
+        """
+        Returns the ``depend`` clauses of an OpenMP task that executes a connected component of a state, derived from
+        the data containers the component reads and writes.
+        """
+        from dace.codegen.targets.cpp import ptr  # Avoid circular import
+
+        scope_dict = state.scope_dict()
+        reads: Set[str] = set()
+        writes: Set[str] = set()
+        for node in subgraph.nodes():
+            if isinstance(node, nodes.Tasklet) and node.has_side_effects(sdfg):
+                # Keep tasks with side effects in program order
+                writes.add('__state')
+            if not isinstance(node, nodes.AccessNode):
+                continue
+            desc = node.desc(sdfg)
+            # Views are defined within the task, and transients in scopes are private to it
+            if isinstance(desc, (data.View, data.Reference)):
+                continue
+            if (scope_dict[node] is not None and desc.transient
+                    and desc.lifetime == dtypes.AllocationLifetime.Scope):
+                continue
+            name = ptr(node.data, desc, sdfg, self)
+            if state.in_degree(node) > 0:
+                writes.add(name)
+            if state.out_degree(node) > 0:
+                reads.add(name)
+
+        result = ''
+        if reads - writes:
+            result += f' depend(in: {", ".join(sorted(reads - writes))})'
+        if writes:
+            result += f' depend(inout: {", ".join(sorted(writes))})'
+        return result
+
     def generate_states(self, sdfg: SDFG, global_stream: CodeIOStream, callsite_stream: CodeIOStream) -> Set[SDFGState]:
         states_generated = set()
 
@@ -994,6 +1099,17 @@ DACE_EXPORTED void __dace_set_external_memory_{storage.name}({mangle_dace_state_
             self.generate_footer(sdfg, footer_global_stream, footer_stream)
             self.generate_external_memory_management(sdfg, footer_stream)
 
+            # If functions were moved to other translation units, move the file header (types, constants, state
+            # struct) and their declarations to a header shared by all units
+            if self.split_declarations:
+                shared_header = CodeIOStream()
+                shared_header.write('#pragma once\n', sdfg)
+                shared_header.write(header_global_stream.getvalue())
+                shared_header.write('\n'.join(self.split_declarations) + '\n', sdfg)
+                self.shared_header = shared_header.getvalue()
+                header_global_stream = CodeIOStream()
+                header_global_stream.write(f'#include "{sdfg.name}_shared.h"\n', sdfg)
+
             header_global_stream.write(global_stream.getvalue())
             header_global_stream.write(footer_global_stream.getvalue())
             generated_header = header_global_stream.getvalue()
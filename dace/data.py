@@ -1377,6 +1377,14 @@ class Array(Data):
                         'If False, the array must not be None. If option is not set, '
                         'it is inferred by other properties and the OptionalArrayInference pass.')
     pool = Property(dtype=bool, default=False, desc='Hint to the allocator that using a memory pool is preferred')
+    numa_policy = EnumProperty(dtype=dtypes.NUMAPolicy,
+                               default=dtypes.NUMAPolicy.Default,
+                               desc='NUMA page placement policy of host heap arrays')
+    numa_node = Property(dtype=int, default=0, desc='NUMA node to bind the array to (if ``numa_policy`` is Bind)')
+    arena_offset = SymbolicProperty(default=None,
+                                    allow_none=True,
+                                    desc='Byte offset of the array in the memory arena of its SDFG, as assigned by '
+                                    'static memory planning. If None, the array is allocated separately.')
 
     def __init__(self,
                  dtype,
@@ -1430,9 +1438,13 @@ class Array(Data):
         return '%s (dtype=%s, shape=%s)' % (type(self).__name__, self.dtype, self.shape)
 
     def clone(self):
-        return type(self)(self.dtype, self.shape, self.transient, self.allow_conflicts, self.storage, self.location,
-                          self.strides, self.offset, self.may_alias, self.lifetime, self.alignment, self.debuginfo,
-                          self.total_size, self.start_offset, self.optional, self.pool)
+        result = type(self)(self.dtype, self.shape, self.transient, self.allow_conflicts, self.storage, self.location,
+                            self.strides, self.offset, self.may_alias, self.lifetime, self.alignment, self.debuginfo,
+                            self.total_size, self.start_offset, self.optional, self.pool)
+        result.arena_offset = self.arena_offset
+        result.numa_policy = self.numa_policy
+        result.numa_node = self.numa_node
+        return result
 
     def to_json(self):
         attrs = serialize.all_properties_to_json(self)
@@ -53,6 +53,27 @@ class OMPScheduleType(aenum.AutoNumberEnum):
     Static = ()  #: Static schedule
     Dynamic = ()  #: Dynamic schedule
     Guided = ()  #: Guided schedule
+    WorkStealing = ()  #: Work-stealing schedule with adaptive chunk sizes (``dace/worksteal.h``)
+
+
+@undefined_safe_enum
+@extensible_enum
+class OMPProcBindType(aenum.AutoNumberEnum):
+    """ Available OpenMP thread affinity policies (``proc_bind``) for Maps with CPU-Multicore schedule. """
+    Default = ()  #: OpenMP library default (or ``OMP_PROC_BIND``)
+    Master = ()  #: Bind threads to the place of the primary thread
+    Close = ()  #: Bind threads to places close to the primary thread
+    Spread = ()  #: Spread threads evenly across places (e.g., sockets)
+
+
+@undefined_safe_enum
+@extensible_enum
+class NUMAPolicy(aenum.AutoNumberEnum):
+    """ Available NUMA page placement policies for host arrays. """
+    Default = ()  #: Pages are placed on the NUMA node of the thread that touches them first (usually the allocator)
+    FirstTouch = ()  #: Pages are touched in parallel upon allocation, matching the schedule of the consuming map
+    Interleave = ()  #: Pages are interleaved across all NUMA nodes
+    Bind = ()  #: Pages are bound to a specific NUMA node
 
 
 @undefined_safe_enum
@@ -167,6 +188,8 @@ class InstrumentationType(aenum.AutoNumberEnum):
     LIKWID_GPU = ()
     GPU_Events = ()
     FPGA = ()
+    Perf_Counters = ()
+    Memory_Usage = ()
 
 
 @undefined_safe_enum
@@ -293,5 +293,8 @@ def _install_hooks_from_config():
     if config.Config.get_bool('profiling'):
         from dace.frontend.operations import CompiledSDFGProfiler
         register_compiled_sdfg_call_hook(context_manager=CompiledSDFGProfiler())
+    if config.Config.get_bool('profiling_latency'):
+        from dace.codegen.instrumentation.latency import LatencyRecorder
+        register_compiled_sdfg_call_hook(context_manager=LatencyRecorder())
 
 
@@ -1,7 +1,12 @@
 from dace.optimization.map_permutation_tuner import MapPermutationTuner
 from dace.optimization.map_tiling_tuner import MapTilingTuner
+from dace.optimization.map_schedule_tuner import MapScheduleTuner
 from dace.optimization.data_layout_tuner import DataLayoutTuner
 from dace.optimization.distributed_cutout_tuner import DistributedCutoutTuner, DistributedSpaceTuner
+from dace.optimization.worker_pool_tuner import WorkerPoolTuner
 from dace.optimization.on_the_fly_map_fusion_tuner import OnTheFlyMapFusionTuner
 from dace.optimization.subgraph_fusion_tuner import SubgraphFusionTuner
 from dace.optimization.cutout_tuner import CutoutTuner
+from dace.optimization.search_strategy import SearchStrategy, ExhaustiveSearch, TPESearch
+from dace.optimization.transformation_database import TransformationDatabase
+from dace.optimization.transfer_tuning import TransferTuningCache
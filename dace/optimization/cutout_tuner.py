@@ -1,13 +1,17 @@
 # Copyright 2019-2022 ETH Zurich and the DaCe authors. All rights reserved.
+import contextlib
 import os
 import tempfile
 import math
 import dace
 import json
 
-from typing import Dict, Generator, Any, List, Tuple
+from typing import Callable, Dict, Generator, Any, List, Optional, Tuple
 from dace.optimization import auto_tuner
+from dace.optimization.transformation_database import TransformationDatabase
 from dace.optimization import utils as optim_utils
+from dace.optimization.search_strategy import SearchStrategy
+from dace.optimization.transfer_tuning import TransferTuningCache
 from dace.sdfg.sdfg import SDFG
 from dace.sdfg.state import SDFGState
 
@@ -35,15 +39,19 @@ class CutoutTuner(auto_tuner.AutoTuner):
         # results will now contain the fastest data layout configurations for each array
     """
 
-    def __init__(self, task: str, sdfg: SDFG) -> None:
+    def __init__(self, task: str, sdfg: SDFG, strategy: Optional[SearchStrategy] = None) -> None:
         """
         Creates a cutout tuner.
         
         :param task: Name of tuning task (for filename labeling).
         :param sdfg: The SDFG to tune.
+        :param strategy: The search strategy to use for each cutout (e.g., ``TPESearch``). If None, evaluates the
+                         whole configuration space.
         """
         super().__init__(sdfg=sdfg)
         self._task = task
+        self.strategy = strategy
+        self._measurement_hook: Optional[Callable[[SDFG, Dict[str, Any], int], float]] = None
 
     @property
     def task(self) -> str:
@@ -68,9 +76,6 @@ class CutoutTuner(auto_tuner.AutoTuner):
     def space(self, **kwargs) -> Generator[Any, None, None]:
         raise NotImplementedError
 
-    def search(self, cutout: SDFG, measurements: int, **kwargs) -> Dict:
-        raise NotImplementedError
-
     def pre_evaluate(self, **kwargs) -> Dict:
         raise NotImplementedError
 
@@ -83,37 +88,104 @@ class CutoutTuner(auto_tuner.AutoTuner):
     def apply(self, config, cutout, **kwargs) -> None:
         raise NotImplementedError
 
-    def measure(self, cutout, dreport, repetitions: int = 30, timeout: float = 300.0) -> float:
+    def measurement_data(self, cutout, dreport) -> Dict[str, Any]:
+        """
+        Collects the input data of a cutout from an instrumented data report.
+
+        :return: A dictionary mapping non-transient data container names to their first saved version.
+        """
         dreport_ = {}
         for cstate in cutout.nodes():
             for dnode in cstate.data_nodes():
                 array = cutout.arrays[dnode.data]
                 if array.transient:
                     continue
-            try:
-                data = dreport.get_first_version(dnode.data)
-                dreport_[dnode.data] = data
-            except:
-                continue
-        
+                try:
+                    data = dreport.get_first_version(dnode.data)
+                    dreport_[dnode.data] = data
+                except:
+                    continue
+        return dreport_
+
+    @contextlib.contextmanager
+    def intercept_measurements(self, hook: Callable[[SDFG, Dict[str, Any], int], float]):
+        """
+        Context manager that passes every cutout measured within it to the given function instead of running it.
+        Used to measure configurations elsewhere, e.g., in a worker pool (see ``WorkerPoolTuner``).
+
+        :param hook: A function that receives the cutout, its input data (see ``measurement_data``), and the number
+                     of repetitions, and returns the runtime to report to ``evaluate``.
+        """
+        previous = self._measurement_hook
+        self._measurement_hook = hook
+        try:
+            yield
+        finally:
+            self._measurement_hook = previous
+
+    def measure(self, cutout, dreport, repetitions: int = 30, timeout: float = 300.0) -> float:
+        dreport_ = self.measurement_data(cutout, dreport)
+        if self._measurement_hook is not None:
+            return self._measurement_hook(cutout, dreport_, repetitions)
         runtime = optim_utils.subprocess_measure(cutout=cutout, dreport=dreport_, repetitions=repetitions, timeout=timeout)
         return runtime
 
-    def optimize(self, measurements: int = 30, apply: bool = False, **kwargs) -> Dict[Any, Any]:
+    def optimize(self,
+                 measurements: int = 30,
+                 apply: bool = False,
+                 database: Optional[TransformationDatabase] = None,
+                 transfer: Optional[TransferTuningCache] = None,
+                 **kwargs) -> Dict[Any, Any]:
+        """
+        Tunes every cutout of the SDFG.
+
+        :param measurements: The number of times to run each configuration for performance analysis.
+        :param apply: Applies the best-found configuration of each cutout on the original SDFG.
+        :param database: An optional transformation database. If given, cutouts with a known tuned configuration
+                         are not searched again, and newly tuned configurations are recorded. If None and
+                         ``optimizer.replay_transformations`` is enabled, the default database is used.
+        :param transfer: An optional transfer tuning cache. If given, configurations that performed best on
+                         structurally identical cutouts of similar size are evaluated first and the search stops
+                         shortly after them (see ``TransferTuningCache``), and the results of every tuned cutout are
+                         added to the cache.
+        :return: A dictionary mapping cutout labels to their tuning results.
+        """
+        if database is None and dace.Config.get_bool('optimizer', 'replay_transformations'):
+            database = TransformationDatabase()
+
         tuning_report = {}
         for cutout, label in tqdm(list(self.cutouts())):
             fn = self.file_name(label)
             results = self.try_load(fn)
 
+            if results is None and database is not None:
+                recipe = database.best(cutout, task=self._task)
+                if recipe is not None:
+                    print(f'Using known configuration for {label}')
+                    results = {recipe.config['key']: recipe.runtime if recipe.runtime is not None else math.inf}
+
             if results is None:
-                results = self.search(cutout, measurements, **kwargs)
+                results = self.search(cutout, measurements, transfer=transfer, **kwargs)
                 if results is None:
                     tuning_report[label] = None
                     continue
 
+                if transfer is not None:
+                    transfer.add(cutout, results)
+
                 with open(fn, 'w') as fp:
                     json.dump(results, fp)
 
+                best_config = min(results, key=results.get) if len(results) > 0 else None
+                if database is not None and best_config is not None and results[best_config] != math.inf:
+                    database.record(cutout,
+                                    config={
+                                        'task': self._task,
+                                        'key': best_config
+                                    },
+                                    runtime=results[best_config],
+                                    label=label)
+
             best_config = min(results, key=results.get)
             if apply:
                 config = self.config_from_key(best_config, cutout=cutout)
@@ -123,19 +195,72 @@ class CutoutTuner(auto_tuner.AutoTuner):
 
         return tuning_report
 
-    def search(self, cutout: SDFG, measurements: int,
+    def search(self,
+               cutout: SDFG,
+               measurements: int,
+               strategy: Optional[SearchStrategy] = None,
+               transfer: Optional[TransferTuningCache] = None,
                **kwargs) -> Dict[str, float]:
+        """
+        Evaluates the configuration space of a cutout.
+
+        :param cutout: The cutout to tune.
+        :param measurements: The number of times to run each configuration.
+        :param strategy: The search strategy to use. If None, uses the strategy of the tuner, which evaluates the
+                         whole space by default.
+        :param transfer: An optional transfer tuning cache that suggests configurations to evaluate first. If the
+                         cache has suggestions, the search stops after the suggestions and the number of further
+                         configurations that the cache allows to explore (none if the cache is exclusive).
+        :return: A dictionary mapping evaluated configuration keys to runtimes.
+        """
+        strategy = strategy or self.strategy
         kwargs = self.pre_evaluate(cutout=cutout, measurements=measurements, **kwargs)
 
         results = {}
         key = kwargs["key"]
-        for config in tqdm(list(self.space(**(kwargs["space_kwargs"])))):
-            kwargs["config"] = config
-            runtime = self.evaluate(**kwargs)
-            results[key(config)] = runtime
+        space = list(self.space(**(kwargs["space_kwargs"])))
+
+        initial = []
+        budget = None
+        if transfer is not None:
+            suggestions = transfer.suggest(cutout)
+            configs = {key(config): config for config in space}
+            initial = [configs[k] for k in suggestions if k in configs]
+            if transfer.exclusive and len(initial) > 0:
+                space = initial
+            elif transfer.explore is not None and len(initial) > 0:
+                budget = len(initial) + transfer.explore
+
+        if strategy is None:
+            order = initial + [config for config in space if not any(config is c for c in initial)]
+            if budget is not None:
+                order = order[:budget]
+            for config in tqdm(order):
+                kwargs["config"] = config
+                runtime = self.evaluate(**kwargs)
+                results[key(config)] = runtime
+        else:
+            def evaluate(config) -> float:
+                kwargs["config"] = config
+                return self.evaluate(**kwargs)
+
+            def features(config) -> Tuple:
+                return self.features(config, **(kwargs["space_kwargs"]))
+
+            for config, runtime in strategy.search(space, evaluate, features, initial=initial, budget=budget):
+                results[key(config)] = runtime
 
         return results
 
+    def features(self, config: Any, **kwargs) -> Tuple:
+        """
+        Describes a configuration as a tuple of numeric or categorical values, used by model-based search strategies
+        to relate configurations to each other. Receives the same keyword arguments as ``space``.
+        """
+        if isinstance(config, (tuple, list)):
+            return tuple(config)
+        return (config, )
+
     @staticmethod
     def top_k_configs(tuning_report, k: int) -> List[Tuple[str, float]]:
         all_configs = []
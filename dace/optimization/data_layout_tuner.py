@@ -9,6 +9,7 @@ from typing import Generator, Optional, Tuple, Dict, List, Sequence, Set
 
 from dace import data as dt, SDFG, dtypes
 from dace.optimization import cutout_tuner
+from dace.optimization.search_strategy import SearchStrategy
 from dace.sdfg.state import SDFGState
 from dace.transformation import helpers as xfh
 from dace.sdfg.analysis.cutout import SDFGCutout
@@ -29,8 +30,11 @@ class TuningGroups(enum.Enum):
 
 class DataLayoutTuner(cutout_tuner.CutoutTuner):
 
-    def __init__(self, sdfg: SDFG, measurement: dtypes.InstrumentationType = dtypes.InstrumentationType.Timer) -> None:
-        super().__init__(task="DataLayout", sdfg=sdfg)
+    def __init__(self,
+                 sdfg: SDFG,
+                 measurement: dtypes.InstrumentationType = dtypes.InstrumentationType.Timer,
+                 strategy: Optional[SearchStrategy] = None) -> None:
+        super().__init__(task="DataLayout", sdfg=sdfg, strategy=strategy)
         self.instrument = measurement
 
     def cutouts(self) -> Generator[Tuple[dace.SDFG, str], None, None]:
@@ -97,6 +101,11 @@ class DataLayoutTuner(cutout_tuner.CutoutTuner):
             # Yield configuration
             yield modified_arrays, new_arrays
 
+    def features(self, config, **kwargs) -> Tuple:
+        # Strides of every modified array, each as one categorical dimension
+        modified_arrays, new_arrays = config
+        return tuple(str(new_arrays[name].strides) for name in sorted(modified_arrays))
+
     def config_from_key(self, key: str, **kwargs) -> List[int]:
         # TODO
         raise NotImplementedError
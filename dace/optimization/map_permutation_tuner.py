@@ -2,10 +2,11 @@
 import dace
 import itertools
 
-from typing import Generator, Tuple, Dict, List
+from typing import Generator, Optional, Tuple, Dict, List
 
 from dace import SDFG, dtypes
 from dace.optimization import cutout_tuner
+from dace.optimization.search_strategy import SearchStrategy
 from dace.transformation import helpers as xfh
 from dace.sdfg.analysis.cutout import SDFGCutout
 from dace.codegen.instrumentation.data import data_report
@@ -18,8 +19,11 @@ except (ImportError, ModuleNotFoundError):
 
 class MapPermutationTuner(cutout_tuner.CutoutTuner):
 
-    def __init__(self, sdfg: SDFG, measurement: dtypes.InstrumentationType = dtypes.InstrumentationType.Timer) -> None:
-        super().__init__(task="MapPermutation", sdfg=sdfg)
+    def __init__(self,
+                 sdfg: SDFG,
+                 measurement: dtypes.InstrumentationType = dtypes.InstrumentationType.Timer,
+                 strategy: Optional[SearchStrategy] = None) -> None:
+        super().__init__(task="MapPermutation", sdfg=sdfg, strategy=strategy)
         self.instrument = measurement
 
     def cutouts(self) -> Generator[Tuple[dace.SDFGState, str], None, None]:
@@ -37,6 +41,10 @@ class MapPermutationTuner(cutout_tuner.CutoutTuner):
     def space(self, map_entry: dace.nodes.MapEntry, **kwargs) -> Generator[Tuple[str], None, None]:
         return itertools.permutations(map_entry.map.params)
 
+    def features(self, config: Tuple[str], **kwargs) -> Tuple:
+        # Position of every map parameter in the permuted order
+        return tuple(config.index(p) for p in sorted(config))
+
     def config_from_key(self, key: str, **kwargs) -> List[str]:
         return key.split(".")
 
@@ -0,0 +1,116 @@
+# Copyright 2019-2024 ETH Zurich and the DaCe authors. All rights reserved.
+import dace
+import itertools
+import math
+
+from typing import Dict, Generator, Optional, Sequence, Tuple
+
+from dace import SDFG, dtypes
+from dace.optimization import cutout_tuner
+from dace.optimization.search_strategy import SearchStrategy
+from dace.sdfg.analysis.cutout import SDFGCutout
+from dace.codegen.instrumentation.data import data_report
+
+
+class MapScheduleTuner(cutout_tuner.CutoutTuner):
+    """
+    Tunes the OpenMP schedule (including the work-stealing schedule) and chunk size of every top-level multi-core map.
+    Cutouts are measured on the inputs saved by a data-instrumented dry run, such that irregular maps (e.g., over the
+    rows of sparse matrices) are tuned on their actual load distribution.
+
+    For example::
+
+        tuner = MapScheduleTuner(sdfg)
+        tuner.dry_run(sdfg, A_val, A_row, A_col, x, b)
+        tuner.optimize(apply=True)
+    """
+
+    def __init__(self,
+                 sdfg: SDFG,
+                 measurement: dtypes.InstrumentationType = dtypes.InstrumentationType.Timer,
+                 schedules: Optional[Sequence[dtypes.OMPScheduleType]] = None,
+                 chunk_sizes: Optional[Sequence[int]] = None,
+                 strategy: Optional[SearchStrategy] = None) -> None:
+        """
+        Creates a map schedule tuner.
+
+        :param sdfg: The SDFG to tune.
+        :param measurement: The instrumentation type to measure with.
+        :param schedules: The OpenMP schedules to consider. If None, considers all non-default schedules.
+        :param chunk_sizes: The chunk sizes to consider for every schedule (zero uses the schedule's default).
+        :param strategy: The search strategy to use (e.g., ``TPESearch`` for large spaces).
+        """
+        super().__init__(task="MapSchedule", sdfg=sdfg, strategy=strategy)
+        self.instrument = measurement
+        self.schedules = schedules or [
+            dtypes.OMPScheduleType.Static, dtypes.OMPScheduleType.Dynamic, dtypes.OMPScheduleType.Guided,
+            dtypes.OMPScheduleType.WorkStealing
+        ]
+        self.chunk_sizes = chunk_sizes or [0, 1, 4, 16, 64, 256]
+
+    def cutouts(self) -> Generator[Tuple[dace.SDFG, str], None, None]:
+        for state in self._sdfg.nodes():
+            scope_dict = state.scope_dict()
+            for node in state.nodes():
+                if not isinstance(node, dace.nodes.MapEntry) or scope_dict[node] is not None:
+                    continue
+                if node.map.schedule != dtypes.ScheduleType.CPU_Multicore:
+                    continue
+
+                node_id = state.node_id(node)
+                state_id = self._sdfg.node_id(state)
+                subgraph_nodes = state.scope_subgraph(node).nodes()
+                cutout = SDFGCutout.singlestate_cutout(state, *subgraph_nodes)
+                yield cutout, f"{state_id}.{node_id}.{node.label}"
+
+    def space(self, map_entry: dace.nodes.MapEntry) -> Generator[Tuple[dtypes.OMPScheduleType, int], None, None]:
+        return itertools.chain([(dtypes.OMPScheduleType.Default, 0)],
+                               itertools.product(self.schedules, self.chunk_sizes))
+
+    def features(self, config: Tuple[dtypes.OMPScheduleType, int], **kwargs) -> Tuple:
+        schedule, chunk_size = config
+        return (schedule.name, math.log2(chunk_size + 1))
+
+    def config_from_key(self, key: str, **kwargs) -> Tuple[dtypes.OMPScheduleType, int]:
+        schedule, chunk_size = key.split(".")
+        return dtypes.OMPScheduleType[schedule], int(chunk_size)
+
+    def apply(self, config: Tuple[dtypes.OMPScheduleType, int], label: str, **kwargs) -> None:
+        state_id, node_id, _ = label.split(".")
+        map_entry = self._sdfg.node(int(state_id)).node(int(node_id))
+        map_entry.map.omp_schedule, map_entry.map.omp_chunk_size = config
+
+    def pre_evaluate(self,
+                     cutout: dace.SDFG,
+                     measurements: int,
+                     dreport: Optional[data_report.InstrumentedDataReport] = None,
+                     **kwargs) -> Dict:
+        cutout.start_state.instrument = self.instrument
+
+        map_entry = None
+        scope_dict = cutout.start_state.scope_dict()
+        for node in cutout.start_state.nodes():
+            if isinstance(node, dace.nodes.MapEntry) and scope_dict[node] is None:
+                map_entry = node
+                break
+        assert map_entry is not None
+
+        new_kwargs = {
+            "space_kwargs": {
+                "map_entry": map_entry
+            },
+            "cutout": cutout.to_json(),
+            "map_entry_id": cutout.start_state.node_id(map_entry),
+            "dreport": dreport if dreport is not None else self._sdfg.get_instrumented_data(),
+            "measurements": measurements,
+            "key": lambda point: f"{point[0].name}.{point[1]}"
+        }
+        return new_kwargs
+
+    def evaluate(self, config, cutout, map_entry_id: int, dreport: data_report.InstrumentedDataReport,
+                 measurements: int, **kwargs) -> float:
+        cutout_ = dace.SDFG.from_json(cutout)
+        map_ = cutout_.start_state.node(map_entry_id)
+        map_.map.omp_schedule, map_.map.omp_chunk_size = config
+
+        return self.measure(cutout_, dreport, measurements)
@@ -1,10 +1,13 @@
 # Copyright 2019-2022 ETH Zurich and the DaCe authors. All rights reserved.
 import dace
+import itertools
+import math
 
-from typing import Generator, Tuple, Dict, List
+from typing import Generator, Optional, Sequence, Tuple, Dict, List
 
 from dace import dtypes
 from dace.optimization import cutout_tuner
+from dace.optimization.search_strategy import SearchStrategy
 from dace.transformation import dataflow as df
 from dace.transformation import helpers as xfh
 from dace.sdfg.analysis.cutout import SDFGCutout
@@ -19,9 +22,20 @@ class MapTilingTuner(cutout_tuner.CutoutTuner):
 
     def __init__(self,
                  sdfg: dace.SDFG,
-                 measurement: dtypes.InstrumentationType = dtypes.InstrumentationType.Timer) -> None:
-        super().__init__(task="MapTiling", sdfg=sdfg)
+                 measurement: dtypes.InstrumentationType = dtypes.InstrumentationType.Timer,
+                 tile_sizes: Optional[Sequence[int]] = None,
+                 strategy: Optional[SearchStrategy] = None) -> None:
+        """
+        Creates a map tiling tuner.
+
+        :param sdfg: The SDFG to tune.
+        :param measurement: The instrumentation type to measure with.
+        :param tile_sizes: Tile sizes to consider in every map dimension. If None, only tests a fixed default tiling.
+        :param strategy: The search strategy to use (e.g., ``TPESearch`` for large spaces).
+        """
+        super().__init__(task="MapTiling", sdfg=sdfg, strategy=strategy)
         self.instrument = measurement
+        self.tile_sizes = tile_sizes
 
     def cutouts(self) -> Generator[Tuple[dace.SDFG, str], None, None]:
         for node, state in self._sdfg.all_nodes_recursive():
@@ -36,12 +50,28 @@ class MapTilingTuner(cutout_tuner.CutoutTuner):
                 yield cutout, f"{state_id}.{node_id}.{node.label}"
 
     def space(self, map_entry: dace.nodes.MapEntry) -> Generator[Tuple[int], None, None]:
-        choices = [
-            None,
-            (64, 8, 1),
-        ]
-
-        return choices
+        if self.tile_sizes is None:
+            choices = [
+                None,
+                (64, 8, 1),
+            ]
+            return choices
+
+        return itertools.chain([None], itertools.product(self.tile_sizes, repeat=len(map_entry.map.params)))
+
+    def features(self, config: Optional[Tuple[int]], map_entry: dace.nodes.MapEntry, **kwargs) -> Tuple:
+        # Tile sizes are compared on a logarithmic scale. An untiled map is described as one tile that spans the
+        # full extent of every dimension, or twice the largest tile size if the extent is symbolic
+        if config is None:
+            largest = max(self.tile_sizes) if self.tile_sizes else 64
+            features = []
+            for extent in map_entry.map.range.size():
+                try:
+                    features.append(math.log2(max(int(extent), 1)))
+                except TypeError:
+                    features.append(math.log2(2 * largest))
+            return tuple(features)
+        return tuple(math.log2(t) for t in config)
 
     def config_from_key(self, key: str, **kwargs) -> List[int]:
         if key == "None":
@@ -81,7 +111,7 @@ class MapTilingTuner(cutout_tuner.CutoutTuner):
     def evaluate(self, config, cutout, map_entry_id: int, measurements: int, **kwargs) -> float:
         cutout_ = dace.SDFG.from_json(cutout)
         map_ = cutout_.start_state.node(map_entry_id)
-        if config == "None":
+        if config is not None:
             df.MapTiling.apply_to(cutout_, map_entry=map_, options={"tile_sizes": config})
 
         return self.measure(cutout_, measurements)
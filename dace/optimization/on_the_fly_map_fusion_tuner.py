@@ -5,11 +5,12 @@ import math
 import copy
 import numpy as np
 
-from typing import Generator, Dict, List, Tuple
+from typing import Generator, Dict, List, Optional, Tuple
 from collections import Counter
 
 from dace import SDFG, dtypes
 from dace.optimization import cutout_tuner
+from dace.optimization.search_strategy import SearchStrategy
 from dace.sdfg.analysis.cutout import SDFGCutout
 
 from dace.transformation import subgraph as sg
@@ -26,8 +27,13 @@ except (ImportError, ModuleNotFoundError):
 
 class OnTheFlyMapFusionTuner(cutout_tuner.CutoutTuner):
 
-    def __init__(self, sdfg: SDFG, i, j, measurement: dtypes.InstrumentationType = dtypes.InstrumentationType.Timer) -> None:
-        super().__init__(task="OnTheFlyMapFusion", sdfg=sdfg, i=i, j=j)
+    def __init__(self,
+                 sdfg: SDFG,
+                 i,
+                 j,
+                 measurement: dtypes.InstrumentationType = dtypes.InstrumentationType.Timer,
+                 strategy: Optional[SearchStrategy] = None) -> None:
+        super().__init__(task="OnTheFlyMapFusion", sdfg=sdfg, strategy=strategy)
         self.instrument = measurement
 
     def cutouts(self):
@@ -57,6 +63,10 @@ class OnTheFlyMapFusionTuner(cutout_tuner.CutoutTuner):
         for i, (subgraph, score) in enumerate(subgraphs):
             yield i + 1, list(map(lambda m: cutout.start_state.node_id(m), subgraph))
 
+    def features(self, config: Tuple[int, List[int]], **kwargs) -> Tuple:
+        # Fused maps, as one categorical dimension per position in the fused subgraph
+        return tuple(sorted(config[1]))
+
     def pre_evaluate(self, cutout: dace.SDFG, measurements: int, **kwargs) -> Dict:
         cutout.start_state.instrument = self.instrument
 
@@ -0,0 +1,184 @@
+# Copyright 2019-2024 ETH Zurich and the DaCe authors. All rights reserved.
+""" Search strategies that select which configurations of a tuning space to evaluate. """
+import math
+import numbers
+import random
+
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+
+class SearchStrategy:
+    """
+    General API for search strategies of cutout tuners. A search strategy decides which points of a (finite)
+    configuration space are evaluated, and in which order.
+    """
+
+    def search(self,
+               space: Sequence[Any],
+               evaluate: Callable[[Any], float],
+               features: Callable[[Any], Sequence[Hashable]],
+               initial: Sequence[Any] = (),
+               budget: Optional[int] = None) -> List[Tuple[Any, float]]:
+        """
+        Searches a configuration space.
+
+        :param space: The configurations to choose from.
+        :param evaluate: A function that measures a configuration (lower is better).
+        :param features: A function that describes a configuration as a tuple of numeric or categorical values.
+        :param initial: Elements of ``space`` that should be evaluated first (e.g., configurations that worked well
+                        on similar cutouts).
+        :param budget: If not None, the maximal number of evaluations of this search, in addition to any limit of
+                       the strategy itself.
+        :return: A list of evaluated (configuration, value) pairs, in evaluation order.
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def _initial_indices(space: Sequence[Any], initial: Sequence[Any]) -> List[int]:
+        indices = []
+        for config in initial:
+            index = next(i for i, c in enumerate(space) if c is config)
+            if index not in indices:
+                indices.append(index)
+        return indices
+
+
+class ExhaustiveSearch(SearchStrategy):
+    """ Evaluates every point of the configuration space. """
+
+    def search(self,
+               space: Sequence[Any],
+               evaluate: Callable[[Any], float],
+               features: Callable[[Any], Sequence[Hashable]],
+               initial: Sequence[Any] = (),
+               budget: Optional[int] = None) -> List[Tuple[Any, float]]:
+        first = self._initial_indices(space, initial)
+        order = first + [i for i in range(len(space)) if i not in first]
+        if budget is not None:
+            order = order[:budget]
+        return [(space[i], evaluate(space[i])) for i in order]
+
+
+class TPESearch(SearchStrategy):
+    """
+    Model-based search using a tree-structured Parzen estimator (TPE). After a number of random initial evaluations,
+    the evaluated configurations are split into a "good" and a "bad" set by the ``gamma`` quantile of their values.
+    The next configuration to evaluate is the unevaluated point that maximizes the ratio between its density under
+    the good set and its density under the bad set. Numeric feature dimensions are modeled with Gaussian kernels,
+    all other dimensions as categorical distributions.
+
+    Configurations given as ``initial`` are evaluated before any others. The search stops when the evaluation
+    budget is exhausted, the whole space was evaluated, or (optionally) when no improvement was found for
+    ``patience`` consecutive evaluations.
+    """
+
+    def __init__(self,
+                 budget: int = 32,
+                 initial: int = 8,
+                 gamma: float = 0.25,
+                 patience: Optional[int] = None,
+                 min_improvement: float = 0.0,
+                 seed: int = 0) -> None:
+        """
+        Creates a TPE search strategy.
+
+        :param budget: Maximal number of evaluations.
+        :param initial: Number of randomly chosen configurations to evaluate before using the model.
+        :param gamma: Fraction of evaluated configurations that is considered "good".
+        :param patience: If not None, stops after this many evaluations without improvement.
+        :param min_improvement: Relative improvement over the best value that counts as improvement for early stopping.
+        :param seed: Random seed.
+        """
+        self.budget = budget
+        self.initial = initial
+        self.gamma = gamma
+        self.patience = patience
+        self.min_improvement = min_improvement
+        self.seed = seed
+
+    @staticmethod
+    def _is_numeric(values: Sequence[Any]) -> bool:
+        return all(isinstance(v, numbers.Real) and not isinstance(v, bool) for v in values)
+
+    def _densities(self, points: List[Tuple], observed: List[Tuple], dimensions: List[Dict[str, Any]]) -> List[float]:
+        """ Returns the log-density of every point under the Parzen estimator built from ``observed`` points. """
+        result = [0.0] * len(points)
+        n = len(observed)
+        for d, dim in enumerate(dimensions):
+            if dim['numeric']:
+                h = dim['bandwidth']
+                samples = [o[d] for o in observed]
+                for i, p in enumerate(points):
+                    kernel = sum(math.exp(-0.5 * ((p[d] - x) / h)**2) for x in samples) / (math.sqrt(2 * math.pi) * h)
+                    result[i] += math.log((kernel + dim['prior']) / (n + 1))
+            else:
+                counts: Dict[Any, int] = {}
+                for o in observed:
+                    counts[o[d]] = counts.get(o[d], 0) + 1
+                for i, p in enumerate(points):
+                    result[i] += math.log((counts.get(p[d], 0) + 1) / (n + dim['categories']))
+        return result
+
+    def search(self,
+               space: Sequence[Any],
+               evaluate: Callable[[Any], float],
+               features: Callable[[Any], Sequence[Hashable]],
+               initial: Sequence[Any] = (),
+               budget: Optional[int] = None) -> List[Tuple[Any, float]]:
+        rng = random.Random(self.seed)
+        space = list(space)
+        if len(space) == 0:
+            return []
+
+        # Describe configurations as equal-length feature tuples
+        points = [tuple(features(config)) for config in space]
+        ndims = max(len(p) for p in points)
+        points = [p + (None, ) * (ndims - len(p)) for p in points]
+
+        dimensions = []
+        for d in range(ndims):
+            values = [p[d] for p in points]
+            if self._is_numeric(values):
+                lo, hi = min(values), max(values)
+                width = max(hi - lo, 1)
+                mean = sum(values) / len(values)
+                std = math.sqrt(sum((v - mean)**2 for v in values) / len(values))
+                bandwidth = max(std * len(values)**(-1 / 5), width * 1e-3)
+                dimensions.append({'numeric': True, 'bandwidth': bandwidth, 'prior': 1 / width})
+            else:
+                dimensions.append({'numeric': False, 'categories': len(set(values))})
+
+        first = self._initial_indices(space, initial)
+        remaining = [i for i in range(len(space)) if i not in first]
+        evaluated: List[Tuple[int, float]] = []
+        best = math.inf
+        since_best = 0
+        budget = self.budget if budget is None else min(self.budget, budget)
+        while (len(first) > 0 or len(remaining) > 0) and len(evaluated) < budget:
+            if len(first) > 0:
+                index = first.pop(0)
+            elif len(evaluated) < self.initial:
+                index = remaining.pop(rng.randrange(len(remaining)))
+            else:
+                ordered = sorted(evaluated, key=lambda e: e[1])
+                ngood = max(1, int(math.ceil(self.gamma * len(ordered))))
+                good = [points[i] for i, _ in ordered[:ngood]]
+                bad = [points[i] for i, _ in ordered[ngood:]]
+                candidates = [points[i] for i in remaining]
+                lgood = self._densities(candidates, good, dimensions)
+                lbad = self._densities(candidates, bad, dimensions)
+                choice = max(range(len(candidates)), key=lambda c: lgood[c] - lbad[c])
+                index = remaining.pop(choice)
+
+            value = evaluate(space[index])
+            evaluated.append((index, value))
+
+            if value < best * (1 - self.min_improvement) or (best == math.inf and value < best):
+                best = value
+                since_best = 0
+            else:
+                since_best += 1
+                if self.patience is not None and since_best >= self.patience:
+                    break
+
+        return [(space[i], value) for i, value in evaluated]
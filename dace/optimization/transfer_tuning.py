@@ -0,0 +1,140 @@
+# Copyright 2019-2024 ETH Zurich and the DaCe authors. All rights reserved.
+""" Transfer of tuning results between structurally similar cutouts. """
+import json
+import math
+import os
+
+from typing import Any, Dict, List, Optional
+
+import dace
+from dace import symbolic
+from dace.optimization.transformation_database import structural_hash
+
+
+class TransferTuningCache:
+    """
+    Stores tuning results of cutouts by a size-independent structural signature, along with the sizes of the
+    cutout's data. When a new cutout is tuned, the best configurations of the structurally identical cutouts with
+    the nearest sizes are evaluated first, followed by ``explore`` further configurations chosen by the search
+    strategy, after which the search stops. If ``exclusive`` is set, only the suggested configurations are evaluated.
+    Cutouts without suggestions are searched as usual.
+
+    For example::
+
+        transfer = TransferTuningCache('MapTiling')
+        tuner = MapTilingTuner(sdfg)
+        tuner.optimize(transfer=transfer)
+    """
+
+    def __init__(self,
+                 task: str,
+                 path: Optional[str] = None,
+                 neighbors: int = 3,
+                 configs_per_neighbor: int = 1,
+                 exclusive: bool = False,
+                 explore: Optional[int] = 4,
+                 symbols: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Creates or loads a transfer tuning cache.
+
+        :param task: Name of the tuning task (for filename labeling).
+        :param path: Path to the cache file. If None, uses ``<task>.transfer.json`` in the working directory.
+        :param neighbors: Number of nearest cutouts (by data sizes) to take configurations from.
+        :param configs_per_neighbor: Number of best configurations to take from each neighbor.
+        :param exclusive: If True, only the suggested configurations are evaluated when suggestions exist.
+        :param explore: Number of configurations to evaluate after the suggestions, to find configurations that
+                        improve on them. If None, the rest of the search proceeds as without suggestions (e.g.,
+                        evaluating the whole space).
+        :param symbols: Values of symbols used to evaluate symbolic data sizes.
+        """
+        self._path = path or f"{task}.transfer.json"
+        self.neighbors = neighbors
+        self.configs_per_neighbor = configs_per_neighbor
+        self.exclusive = exclusive
+        self.explore = explore
+        self.symbols = symbols or {}
+
+        # Signature -> list of {"sizes": [...], "results": {key: runtime}}
+        self._entries: Dict[str, List[Dict[str, Any]]] = {}
+        if os.path.exists(self._path):
+            with open(self._path, 'r') as fp:
+                self._entries = json.load(fp)
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @staticmethod
+    def signature(cutout: dace.SDFG) -> str:
+        """ Returns the size-independent structural signature of a cutout. """
+        return structural_hash(cutout, size_independent=True)
+
+    def sizes(self, cutout: dace.SDFG) -> List[float]:
+        """
+        Returns the data sizes of a cutout, as the dimensions of its non-transient data containers in order of
+        appearance. Structurally identical cutouts have size vectors of the same length.
+        """
+        symbols = {**cutout.constants, **self.symbols}
+        sizes = []
+        seen = set()
+        for state in cutout.nodes():
+            for dnode in state.data_nodes():
+                desc = dnode.desc(cutout)
+                if desc.transient or dnode.data in seen:
+                    continue
+                seen.add(dnode.data)
+                for dim in desc.shape:
+                    try:
+                        sizes.append(float(symbolic.evaluate(dim, symbols)))
+                    except (TypeError, ValueError):
+                        # Unknown symbol values do not contribute to the distance
+                        sizes.append(0.0)
+        return sizes
+
+    @staticmethod
+    def _distance(a: List[float], b: List[float]) -> float:
+        if len(a) != len(b):
+            return math.inf
+        # Compare sizes on a logarithmic scale, such that 64 vs. 128 is as far apart as 1024 vs. 2048
+        return math.sqrt(sum((math.log2(1 + x) - math.log2(1 + y))**2 for x, y in zip(a, b)))
+
+    def add(self, cutout: dace.SDFG, results: Dict[str, float]) -> None:
+        """
+        Records the tuning results of a cutout and saves the cache.
+
+        :param cutout: The tuned cutout.
+        :param results: A dictionary mapping configuration keys to runtimes.
+        """
+        results = {k: v for k, v in results.items() if v is not None and v != math.inf and not math.isnan(v)}
+        if len(results) == 0:
+            return
+
+        self._entries.setdefault(self.signature(cutout), []).append({'sizes': self.sizes(cutout), 'results': results})
+
+        # Write atomically so that an interrupted run does not corrupt the cache
+        tmp_path = self._path + '.tmp'
+        with open(tmp_path, 'w') as fp:
+            json.dump(self._entries, fp)
+        os.replace(tmp_path, self._path)
+
+    def suggest(self, cutout: dace.SDFG) -> List[str]:
+        """
+        Returns the keys of the best configurations of the nearest structurally identical cutouts.
+
+        :param cutout: The cutout to tune.
+        :return: A list of configuration keys, ordered by distance of the originating cutout and then by runtime.
+        """
+        entries = self._entries.get(self.signature(cutout), [])
+        if len(entries) == 0:
+            return []
+
+        sizes = self.sizes(cutout)
+        nearest = sorted(entries, key=lambda e: self._distance(sizes, e['sizes']))[:self.neighbors]
+
+        suggestions = []
+        for entry in nearest:
+            best = sorted(entry['results'].items(), key=lambda item: item[1])[:self.configs_per_neighbor]
+            for key, _ in best:
+                if key not in suggestions:
+                    suggestions.append(key)
+        return suggestions
@@ -0,0 +1,287 @@
+# Copyright 2019-2024 ETH Zurich and the DaCe authors. All rights reserved.
+""" A persistent database of transformation sequences and tuned configurations that worked for SDFGs. """
+import contextlib
+import copy
+import json
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from dace import dtypes
+from dace.config import Config
+from dace.sdfg import SDFG
+from dace.transformation.estimator.enumeration import apply_transformation_sequence
+from dace.transformation.transformation import PatternTransformation
+
+#: Properties that encode sizes (rather than structure), removed when computing size-independent hashes. Labels are
+#: also removed, as the labels of scope nodes contain their ranges (e.g., ``map[i=0:N]``).
+SIZE_PROPERTIES = {
+    'shape', 'strides', 'total_size', 'offset', 'start_offset', 'alignment', 'range', 'subset', 'other_subset',
+    'src_subset', 'dst_subset', 'volume', 'num_accesses', 'executions', 'constants_prop', 'symbols', 'label'
+}
+
+
+def structural_hash(sdfg: SDFG, size_independent: bool = False) -> str:
+    """
+    Returns a hash of the structure of an SDFG (or a cutout thereof), which does not consider names and IDs.
+
+    :param sdfg: The SDFG to hash.
+    :param size_independent: If True, also disregards shapes, strides, subsets, symbol values and labels, such that
+                             SDFGs that only differ in their sizes obtain the same hash.
+    :return: The hash (in SHA-256 format).
+    """
+    if not size_independent:
+        return sdfg.hash_sdfg()
+
+    def size_remover(json_obj: Any):
+        if isinstance(json_obj, dict):
+            for key in list(json_obj.keys()):
+                if key in SIZE_PROPERTIES:
+                    del json_obj[key]
+                else:
+                    size_remover(json_obj[key])
+        elif isinstance(json_obj, (list, tuple)):
+            for value in json_obj:
+                size_remover(value)
+
+    jsondict = json.loads(json.dumps(sdfg.to_json()))
+    size_remover(jsondict)
+    return sdfg.hash_sdfg(jsondict)
+
+
+@dataclass
+class Recipe:
+    """ A transformation sequence and/or tuned configuration recorded for an SDFG. """
+    sdfg_hash: str
+    structure_hash: str
+    sequence: List[Dict[str, Any]]
+    config: Optional[Dict[str, Any]] = None
+    label: str = ''
+    baseline: Optional[float] = None
+    runtime: Optional[float] = None
+    device: Optional[dtypes.DeviceType] = None
+
+    @property
+    def speedup(self) -> Optional[float]:
+        if self.baseline is None or not self.runtime:
+            return None
+        return self.baseline / self.runtime
+
+
+class TransformationDatabase:
+    """
+    A local SQLite database that records which transformation sequences and tuned configurations worked for SDFGs,
+    keyed by their structural hash and the device they were optimized for, along with the measured runtimes. The
+    database can be used to replay the best known recipe when the same (or a structurally similar) SDFG is optimized
+    again.
+
+    For example::
+
+        db = TransformationDatabase()
+        # After optimizing ``sdfg`` interactively
+        db.record_history(sdfg, baseline=10.2, runtime=3.1, device=dace.DeviceType.CPU)
+
+        # Later, on a fresh copy of the same program
+        db.replay(other_sdfg, device=dace.DeviceType.CPU)
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        """
+        Opens (and creates if necessary) a transformation database.
+
+        :param path: Path to the database file. If None, uses the ``optimizer.transformation_database``
+                     configuration entry.
+        """
+        self._path = os.path.expanduser(path or Config.get('optimizer', 'transformation_database'))
+        folder = os.path.dirname(os.path.abspath(self._path))
+        os.makedirs(folder, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute('''CREATE TABLE IF NOT EXISTS recipes (
+                                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                                sdfg_hash TEXT NOT NULL,
+                                structure_hash TEXT NOT NULL,
+                                label TEXT,
+                                device TEXT,
+                                sequence TEXT NOT NULL,
+                                config TEXT,
+                                baseline REAL,
+                                runtime REAL,
+                                speedup REAL,
+                                created REAL)''')
+            # Databases created before recipes were keyed by device
+            columns = [row[1] for row in conn.execute('PRAGMA table_info(recipes)')]
+            if 'device' not in columns:
+                conn.execute('ALTER TABLE recipes ADD COLUMN device TEXT')
+            conn.execute('CREATE INDEX IF NOT EXISTS recipes_sdfg_hash ON recipes (sdfg_hash, device)')
+            conn.execute('CREATE INDEX IF NOT EXISTS recipes_structure_hash ON recipes (structure_hash, device)')
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @contextlib.contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self._path, timeout=60)
+        try:
+            with conn:  # Commits on success, rolls back on error
+                yield conn
+        finally:
+            conn.close()
+
+    def record(self,
+               sdfg: SDFG,
+               sequence: Optional[List[Union[PatternTransformation, Dict[str, Any]]]] = None,
+               config: Optional[Dict[str, Any]] = None,
+               baseline: Optional[float] = None,
+               runtime: Optional[float] = None,
+               label: str = '',
+               device: Optional[dtypes.DeviceType] = None) -> Recipe:
+        """
+        Records a recipe that was applied on an SDFG.
+
+        :param sdfg: The SDFG (or cutout) before the recipe was applied.
+        :param sequence: The applied transformations, either as objects or in their JSON form
+                         (see ``PatternTransformation.to_json``).
+        :param config: An optional tuned configuration (e.g., the task and best configuration key of a tuner).
+        :param baseline: Measured runtime of the SDFG before applying the recipe.
+        :param runtime: Measured runtime of the SDFG after applying the recipe.
+        :param label: An optional human-readable label of the recorded region.
+        :param device: The device the SDFG was optimized for. Recipes without a device are only returned by lookups
+                       that do not specify one.
+        :return: The recorded recipe.
+        """
+        recipe = Recipe(sdfg_hash=structural_hash(sdfg),
+                        structure_hash=structural_hash(sdfg, size_independent=True),
+                        sequence=[
+                            xform.to_json() if isinstance(xform, PatternTransformation) else xform
+                            for xform in sequence or []
+                        ],
+                        config=config,
+                        label=label,
+                        baseline=baseline,
+                        runtime=runtime,
+                        device=device)
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT INTO recipes (sdfg_hash, structure_hash, label, device, sequence, config, baseline, runtime, '
+                'speedup, created) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (recipe.sdfg_hash, recipe.structure_hash, label, device.name if device is not None else None,
+                 json.dumps(recipe.sequence),
+                 json.dumps(config) if config is not None else None, baseline, runtime, recipe.speedup, time.time()))
+        return recipe
+
+    def record_history(self,
+                       sdfg: SDFG,
+                       baseline: Optional[float] = None,
+                       runtime: Optional[float] = None,
+                       label: str = '',
+                       device: Optional[dtypes.DeviceType] = None) -> Optional[Recipe]:
+        """
+        Records the transformation history of an SDFG (``sdfg.transformation_hist``) as a recipe for its
+        original, untransformed version. The history is only appended to by ``PatternTransformation.apply_pattern``
+        (e.g., in the interactive optimizer or when replaying recipes), not by ``SDFG.apply_transformations``.
+        To record transformations applied otherwise, pass them to ``record`` directly.
+
+        :return: The recorded recipe, or None if the SDFG was not transformed.
+        :raise ValueError: If the history contains entries that cannot be replayed.
+        """
+        if sdfg.orig_sdfg is None or len(sdfg.transformation_hist) == 0:
+            return None
+        for xform in sdfg.transformation_hist:
+            if not isinstance(xform, PatternTransformation):
+                raise ValueError(f'Transformation history entry "{type(xform).__name__}" cannot be replayed')
+
+        sequence = [xform.to_json() for xform in sdfg.transformation_hist]
+        return self.record(sdfg.orig_sdfg,
+                           sequence,
+                           baseline=baseline,
+                           runtime=runtime,
+                           label=label or sdfg.name,
+                           device=device)
+
+    def lookup(self,
+               sdfg: SDFG,
+               similar: bool = True,
+               task: Optional[str] = None,
+               device: Optional[dtypes.DeviceType] = None) -> List[Recipe]:
+        """
+        Returns the recipes recorded for an SDFG, best first. Recipes recorded for the exact same SDFG are
+        returned before recipes of structurally similar SDFGs (i.e., that only differ in sizes).
+
+        :param sdfg: The SDFG to look up.
+        :param similar: If True, also returns recipes of structurally similar SDFGs.
+        :param task: If not None, only returns tuned configurations of the given tuning task.
+        :param device: If not None, only returns recipes recorded for the given device.
+        :return: A list of recipes, ordered by exactness and then by speedup.
+        """
+        queries = [('sdfg_hash', structural_hash(sdfg))]
+        if similar:
+            queries.append(('structure_hash', structural_hash(sdfg, size_independent=True)))
+        device_filter = '' if device is None else ' AND device = ?'
+        device_args = () if device is None else (device.name, )
+
+        result: List[Recipe] = []
+        seen = set()
+        with self._connect() as conn:
+            for column, value in queries:
+                rows = conn.execute(
+                    'SELECT id, sdfg_hash, structure_hash, label, sequence, config, baseline, runtime, device FROM '
+                    f'recipes WHERE {column} = ?{device_filter} ORDER BY speedup IS NULL, speedup DESC, id DESC',
+                    (value, ) + device_args)
+                for rid, sdfg_hash, structure_hash, label, sequence, config, baseline, runtime, rdevice in rows:
+                    if rid in seen:
+                        continue
+                    seen.add(rid)
+                    recipe = Recipe(sdfg_hash, structure_hash, json.loads(sequence),
+                                    json.loads(config) if config is not None else None, label or '', baseline,
+                                    runtime, dtypes.DeviceType[rdevice] if rdevice is not None else None)
+                    if task is not None and (recipe.config is None or recipe.config.get('task') != task):
+                        continue
+                    result.append(recipe)
+        return result
+
+    def best(self,
+             sdfg: SDFG,
+             similar: bool = True,
+             task: Optional[str] = None,
+             device: Optional[dtypes.DeviceType] = None) -> Optional[Recipe]:
+        """
+        Returns the best recipe recorded for an SDFG, or None if no recipe is known.
+
+        :see: TransformationDatabase.lookup
+        """
+        recipes = self.lookup(sdfg, similar, task, device)
+        return recipes[0] if len(recipes) > 0 else None
+
+    def replay(self,
+               sdfg: SDFG,
+               similar: bool = True,
+               validate: bool = True,
+               device: Optional[dtypes.DeviceType] = None) -> Optional[Recipe]:
+        """
+        Applies the best known transformation sequence on an SDFG, in-place. Recipes are tried in order,
+        and a recipe that fails to apply (e.g., on a structurally similar SDFG with different sizes) is skipped.
+
+        :param sdfg: The SDFG to transform.
+        :param similar: If True, also considers recipes of structurally similar SDFGs.
+        :param validate: If True, validates the SDFG after every applied transformation.
+        :param device: If not None, only considers recipes recorded for the given device.
+        :return: The applied recipe, or None if no recipe could be applied.
+        """
+        for recipe in self.lookup(sdfg, similar, device=device):
+            if len(recipe.sequence) == 0:
+                continue
+            # Try on a copy first so that a failing recipe does not leave the SDFG partially transformed
+            try:
+                apply_transformation_sequence(copy.deepcopy(sdfg), recipe.sequence, validate=validate)
+            except Exception as ex:
+                if Config.get_bool('debugprint'):
+                    print(f'Skipping recipe for {recipe.label or recipe.sdfg_hash}: {ex}')
+                continue
+            apply_transformation_sequence(sdfg, recipe.sequence, validate=validate)
+            return recipe
+
+        return None
@@ -7,7 +7,7 @@ import dace
 import itertools
 import numpy as np
 
-from typing import Dict
+from typing import Dict, Optional, Sequence
 
 from dace.codegen.instrumentation.data import data_report
 
@@ -111,9 +111,11 @@ def subprocess_measure(cutout: dace.SDFG, dreport, repetitions: int = 30, timeou
 
     return runtime
 
-def _subprocess_measure(cutout_json: Dict, dreport, repetitions: int, q: mp.Queue) -> float:
-    cutout = dace.SDFG.from_json(cutout_json)
-    
+def _measurement_arguments(cutout: dace.SDFG, dreport) -> Dict:
+    """
+    Creates the arguments to call a cutout with, taking data from ``dreport`` where available, and removes
+    non-transient data containers that are not accessed from the cutout.
+    """
     arguments = {}
     # TODO: Store symbolic arguments in file
     for symbol in cutout.free_symbols:
@@ -132,14 +134,32 @@ def _subprocess_measure(cutout_json: Dict, dreport, repetitions: int, q: mp.Queu
                 arguments[dnode.data] = dace.data.make_array_from_descriptor(array)
 
 
+    _prune_unused_arrays(cutout, arguments)
+    return arguments
+
+
+def _prune_unused_arrays(cutout: dace.SDFG, used=None) -> None:
+    if used is None:
+        used = set(dnode.data for state in cutout.nodes() for dnode in state.data_nodes())
+
     for name, array in list(cutout.arrays.items()):
         if array.transient:
             continue
 
-        if not name in arguments:
+        if not name in used:
             del cutout.arrays[name]
 
 
+def _median_runtime(sdfg: dace.SDFG) -> float:
+    report = sdfg.get_latest_report()
+    durations = next(iter(next(iter(next(iter(report.durations.values())).values())).values()))
+    return np.median(np.array(durations))
+
+
+def _subprocess_measure(cutout_json: Dict, dreport, repetitions: int, q: mp.Queue) -> float:
+    cutout = dace.SDFG.from_json(cutout_json)
+    arguments = _measurement_arguments(cutout, dreport)
+
     with dace.config.set_temporary('debugprint', value=False):
         with dace.config.set_temporary('instrumentation', 'report_each_invocation', value=False):
             with dace.config.set_temporary('compiler', 'allow_view_arguments', value=True):
@@ -150,9 +170,90 @@ def _subprocess_measure(cutout_json: Dict, dreport, repetitions: int, q: mp.Queu
 
                 csdfg.finalize()
 
-    report = cutout.get_latest_report()
-    durations = next(iter(next(iter(next(iter(report.durations.values())).values())).values()))
-    q.put(np.median(np.array(durations)))
+    q.put(_median_runtime(cutout))
+
+
+def compile_cutout(cutout_json: Dict, build_folder: str) -> str:
+    """
+    Compiles a cutout into the given build folder, without running it. Non-transient data containers that are not
+    accessed are removed first, in the same way as for measurement.
+
+    :param cutout_json: The cutout SDFG in JSON form.
+    :param build_folder: The folder to compile the cutout into.
+    :return: The build folder, which can be passed to ``subprocess_measure_precompiled``.
+    """
+    cutout = dace.SDFG.from_json(cutout_json)
+    _prune_unused_arrays(cutout)
+
+    with dace.config.set_temporary('debugprint', value=False):
+        with dace.config.set_temporary('instrumentation', 'report_each_invocation', value=False):
+            with dace.config.set_temporary('compiler', 'allow_view_arguments', value=True):
+                cutout.build_folder = build_folder
+                cutout.compile()
+
+    return build_folder
+
+
+def subprocess_measure_precompiled(build_folder: str,
+                                   dreport,
+                                   repetitions: int = 30,
+                                   timeout: float = 600.0,
+                                   cores: Optional[Sequence[int]] = None) -> float:
+    """
+    Measures a cutout that was compiled with ``compile_cutout`` in a separate process.
+
+    :param build_folder: The build folder of the compiled cutout.
+    :param dreport: A dictionary of input data to call the cutout with.
+    :param repetitions: Number of times to run the cutout.
+    :param timeout: Maximal time (in seconds) to wait for the measurement.
+    :param cores: An optional set of CPU cores to pin the measurement process to.
+    :return: The median runtime, or infinity if the measurement failed.
+    """
+    q = mp.Queue()
+    proc = MeasureProcess(target=_subprocess_measure_precompiled, args=(build_folder, dreport, repetitions, cores, q))
+    proc.start()
+    proc.join(timeout)
+
+    if proc.exitcode != 0:
+        if proc.is_alive():
+            proc.terminate()
+        print("Error occured during measuring")
+        return math.inf
+
+    if proc.exception:
+        error, traceback = proc.exception
+        print(traceback)
+        print("Error occured during measuring: ", error)
+        return math.inf
+
+    try:
+        runtime = q.get(block=True, timeout=30)
+    except:
+        return math.inf
+
+    return runtime
+
+
+def _subprocess_measure_precompiled(build_folder: str, dreport, repetitions: int, cores: Optional[Sequence[int]],
+                                    q: mp.Queue) -> float:
+    if cores and hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, cores)
+
+    from dace.sdfg.utils import load_precompiled_sdfg
+    csdfg = load_precompiled_sdfg(build_folder)
+    sdfg = csdfg.sdfg
+    sdfg.build_folder = build_folder
+    arguments = _measurement_arguments(sdfg, dreport)
+
+    with dace.config.set_temporary('debugprint', value=False):
+        with dace.config.set_temporary('instrumentation', 'report_each_invocation', value=False):
+            with dace.config.set_temporary('compiler', 'allow_view_arguments', value=True):
+                for _ in range(repetitions):
+                    csdfg(**arguments)
+
+                csdfg.finalize()
+
+    q.put(_median_runtime(sdfg))
 
 class MeasureProcess(mp.Process):
     def __init__(self, *args, **kwargs):
@@ -0,0 +1,209 @@
+# Copyright 2019-2024 ETH Zurich and the DaCe authors. All rights reserved.
+import concurrent.futures
+import contextlib
+import json
+import math
+import multiprocessing as mp
+import os
+import re
+import tempfile
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from dace.optimization import cutout_tuner as ct
+from dace.optimization import utils as optim_utils
+
+try:
+    from tqdm import tqdm
+except (ImportError, ModuleNotFoundError):
+    tqdm = lambda x, **kwargs: x
+
+
+def _available_cores() -> List[int]:
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def _pin_compile_worker(cores: Sequence[int]) -> None:
+    if cores and hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, cores)
+
+
+class WorkerPoolTuner:
+    """
+    Local worker-pool wrapper for cutout tuning. Candidate configurations of each cutout are compiled in parallel by a
+    pool of worker processes, while compiled candidates are measured one at a time in a process pinned to a dedicated
+    set of cores, such that compilation does not disturb timing. Measured results are stored incrementally, so an
+    interrupted tuning run resumes where it stopped.
+
+    For example::
+
+        tuner = WorkerPoolTuner(MapPermutationTuner(sdfg), compile_workers=15, measure_cores=[15])
+        results = tuner.optimize()
+    """
+
+    def __init__(self,
+                 tuner: ct.CutoutTuner,
+                 compile_workers: Optional[int] = None,
+                 measure_cores: Optional[Sequence[int]] = None,
+                 build_folder: Optional[str] = None,
+                 timeout: float = 600.0) -> None:
+        """
+        Creates a worker-pool tuner.
+
+        :param tuner: The cutout tuner to run.
+        :param compile_workers: Number of parallel compilation processes. If None, uses all cores that are not used
+                                for measurement.
+        :param measure_cores: Cores to pin measurements to. If None, uses the last available core.
+        :param build_folder: Folder to compile candidates into. If None, uses a temporary folder.
+        :param timeout: Maximal time (in seconds) for a single measurement.
+        """
+        self._tuner = tuner
+        cores = _available_cores()
+        self._measure_cores = list(measure_cores) if measure_cores is not None else cores[-1:]
+        self._compile_cores = [c for c in cores if c not in self._measure_cores] or cores
+        self._compile_workers = compile_workers or len(self._compile_cores)
+        self._build_folder = build_folder
+        if build_folder is not None:
+            os.makedirs(build_folder, exist_ok=True)
+        self._timeout = timeout
+
+    def partial_file_name(self, label: str) -> str:
+        return self._tuner.file_name(label) + '.partial'
+
+    def _load_partial(self, file_name: str) -> Dict[str, float]:
+        results = {}
+        if os.path.exists(file_name):
+            print(f'Resuming from {file_name}')
+            with open(file_name, 'r') as fp:
+                for line in fp:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:  # Truncated line from an interrupted run
+                        continue
+                    results[entry['key']] = entry['runtime']
+        return results
+
+    @contextlib.contextmanager
+    def _capture_measurements(self):
+        """ Collects the cutouts that the tuner measures, instead of measuring them. """
+        captured: List[Tuple[Dict, Dict[str, Any], int]] = []
+
+        def capture(cutout, data: Dict[str, Any], repetitions: int) -> float:
+            captured.append((cutout.to_json(), data, repetitions))
+            return math.nan
+
+        with self._tuner.intercept_measurements(capture):
+            yield captured
+
+    def search(self, cutout, label: str, measurements: int, **kwargs) -> Dict[str, float]:
+        """
+        Evaluates the search space of a single cutout, pipelining compilation and measurement.
+
+        :return: A dictionary mapping configuration keys to runtimes.
+        """
+        kwargs = self._tuner.pre_evaluate(cutout=cutout, measurements=measurements, **kwargs)
+        key = kwargs["key"]
+
+        partial_file = self.partial_file_name(label)
+        results = self._load_partial(partial_file)
+
+        # Terminate a truncated line from an interrupted run before appending to it
+        truncated = False
+        if os.path.exists(partial_file) and os.path.getsize(partial_file) > 0:
+            with open(partial_file, 'rb') as fp:
+                fp.seek(-1, os.SEEK_END)
+                truncated = fp.read(1) != b'\n'
+
+        # Create candidates by applying every configuration that was not measured yet
+        candidates: Dict[str, Tuple[Dict, Dict[str, Any], int]] = {}
+        with open(partial_file, 'a') as fp:
+            if truncated:
+                fp.write('\n')
+
+            def store(config_key: str, runtime: float):
+                results[config_key] = runtime
+                fp.write(json.dumps({'key': config_key, 'runtime': runtime}) + '\n')
+                fp.flush()
+
+            with self._capture_measurements() as captured:
+                for config in self._tuner.space(**(kwargs["space_kwargs"])):
+                    config_key = key(config)
+                    if config_key in results or config_key in candidates:
+                        continue
+                    kwargs["config"] = config
+                    captured.clear()
+                    runtime = self._tuner.evaluate(**kwargs)
+                    if len(captured) == 0:
+                        # Configuration was rejected without measuring
+                        store(config_key, runtime)
+                    else:
+                        candidates[config_key] = captured[-1]
+
+            if len(candidates) == 0:
+                return results
+
+            # Compile candidates in parallel, measure them serially as they become available
+            with tempfile.TemporaryDirectory(dir=self._build_folder) as build_folder:
+                ctx = mp.get_context('spawn')
+                with concurrent.futures.ProcessPoolExecutor(max_workers=self._compile_workers,
+                                                            mp_context=ctx,
+                                                            initializer=_pin_compile_worker,
+                                                            initargs=(self._compile_cores, )) as pool:
+                    futures = {}
+                    for i, (config_key, (cutout_json, _, _)) in enumerate(candidates.items()):
+                        folder = os.path.join(build_folder, f'{re.sub(r"[^a-zA-Z0-9_]", "_", label)}_{i}')
+                        futures[pool.submit(optim_utils.compile_cutout, cutout_json, folder)] = config_key
+
+                    for future in tqdm(concurrent.futures.as_completed(futures), total=len(futures), desc=label):
+                        config_key = futures[future]
+                        _, dreport, repetitions = candidates[config_key]
+                        try:
+                            folder = future.result()
+                        except Exception as ex:
+                            print(f'Error occured during compilation of {config_key}: {ex}')
+                            store(config_key, math.inf)
+                            continue
+
+                        runtime = optim_utils.subprocess_measure_precompiled(folder,
+                                                                             dreport,
+                                                                             repetitions=repetitions,
+                                                                             timeout=self._timeout,
+                                                                             cores=self._measure_cores)
+                        store(config_key, runtime)
+
+        return results
+
+    def optimize(self, measurements: int = 30, apply: bool = False, **kwargs) -> Dict[Any, Any]:
+        tuning_report = {}
+        for cutout, label in list(self._tuner.cutouts()):
+            file_name = self._tuner.file_name(label)
+            results = self._tuner.try_load(file_name)
+
+            if results is None:
+                results = self.search(cutout, label, measurements, **kwargs)
+                if results is None:
+                    tuning_report[label] = None
+                    continue
+
+                with open(file_name, 'w') as fp:
+                    json.dump(results, fp)
+
+                # Tuning of this cutout is complete
+                partial_file = self.partial_file_name(label)
+                if os.path.exists(partial_file):
+                    os.remove(partial_file)
+
+            if len(results) == 0:
+                tuning_report[label] = results
+                continue
+
+            best_config = min(results, key=results.get)
+            if apply:
+                config = self._tuner.config_from_key(best_config, cutout=cutout)
+                self._tuner.apply(config, label=label)
+
+            tuning_report[label] = results
+
+        return tuning_report
@@ -21,7 +21,11 @@
 #include "copy.h"
 #include "stream.h"
 #include "os.h"
+#include "mempool.h"
+#include "numa.h"
+#include "worksteal.h"
 #include "perf/reporting.h"
+#include "perf/memory.h"
 #include "comm.h"
 #include "serialization.h"
 
@@ -0,0 +1,186 @@
+// Copyright 2019-2024 ETH Zurich and the DaCe authors. All rights reserved.
+#ifndef __DACE_MEMPOOL_H
+#define __DACE_MEMPOOL_H
+
+#include <cstddef>
+#include <cstdlib>
+#include <mutex>
+#include <new>
+#include <unordered_map>
+#include <vector>
+
+#ifdef _WIN32
+#include <malloc.h>
+#endif
+
+#if defined(__linux__)
+#include <sys/mman.h>
+#endif
+
+#define DACE_MEMPOOL_ALIGNMENT  64
+#define DACE_MEMPOOL_HUGEPAGE   (2 * 1024 * 1024)
+
+namespace dace {
+
+    /**
+     * Host memory pool with size-class free lists. Released buffers are kept
+     * for subsequent allocations of the same size class instead of being
+     * returned to the system, which avoids repeated allocation and page
+     * faults on fresh pages. Since the pool lives in the SDFG state struct,
+     * buffers are reused across invocations of the same compiled SDFG.
+     *
+     * Allocations of at least `hugepage_threshold` bytes (if non-negative)
+     * are backed by anonymous memory mappings that are advised to use
+     * transparent huge pages (Linux only).
+     */
+    class MemoryPool {
+    protected:
+        struct Block {
+            size_t size;
+            bool mapped;
+        };
+
+        std::mutex _mutex;
+        std::unordered_map<size_t, std::vector<void *>> _free;
+        std::unordered_map<void *, Block> _blocks;
+        long long _hugepage_threshold;
+        size_t _cached_bytes = 0;
+
+        /**
+         * Rounds a size up to its size class. Classes are split into four
+         * steps per power of two, bounding the wasted space by 25%.
+         */
+        static size_t size_class(size_t bytes) {
+            if (bytes <= DACE_MEMPOOL_ALIGNMENT)
+                return DACE_MEMPOOL_ALIGNMENT;
+            size_t msb = 1;
+            while ((msb << 1) <= bytes - 1)
+                msb <<= 1;
+            size_t step = msb / 4;
+            if (step < DACE_MEMPOOL_ALIGNMENT)
+                step = DACE_MEMPOOL_ALIGNMENT;
+            return ((bytes + step - 1) / step) * step;
+        }
+
+        bool use_hugepages(size_t bytes) const {
+#if defined(__linux__)
+            return _hugepage_threshold >= 0 && bytes >= (size_t)_hugepage_threshold;
+#else
+            return false;
+#endif
+        }
+
+        void *system_allocate(size_t bytes, bool mapped) {
+            void *ptr = nullptr;
+#if defined(__linux__)
+            if (mapped) {
+                ptr = mmap(nullptr, bytes, PROT_READ | PROT_WRITE, MAP_PRIVATE | MAP_ANONYMOUS, -1, 0);
+                if (ptr == MAP_FAILED)
+                    throw std::bad_alloc();
+#ifdef MADV_HUGEPAGE
+                madvise(ptr, bytes, MADV_HUGEPAGE);
+#endif
+                return ptr;
+            }
+#endif
+#ifdef _WIN32
+            ptr = _aligned_malloc(bytes, DACE_MEMPOOL_ALIGNMENT);
+#else
+            if (posix_memalign(&ptr, DACE_MEMPOOL_ALIGNMENT, bytes) != 0)
+                ptr = nullptr;
+#endif
+            if (ptr == nullptr)
+                throw std::bad_alloc();
+            return ptr;
+        }
+
+        static void system_free(void *ptr, const Block& block) {
+#if defined(__linux__)
+            if (block.mapped) {
+                munmap(ptr, block.size);
+                return;
+            }
+#endif
+#ifdef _WIN32
+            _aligned_free(ptr);
+#else
+            free(ptr);
+#endif
+        }
+
+    public:
+        explicit MemoryPool(long long hugepage_threshold = -1) : _hugepage_threshold(hugepage_threshold) {}
+        MemoryPool(const MemoryPool&) = delete;
+        MemoryPool& operator=(const MemoryPool&) = delete;
+
+        ~MemoryPool() {
+            for (auto& block : _blocks)
+                system_free(block.first, block.second);
+        }
+
+        /**
+         * Allocates an aligned buffer of `count` elements, reusing a cached
+         * buffer of the same size class if one is available.
+         */
+        template <typename T>
+        T *allocate(size_t count) {
+            size_t bytes = size_class(count * sizeof(T));
+            bool mapped = use_hugepages(bytes);
+            if (mapped)
+                bytes = ((bytes + DACE_MEMPOOL_HUGEPAGE - 1) / DACE_MEMPOOL_HUGEPAGE) * DACE_MEMPOOL_HUGEPAGE;
+
+            std::lock_guard<std::mutex> guard(_mutex);
+            auto& freelist = _free[bytes];
+            if (!freelist.empty()) {
+                void *ptr = freelist.back();
+                freelist.pop_back();
+                _cached_bytes -= bytes;
+                return static_cast<T *>(ptr);
+            }
+            void *ptr = system_allocate(bytes, mapped);
+            _blocks[ptr] = Block{bytes, mapped};
+            return static_cast<T *>(ptr);
+        }
+
+        /**
+         * Returns a buffer obtained from `allocate` to the pool.
+         */
+        void release(void *ptr) {
+            if (ptr == nullptr)
+                return;
+            std::lock_guard<std::mutex> guard(_mutex);
+            auto it = _blocks.find(ptr);
+            if (it == _blocks.end())
+                return;
+            _free[it->second.size].push_back(ptr);
+            _cached_bytes += it->second.size;
+        }
+
+        /**
+         * Returns all cached (released) buffers to the system.
+         */
+        void trim() {
+            std::lock_guard<std::mutex> guard(_mutex);
+            for (auto& freelist : _free) {
+                for (void *ptr : freelist.second) {
+                    auto it = _blocks.find(ptr);
+                    system_free(ptr, it->second);
+                    _blocks.erase(it);
+                }
+                freelist.second.clear();
+            }
+            _cached_bytes = 0;
+        }
+
+        /**
+         * Returns the number of bytes held in free lists.
+         */
+        size_t cached_bytes() {
+            std::lock_guard<std::mutex> guard(_mutex);
+            return _cached_bytes;
+        }
+    };
+
+}  // namespace dace
+
+#endif  // __DACE_MEMPOOL_H
@@ -0,0 +1,120 @@
+// Copyright 2019-2024 ETH Zurich and the DaCe authors. All rights reserved.
+#ifndef __DACE_NUMA_H
+#define __DACE_NUMA_H
+
+#include <cstddef>
+#include <cstdio>
+#include <new>
+
+#if defined(__linux__)
+#include <sys/mman.h>
+#include <sys/syscall.h>
+#include <unistd.h>
+#endif
+
+namespace dace {
+namespace numa {
+
+    enum class Policy {
+        Interleave,
+        Bind
+    };
+
+    /**
+     * Returns the number of NUMA nodes of the system (at most the number of
+     * bits in a node mask), or 1 if unknown.
+     */
+    inline int num_nodes() {
+        static int nodes = 0;
+        if (nodes > 0)
+            return nodes;
+        nodes = 1;
+#if defined(__linux__)
+        // Format: comma-separated ranges, e.g., "0-1" or "0,2-3"
+        FILE *fp = fopen("/sys/devices/system/node/online", "r");
+        if (fp) {
+            int first, last = 0, maxnode = 0;
+            char sep;
+            while (fscanf(fp, "%d", &first) == 1) {
+                last = first;
+                if (fscanf(fp, "%c", &sep) == 1 && sep == '-') {
+                    if (fscanf(fp, "%d", &last) != 1)
+                        break;
+                    if (fscanf(fp, "%c", &sep) != 1)
+                        sep = '\n';
+                }
+                if (last > maxnode)
+                    maxnode = last;
+                if (sep != ',')
+                    break;
+            }
+            fclose(fp);
+            nodes = maxnode + 1;
+            if (nodes > (int)(8 * sizeof(unsigned long)))
+                nodes = 8 * sizeof(unsigned long);
+        }
+#endif
+        return nodes;
+    }
+
+    inline size_t mapped_size(size_t bytes) {
+#if defined(__linux__)
+        size_t page = (size_t)sysconf(_SC_PAGESIZE);
+        return ((bytes + page - 1) / page) * page;
+#else
+        return bytes;
+#endif
+    }
+
+    /**
+     * Allocates an array of `count` elements whose pages are placed
+     * according to the given policy. Placement is applied before the pages
+     * are touched, so it is independent of the allocating thread.
+     * On systems without NUMA support, falls back to a regular allocation.
+     */
+    template <typename T>
+    T *allocate(size_t count, Policy policy, int node = 0) {
+        size_t bytes = count * sizeof(T);
+#if defined(__linux__) && defined(SYS_mbind)
+        size_t size = mapped_size(bytes);
+        void *ptr = mmap(nullptr, size, PROT_READ | PROT_WRITE, MAP_PRIVATE | MAP_ANONYMOUS, -1, 0);
+        if (ptr == MAP_FAILED)
+            throw std::bad_alloc();
+
+        // Constants from <numaif.h>, to avoid depending on libnuma
+        const int MPOL_BIND_ = 2, MPOL_INTERLEAVE_ = 3;
+        unsigned long mask = 0;
+        int mode;
+        if (policy == Policy::Interleave) {
+            int nodes = num_nodes();
+            for (int i = 0; i < nodes; ++i)
+                mask |= 1UL << i;
+            mode = MPOL_INTERLEAVE_;
+        } else {
+            mask = 1UL << (node % num_nodes());
+            mode = MPOL_BIND_;
+        }
+        // Failure (e.g., no NUMA support in the kernel) leaves the default policy in place
+        syscall(SYS_mbind, ptr, size, mode, &mask, 8 * sizeof(unsigned long), 0);
+        return static_cast<T *>(ptr);
+#else
+        return new T[count];
+#endif
+    }
+
+    /**
+     * Releases an array obtained from `allocate`.
+     */
+    template <typename T>
+    void release(T *ptr, size_t count) {
+#if defined(__linux__) && defined(SYS_mbind)
+        munmap(ptr, mapped_size(count * sizeof(T)));
+#else
+        delete[] ptr;
+#endif
+    }
+
+}  // namespace numa
+}  // namespace dace
+
+#endif  // __DACE_NUMA_H
@@ -0,0 +1,106 @@
+// Copyright 2019-2024 ETH Zurich and the DaCe authors. All rights reserved.
+#ifndef __DACE_PERF_MEMORY_H
+#define __DACE_PERF_MEMORY_H
+
+#include <algorithm>
+#include <atomic>
+#include <cstdint>
+
+#include "reporting.h"
+
+namespace dace {
+namespace perf {
+
+    /**
+     * Statistics of the memory tracker at the beginning of an instrumented
+     * region.
+     */
+    struct MemoryRegion {
+        uint64_t outer_peak;
+        uint64_t allocations;
+        uint64_t deallocations;
+        uint64_t allocated_bytes;
+    };
+
+    /**
+     * Tracks the live host memory of the data containers that an SDFG
+     * allocates. Instrumented regions (e.g., states) report the peak of the
+     * live bytes within the region, the live bytes at its end, and the number
+     * and size of allocations in the region. Regions are expected to nest,
+     * as states in SDFGs do.
+     */
+    class MemoryTracker {
+     public:
+        MemoryTracker() : _live(0), _peak(0), _allocations(0), _deallocations(0), _allocated_bytes(0) {}
+
+        void allocate(uint64_t bytes) {
+            uint64_t live = _live.fetch_add(bytes, std::memory_order_relaxed) + bytes;
+            _allocations.fetch_add(1, std::memory_order_relaxed);
+            _allocated_bytes.fetch_add(bytes, std::memory_order_relaxed);
+            uint64_t peak = _peak.load(std::memory_order_relaxed);
+            while (live > peak && !_peak.compare_exchange_weak(peak, live, std::memory_order_relaxed)) {}
+        }
+
+        void deallocate(uint64_t bytes) {
+            _live.fetch_sub(bytes, std::memory_order_relaxed);
+            _deallocations.fetch_add(1, std::memory_order_relaxed);
+        }
+
+        uint64_t live() const {
+            return _live.load(std::memory_order_relaxed);
+        }
+
+        uint64_t peak() const {
+            return _peak.load(std::memory_order_relaxed);
+        }
+
+        /**
+         * Begins an instrumented region.
+         * @param allocations: Number of allocations that belong to the region
+         *                     but were made before it began.
+         * @param allocated_bytes: Total size of these allocations.
+         */
+        MemoryRegion begin_region(uint64_t allocations = 0, uint64_t allocated_bytes = 0) {
+            MemoryRegion region;
+            region.outer_peak = _peak.exchange(_live.load(std::memory_order_relaxed), std::memory_order_relaxed);
+            region.allocations = _allocations.load(std::memory_order_relaxed) - allocations;
+            region.deallocations = _deallocations.load(std::memory_order_relaxed);
+            region.allocated_bytes = _allocated_bytes.load(std::memory_order_relaxed) - allocated_bytes;
+            return region;
+        }
+
+        /**
+         * Ends an instrumented region and adds its statistics to a report.
+         */
+        void end_region(const MemoryRegion& region, Report& report, const char *name, int cfg_id, int state_id,
+                        int el_id) {
+            uint64_t peak = _peak.load(std::memory_order_relaxed);
+            // The enclosing region continues with the maximum of both peaks
+            _peak.store(std::max(peak, region.outer_peak), std::memory_order_relaxed);
+
+            size_t tid = detail::thread_hash();
+            report.add_counter(name, "memory", "peak_bytes", peak, tid, cfg_id, state_id, el_id);
+            report.add_counter(name, "memory", "live_bytes", live(), tid, cfg_id, state_id, el_id);
+            report.add_counter(name, "memory", "allocations",
+                               _allocations.load(std::memory_order_relaxed) - region.allocations, tid, cfg_id,
+                               state_id, el_id);
+            report.add_counter(name, "memory", "deallocations",
+                               _deallocations.load(std::memory_order_relaxed) - region.deallocations, tid, cfg_id,
+                               state_id, el_id);
+            report.add_counter(name, "memory", "allocated_bytes",
+                               _allocated_bytes.load(std::memory_order_relaxed) - region.allocated_bytes, tid,
+                               cfg_id, state_id, el_id);
+        }
+
+     private:
+        std::atomic<uint64_t> _live;
+        std::atomic<uint64_t> _peak;
+        std::atomic<uint64_t> _allocations;
+        std::atomic<uint64_t> _deallocations;
+        std::atomic<uint64_t> _allocated_bytes;
+    };
+
+}  // namespace perf
+}  // namespace dace
+
+#endif  // __DACE_PERF_MEMORY_H
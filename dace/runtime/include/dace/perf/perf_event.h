@@ -0,0 +1,180 @@
+// Copyright 2019-2024 ETH Zurich and the DaCe authors. All rights reserved.
+#ifndef __DACE_PERF_PERF_EVENT_H
+#define __DACE_PERF_PERF_EVENT_H
+
+#include <algorithm>
+#include <atomic>
+#include <cstdint>
+#include <cstdio>
+#include <cstring>
+#include <vector>
+
+#ifdef __linux__
+#include <cerrno>
+#include <linux/perf_event.h>
+#include <sys/ioctl.h>
+#include <sys/syscall.h>
+#include <unistd.h>
+#endif
+
+#ifdef _OPENMP
+#include <omp.h>
+#endif
+
+#include "reporting.h"
+
+#define DACE_PERF_MAX_EVENTS 8
+
+namespace dace {
+namespace perf {
+
+    /**
+     * A hardware or software event to count, as given to perf_event_open.
+     */
+    struct PerfEventSpec {
+        uint32_t type;
+        uint64_t config;
+        const char *name;
+    };
+
+    /**
+     * Cumulative counts of the events in a group.
+     */
+    struct PerfEventValues {
+        uint64_t values[DACE_PERF_MAX_EVENTS];
+    };
+
+    /**
+     * A group of counters that are read together through the Linux
+     * perf_event interface. Every thread opens its own group on first use,
+     * which counts the user-space events of that thread. If the system does
+     * not permit opening a counter (e.g., due to perf_event_paranoid), the
+     * counter is skipped and a warning is printed once.
+     */
+    class PerfEventGroup {
+     public:
+        /**
+         * Sets the events that thread groups open. Must be called before
+         * the first thread group is created.
+         */
+        static void configure(const PerfEventSpec *events, int num_events) {
+            std::vector<PerfEventSpec>& specs = config();
+            specs.assign(events, events + std::min(num_events, DACE_PERF_MAX_EVENTS));
+        }
+
+        /**
+         * Returns the counter group of the calling thread.
+         */
+        static PerfEventGroup& thread_group() {
+            thread_local PerfEventGroup group;
+            return group;
+        }
+
+        PerfEventGroup(const PerfEventGroup&) = delete;
+        PerfEventGroup& operator=(const PerfEventGroup&) = delete;
+
+        ~PerfEventGroup() {
+#ifdef __linux__
+            for (int i = 0; i < _num_events; ++i)
+                close(_fds[i]);
+#endif
+        }
+
+        int num_events() const {
+            return _num_events;
+        }
+
+        /**
+         * Reads the current counts of the group. Counts are scaled if the
+         * kernel multiplexed the group with other events.
+         */
+        PerfEventValues read() const {
+            PerfEventValues result = {};
+#ifdef __linux__
+            if (_num_events == 0)
+                return result;
+
+            // Format: number of events, time enabled, time running, values
+            uint64_t buffer[3 + DACE_PERF_MAX_EVENTS];
+            if (::read(_fds[0], buffer, sizeof(buffer)) < (ssize_t)(3 * sizeof(uint64_t)))
+                return result;
+            uint64_t enabled = buffer[1], running = buffer[2];
+            if (running == 0)
+                return result;
+            for (uint64_t i = 0; i < buffer[0] && i < (uint64_t)_num_events; ++i) {
+                if (enabled == running)
+                    result.values[i] = buffer[3 + i];
+                else
+                    result.values[i] = (uint64_t)((double)buffer[3 + i] * enabled / running);
+            }
+#endif
+            return result;
+        }
+
+        /**
+         * Adds the counts between two reads of this group to a report.
+         */
+        void report(Report& report, const char *name, const PerfEventValues& start, const PerfEventValues& end,
+                    size_t tid, int cfg_id, int state_id, int el_id) const {
+            for (int i = 0; i < _num_events; ++i) {
+                report.add_counter(name, "perf", _names[i], end.values[i] - start.values[i], tid, cfg_id,
+                                   state_id, el_id);
+            }
+        }
+
+     private:
+        PerfEventGroup() : _num_events(0) {
+#ifdef __linux__
+            for (const PerfEventSpec& spec : config()) {
+                struct perf_event_attr attr;
+                memset(&attr, 0, sizeof(attr));
+                attr.size = sizeof(attr);
+                attr.type = spec.type;
+                attr.config = spec.config;
+                attr.exclude_kernel = 1;
+                attr.exclude_hv = 1;
+                attr.read_format = PERF_FORMAT_GROUP | PERF_FORMAT_TOTAL_TIME_ENABLED |
+                                   PERF_FORMAT_TOTAL_TIME_RUNNING;
+                // The group leader starts disabled and enables the whole group once it is complete
+                attr.disabled = (_num_events == 0) ? 1 : 0;
+
+                int group_fd = (_num_events == 0) ? -1 : _fds[0];
+                int fd = (int)syscall(__NR_perf_event_open, &attr, 0, -1, group_fd, 0);
+                if (fd < 0) {
+                    warn(spec.name, strerror(errno));
+                    continue;
+                }
+                _fds[_num_events] = fd;
+                _names[_num_events] = spec.name;
+                ++_num_events;
+            }
+            if (_num_events > 0) {
+                ioctl(_fds[0], PERF_EVENT_IOC_RESET, PERF_IOC_FLAG_GROUP);
+                ioctl(_fds[0], PERF_EVENT_IOC_ENABLE, PERF_IOC_FLAG_GROUP);
+            }
+#else
+            if (!config().empty())
+                warn("all counters", "perf_event is only available on Linux");
+#endif
+        }
+
+        static std::vector<PerfEventSpec>& config() {
+            static std::vector<PerfEventSpec> specs;
+            return specs;
+        }
+
+        static void warn(const char *name, const char *reason) {
+            static std::atomic<bool> warned(false);
+            if (!warned.exchange(true))
+                fprintf(stderr, "WARNING: Cannot open performance counter \"%s\" (%s), skipping\n", name, reason);
+        }
+
+        int _fds[DACE_PERF_MAX_EVENTS];
+        const char *_names[DACE_PERF_MAX_EVENTS];
+        int _num_events;
+    };
+
+}  // namespace perf
+}  // namespace dace
+
+#endif  // __DACE_PERF_PERF_EVENT_H
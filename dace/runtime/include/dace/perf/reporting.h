@@ -2,12 +2,17 @@
 #ifndef __DACE_PERF_REPORTING_H
 #define __DACE_PERF_REPORTING_H
 
+#include <algorithm>
+#include <atomic>
 #include <chrono>
+#include <cstdint>
 #include <cstring>
+#include <ctime>
 #include <fstream>
 #include <map>
 #include <mutex>
 #include <sstream>
+#include <string>
 #include <thread>
 #include <vector>
 
@@ -20,12 +25,37 @@
 #endif
 
 #define DACE_REPORT_BUFFER_SIZE     2048
+#define DACE_REPORT_MAX_THREADS     256
 #define DACE_REPORT_EVENT_NAME_LEN  64
 #define DACE_REPORT_EVENT_CAT_LEN   10
 
 namespace dace {
 namespace perf {
 
+    /**
+     * Returns a monotonic timestamp in nanoseconds. Uses the raw hardware
+     * clock where available, which is not subject to NTP adjustments.
+     */
+    inline uint64_t timestamp_ns() {
+#if defined(__linux__) && defined(CLOCK_MONOTONIC_RAW)
+        struct timespec ts;
+        clock_gettime(CLOCK_MONOTONIC_RAW, &ts);
+        return uint64_t(ts.tv_sec) * 1000000000ULL + uint64_t(ts.tv_nsec);
+#else
+        return std::chrono::duration_cast<std::chrono::nanoseconds>(
+            std::chrono::steady_clock::now().time_since_epoch()
+        ).count();
+#endif
+    }
+
+    /**
+     * Returns a monotonic timestamp in microseconds, the time unit of
+     * instrumentation reports.
+     */
+    inline unsigned long int timestamp_us() {
+        return (unsigned long int)(timestamp_ns() / 1000);
+    }
+
     struct TraceEvent {
         char ph;
         char name[DACE_REPORT_EVENT_NAME_LEN];
@@ -44,23 +74,343 @@ namespace perf {
         } counter;
     };
 
+    namespace detail {
+        /**
+         * Process-wide pool of dense thread indices. Indices of exited
+         * threads are reused, such that the number of indices in use is
+         * bounded by the number of concurrently running threads.
+         */
+        class ThreadSlots {
+            std::mutex _mutex;
+            std::vector<int> _free;
+            int _next = 0;
+
+        public:
+            int acquire() {
+                std::lock_guard<std::mutex> guard (this->_mutex);
+                if (this->_free.empty())
+                    return this->_next++;
+                int index = this->_free.back();
+                this->_free.pop_back();
+                return index;
+            }
+
+            void release(int index) {
+                std::lock_guard<std::mutex> guard (this->_mutex);
+                this->_free.push_back(index);
+            }
+        };
+
+        inline ThreadSlots& thread_slots() {
+            static ThreadSlots slots;
+            return slots;
+        }
+
+        /**
+         * Index of a thread, which is returned to the pool when the thread
+         * exits.
+         */
+        struct ThreadSlot {
+            int index;
+            ThreadSlot() : index(thread_slots().acquire()) {}
+            ~ThreadSlot() { thread_slots().release(index); }
+        };
+
+        /**
+         * Returns a dense index of the calling thread, which is assigned on
+         * the first call from each thread. Indices are unique among running
+         * threads.
+         */
+        inline int thread_index() {
+            thread_local ThreadSlot slot;
+            return slot.index;
+        }
+
+        /**
+         * Returns the hashed ID of the calling thread, as written to reports.
+         */
+        inline size_t thread_hash() {
+            thread_local size_t tid = std::hash<std::thread::id>{}(std::this_thread::get_id());
+            return tid;
+        }
+    }  // namespace detail
+
+    /**
+     * Sampling decision that selects every ``interval``-th execution.
+     * @param counter:  Execution counter of the sampled element.
+     * @param interval: Sampling interval.
+     */
+    inline bool sample_interval(unsigned long int& counter, unsigned long int interval) {
+        return (counter++ % interval) == 0;
+    }
+
+    /**
+     * Sampling decision that selects executions with the given probability,
+     * using a thread-local xorshift generator.
+     * @param fraction: Probability of selecting an execution.
+     */
+    inline bool sample_fraction(double fraction) {
+        thread_local uint64_t state = (uint64_t(detail::thread_hash()) ^ timestamp_ns()) | 1;
+        state ^= state << 13;
+        state ^= state >> 7;
+        state ^= state << 17;
+        return double(state >> 11) * (1.0 / 9007199254740992.0) < fraction;
+    }
+
     /**
      * Simple instrumentation report class that can save to JSON.
+     *
+     * Every thread appends events to its own preallocated buffer without
+     * locking. Buffers never grow: a full buffer is written out when the
+     * report is streamed, and otherwise kept as a chunk until the report is
+     * saved, where all events are merged (ordered by timestamp). Buffers
+     * belong to thread indices, which are reused after a thread exits.
+     * Beyond ``DACE_REPORT_MAX_THREADS`` concurrently running threads,
+     * threads share a buffer that is guarded by a mutex.
      */
     class Report {
     protected:
         std::mutex _mutex;
-        std::vector<TraceEvent> _events;
+        std::atomic<std::vector<TraceEvent> *> _buffers[DACE_REPORT_MAX_THREADS];
+        std::vector<TraceEvent> _overflow;
+        std::vector<std::vector<TraceEvent>> _chunks;
+        std::ofstream _stream;
+        std::atomic<bool> _streaming;
+
+        // Sampling state
+        std::map<std::string, double> _sampling_weights;
+        std::map<std::string, std::atomic<uint64_t>, std::less<>> _skipped_samples;
+        uint64_t _budget_samples;
+        std::atomic<uint64_t> _call_samples;
+        std::atomic<bool> _call_exceeded;
+        std::atomic<uint64_t> _exceeded_calls;
+
+        static std::string report_filename(const char *path, const char *extension) {
+            std::stringstream ss;
+            std::chrono::milliseconds ms =
+                std::chrono::duration_cast<std::chrono::milliseconds>(
+                    std::chrono::system_clock::now().time_since_epoch()
+                );
+            ss << path << "/" << "report-" << ms.count() << extension;
+            return ss.str();
+        }
+
+        template <typename T, typename F>
+        void write_column(const std::vector<TraceEvent>& events, F field) {
+            std::vector<T> column (events.size());
+            for (size_t i = 0; i < events.size(); ++i)
+                column[i] = T(field(events[i]));
+            this->_stream.write((const char *)column.data(), sizeof(T) * column.size());
+        }
+
+        /**
+         * Writes events as one block of the binary report format. Each block
+         * contains its own string table, followed by one array per field
+         * (see ``dace.codegen.instrumentation.report`` for the layout).
+         * Must be called with the report mutex held.
+         */
+        void write_block(const std::vector<TraceEvent>& events) {
+            if (events.empty())
+                return;
+            size_t n = events.size();
+
+            std::map<std::string, uint32_t> string_ids;
+            std::vector<std::string> strings;
+            std::vector<uint32_t> names (n), cats (n), counter_names (n);
+            auto intern = [&](const char *str) -> uint32_t {
+                auto it = string_ids.find(str);
+                if (it != string_ids.end())
+                    return it->second;
+                uint32_t id = (uint32_t)strings.size();
+                string_ids[str] = id;
+                strings.push_back(str);
+                return id;
+            };
+            for (size_t i = 0; i < n; ++i) {
+                names[i] = intern(events[i].name);
+                cats[i] = intern(events[i].cat);
+                counter_names[i] = intern(events[i].counter.name);
+            }
+
+            uint64_t num_events = n;
+            uint32_t num_strings = (uint32_t)strings.size();
+            this->_stream.write((const char *)&num_events, sizeof(uint64_t));
+            this->_stream.write((const char *)&num_strings, sizeof(uint32_t));
+            for (const auto& str : strings) {
+                uint16_t len = (uint16_t)str.size();
+                this->_stream.write((const char *)&len, sizeof(uint16_t));
+                this->_stream.write(str.data(), len);
+            }
+
+            write_column<uint8_t>(events, [](const TraceEvent& e) { return e.ph; });
+            write_column<int32_t>(events, [](const TraceEvent& e) { return e.element_id.cfg_id; });
+            write_column<int32_t>(events, [](const TraceEvent& e) { return e.element_id.state_id; });
+            write_column<int32_t>(events, [](const TraceEvent& e) { return e.element_id.el_id; });
+            write_column<uint64_t>(events, [](const TraceEvent& e) { return e.tstart; });
+            write_column<uint64_t>(events, [](const TraceEvent& e) { return e.ph == 'X' ? e.tend - e.tstart : 0; });
+            write_column<uint64_t>(events, [](const TraceEvent& e) { return e.tid; });
+            this->_stream.write((const char *)names.data(), sizeof(uint32_t) * n);
+            this->_stream.write((const char *)cats.data(), sizeof(uint32_t) * n);
+            this->_stream.write((const char *)counter_names.data(), sizeof(uint32_t) * n);
+            write_column<uint64_t>(events, [](const TraceEvent& e) { return e.counter.val; });
+        }
+
+        /**
+         * Returns the event buffer of the calling thread, allocating it on
+         * first use, or nullptr if the thread should use the overflow buffer.
+         */
+        std::vector<TraceEvent> *thread_buffer() {
+            int index = detail::thread_index();
+            if (index >= DACE_REPORT_MAX_THREADS)
+                return nullptr;
+            std::vector<TraceEvent> *buffer = this->_buffers[index].load(std::memory_order_acquire);
+            if (buffer == nullptr) {
+                buffer = new std::vector<TraceEvent>();
+                buffer->reserve(DACE_REPORT_BUFFER_SIZE);
+                this->_buffers[index].store(buffer, std::memory_order_release);
+            }
+            return buffer;
+        }
+
+        /**
+         * Empties a full buffer without reallocating it. When streaming, the
+         * events are written to the file, otherwise they are moved to a new
+         * chunk. Must be called with the report mutex held.
+         */
+        void flush(std::vector<TraceEvent>& buffer) {
+            if (this->_streaming.load(std::memory_order_relaxed)) {
+                this->write_block(buffer);
+                buffer.clear();
+                return;
+            }
+            this->_chunks.emplace_back();
+            this->_chunks.back().swap(buffer);
+            buffer.reserve(DACE_REPORT_BUFFER_SIZE);
+        }
+
+        void append(const TraceEvent& event) {
+            std::vector<TraceEvent> *buffer = thread_buffer();
+            if (buffer != nullptr) {
+                buffer->push_back(event);
+                if (buffer->size() >= DACE_REPORT_BUFFER_SIZE) {
+                    std::lock_guard<std::mutex> guard (this->_mutex);
+                    this->flush(*buffer);
+                }
+            } else {
+                std::lock_guard<std::mutex> guard (this->_mutex);
+                this->_overflow.push_back(event);
+                if (this->_overflow.size() >= DACE_REPORT_BUFFER_SIZE)
+                    this->flush(this->_overflow);
+            }
+        }
+
     public:
-        ~Report() {}
+        Report() : _streaming(false), _budget_samples(0), _call_samples(0), _call_exceeded(false), _exceeded_calls(0) {
+            for (int i = 0; i < DACE_REPORT_MAX_THREADS; ++i)
+                this->_buffers[i].store(nullptr, std::memory_order_relaxed);
+            this->_overflow.reserve(DACE_REPORT_BUFFER_SIZE);
+        }
+
+        ~Report() {
+            for (int i = 0; i < DACE_REPORT_MAX_THREADS; ++i)
+                delete this->_buffers[i].load(std::memory_order_acquire);
+        }
 
         /**
-         * Clears the report.
+         * Clears the report. Must not be called concurrently with adding
+         * events.
          */
         void reset() {
             std::lock_guard<std::mutex> guard (this->_mutex);
-            this->_events.clear();
-            this->_events.reserve(DACE_REPORT_BUFFER_SIZE);
+            for (int i = 0; i < DACE_REPORT_MAX_THREADS; ++i) {
+                std::vector<TraceEvent> *buffer = this->_buffers[i].load(std::memory_order_acquire);
+                if (buffer != nullptr)
+                    buffer->clear();
+            }
+            this->_overflow.clear();
+            this->_chunks.clear();
+            this->_exceeded_calls = 0;
+            for (auto& skipped : this->_skipped_samples)
+                skipped.second.store(0, std::memory_order_relaxed);
+        }
+
+        /**
+         * Sets the factor by which the events of a category are scaled to
+         * estimate totals, i.e., the inverse of the sampling rate. Also
+         * registers the category for counting executions that are skipped
+         * due to the sampling budget (see ``within_budget``). Must be called
+         * before any events are added.
+         * @param cat:    Event category of the sampled provider.
+         * @param weight: Sampling weight.
+         */
+        void set_sampling_weight(const char *cat, double weight) {
+            std::lock_guard<std::mutex> guard (this->_mutex);
+            this->_sampling_weights[cat] = weight;
+            this->_skipped_samples[cat].store(0, std::memory_order_relaxed);
+        }
+
+        /**
+         * Caps the instrumentation overhead per SDFG call. The budget is
+         * converted to a number of samples using the measured overhead per
+         * event (see ``measure_overhead``).
+         * @param budget_us: Time budget per call in microseconds, or zero
+         *                   for no limit.
+         */
+        void set_sampling_budget(double budget_us) {
+            if (budget_us <= 0) {
+                this->_budget_samples = 0;
+                return;
+            }
+            double event_ns = measure_overhead(10000);
+            this->_budget_samples = std::max(uint64_t(1), uint64_t(budget_us * 1000.0 / event_ns));
+        }
+
+        /**
+         * Starts a new SDFG call with respect to the sampling budget.
+         */
+        void begin_call() {
+            this->_call_samples.store(0, std::memory_order_relaxed);
+            this->_call_exceeded.store(false, std::memory_order_relaxed);
+        }
+
+        /**
+         * Returns true if another sample fits into the budget of the
+         * current call, and counts the sample. Executions that do not fit
+         * are counted per category, such that reported aggregates can be
+         * scaled by the number of skipped executions.
+         * @param cat: Event category of the sampled provider.
+         */
+        bool within_budget(const char *cat) {
+            if (this->_budget_samples == 0)
+                return true;
+            if (this->_call_samples.fetch_add(1, std::memory_order_relaxed) < this->_budget_samples)
+                return true;
+            if (!this->_call_exceeded.exchange(true, std::memory_order_relaxed))
+                this->_exceeded_calls.fetch_add(1, std::memory_order_relaxed);
+            auto skipped = this->_skipped_samples.find(cat);
+            if (skipped != this->_skipped_samples.end())
+                skipped->second.fetch_add(1, std::memory_order_relaxed);
+            return false;
+        }
+
+        /**
+         * Returns all events in the report, ordered by their start timestamp.
+         * Must not be called concurrently with adding events.
+         */
+        std::vector<TraceEvent> events() {
+            std::lock_guard<std::mutex> guard (this->_mutex);
+            std::vector<TraceEvent> result (this->_overflow);
+            for (const auto& chunk : this->_chunks)
+                result.insert(result.end(), chunk.begin(), chunk.end());
+            for (int i = 0; i < DACE_REPORT_MAX_THREADS; ++i) {
+                std::vector<TraceEvent> *buffer = this->_buffers[i].load(std::memory_order_acquire);
+                if (buffer != nullptr)
+                    result.insert(result.end(), buffer->begin(), buffer->end());
+            }
+            std::stable_sort(result.begin(), result.end(), [](const TraceEvent& a, const TraceEvent& b) {
+                return a.tstart < b.tstart;
+            });
+            return result;
         }
 
         void add_counter(
@@ -69,9 +419,7 @@ namespace perf {
             const char *counter_name,
             unsigned long int counter_val
         ) {
-            std::thread::id thread_id = std::this_thread::get_id();
-            size_t tid = std::hash<std::thread::id>{}(thread_id);
-            add_counter(name, cat, counter_name, counter_val, tid, -1, -1, -1);
+            add_counter(name, cat, counter_name, counter_val, detail::thread_hash(), -1, -1, -1);
         }
 
         void add_counter(
@@ -84,15 +432,11 @@ namespace perf {
             int state_id,
             int el_id
         ) {
-            long unsigned int tstart = std::chrono::duration_cast<std::chrono::microseconds>(
-                std::chrono::high_resolution_clock::now().time_since_epoch()
-            ).count();
-            std::lock_guard<std::mutex> guard (this->_mutex);
             struct TraceEvent event = {
                 'C',
                 "",
                 "",
-                tstart,
+                timestamp_us(),
                 0,
                 tid,
                 { cfg_id, state_id, el_id },
@@ -104,7 +448,7 @@ namespace perf {
             event.cat[DACE_REPORT_EVENT_CAT_LEN - 1] = '\0';
             strncpy(event.counter.name, counter_name, DACE_REPORT_EVENT_NAME_LEN);
             event.counter.name[DACE_REPORT_EVENT_NAME_LEN - 1] = '\0';
-            this->_events.push_back(event);
+            append(event);
         }
 
         /**
@@ -126,9 +470,7 @@ namespace perf {
             int state_id,
             int el_id
         ) {
-            std::thread::id thread_id = std::this_thread::get_id();
-            size_t tid = std::hash<std::thread::id>{}(thread_id);
-            add_completion(name, cat, tstart, tend, tid, cfg_id, state_id, el_id);
+            add_completion(name, cat, tstart, tend, detail::thread_hash(), cfg_id, state_id, el_id);
         }
 
         void add_completion(
@@ -141,7 +483,6 @@ namespace perf {
             int state_id,
             int el_id
         ) {
-            std::lock_guard<std::mutex> guard (this->_mutex);
             struct TraceEvent event = {
                 'X',
                 "",
@@ -156,36 +497,115 @@ namespace perf {
             event.name[DACE_REPORT_EVENT_NAME_LEN - 1] = '\0';
             strncpy(event.cat, cat, DACE_REPORT_EVENT_CAT_LEN);
             event.cat[DACE_REPORT_EVENT_CAT_LEN - 1] = '\0';
-            this->_events.push_back(event);
+            append(event);
+        }
+
+        /**
+         * Measures the average cost of recording one timed event (two
+         * timestamps and one completion event) on the calling thread. The
+         * scratch report is cleared periodically such that the result does
+         * not include flushing full buffers.
+         * @param samples: Number of events to record.
+         * @return The overhead per event in nanoseconds.
+         */
+        static double measure_overhead(size_t samples = 100000) {
+            Report scratch;
+            uint64_t begin = timestamp_ns();
+            for (size_t i = 0; i < samples; ++i) {
+                if (i % (DACE_REPORT_BUFFER_SIZE - 1) == 0)
+                    scratch.reset();
+                unsigned long int tstart = timestamp_us();
+                unsigned long int tend = timestamp_us();
+                scratch.add_completion("overhead", "Timer", tstart, tend, -1, -1, -1);
+            }
+            uint64_t end = timestamp_ns();
+            return double(end - begin) / double(samples > 0 ? samples : 1);
+        }
+
+        /**
+         * Starts streaming the report to a timestamped file in the binary
+         * report format. Events are written in blocks whenever a thread
+         * buffer is full, and the file is completed by ``save``.
+         * @param path: Path to folder where the output file will be stored.
+         * @param hash: Hash of the SDFG.
+         */
+        void stream(const char *path, const char *hash) {
+            std::lock_guard<std::mutex> guard (this->_mutex);
+            if (this->_stream.is_open())
+                this->_stream.close();
+            this->_stream.open(report_filename(path, ".dacereport"), std::ios::binary);
+
+            // Header: magic number and version, SDFG hash, process ID
+            uint32_t hash_len = (uint32_t)strlen(hash);
+            int32_t pid = getpid();
+            this->_stream.write("DACEPRF1", 8);
+            this->_stream.write((const char *)&hash_len, sizeof(uint32_t));
+            this->_stream.write(hash, hash_len);
+            this->_stream.write((const char *)&pid, sizeof(int32_t));
+
+            // Sampling weights
+            uint32_t num_weights = (uint32_t)this->_sampling_weights.size();
+            this->_stream.write((const char *)&num_weights, sizeof(uint32_t));
+            for (const auto& weight : this->_sampling_weights) {
+                uint16_t len = (uint16_t)weight.first.size();
+                this->_stream.write((const char *)&len, sizeof(uint16_t));
+                this->_stream.write(weight.first.data(), len);
+                this->_stream.write((const char *)&weight.second, sizeof(double));
+            }
+
+            // Events that were recorded before streaming started
+            for (const auto& chunk : this->_chunks)
+                this->write_block(chunk);
+            this->_chunks.clear();
+            this->_streaming.store(true);
         }
 
         /**
-         * Saves the report to a timestamped JSON file.
+         * Saves the report to a timestamped JSON file. If the report is
+         * streamed, writes the remaining events and closes the binary file
+         * instead.
          * @param path: Path to folder where the output JSON file will be stored.
          * @param hash: Hash of the SDFG.
          */
         void save(const char *path, const char *hash) {
-            std::lock_guard<std::mutex> guard (this->_mutex);
+            uint64_t exceeded_calls = this->_exceeded_calls.exchange(0);
+            if (exceeded_calls > 0)
+                add_counter("Sampling budget exceeded", "Sampling", "calls", exceeded_calls);
+            for (auto& skipped : this->_skipped_samples) {
+                uint64_t skipped_samples = skipped.second.exchange(0);
+                if (skipped_samples > 0)
+                    add_counter("Sampling budget exceeded", "Sampling", skipped.first.c_str(), skipped_samples);
+            }
 
-            // Create report filename
-            std::stringstream ss;
-            std::chrono::milliseconds ms =
-                std::chrono::duration_cast<std::chrono::milliseconds>(
-                    std::chrono::system_clock::now().time_since_epoch()
-                );
-            ss << path << "/" << "report-" << ms.count() << ".json";
+            if (this->_streaming.load()) {
+                std::lock_guard<std::mutex> guard (this->_mutex);
+                for (int i = 0; i < DACE_REPORT_MAX_THREADS; ++i) {
+                    std::vector<TraceEvent> *buffer = this->_buffers[i].load(std::memory_order_acquire);
+                    if (buffer != nullptr) {
+                        this->write_block(*buffer);
+                        buffer->clear();
+                    }
+                }
+                this->write_block(this->_overflow);
+                this->_overflow.clear();
+                this->_stream.close();
+                this->_streaming.store(false);
+                return;
+            }
+
+            std::vector<TraceEvent> all_events = this->events();
 
             // Dump report as JSON
             {
                 bool first = true;
-                std::ofstream ofs (ss.str(), std::ios::binary);
+                std::ofstream ofs (report_filename(path, ".json"), std::ios::binary);
 
                 ofs << "{" << std::endl;
                 ofs << "  \"traceEvents\": [" << std::endl;
 
                 int pid = getpid();
 
-                for (const auto& event : this->_events) {
+                for (const auto& event : all_events) {
                     if (first)
                         first = false;
                     else
@@ -225,6 +645,18 @@ namespace perf {
 
                 ofs << std::endl << "  ]," << std::endl;
 
+                if (!this->_sampling_weights.empty()) {
+                    ofs << "  \"sampling\": {";
+                    first = true;
+                    for (const auto& weight : this->_sampling_weights) {
+                        if (!first)
+                            ofs << ", ";
+                        first = false;
+                        ofs << "\"" << weight.first << "\": " << weight.second;
+                    }
+                    ofs << "}," << std::endl;
+                }
+
                 ofs << "  \"sdfgHash\": \"";
                 ofs << hash;
                 ofs << "\"" << std::endl;
@@ -240,6 +672,7 @@ namespace perf {
 }  // namespace dace
 
 #undef DACE_REPORT_BUFFER_SIZE
+#undef DACE_REPORT_MAX_THREADS
 #undef DACE_REPORT_EVENT_NAME_LEN
 #undef DACE_REPORT_EVENT_CAT_LEN
 
@@ -2,12 +2,24 @@
 #ifndef __DACE_SERIALIZATION_H
 #define __DACE_SERIALIZATION_H
 
+#include <algorithm>
 #include <chrono>
+#include <condition_variable>
+#include <cstdint>
 #include <cstdlib>
+#include <cstring>
+#include <deque>
 #include <fstream>
 #include <map>
 #include <mutex>
 #include <sstream>
+#include <string>
+#include <thread>
+#include <vector>
+
+#ifdef DACE_WITH_ZLIB
+#include <zlib.h>
+#endif
 
 #if defined(_WIN32) || defined(_WIN64)
 #include <windows.h>
@@ -51,15 +63,261 @@ static inline void write_parameter_pack(std::ofstream& ofs, T value, Args... val
     write_parameter_pack(ofs, values...);
 }
 
+static inline void collect_parameter_pack(std::vector<uint32_t>& result) {
+}
+
+template <typename T, typename... Args>
+static inline void collect_parameter_pack(std::vector<uint32_t>& result, T value, Args... values) {
+    result.push_back(uint32_t(value));
+    collect_parameter_pack(result, values...);
+}
+
+enum class DataCompression : uint32_t {
+    None = 0,
+    Zlib = 1,
+};
+
+/**
+ * Chunked data container files. The contents of an array are split into
+ * fixed-size chunks, which are (optionally) compressed, written, and read in
+ * parallel. The file layout is as follows (all integers in native byte order):
+ *   - Magic number "DACECHK1" (8 bytes)
+ *   - uint32 number of dimensions, followed by uint32 shape and strides
+ *   - uint32 element size, uint32 compression (see DataCompression)
+ *   - uint64 total uncompressed size in bytes, uint64 chunk size, uint64
+ *     number of chunks
+ *   - Index: uint64 file offset and uint64 stored size of every chunk
+ *   - Chunks, starting at a page-aligned offset. Uncompressed chunks are
+ *     stored contiguously, such that the data can be memory-mapped.
+ */
+class ChunkedDataFile {
+public:
+    static constexpr const char *magic = "DACECHK1";
+    static constexpr uint64_t alignment = 4096;
+
+    /**
+     * Writes a chunked data container file.
+     * @param shape_strides: Shape followed by strides of the array.
+     * @return True if the file was written successfully.
+     */
+    static bool write(const std::string& path, const char *data, uint64_t nbytes,
+                      const std::vector<uint32_t>& shape_strides, uint32_t elem_size, uint64_t chunk_size,
+                      DataCompression compression) {
+        chunk_size = std::max(chunk_size, uint64_t(1));
+        int64_t nchunks = int64_t((nbytes + chunk_size - 1) / chunk_size);
+        std::vector<uint64_t> sizes(nchunks);
+        for (int64_t i = 0; i < nchunks; ++i)
+            sizes[i] = std::min(chunk_size, nbytes - i * chunk_size);
+
+        // Compress chunks in parallel
+        std::vector<std::vector<char>> compressed;
+        if (compression == DataCompression::Zlib) {
+#ifdef DACE_WITH_ZLIB
+            compressed.resize(nchunks);
+            bool success = true;
+            #pragma omp parallel for schedule(dynamic)
+            for (int64_t i = 0; i < nchunks; ++i) {
+                uLongf len = compressBound((uLong)sizes[i]);
+                compressed[i].resize(len);
+                if (compress((Bytef *)compressed[i].data(), &len, (const Bytef *)(data + i * chunk_size),
+                             (uLong)sizes[i]) != Z_OK) {
+                    #pragma omp critical
+                    success = false;
+                }
+                compressed[i].resize(len);
+                sizes[i] = len;
+            }
+            if (!success)
+                return false;
+#else
+            printf("WARNING: Data instrumentation compression requires zlib, writing uncompressed chunks.\n");
+            compression = DataCompression::None;
+#endif
+        }
+
+        // Create header and index
+        std::vector<char> header(magic, magic + 8);
+        append(header, uint32_t(shape_strides.size() / 2));
+        for (uint32_t value : shape_strides)
+            append(header, value);
+        append(header, elem_size);
+        append(header, uint32_t(compression));
+        append(header, nbytes);
+        append(header, chunk_size);
+        append(header, uint64_t(nchunks));
+
+        std::vector<uint64_t> offsets(nchunks);
+        uint64_t offset = header.size() + nchunks * 2 * sizeof(uint64_t);
+        offset = (offset + alignment - 1) / alignment * alignment;
+        for (int64_t i = 0; i < nchunks; ++i) {
+            offsets[i] = offset;
+            append(header, offsets[i]);
+            append(header, sizes[i]);
+            offset += sizes[i];
+        }
+
+        {
+            std::ofstream ofs(path, std::ios::binary | std::ios::trunc);
+            ofs.write(header.data(), header.size());
+            if (!ofs)
+                return false;
+        }
+
+        // Write chunks in parallel
+        bool success = true;
+        #pragma omp parallel for schedule(dynamic)
+        for (int64_t i = 0; i < nchunks; ++i) {
+            const char *src = compressed.empty() ? (data + i * chunk_size) : compressed[i].data();
+            std::fstream fs(path, std::ios::in | std::ios::out | std::ios::binary);
+            fs.seekp(offsets[i]);
+            fs.write(src, sizes[i]);
+            if (!fs) {
+                #pragma omp critical
+                success = false;
+            }
+        }
+        return success;
+    }
+
+    /**
+     * Returns true if the given file is a chunked data container file.
+     */
+    static bool is_chunked(const std::string& path) {
+        std::ifstream ifs(path, std::ios::binary);
+        char buffer[8];
+        ifs.read(buffer, 8);
+        return ifs && memcmp(buffer, magic, 8) == 0;
+    }
+
+    /**
+     * Reads the contents of a chunked data container file to a buffer.
+     * @return True if the file was read successfully.
+     */
+    static bool read(const std::string& path, char *data, uint64_t nbytes) {
+        std::ifstream ifs(path, std::ios::binary);
+        ifs.ignore(8);
+
+        // Ignore dimensions, shape, and strides
+        uint32_t ndims = read_value<uint32_t>(ifs);
+        ifs.ignore(ndims * 2 * sizeof(uint32_t));
+        read_value<uint32_t>(ifs);  // Element size
+        DataCompression compression = (DataCompression)read_value<uint32_t>(ifs);
+        uint64_t file_bytes = read_value<uint64_t>(ifs);
+        uint64_t chunk_size = read_value<uint64_t>(ifs);
+        int64_t nchunks = (int64_t)read_value<uint64_t>(ifs);
+        if (!ifs || file_bytes != nbytes) {
+            printf("WARNING: Data file '%s' does not match the restored array, skipping.\n", path.c_str());
+            return false;
+        }
+#ifndef DACE_WITH_ZLIB
+        if (compression == DataCompression::Zlib) {
+            printf("WARNING: Reading compressed data file '%s' requires zlib, skipping.\n", path.c_str());
+            return false;
+        }
+#endif
+
+        std::vector<uint64_t> offsets(nchunks), sizes(nchunks);
+        for (int64_t i = 0; i < nchunks; ++i) {
+            offsets[i] = read_value<uint64_t>(ifs);
+            sizes[i] = read_value<uint64_t>(ifs);
+        }
+        if (!ifs)
+            return false;
+
+        // Read (and decompress) chunks in parallel
+        bool success = true;
+        #pragma omp parallel for schedule(dynamic)
+        for (int64_t i = 0; i < nchunks; ++i) {
+            char *dst = data + i * chunk_size;
+            uint64_t dst_size = std::min(chunk_size, nbytes - i * chunk_size);
+            std::ifstream chunk(path, std::ios::binary);
+            chunk.seekg(offsets[i]);
+            bool chunk_success;
+            if (compression == DataCompression::None) {
+                chunk.read(dst, std::min(dst_size, sizes[i]));
+                chunk_success = bool(chunk);
+            } else {
+                std::vector<char> buffer(sizes[i]);
+                chunk.read(buffer.data(), sizes[i]);
+                chunk_success = bool(chunk);
+#ifdef DACE_WITH_ZLIB
+                uLongf len = (uLongf)dst_size;
+                chunk_success = chunk_success && uncompress((Bytef *)dst, &len, (const Bytef *)buffer.data(),
+                                                            (uLong)sizes[i]) == Z_OK;
+#endif
+            }
+            if (!chunk_success) {
+                #pragma omp critical
+                success = false;
+            }
+        }
+        return success;
+    }
+
+private:
+    template <typename T>
+    static void append(std::vector<char>& buffer, T value) {
+        const char *bytes = (const char *)&value;
+        buffer.insert(buffer.end(), bytes, bytes + sizeof(T));
+    }
+
+    template <typename T>
+    static T read_value(std::ifstream& ifs) {
+        T value = T(0);
+        ifs.read((char *)&value, sizeof(T));
+        return value;
+    }
+};
+
+/**
+ * Behavior of asynchronous saves when the staging buffer is full.
+ */
+enum class BackpressurePolicy : uint32_t {
+    Block = 0,   ///< Wait until the writer thread frees enough space
+    Drop = 1,    ///< Skip the save
+    Sample = 2,  ///< Wait for every N-th save of an array, skip the others
+};
+
 class DataSerializer {
 protected:
+    /**
+     * A copy of an array that awaits writing by the writer thread.
+     */
+    struct PendingSave {
+        std::string path;
+        std::vector<char> data;
+        std::vector<uint32_t> shape_strides;
+        uint32_t elem_size;
+    };
+
     std::mutex _mutex;
     std::string folder;
     std::map<std::string, int> version;
     bool enable;
+    uint64_t chunk_size;
+    DataCompression compression;
+
+    // Asynchronous saves
+    bool async;
+    uint64_t staging_capacity;
+    BackpressurePolicy policy;
+    uint64_t sample_interval;
+    std::thread writer;
+    std::mutex queue_mutex;
+    std::condition_variable queue_cv;
+    std::deque<PendingSave> queue;
+    uint64_t staged_bytes;
+    bool writing;
+    bool stop;
+    uint64_t dropped;
+    std::map<std::string, uint64_t> pressure_count;
 
 public:
-    DataSerializer(const std::string& build_folder) : enable(true) {
+    DataSerializer(const std::string& build_folder) : enable(true), chunk_size(0),
+                                                      compression(DataCompression::None), async(false),
+                                                      staging_capacity(0), policy(BackpressurePolicy::Block),
+                                                      sample_interval(1), staged_bytes(0), writing(false),
+                                                      stop(false), dropped(0) {
         long unsigned int tstart = std::chrono::duration_cast<std::chrono::milliseconds>(
             std::chrono::high_resolution_clock::now().time_since_epoch()).count();
 
@@ -83,12 +341,67 @@ public:
         }
     }
 
-    ~DataSerializer() {}
+    ~DataSerializer() {
+        if (!this->async)
+            return;
+        this->flush();
+        {
+            std::lock_guard<std::mutex> guard(this->queue_mutex);
+            this->stop = true;
+        }
+        this->queue_cv.notify_all();
+        this->writer.join();
+    }
 
     void set_folder(const std::string& folder) {
         this->folder = folder;
     }
 
+    /**
+     * Saves arrays asynchronously. Every save copies the array to a staging
+     * buffer, which a background writer thread drains to disk.
+     * @param capacity: Size of the staging buffer in bytes.
+     * @param policy: Behavior of saves when the staging buffer is full.
+     * @param sample_interval: For the Sample policy, every N-th save of an
+     *                         array waits for space, and the others are
+     *                         skipped.
+     */
+    void set_async(uint64_t capacity, BackpressurePolicy policy = BackpressurePolicy::Block,
+                   uint64_t sample_interval = 1) {
+        if (this->async || !this->enable)
+            return;
+        this->async = true;
+        this->staging_capacity = capacity;
+        this->policy = policy;
+        this->sample_interval = std::max(sample_interval, uint64_t(1));
+        this->writer = std::thread(&DataSerializer::write_pending, this);
+    }
+
+    /**
+     * Waits until all asynchronous saves are written to disk.
+     */
+    void flush() {
+        if (!this->async)
+            return;
+        std::unique_lock<std::mutex> lock(this->queue_mutex);
+        this->queue_cv.wait(lock, [this] { return this->queue.empty() && !this->writing; });
+        if (this->dropped > 0) {
+            printf("WARNING: Data instrumentation skipped %llu saves because the staging buffer was full.\n",
+                   (unsigned long long)this->dropped);
+            this->dropped = 0;
+        }
+    }
+
+    /**
+     * Saves arrays as chunked data container files (see ChunkedDataFile).
+     * @param chunk_size: Chunk size in bytes, or zero to save raw files.
+     * @param compression: Compression of the chunks.
+     */
+    void set_chunked(uint64_t chunk_size, DataCompression compression = DataCompression::None) {
+        this->chunk_size = chunk_size;
+        this->compression = compression;
+    }
+
     template <typename T>
     void save_symbol(const std::string &symbol_name, const std::string &filename, const T symbol_value) {
         if (!this->enable) return;
@@ -145,33 +458,55 @@ public:
     void save(const T *buffer, size_t size, const std::string &arrayname, const std::string &filename, Args... shape_stride) {
         // NOTE: The "shape_stride" parameter is two concatenated tuples of shape, strides
         if (!this->enable) return;
-        std::lock_guard<std::mutex> guard(this->_mutex);
+        uint64_t nbytes = sizeof(T) * size;
 
-        // Update version
-        int version;
-        if (this->version.find(filename) == this->version.end())
-            version = 0;
-        else
-            version = this->version[filename] + 1;
-        this->version[filename] = version;
+        // Skipped saves do not count as versions
+        if (this->async && !this->reserve(filename, nbytes))
+            return;
 
         std::stringstream ss;
-        ss << this->folder << "/" << arrayname;
+        {
+            std::lock_guard<std::mutex> guard(this->_mutex);
+
+            // Update version
+            int version;
+            if (this->version.find(filename) == this->version.end())
+                version = 0;
+            else
+                version = this->version[filename] + 1;
+            this->version[filename] = version;
+
+            ss << this->folder << "/" << arrayname;
+
+            // Try to create directory for array versions
+            if (!create_directory(ss.str().c_str())) {
+                if (version == 0)  // Only print the first time
+                    printf("WARNING: Could not create directory '%s' for data instrumentation.\n", ss.str().c_str());
+                if (this->async)
+                    this->release(nbytes);
+                return;
+            }
+            ss << "/" << filename << "_" << version << ".bin";
+        }
 
-        // Try to create directory for array versions
-        if (!create_directory(ss.str().c_str())) {
-            if (version == 0)  // Only print the first time
-                printf("WARNING: Could not create directory '%s' for data instrumentation.\n", ss.str().c_str());
+        std::vector<uint32_t> shape_strides;
+        collect_parameter_pack(shape_strides, shape_stride...);
+        if (!this->async) {
+            this->write_file(ss.str(), (const char *)buffer, nbytes, shape_strides, sizeof(T));
             return;
         }
 
-        // Write contents to file
-        ss << "/" << filename << "_" << version << ".bin";
-        std::ofstream ofs(ss.str(), std::ios::binary);
-        uint32_t ndims = sizeof...(shape_stride) / 2;
-        ofs.write((const char *)&ndims, sizeof(uint32_t));
-        write_parameter_pack(ofs, shape_stride...);
-        ofs.write((const char *)buffer, sizeof(T) * size);
+        // Snapshot contents and pass them to the writer thread
+        PendingSave pending;
+        pending.path = ss.str();
+        pending.data.assign((const char *)buffer, (const char *)buffer + nbytes);
+        pending.shape_strides = std::move(shape_strides);
+        pending.elem_size = sizeof(T);
+        {
+            std::lock_guard<std::mutex> guard(this->queue_mutex);
+            this->queue.push_back(std::move(pending));
+        }
+        this->queue_cv.notify_all();
     }
 
     template <typename T>
@@ -189,8 +524,12 @@ public:
         // Read contents from file
         std::stringstream ss;
         ss << this->folder << "/" << arrayname << "/" << filename << "_" << version << ".bin";
+        if (ChunkedDataFile::is_chunked(ss.str())) {
+            ChunkedDataFile::read(ss.str(), (char *)buffer, sizeof(T) * size);
+            return;
+        }
         std::ifstream ifs(ss.str(), std::ios::binary);
-        
+
         // Ignore header (dimensions, shape, and strides)
         uint32_t ndims;
         ifs.read((char *)&ndims, sizeof(uint32_t));
@@ -199,6 +538,77 @@ public:
         // Read contents
         ifs.read((char *)buffer, sizeof(T) * size);
     }
+
+protected:
+    void write_file(const std::string& path, const char *data, uint64_t nbytes,
+                    const std::vector<uint32_t>& shape_strides, uint32_t elem_size) {
+        if (this->chunk_size > 0) {
+            if (!ChunkedDataFile::write(path, data, nbytes, shape_strides, elem_size, this->chunk_size,
+                                        this->compression))
+                printf("WARNING: Could not write data file '%s'.\n", path.c_str());
+            return;
+        }
+        std::ofstream ofs(path, std::ios::binary);
+        uint32_t ndims = shape_strides.size() / 2;
+        ofs.write((const char *)&ndims, sizeof(uint32_t));
+        ofs.write((const char *)shape_strides.data(), shape_strides.size() * sizeof(uint32_t));
+        ofs.write(data, nbytes);
+    }
+
+    /**
+     * Reserves space for a save in the staging buffer, applying the
+     * backpressure policy if it is full.
+     * @return True if the save should proceed.
+     */
+    bool reserve(const std::string& filename, uint64_t nbytes) {
+        std::unique_lock<std::mutex> lock(this->queue_mutex);
+        // Saves larger than the buffer proceed once it is empty
+        auto fits = [&] { return this->staged_bytes == 0 || this->staged_bytes + nbytes <= this->staging_capacity; };
+        if (!fits()) {
+            bool wait = (this->policy == BackpressurePolicy::Block);
+            if (this->policy == BackpressurePolicy::Sample)
+                wait = (this->pressure_count[filename]++ % this->sample_interval == 0);
+            if (!wait) {
+                ++this->dropped;
+                return false;
+            }
+            this->queue_cv.wait(lock, fits);
+        }
+        this->staged_bytes += nbytes;
+        return true;
+    }
+
+    void release(uint64_t nbytes) {
+        {
+            std::lock_guard<std::mutex> guard(this->queue_mutex);
+            this->staged_bytes -= nbytes;
+        }
+        this->queue_cv.notify_all();
+    }
+
+    /**
+     * Main loop of the writer thread.
+     */
+    void write_pending() {
+        std::unique_lock<std::mutex> lock(this->queue_mutex);
+        while (true) {
+            this->queue_cv.wait(lock, [this] { return this->stop || !this->queue.empty(); });
+            if (this->queue.empty())
+                return;
+            PendingSave pending = std::move(this->queue.front());
+            this->queue.pop_front();
+            this->writing = true;
+            lock.unlock();
+
+            this->write_file(pending.path, pending.data.data(), pending.data.size(), pending.shape_strides,
+                             pending.elem_size);
+
+            lock.lock();
+            this->staged_bytes -= pending.data.size();
+            this->writing = false;
+            this->queue_cv.notify_all();
+        }
+    }
 };
 
 }  // namespace dace
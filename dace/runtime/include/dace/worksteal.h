@@ -0,0 +1,153 @@
+// Copyright 2019-2024 ETH Zurich and the DaCe authors. All rights reserved.
+#ifndef __DACE_WORKSTEAL_H
+#define __DACE_WORKSTEAL_H
+
+#include <algorithm>
+#include <atomic>
+#include <memory>
+
+#ifdef _OPENMP
+#include <omp.h>
+#endif
+
+namespace dace {
+namespace worksteal {
+
+    /**
+     * A contiguous range of iterations owned by one thread. The owner takes
+     * chunks from the front, thieves take the back half. Padded to a cache
+     * line to avoid false sharing between threads.
+     */
+    struct Range {
+        std::atomic_flag lock = ATOMIC_FLAG_INIT;
+        long long begin = 0;
+        long long end = 0;
+        char padding[64 - sizeof(std::atomic_flag) - 2 * sizeof(long long)];
+
+        void acquire() {
+            while (lock.test_and_set(std::memory_order_acquire))
+                ;
+        }
+        void release() {
+            lock.clear(std::memory_order_release);
+        }
+    };
+
+    /**
+     * Takes a chunk from the front of a thread's own range. The chunk size
+     * adapts to the remaining work: large chunks while the range is long
+     * (few synchronizations) and down to `grain` iterations towards its end
+     * (fine-grained load balancing).
+     */
+    static inline bool take(Range& range, long long grain, long long& begin, long long& end) {
+        range.acquire();
+        long long remaining = range.end - range.begin;
+        if (remaining <= 0) {
+            range.release();
+            return false;
+        }
+        long long chunk = std::min(remaining, std::max(grain, remaining / 8));
+        begin = range.begin;
+        end = begin + chunk;
+        range.begin = end;
+        range.release();
+        return true;
+    }
+
+    /**
+     * Steals the back half of a victim's range (or all of it, if it is
+     * shorter than two grains) into the thief's own range.
+     */
+    static inline bool steal(Range& victim, Range& own, long long grain) {
+        victim.acquire();
+        long long remaining = victim.end - victim.begin;
+        if (remaining <= 0) {
+            victim.release();
+            return false;
+        }
+        long long stolen = (remaining < 2 * grain) ? remaining : (remaining + 1) / 2;
+        long long end = victim.end;
+        victim.end -= stolen;
+        victim.release();
+
+        own.acquire();
+        own.begin = end - stolen;
+        own.end = end;
+        own.release();
+        return true;
+    }
+
+    /**
+     * Executes `func(i)` for every `i` in `[0, count)` on a team of OpenMP
+     * threads. Iterations are initially split evenly between threads, and
+     * threads that run out of work steal from others. This balances maps
+     * whose iterations have irregular amounts of work (e.g., rows of sparse
+     * matrices) without the central queue of a dynamic schedule.
+     *
+     * @param count Number of iterations.
+     * @param grain Minimal number of consecutive iterations per chunk.
+     * @param nthreads Number of threads, or 0 for the OpenMP default.
+     * @param func Function to call with every iteration index.
+     */
+    template <typename F>
+    void parallel_for(long long count, long long grain, int nthreads, F&& func) {
+        if (count <= 0)
+            return;
+        if (grain < 1)
+            grain = 1;
+#ifdef _OPENMP
+        int nranges = (nthreads > 0) ? nthreads : omp_get_max_threads();
+        nranges = (int)std::max(1LL, std::min((long long)nranges, (count + grain - 1) / grain));
+        if (nranges == 1) {
+            for (long long i = 0; i < count; ++i)
+                func(i);
+            return;
+        }
+
+        std::unique_ptr<Range[]> ranges(new Range[nranges]);
+        long long base = count / nranges, extra = count % nranges;
+        for (int t = 0; t < nranges; ++t) {
+            ranges[t].begin = t * base + std::min((long long)t, extra);
+            ranges[t].end = ranges[t].begin + base + (t < extra ? 1 : 0);
+        }
+
+        #pragma omp parallel num_threads(nranges)
+        {
+            // The team may be smaller than requested, in which case the
+            // ranges of missing threads are stolen by the others
+            int tid = omp_get_thread_num();
+            Range& own = ranges[tid];
+            unsigned int seed = 2654435761u * (unsigned int)(tid + 1);
+
+            long long begin, end;
+            while (true) {
+                while (take(own, grain, begin, end)) {
+                    for (long long i = begin; i < end; ++i)
+                        func(i);
+                }
+
+                // Look for a victim, starting from a random thread
+                seed ^= seed << 13;
+                seed ^= seed >> 17;
+                seed ^= seed << 5;
+                int start = (int)(seed % (unsigned int)nranges);
+                bool found = false;
+                for (int k = 0; k < nranges && !found; ++k) {
+                    int victim = (start + k) % nranges;
+                    if (victim != tid)
+                        found = steal(ranges[victim], own, grain);
+                }
+                if (!found)
+                    break;
+            }
+        }
+#else
+        for (long long i = 0; i < count; ++i)
+            func(i);
+#endif
+    }
+
+}  // namespace worksteal
+}  // namespace dace
+
+#endif  // __DACE_WORKSTEAL_H
@@ -886,6 +886,13 @@ class Map(object):
     unroll_factor = Property(dtype=int, allow_none=True, default=0,
                              desc="How much iterations should be unrolled."
                              " To prevent unrolling, set this value to 1.")
+    simd = Property(dtype=bool,
+                    default=False,
+                    desc="Explicitly vectorize the innermost dimension of the map (CPU schedules only)")
+    simd_length = Property(dtype=int,
+                           default=0,
+                           desc="Preferred number of SIMD lanes for explicit vectorization (0 for the compiler default)",
+                           serialize_if=lambda m: m.simd)
     collapse = Property(dtype=int, default=1, desc="How many dimensions to collapse into the parallel range")
     debuginfo = DebugInfoProperty()
     is_collapsed = Property(dtype=bool, desc="Show this node/scope/state as collapsed", default=False)
@@ -906,6 +913,10 @@ class Map(object):
                               default=0,
                               desc="OpenMP schedule chunk size",
                               serialize_if=lambda m: m.schedule in dtypes.CPU_SCHEDULES)
+    omp_proc_bind = EnumProperty(dtype=dtypes.OMPProcBindType,
+                                 default=dtypes.OMPProcBindType.Default,
+                                 desc="OpenMP thread affinity policy {master, close, spread}",
+                                 serialize_if=lambda m: m.schedule in dtypes.CPU_SCHEDULES)
 
     gpu_block_size = ListProperty(element_type=int,
                                   default=None,
@@ -0,0 +1,219 @@
+# Copyright 2019-2024 ETH Zurich and the DaCe authors. All rights reserved.
+"""
+Rates instrumented maps against the roofline model of a machine. Static floating-point operation and data movement
+counts of each map are evaluated with the symbol values of a call and combined with measured runtimes from an
+instrumentation report.
+"""
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import sympy as sp
+
+from dace import SDFG, symbolic
+from dace.config import Config
+from dace.sdfg import nodes as nd
+from dace.sdfg.performance_evaluation.helpers import UUID_SEPARATOR, get_uuid
+from dace.sdfg.performance_evaluation.work_depth import analyze_sdfg, get_tasklet_work
+
+if TYPE_CHECKING:
+    from dace.codegen.compiled_sdfg import CompiledSDFG
+    from dace.codegen.instrumentation.report import InstrumentationReport
+
+UUIDType = Tuple[int, int, int]
+
+
+@dataclass
+class StaticCosts:
+    """ Symbolic costs of one execution of an SDFG element. """
+    label: str  #: Element label
+    flops: Optional[sp.Expr]  #: Floating-point operations (or None if unknown)
+    bytes: sp.Expr  #: Compulsory data movement in bytes, i.e., the data read or written by the element
+
+
+@dataclass
+class RooflineEntry:
+    """ Achieved performance of an instrumented element, relative to the machine roofline. """
+    uuid: UUIDType  #: Unique locator for SDFG/state/node
+    label: str  #: Element label
+    runtime: float  #: Median runtime (in milliseconds)
+    flops: Optional[float]  #: Floating-point operations per execution (or None if not evaluable)
+    bytes: Optional[float]  #: Bytes moved per execution (or None if not evaluable)
+    peak_gflops: float = 0  #: Peak performance of the machine (in GFLOP/s), 0 if unknown
+    peak_bandwidth: float = 0  #: Peak memory bandwidth of the machine (in GB/s), 0 if unknown
+
+    @property
+    def gflops(self) -> Optional[float]:
+        """ Achieved performance in GFLOP/s. """
+        if self.flops is None or self.runtime <= 0:
+            return None
+        return self.flops / (self.runtime * 1e6)
+
+    @property
+    def bandwidth(self) -> Optional[float]:
+        """ Achieved memory bandwidth in GB/s. """
+        if self.bytes is None or self.runtime <= 0:
+            return None
+        return self.bytes / (self.runtime * 1e6)
+
+    @property
+    def intensity(self) -> Optional[float]:
+        """ Operational intensity in FLOP/byte. """
+        if self.flops is None or not self.bytes:
+            return None
+        return self.flops / self.bytes
+
+    @property
+    def bound(self) -> Optional[str]:
+        """ The roof that limits the element on the machine, ``'memory'`` or ``'compute'``. """
+        if self.peak_gflops <= 0 or self.peak_bandwidth <= 0 or self.intensity is None:
+            return None
+        return 'memory' if self.intensity * self.peak_bandwidth < self.peak_gflops else 'compute'
+
+    @property
+    def percent_of_peak(self) -> Optional[float]:
+        """ Achieved percentage of the attainable performance under the roofline. """
+        bound = self.bound
+        if bound is None:  # Only one of the roofs is known
+            if self.peak_gflops > 0 and self.gflops is not None and self.flops > 0:
+                bound = 'compute'
+            elif self.peak_bandwidth > 0 and self.bandwidth is not None:
+                bound = 'memory'
+            else:
+                return None
+        if bound == 'compute':
+            return 100 * self.gflops / self.peak_gflops
+        return 100 * self.bandwidth / self.peak_bandwidth
+
+
+def _str_to_uuid(uuid: str) -> UUIDType:
+    return tuple(int(i) for i in uuid.split(UUID_SEPARATOR)[:3])
+
+
+def _scope_bytes(state, entry: nd.EntryNode) -> sp.Expr:
+    """ Returns the number of bytes read and written by a scope, as given by the memlets around it. """
+    sdfg = state.sdfg
+    result = 0
+    for e in state.in_edges(entry) + state.out_edges(state.exit_node(entry)):
+        if e.data.is_empty() or e.data.subset is None:
+            continue
+        result += e.data.subset.num_elements() * sdfg.arrays[e.data.data].dtype.bytes
+    return sp.sympify(result)
+
+
+def static_costs(sdfg: SDFG) -> Dict[UUIDType, StaticCosts]:
+    """
+    Computes the symbolic floating-point operations and compulsory data movement of every map and consume scope in
+    an SDFG. Operation counts are obtained from work analysis, data movement from the memlets entering and leaving
+    the scope.
+
+    :param sdfg: The SDFG to analyze.
+    :return: A dictionary mapping scope entry UUIDs to their static costs.
+    """
+    work_map = {}
+    analyze_sdfg(sdfg, work_map, get_tasklet_work, [])
+
+    result = {}
+    for node, state in sdfg.all_nodes_recursive():
+        if not isinstance(node, nd.EntryNode):
+            continue
+        key = get_uuid(node, state)
+        flops = work_map[key][0] if key in work_map else None
+        if flops is not None:
+            # Work analysis uses plain SymPy symbols, convert them to DaCe symbols
+            flops = sp.sympify(flops)
+            flops = flops.subs({s: symbolic.symbol(s.name) for s in flops.free_symbols})
+        scope = node.consume if hasattr(node, 'consume') else node.map
+        result[_str_to_uuid(key)] = StaticCosts(f'{type(scope).__name__} {scope.label}', flops,
+                                                _scope_bytes(state, node))
+    return result
+
+
+def _evaluate(expr: Optional[sp.Expr], symbols: Dict[str, Any]) -> Optional[float]:
+    if expr is None:
+        return None
+    # Substitute by name, as the expression may contain plain SymPy symbols rather than DaCe symbols
+    expr = sp.sympify(expr)
+    try:
+        return float(expr.subs({s: symbols[str(s)] for s in expr.free_symbols if str(s) in symbols}))
+    except (TypeError, ValueError):
+        return None
+
+
+def roofline(sdfg: SDFG,
+             report: 'InstrumentationReport',
+             symbols: Optional[Dict[str, Any]] = None,
+             peak_gflops: Optional[float] = None,
+             peak_bandwidth: Optional[float] = None,
+             costs: Optional[Dict[UUIDType, StaticCosts]] = None) -> List[RooflineEntry]:
+    """
+    Rates every instrumented scope in an instrumentation report against the roofline of the machine.
+
+    :param sdfg: The SDFG that generated the report.
+    :param report: The instrumentation report with scope runtimes (e.g., from Timer instrumentation).
+    :param symbols: The symbol values with which the SDFG was called.
+    :param peak_gflops: Peak performance of the machine in GFLOP/s. If None, uses
+                        ``instrumentation.roofline.peak_gflops`` from the configuration.
+    :param peak_bandwidth: Peak memory bandwidth of the machine in GB/s. If None, uses
+                           ``instrumentation.roofline.peak_bandwidth`` from the configuration.
+    :param costs: Precomputed static costs of the SDFG (see ``static_costs``), to avoid analyzing it again.
+    :return: A list of roofline entries, one per instrumented scope, in SDFG order.
+    """
+    if peak_gflops is None:
+        peak_gflops = Config.get('instrumentation', 'roofline', 'peak_gflops')
+    if peak_bandwidth is None:
+        peak_bandwidth = Config.get('instrumentation', 'roofline', 'peak_bandwidth')
+    if costs is None:
+        costs = static_costs(sdfg)
+
+    values = dict(sdfg.constants)
+    values.update(symbols or {})
+
+    result = []
+    for uuid, cost in costs.items():
+        if uuid not in report.durations:
+            continue
+        runtimes = [np.asarray(times) for events in report.durations[uuid].values() for times in events.values()]
+        runtimes = np.concatenate(runtimes) if runtimes else np.array([])
+        if len(runtimes) == 0:
+            continue
+        result.append(
+            RooflineEntry(uuid, cost.label, float(np.median(runtimes)), _evaluate(cost.flops, values),
+                          _evaluate(cost.bytes, values), float(peak_gflops), float(peak_bandwidth)))
+    return result
+
+
+def call_symbols(csdfg: 'CompiledSDFG') -> Dict[str, Any]:
+    """ Returns the values of the free symbols in the last call of a compiled SDFG. """
+    if not csdfg._lastargs:
+        return {}
+    names = [name for name in csdfg._sig if name in csdfg._free_symbols]
+    return {name: getattr(value, 'value', value) for name, value in zip(names, csdfg._lastargs[1])}
+
+
+def format_roofline(entries: List[RooflineEntry]) -> str:
+    """ Formats roofline entries as a table. """
+
+    def fmt(value: Optional[float], spec: str) -> str:
+        return 'N/A' if value is None else format(value, spec)
+
+    header = ['Element', 'Runtime (ms)', 'GFLOP', 'GB', 'FLOP/B', 'GFLOP/s', 'GB/s', '% of peak', 'Bound']
+    rows = []
+    for entry in entries:
+        rows.append([
+            entry.label,
+            fmt(entry.runtime, '.3f'),
+            fmt(None if entry.flops is None else entry.flops / 1e9, '.4g'),
+            fmt(None if entry.bytes is None else entry.bytes / 1e9, '.4g'),
+            fmt(entry.intensity, '.3g'),
+            fmt(entry.gflops, '.3f'),
+            fmt(entry.bandwidth, '.3f'),
+            fmt(entry.percent_of_peak, '.1f'),
+            entry.bound or 'N/A',
+        ])
+
+    widths = [max(len(row[i]) for row in [header] + rows) for i in range(len(header))]
+    lines = ['  '.join(cell.ljust(width) if i == 0 else cell.rjust(width)
+                       for i, (cell, width) in enumerate(zip(row, widths))) for row in [header] + rows]
+    lines.insert(1, '-' * len(lines[0]))
+    return '\n'.join(lines)
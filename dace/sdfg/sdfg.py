@@ -425,6 +425,10 @@ class SDFG(ControlFlowRegion):
     openmp_sections = Property(dtype=bool,
                                default=Config.get_bool('compiler', 'cpu', 'openmp_sections'),
                                desc='Whether to generate OpenMP sections in code')
+    openmp_tasks = Property(dtype=bool,
+                            default=Config.get_bool('compiler', 'cpu', 'openmp_tasks'),
+                            desc='Whether to execute states and their components as OpenMP tasks with data '
+                            'dependencies')
 
     debuginfo = DebugInfoProperty(allow_none=True)
 
@@ -2254,13 +2258,18 @@ class SDFG(ControlFlowRegion):
         dll = cs.ReloadableDLL(binary_filename, self.name)
         return dll.is_loaded()
 
-    def compile(self, output_file=None, validate=True) -> 'CompiledSDFG':
+    def compile(self, output_file=None, validate=True, pgo=None) -> 'CompiledSDFG':
         """ Compiles a runnable binary from this SDFG.
 
             :param output_file: If not None, copies the output library file to
                                 the specified path.
             :param validate: If True, validates the SDFG prior to generating
                              code.
+            :param pgo: If not None, builds the binary with profile-guided
+                        optimization. Either a callable that invokes the
+                        instrumented ``CompiledSDFG`` on representative
+                        inputs, or an ``InstrumentedDataReport`` to replay.
+                        See ``compiler.configure_and_compile``.
             :return: A callable CompiledSDFG object.
         """
 
@@ -2315,7 +2324,7 @@ class SDFG(ControlFlowRegion):
             sdfg = self
 
         # Compile the code and get the shared library path
-        shared_library = compiler.configure_and_compile(program_folder, sdfg.name)
+        shared_library = compiler.configure_and_compile(program_folder, sdfg.name, pgo=pgo)
 
         # If provided, save output to path or filename
         if output_file is not None:
@@ -16,6 +16,7 @@ import warnings
 # Transformations
 from dace.transformation.dataflow import MapCollapse, TrivialMapElimination, MapFusion, ReduceExpansion
 from dace.transformation.interstate import LoopToMap, RefineNestedAccess
+from dace.transformation.passes.transformation_replay import ReplayTransformations
 from dace.transformation.subgraph.composite import CompositeFusion
 from dace.transformation.subgraph import helpers as xfsh
 from dace.transformation import helpers as xfh
@@ -554,6 +555,13 @@ def auto_optimize(sdfg: SDFG,
         * Set all library nodes to expand to ``fast`` expansion, which calls
           the fastest library on the target device
 
+    If ``optimizer.replay_transformations`` is enabled in the configuration and
+    a recipe for the same (or a structurally similar) SDFG and the same device
+    exists in the transformation database, the recipe is replayed instead of
+    the device-independent transformations (simplification, parallelization,
+    and fusion). The device-specific steps are applied afterwards in both
+    cases.
+
     :param sdfg: The SDFG to optimize.
     :param device: the device to optimize for.
     :param validate: If True, validates the SDFG after all transformations
@@ -568,21 +576,29 @@ def auto_optimize(sdfg: SDFG,
     """
     debugprint = config.Config.get_bool('debugprint')
 
-    # Simplification and loop parallelization
-    transformed = True
-    sdfg.apply_transformations_repeated(TrivialMapElimination, validate=validate, validate_all=validate_all)
-    while transformed:
-        sdfg.simplify(validate=False, validate_all=validate_all)
-        for s in sdfg.cfg_list:
-            xfh.split_interstate_edges(s)
-        l2ms = sdfg.apply_transformations_repeated((LoopToMap, RefineNestedAccess),
-                                                   validate=False,
-                                                   validate_all=validate_all)
-        transformed = l2ms > 0
-
-    # Collapse maps and eliminate trivial dimensions
-    sdfg.simplify()
-    sdfg.apply_transformations_repeated(MapCollapse, validate=False, validate_all=validate_all)
+    # Replay a known recipe for this device, if one exists
+    replayed = False
+    if config.Config.get_bool('optimizer', 'replay_transformations'):
+        replayed = ReplayTransformations(device=device).apply_pass(sdfg, {}) is not None
+        if replayed and debugprint:
+            print(f'Replayed known transformation recipe on {sdfg.name}')
+
+    if not replayed:
+        # Simplification and loop parallelization
+        transformed = True
+        sdfg.apply_transformations_repeated(TrivialMapElimination, validate=validate, validate_all=validate_all)
+        while transformed:
+            sdfg.simplify(validate=False, validate_all=validate_all)
+            for s in sdfg.cfg_list:
+                xfh.split_interstate_edges(s)
+            l2ms = sdfg.apply_transformations_repeated((LoopToMap, RefineNestedAccess),
+                                                       validate=False,
+                                                       validate_all=validate_all)
+            transformed = l2ms > 0
+
+        # Collapse maps and eliminate trivial dimensions
+        sdfg.simplify()
+        sdfg.apply_transformations_repeated(MapCollapse, validate=False, validate_all=validate_all)
 
     # Apply GPU transformations and set library node implementations
 
@@ -592,17 +608,18 @@ def auto_optimize(sdfg: SDFG,
         sdfg.apply_gpu_transformations()
         sdfg.simplify()
 
-    # fuse subgraphs greedily
-    sdfg.simplify()
+    if not replayed:
+        # fuse subgraphs greedily
+        sdfg.simplify()
 
-    greedy_fuse(sdfg, device=device, validate_all=validate_all)
+        greedy_fuse(sdfg, device=device, validate_all=validate_all)
 
-    # fuse stencils greedily
-    greedy_fuse(sdfg, device=device, validate_all=validate_all, recursive=False, stencil=True)
+        # fuse stencils greedily
+        greedy_fuse(sdfg, device=device, validate_all=validate_all, recursive=False, stencil=True)
 
-    # Move Loops inside Maps when possible
-    from dace.transformation.interstate import MoveLoopIntoMap
-    sdfg.apply_transformations_repeated([MoveLoopIntoMap])
+        # Move Loops inside Maps when possible
+        from dace.transformation.interstate import MoveLoopIntoMap
+        sdfg.apply_transformations_repeated([MoveLoopIntoMap])
 
     if device == dtypes.DeviceType.FPGA:
         # apply FPGA Transformations
@@ -1,3 +1,4 @@
 #from .scoring import ScoringFunction, ExecutionScore, MemletScore, RegisterScore
 from .enumeration import Enumerator
 from .enumeration import BruteForceEnumerator, ConnectedEnumerator, GreedyEnumerator
+from .enumeration import TransformationSequenceEnumerator, BeamSearchEnumerator, MCTSEnumerator
@@ -4,3 +4,7 @@ from .scoring_enumerator import MapScoringEnumerator
 from .brute_force_enumerator import BruteForceEnumerator
 from .connected_enumerator import ConnectedEnumerator
 from .greedy_enumerator import GreedyEnumerator
+from .sequence_enumerator import (TransformationSequenceEnumerator, apply_transformation_sequence, data_movement_cost,
+                                  runtime_cost)
+from .beam_search_enumerator import BeamSearchEnumerator
+from .mcts_enumerator import MCTSEnumerator
@@ -0,0 +1,51 @@
+# Copyright 2019-2024 ETH Zurich and the DaCe authors. All rights reserved.
+""" This file implements the BeamSearchEnumerator class """
+
+from dace.transformation.estimator.enumeration.sequence_enumerator import TransformationSequenceEnumerator
+from dace.properties import make_properties, Property
+
+
+@make_properties
+class BeamSearchEnumerator(TransformationSequenceEnumerator):
+    """
+    Enumerates transformation sequences with beam search. At every depth, all applicable transformations
+    are applied on each SDFG in the beam, and only the ``beam_width`` cheapest resulting SDFGs are kept for
+    the next depth. SDFGs that were already seen (by hash) are not expanded again.
+    """
+
+    beam_width = Property(desc="Number of sequences kept at every search depth", default=4, dtype=int)
+
+    def iterator(self):
+        """
+        returns an iterator that iterates over the explored
+        search space, yielding tuples (sequence, cost)
+        """
+        root_hash = self._sdfg.hash_sdfg()
+        visited = {root_hash}
+        yield [], self.evaluate(self._sdfg, root_hash)
+
+        beam = [([], self._sdfg)]
+        for _ in range(self.max_length):
+            candidates = []
+            for sequence, sdfg in beam:
+                for xform_json in self.matches(sdfg):
+                    new_sdfg = self.transform(sdfg, xform_json)
+                    if new_sdfg is None:
+                        continue
+
+                    new_hash = new_sdfg.hash_sdfg()
+                    if new_hash in visited:
+                        continue
+                    visited.add(new_hash)
+
+                    new_sequence = sequence + [xform_json]
+                    cost = self.evaluate(new_sdfg, new_hash)
+                    candidates.append((cost, len(candidates), new_sequence, new_sdfg))
+                    yield new_sequence, cost
+
+            if len(candidates) == 0:
+                break
+
+            # Keep the best candidates (ties broken by discovery order for determinism)
+            candidates.sort(key=lambda c: (c[0], c[1]))
+            beam = [(sequence, sdfg) for _, _, sequence, sdfg in candidates[:self.beam_width]]
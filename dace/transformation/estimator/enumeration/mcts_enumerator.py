@@ -0,0 +1,108 @@
+# Copyright 2019-2024 ETH Zurich and the DaCe authors. All rights reserved.
+""" This file implements the MCTSEnumerator class """
+
+import math
+import random
+from typing import Dict, List, Optional
+
+from dace.transformation.estimator.enumeration.sequence_enumerator import (TransformationSequence,
+                                                                           TransformationSequenceEnumerator)
+from dace.properties import make_properties, Property
+from dace.sdfg import SDFG
+
+
+class MCTSNode:
+    """ A node in the Monte-Carlo search tree, representing one transformed SDFG. """
+
+    def __init__(self, sdfg: SDFG, sequence: TransformationSequence, parent: Optional['MCTSNode'] = None):
+        self.sdfg = sdfg
+        self.sequence = sequence
+        self.parent = parent
+        self.children: List['MCTSNode'] = []
+        self.untried: Optional[List[Dict]] = None
+        self.visits = 0
+        self.reward = 0.0
+
+    def uct(self, exploration: float) -> float:
+        if self.visits == 0:
+            return math.inf
+        return (self.reward / self.visits) + exploration * math.sqrt(math.log(self.parent.visits) / self.visits)
+
+
+@make_properties
+class MCTSEnumerator(TransformationSequenceEnumerator):
+    """
+    Enumerates transformation sequences with Monte-Carlo tree search (UCT). Each iteration selects a
+    promising partial sequence, expands it by one untried transformation, performs a random rollout
+    of up to ``max_length`` transformations and backpropagates the obtained speedup over the original
+    SDFG (i.e., the ratio between the original cost and the cost of the rolled-out SDFG).
+    """
+
+    iterations = Property(desc="Number of search iterations", default=50, dtype=int)
+    exploration = Property(desc="Exploration constant of the UCT selection policy", default=math.sqrt(2), dtype=float)
+    seed = Property(desc="Random seed for rollouts", default=0, dtype=int)
+
+    def _expand_matches(self, node: MCTSNode) -> List[Dict]:
+        if node.untried is None:
+            node.untried = self.matches(node.sdfg) if len(node.sequence) < self.max_length else []
+        return node.untried
+
+    def iterator(self):
+        """
+        returns an iterator that iterates over all SDFGs evaluated
+        during the search, yielding tuples (sequence, cost)
+        """
+        rng = random.Random(self.seed)
+
+        base_cost = self.evaluate(self._sdfg)
+        yield [], base_cost
+
+        def reward(cost: float) -> float:
+            if cost == math.inf or cost <= 0:
+                return 0.0
+            return base_cost / cost if base_cost != math.inf else 1.0
+
+        yielded = {self._sdfg.hash_sdfg()}
+        root = MCTSNode(self._sdfg, [])
+        for _ in range(self.iterations):
+            # Selection
+            node = root
+            while len(self._expand_matches(node)) == 0 and len(node.children) > 0:
+                node = max(node.children, key=lambda c: c.uct(self.exploration))
+
+            # Expansion
+            untried = self._expand_matches(node)
+            while len(untried) > 0:
+                xform_json = untried.pop(rng.randrange(len(untried)))
+                new_sdfg = self.transform(node.sdfg, xform_json)
+                if new_sdfg is None:
+                    continue
+                child = MCTSNode(new_sdfg, node.sequence + [xform_json], node)
+                node.children.append(child)
+                node = child
+                break
+
+            # Simulation
+            sdfg, sequence = node.sdfg, node.sequence
+            while len(sequence) < self.max_length:
+                matches = self.matches(sdfg)
+                new_sdfg = None
+                while len(matches) > 0 and new_sdfg is None:
+                    xform_json = matches.pop(rng.randrange(len(matches)))
+                    new_sdfg = self.transform(sdfg, xform_json)
+                if new_sdfg is None:
+                    break
+                sdfg, sequence = new_sdfg, sequence + [xform_json]
+
+            sdfg_hash = sdfg.hash_sdfg()
+            cost = self.evaluate(sdfg, sdfg_hash)
+            if sdfg_hash not in yielded:
+                yielded.add(sdfg_hash)
+                yield sequence, cost
+
+            # Backpropagation
+            value = reward(cost)
+            while node is not None:
+                node.visits += 1
+                node.reward += value
+                node = node.parent
@@ -0,0 +1,202 @@
+# Copyright 2019-2024 ETH Zurich and the DaCe authors. All rights reserved.
+""" This file implements the TransformationSequenceEnumerator class and cost functions for sequence search """
+
+import copy
+import math
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Type
+
+import sympy as sp
+
+from dace import data as dt, dtypes, symbolic
+from dace.properties import make_properties, Property
+from dace.sdfg import SDFG, nodes, propagation
+from dace.transformation.passes import pattern_matching
+from dace.transformation.transformation import PatternTransformation
+
+#: A transformation sequence, as a list of serialized ``PatternTransformation`` objects
+TransformationSequence = List[Dict[str, Any]]
+
+
+def apply_transformation_sequence(sdfg: SDFG, sequence: TransformationSequence, validate: bool = True) -> SDFG:
+    """
+    Replays a sequence of serialized pattern-matching transformations on an SDFG (in-place).
+
+    :param sdfg: The SDFG to transform.
+    :param sequence: A list of transformations in their JSON form (see ``PatternTransformation.to_json``).
+    :param validate: If True, validates the SDFG after every applied transformation.
+    :return: The transformed SDFG.
+    """
+    for xform_json in sequence:
+        xform = PatternTransformation.from_json(xform_json)
+        xform._sdfg = sdfg
+        xform.apply_pattern()
+        if validate:
+            sdfg.validate()
+    return sdfg
+
+
+def _evaluate_expression(expr, symbols: Dict[str, Any], default_symbol_value: int) -> float:
+    expr = sp.sympify(symbolic.evaluate(expr, symbols))
+    if expr.free_symbols:
+        expr = expr.subs({s: default_symbol_value for s in expr.free_symbols})
+    return float(expr)
+
+
+def data_movement_cost(sdfg: SDFG, symbols: Optional[Dict[str, Any]] = None, default_symbol_value: int = 64) -> float:
+    """
+    Analytic cost model that estimates the number of bytes moved from and to data containers in an SDFG.
+    Every memlet that touches a top-level access node of a non-register container contributes its (propagated)
+    volume, scaled by the number of executions of the containing state. Containers that are only accessed inside
+    of scopes (e.g., after fusing maps) are considered local and do not contribute.
+
+    :param sdfg: The SDFG to evaluate.
+    :param symbols: Optional mapping from symbol names to values used to evaluate symbolic volumes.
+    :param default_symbol_value: Value used for symbols that are not given in ``symbols``.
+    :return: The estimated number of bytes moved.
+    """
+    symbols = dict(symbols or {})
+    symbols.update({k: v for k, v in sdfg.constants.items() if k not in symbols})
+    sdfg = copy.deepcopy(sdfg)
+    propagation.propagate_states(sdfg, concretize_dynamic_unbounded=True)
+
+    total = 0.0
+    for state in sdfg.states():
+        state_bytes = 0.0
+        scope_dict = state.scope_dict()
+        for edge in state.edges():
+            if edge.data.is_empty():
+                continue
+            for node in (edge.src, edge.dst):
+                if not isinstance(node, nodes.AccessNode) or scope_dict[node] is not None:
+                    continue
+                desc = node.desc(sdfg)
+                if isinstance(desc, dt.Scalar) or desc.storage == dtypes.StorageType.Register:
+                    continue
+                volume = _evaluate_expression(edge.data.volume, symbols, default_symbol_value)
+                state_bytes += volume * desc.dtype.bytes
+                break
+        executions = _evaluate_expression(state.executions, symbols, default_symbol_value)
+        total += state_bytes * max(executions, 1)
+
+    return total
+
+
+def runtime_cost(sdfg: SDFG, dreport=None, repetitions: int = 30) -> float:
+    """
+    Cost function that compiles and runs the SDFG, returning its median measured runtime.
+
+    :param sdfg: The SDFG to evaluate.
+    :param dreport: An optional instrumented data report to take the arguments from.
+    :param repetitions: Number of times to run the SDFG.
+    :return: The median runtime in milliseconds, or infinity if the SDFG fails to compile or run.
+    :see: dace.optimization.utils.measure
+    """
+    # Imported here to avoid a circular import with the cutout tuners
+    from dace.optimization import utils as optim_utils
+
+    sdfg = copy.deepcopy(sdfg)
+    sdfg.instrument = dtypes.InstrumentationType.Timer
+    return optim_utils.measure(sdfg, dreport, repetitions=repetitions)
+
+
+@make_properties
+class TransformationSequenceEnumerator:
+    """
+    Abstract enumerator that searches over sequences of pattern-matching transformations applied to a whole SDFG.
+    Candidate transformations are taken from the registry of ``PatternTransformation`` subclasses (or a given
+    subset of it), and every explored SDFG is scored with a cost function, where lower is better.
+    Costs are memoized by SDFG hash, so sequences that lead to equivalent SDFGs are evaluated only once.
+
+    Iterating over an enumerator yields tuples of (transformation sequence, cost).
+    """
+
+    debug = Property(desc="Debug mode", default=False, dtype=bool)
+    max_length = Property(desc="Maximum number of transformations in a sequence", default=3, dtype=int)
+    permissive = Property(desc="Match transformations in permissive mode", default=False, dtype=bool)
+    validate = Property(desc="Validate every transformed SDFG and discard invalid ones", default=True, dtype=bool)
+
+    def __init__(self,
+                 sdfg: SDFG,
+                 patterns: Optional[List[Type[PatternTransformation]]] = None,
+                 cost_function: Callable[[SDFG], float] = data_movement_cost):
+        """
+        Creates a transformation sequence enumerator.
+
+        :param sdfg: The SDFG to optimize. It is not modified by the search.
+        :param patterns: The transformations to consider. If None, uses all registered pattern transformations.
+        :param cost_function: A function that returns the cost of a given SDFG (e.g., ``data_movement_cost`` or
+                              ``runtime_cost``). Lower costs are better.
+        """
+        self._sdfg = sdfg
+        if patterns is None:
+            patterns = sorted(PatternTransformation.subclasses_recursive(), key=lambda p: p.__name__)
+        self._patterns = list(patterns)
+        self._metadata = pattern_matching.get_transformation_metadata(self._patterns)
+        self._cost_function = cost_function
+
+        # SDFG hash -> cost
+        self._costs: Dict[str, float] = {}
+
+    @property
+    def evaluations(self) -> int:
+        """ Number of distinct SDFGs that have been evaluated with the cost function. """
+        return len(self._costs)
+
+    def iterator(self) -> Iterator[Tuple[TransformationSequence, float]]:
+        """
+        iterator interface to implement
+        """
+        raise NotImplementedError
+
+    def list(self) -> List[TransformationSequence]:
+        return list(e[0] for e in self.iterator())
+
+    def scores(self) -> List[Tuple[TransformationSequence, float]]:
+        return list(e for e in self.iterator())
+
+    def __iter__(self):
+        yield from self.iterator()
+
+    def best(self) -> Tuple[TransformationSequence, float]:
+        """
+        Runs the search and returns the best sequence found along with its cost.
+        """
+        return min(self.iterator(), key=lambda e: e[1])
+
+    def matches(self, sdfg: SDFG) -> TransformationSequence:
+        """
+        Returns all transformations that can be applied on the given SDFG, in their serialized form.
+        """
+        return [
+            match.to_json() for match in pattern_matching.match_patterns(
+                sdfg, self._patterns, metadata=self._metadata, permissive=self.permissive)
+        ]
+
+    def transform(self, sdfg: SDFG, xform_json: Dict[str, Any]) -> Optional[SDFG]:
+        """
+        Applies a single serialized transformation on a copy of the given SDFG.
+
+        :return: The transformed copy, or None if the transformation failed or produced an invalid SDFG.
+        """
+        new_sdfg = copy.deepcopy(sdfg)
+        try:
+            apply_transformation_sequence(new_sdfg, [xform_json], validate=self.validate)
+        except Exception as ex:
+            if self.debug:
+                print(f'Skipping {xform_json["transformation"]}: {ex}')
+            return None
+        return new_sdfg
+
+    def evaluate(self, sdfg: SDFG, sdfg_hash: Optional[str] = None) -> float:
+        """
+        Returns the (memoized) cost of the given SDFG.
+        """
+        sdfg_hash = sdfg_hash or sdfg.hash_sdfg()
+        if sdfg_hash not in self._costs:
+            try:
+                self._costs[sdfg_hash] = self._cost_function(sdfg)
+            except Exception as ex:
+                if self.debug:
+                    print(f'Cost function failed: {ex}')
+                self._costs[sdfg_hash] = math.inf
+        return self._costs[sdfg_hash]
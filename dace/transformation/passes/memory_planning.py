@@ -0,0 +1,208 @@
+# Copyright 2019-2024 ETH Zurich and the DaCe authors. All rights reserved.
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import sympy
+
+from dace import SDFG, SDFGState, data, dtypes, properties, symbolic
+from dace.sdfg import infer_types
+from dace.transformation import pass_pipeline as ppl
+from dace.transformation.passes import analysis as ap
+from dace.transformation.transformation import experimental_cfg_block_compatible
+
+#: Alignment (in bytes) of every array in a memory arena
+ARENA_ALIGNMENT = 64
+
+
+def arena_bytes(desc: data.Array) -> symbolic.SymbolicType:
+    """ Returns the number of bytes an array occupies in a memory arena, including alignment padding. """
+    size = desc.total_size * desc.dtype.bytes
+    if symbolic.issymbolic(size):
+        return symbolic.int_ceil(size, ARENA_ALIGNMENT) * ARENA_ALIGNMENT
+    return ((int(size) + ARENA_ALIGNMENT - 1) // ARENA_ALIGNMENT) * ARENA_ALIGNMENT
+
+
+def get_arena_size(sdfg: SDFG, lifetime: dtypes.AllocationLifetime) -> symbolic.SymbolicType:
+    """
+    Returns the size of the memory arena of an SDFG, as assigned by the ``MemoryPlanning`` pass.
+
+    :param sdfg: The SDFG to query.
+    :param lifetime: The allocation lifetime of the planned arrays (``Persistent`` or ``External``).
+    :return: A (possibly symbolic) number of bytes, or zero if no arrays were planned.
+    """
+    ends = [
+        desc.arena_offset + arena_bytes(desc) for desc in sdfg.arrays.values()
+        if getattr(desc, 'arena_offset', None) is not None and desc.lifetime == lifetime
+    ]
+    if not ends:
+        return 0
+    if len(ends) == 1:
+        return ends[0]
+    return sympy.Max(*ends)
+
+
+def _provably_le(a: symbolic.SymbolicType, b: symbolic.SymbolicType) -> bool:
+    """ Returns True if ``a <= b`` holds for all (positive) values of the symbols in both expressions. """
+    diff = sympy.sympify(a - b)
+    if diff.is_Number:
+        return bool(diff <= 0)
+    diff = diff.replace(symbolic.int_ceil, lambda x, y: sympy.ceiling(x / y))
+    diff = diff.subs({s: sympy.Symbol(str(s), positive=True, integer=True) for s in diff.free_symbols})
+    return sympy.simplify(diff).is_nonpositive is True
+
+
+@properties.make_properties
+@experimental_cfg_block_compatible
+class MemoryPlanning(ppl.Pass):
+    """
+    Statically plans the memory of transient host arrays. Computes the liveness of every transient array (the states
+    in which it is accessed, and the states that can be reached between those accesses) and packs arrays whose
+    lifetimes do not overlap into a single memory arena, assigning each array an offset within it. Arrays with
+    symbolic sizes are planned as long as their size only depends on symbols known at initialization time, in which
+    case their offsets are symbolic expressions.
+
+    The arena is allocated once at SDFG initialization and kept in the state struct. If ``external`` is set, the
+    arena is instead provided by the caller (see ``CompiledSDFG.get_workspace_sizes`` and
+    ``CompiledSDFG.set_workspace``).
+    """
+
+    CATEGORY: str = 'Memory Footprint Reduction'
+
+    external = properties.Property(dtype=bool,
+                                   default=False,
+                                   desc='Use an externally-allocated arena instead of allocating it at initialization.')
+    verbose = properties.Property(dtype=bool, default=False, desc='Print information about the memory reduction.')
+
+    def __init__(self, external: bool = False, verbose: bool = False) -> None:
+        super().__init__()
+        self.external = external
+        self.verbose = verbose
+
+    def modifies(self) -> ppl.Modifies:
+        return ppl.Modifies.Descriptors
+
+    def should_reapply(self, modified: ppl.Modifies) -> bool:
+        return modified & (ppl.Modifies.Nodes | ppl.Modifies.Memlets | ppl.Modifies.Descriptors)
+
+    def depends_on(self):
+        return {ap.StateReachability, ap.FindAccessStates}
+
+    def _candidates(self, sdfg: SDFG, access_sets: Dict[str, Set[SDFGState]]) -> List[str]:
+        """ Returns the names of the transient arrays that can be placed in the arena. """
+        init_symbols = set(map(str, sdfg.free_symbols)) | set(sdfg.constants.keys())
+        interstate_arrays = set()
+        for e in sdfg.all_interstate_edges():
+            interstate_arrays |= e.data.free_symbols & sdfg.arrays.keys()
+
+        result = []
+        for name, desc in sdfg.arrays.items():
+            if (not desc.transient or type(desc) is not data.Array or desc.storage != dtypes.StorageType.CPU_Heap
+                    or desc.pool or desc.alignment != 0 or desc.start_offset != 0):
+                continue
+            if desc.lifetime not in (dtypes.AllocationLifetime.Scope, dtypes.AllocationLifetime.State,
+                                     dtypes.AllocationLifetime.SDFG):
+                continue
+            if name in interstate_arrays or name in sdfg.constants_prop or not access_sets.get(name):
+                continue
+            # Size must be known at initialization time
+            if any(str(s) not in init_symbols for s in symbolic.pystr_to_symbolic(arena_bytes(desc)).free_symbols):
+                continue
+
+            # Arrays inside scopes (e.g., per-thread buffers in parallel maps) or initialized to zero on every
+            # allocation cannot be moved to the arena
+            valid = True
+            for state in access_sets[name]:
+                scope_dict = state.scope_dict()
+                for node in state.data_nodes():
+                    if node.data == name and (scope_dict[node] is not None or node.setzero):
+                        valid = False
+                        break
+                if not valid:
+                    break
+            if valid:
+                result.append(name)
+        return result
+
+    @staticmethod
+    def _gap(end: symbolic.SymbolicType, conflicts: List[Tuple[symbolic.SymbolicType, symbolic.SymbolicType]]):
+        """ Returns a sort key for the unused space between ``end`` and the next conflicting array after it. """
+        if symbolic.issymbolic(end) or any(symbolic.issymbolic(s) for s, _ in conflicts):
+            return (True, 0)
+        following = [int(s) - int(end) for s, _ in conflicts if int(s) >= int(end)]
+        if not following:  # End of the arena
+            return (True, 0)
+        return (False, min(following))
+
+    @staticmethod
+    def _precedes(first: Set[SDFGState], second: Set[SDFGState], reachable: Dict[SDFGState, Set[SDFGState]]) -> bool:
+        """ Returns True if all states in ``first`` execute strictly before all states in ``second``. """
+        return all(a is not b and a not in reachable[b] for a in first for b in second)
+
+    def apply_pass(self, sdfg: SDFG, pipeline_results: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Assigns arena offsets to the transient host arrays of the given SDFG.
+
+        :param sdfg: The SDFG to modify.
+        :param pipeline_results: If in the context of a ``Pipeline``, a dictionary that is populated with prior Pass
+                                 results as ``{Pass subclass name: returned object from pass}``. If not run in a
+                                 pipeline, an empty dictionary is expected.
+        :return: A dictionary mapping planned array names to their arena offsets, or None if nothing was planned.
+        """
+        if ap.StateReachability.__name__ in pipeline_results:
+            reachable = pipeline_results[ap.StateReachability.__name__][sdfg.cfg_id]
+        else:
+            reachable = ap.StateReachability().apply_pass(sdfg, {})[sdfg.cfg_id]
+        if ap.FindAccessStates.__name__ in pipeline_results:
+            access_sets = pipeline_results[ap.FindAccessStates.__name__][sdfg.cfg_id]
+        else:
+            access_sets = ap.FindAccessStates().apply_pass(sdfg, {})[sdfg.cfg_id]
+
+        # Storage types must be known to find host arrays
+        infer_types.set_default_schedule_and_storage_types(sdfg, None)
+
+        candidates = self._candidates(sdfg, access_sets)
+        if not candidates:
+            return None
+
+        sizes = {name: arena_bytes(sdfg.arrays[name]) for name in candidates}
+
+        # Place symbolically-sized arrays (which scale with the problem size) first, then the rest by decreasing size
+        order = sorted(candidates, key=lambda n: (not symbolic.issymbolic(sizes[n]), -int(sizes[n])
+                                                  if not symbolic.issymbolic(sizes[n]) else 0, n))
+
+        offsets: Dict[str, symbolic.SymbolicType] = {}
+        for name in order:
+            size = sizes[name]
+            conflicts: List[Tuple[symbolic.SymbolicType, symbolic.SymbolicType]] = [
+                (offsets[other], offsets[other] + sizes[other]) for other in offsets
+                if not (self._precedes(access_sets[name], access_sets[other], reachable)
+                        or self._precedes(access_sets[other], access_sets[name], reachable))
+            ]
+
+            if not conflicts:
+                offsets[name] = 0
+                continue
+
+            # Candidate offsets are the beginning of the arena and the end of every conflicting array. Among the
+            # candidates where the array provably does not overlap a conflicting one, pick the smallest gap (best fit)
+            fitting = []
+            for candidate in [0] + [end for _, end in conflicts]:
+                if all(_provably_le(candidate + size, start) or _provably_le(end, candidate) for start, end in conflicts):
+                    fitting.append((self._gap(candidate + size, conflicts), len(fitting), candidate))
+            if fitting:
+                offsets[name] = min(fitting, key=lambda f: f[:2])[2]
+            else:
+                offsets[name] = sympy.Max(*(end for _, end in conflicts))
+
+        lifetime = dtypes.AllocationLifetime.External if self.external else dtypes.AllocationLifetime.Persistent
+        for name, offset in offsets.items():
+            desc = sdfg.arrays[name]
+            desc.arena_offset = offset
+            desc.lifetime = lifetime
+
+        if self.verbose:
+            memory_before = sum(sizes.values())
+            memory_after = get_arena_size(sdfg, lifetime)
+            print('memory before: ', memory_before, 'B')
+            print('memory after: ', memory_after, 'B')
+
+        return offsets
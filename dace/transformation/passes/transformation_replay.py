@@ -0,0 +1,63 @@
+# Copyright 2019-2024 ETH Zurich and the DaCe authors. All rights reserved.
+from typing import Any, Dict, Optional
+
+from dace import SDFG, dtypes, properties
+from dace.transformation import pass_pipeline as ppl
+
+
+@properties.make_properties
+class ReplayTransformations(ppl.Pass):
+    """
+    Looks up the SDFG in the transformation database and, if the same or a structurally similar SDFG was
+    optimized before, replays the best known transformation sequence on it.
+
+    :see: dace.optimization.transformation_database.TransformationDatabase
+    """
+
+    CATEGORY: str = 'Optimization'
+
+    database = properties.Property(dtype=str,
+                                   default=None,
+                                   allow_none=True,
+                                   desc='Path to the transformation database. If None, uses the '
+                                   '``optimizer.transformation_database`` configuration entry.')
+    similar = properties.Property(dtype=bool,
+                                  default=True,
+                                  desc='Also replay recipes of structurally similar SDFGs that differ in sizes.')
+    validate = properties.Property(dtype=bool, default=True, desc='Validate the SDFG after every transformation.')
+    device = properties.EnumProperty(dtype=dtypes.DeviceType,
+                                     default=None,
+                                     allow_none=True,
+                                     desc='Only replay recipes recorded for this device. If None, replays recipes '
+                                     'of any device.')
+
+    def __init__(self,
+                 database: Optional[str] = None,
+                 similar: bool = True,
+                 device: Optional[dtypes.DeviceType] = None) -> None:
+        super().__init__()
+        self.database = database
+        self.similar = similar
+        self.device = device
+
+    def modifies(self) -> ppl.Modifies:
+        return ppl.Modifies.Everything
+
+    def should_reapply(self, modified: ppl.Modifies) -> bool:
+        return False
+
+    def apply_pass(self, sdfg: SDFG, _: Dict[str, Any]) -> Optional[int]:
+        """
+        Replays the best known recipe on the SDFG.
+
+        :return: The number of replayed transformations, or None if no recipe was found or applied.
+        """
+        from dace.optimization.transformation_database import TransformationDatabase  # Avoid import loop
+
+        recipe = TransformationDatabase(self.database).replay(sdfg,
+                                                              similar=self.similar,
+                                                              validate=self.validate,
+                                                              device=self.device)
+        if recipe is None:
+            return None
+        return len(recipe.sequence)
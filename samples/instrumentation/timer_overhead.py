@@ -0,0 +1,63 @@
+# Copyright 2019-2024 ETH Zurich and the DaCe authors. All rights reserved.
+""" Calibrates the overhead of timer instrumentation per recorded event. """
+import argparse
+import time
+
+import dace
+import numpy as np
+
+N = dace.symbol('N')
+
+
+def make_sdfg(instrumented: bool, parallel: bool) -> dace.SDFG:
+    """ Creates an SDFG with a map in which every tasklet execution is one event. """
+    sdfg = dace.SDFG(f'timer_overhead_{"instrumented" if instrumented else "plain"}')
+    sdfg.add_array('A', [N], dace.float64)
+    state = sdfg.add_state()
+    tasklet, _, _ = state.add_mapped_tasklet('increment',
+                                             dict(i='0:N'),
+                                             dict(a=dace.Memlet('A[i]')),
+                                             'b = a + 1',
+                                             dict(b=dace.Memlet('A[i]')),
+                                             schedule=(dace.ScheduleType.CPU_Multicore
+                                                       if parallel else dace.ScheduleType.Sequential),
+                                             external_edges=True)
+    if instrumented:
+        tasklet.instrument = dace.InstrumentationType.Timer
+    return sdfg
+
+
+def best_runtime(csdfg, A: np.ndarray, repetitions: int) -> float:
+    """ Returns the minimal runtime of the compiled SDFG in seconds. """
+    times = []
+    for _ in range(repetitions):
+        start = time.perf_counter()
+        csdfg(A=A, N=A.shape[0])
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-N', type=int, default=100000, help='Number of events per invocation')
+    parser.add_argument('-r', '--repetitions', type=int, default=5)
+    parser.add_argument('--parallel',
+                        action='store_true',
+                        help='Record events from all threads (the result is then the amortized cost per event)')
+    args = parser.parse_args()
+
+    A = np.random.rand(args.N)
+
+    # Reports are written once, on finalization, such that saving is not part of the measured time
+    with dace.config.set_temporary('instrumentation', 'report_each_invocation', value=False):
+        plain = make_sdfg(False, args.parallel).compile()
+        instrumented = make_sdfg(True, args.parallel).compile()
+
+        t_plain = best_runtime(plain, A, args.repetitions)
+        t_instrumented = best_runtime(instrumented, A, args.repetitions)
+
+    overhead = (t_instrumented - t_plain) / args.N
+    print(f'Events per invocation:     {args.N}')
+    print(f'Uninstrumented runtime:    {t_plain * 1e3:.3f} ms')
+    print(f'Instrumented runtime:      {t_instrumented * 1e3:.3f} ms')
+    print(f'Overhead per event:        {overhead * 1e9:.1f} ns')
@@ -89,5 +89,6 @@ setup(name='dace',
               'sdfg-diff = dace.cli.sdfg_diff:main',
               'fcfd = dace.cli.fcdc:main',
               'daceprof = dace.cli.daceprof:main',
+              'dacebench = dace.cli.dacebench:main',
           ],
       })
@@ -0,0 +1,53 @@
+# Copyright 2019-2024 ETH Zurich and the DaCe authors. All rights reserved.
+import dace
+import numpy as np
+
+
+@dace.program
+def tester(A: dace.float64[20], B: dace.float64[20]):
+    tmp = A + 1
+    tmp += B
+    B[:] = tmp
+    tmp2 = tmp + 2
+    B[:] = tmp2 + 5
+
+
+def _pooled_sdfg():
+    sdfg = tester.to_sdfg(simplify=True)
+    for arr in sdfg.arrays.values():
+        if arr.transient:
+            arr.storage = dace.StorageType.CPU_Heap
+            arr.pool = True
+    return sdfg
+
+
+def test_memory_pool():
+    sdfg = _pooled_sdfg()
+
+    code = sdfg.generate_code()[0].clean_code
+    assert 'dace::MemoryPool mempool' in code
+    assert code.count('mempool.allocate') == 2
+    assert code.count('mempool.release') == 2
+    assert 'delete[]' not in code
+
+    # Buffers are reused across invocations of the same compiled SDFG
+    csdfg = sdfg.compile()
+    for _ in range(3):
+        a = np.random.rand(20)
+        b = np.random.rand(20)
+        expected = np.copy(b)
+        tester.f(a, expected)
+        csdfg(A=a, B=b)
+        assert np.allclose(b, expected)
+
+
+def test_memory_pool_hugepages():
+    sdfg = _pooled_sdfg()
+    with dace.config.set_temporary('compiler', 'cpu', 'mempool_hugepage_threshold', value=0):
+        code = sdfg.generate_code()[0].clean_code
+    assert 'dace::MemoryPool mempool{0}' in code
+
+
+if __name__ == '__main__':
+    test_memory_pool()
+    test_memory_pool_hugepages()
@@ -0,0 +1,123 @@
+# Copyright 2019-2024 ETH Zurich and the DaCe authors. All rights reserved.
+""" Tests explicit vectorization (``Map.simd``) of CPU maps. """
+import dace
+import numpy as np
+import pytest
+
+N = dace.symbol('N')
+
+
+def _maps(sdfg: dace.SDFG):
+    return [n.map for n, _ in sdfg.all_nodes_recursive() if isinstance(n, dace.nodes.MapEntry)]
+
+
+def test_simd_stencil():
+
+    @dace.program
+    def stencil(A: dace.float64[N, N], B: dace.float64[N, N]):
+        for i in dace.map[1:N - 1]:
+            for j in dace.map[1:N - 1]:
+                B[i, j] = 0.25 * (A[i - 1, j] + A[i + 1, j] + A[i, j - 1] + A[i, j + 1])
+
+    sdfg = stencil.to_sdfg()
+    outer, inner = sorted(_maps(sdfg), key=lambda m: m.params[0])
+    outer.schedule = dace.ScheduleType.CPU_Multicore
+    inner.schedule = dace.ScheduleType.Sequential
+    inner.simd = True
+    inner.simd_length = 4
+
+    code = sdfg.generate_code()[0].clean_code
+    assert '#pragma omp simd simdlen(4)' in code
+
+    a = np.random.rand(33, 33)
+    b = np.zeros((33, 33))
+    sdfg(A=a, B=b, N=33)
+    ref = np.zeros((33, 33))
+    ref[1:-1, 1:-1] = 0.25 * (a[:-2, 1:-1] + a[2:, 1:-1] + a[1:-1, :-2] + a[1:-1, 2:])
+    assert np.allclose(b, ref)
+
+
+def test_simd_horizontal_reduction():
+    """ Matrix-vector product with a vectorized dot product in each row. """
+
+    @dace.program
+    def gemv(A: dace.float64[N, N], x: dace.float64[N], y: dace.float64[N], m: dace.float64[N]):
+        for i, j in dace.map[0:N, 0:N]:
+            with dace.tasklet:
+                a << A[i, j]
+                b << x[j]
+                out >> y(1, lambda u, v: u + v)[i]
+                mx >> m(1, lambda u, v: max(u, v))[i]
+                out = a * b
+                mx = a
+
+    sdfg = gemv.to_sdfg()
+    mapobj, = _maps(sdfg)
+    mapobj.schedule = dace.ScheduleType.CPU_Multicore
+    mapobj.simd = True
+
+    code = sdfg.generate_code()[0].clean_code
+    assert 'reduction(+: __dace_simd_' in code
+    assert 'reduction(max: __dace_simd_' in code
+
+    # Local names must not shadow the tasklet connectors
+    A = np.random.rand(37, 37)
+    X = np.random.rand(37)
+    Y = np.zeros(37)
+    M = np.zeros(37)
+    sdfg(A=A, x=X, y=Y, m=M, N=37)
+    assert np.allclose(Y, A @ X)
+    assert np.allclose(M, np.max(A, axis=1))
+
+
+def test_simd_parallel_reduction():
+    """ One-dimensional parallel map that is vectorized in its OpenMP directive. """
+
+    @dace.program
+    def asum(A: dace.float64[N], out: dace.float64[1]):
+        for i in dace.map[0:N]:
+            with dace.tasklet:
+                a << A[i]
+                o >> out(1, lambda u, v: u + v)[0]
+                o = abs(a)
+
+    sdfg = asum.to_sdfg()
+    mapobj, = _maps(sdfg)
+    mapobj.schedule = dace.ScheduleType.CPU_Multicore
+    mapobj.simd = True
+
+    code = sdfg.generate_code()[0].clean_code
+    assert '#pragma omp parallel for simd reduction(+: __dace_simd_' in code
+
+    A = np.random.rand(1001) - 0.5
+    total = np.zeros(1)
+    sdfg(A=A, out=total, N=1001)
+    assert np.allclose(total[0], np.sum(np.abs(A)))
+
+
+def test_simd_conflicting_writes():
+    """ Maps whose lanes may write to the same element are not vectorized. """
+
+    @dace.program
+    def halve(A: dace.float64[N], B: dace.float64[N]):
+        for i in dace.map[0:N]:
+            with dace.tasklet:
+                a << A[i]
+                b >> B(1, lambda u, v: u + v)[i // 2]
+                b = a
+
+    sdfg = halve.to_sdfg()
+    mapobj, = _maps(sdfg)
+    mapobj.schedule = dace.ScheduleType.Sequential
+    mapobj.simd = True
+
+    with pytest.warns(UserWarning, match='cannot be vectorized'):
+        code = sdfg.generate_code()[0].clean_code
+    assert '#pragma omp simd' not in code
+
+
+if __name__ == '__main__':
+    test_simd_stencil()
+    test_simd_horizontal_reduction()
+    test_simd_parallel_reduction()
+    test_simd_conflicting_writes()
@@ -90,6 +90,37 @@ def test_restore():
     assert np.allclose(result, acopy + 5)
 
 
+@pytest.mark.datainstrument
+@pytest.mark.parametrize('compression', ('none', 'zlib'))
+def test_dump_chunked(compression):
+    @dace.program
+    def tester(A: dace.float64[20, 20]):
+        tmp = A + 1
+        return tmp + 5
+
+    sdfg = tester.to_sdfg(simplify=True)
+    _instrument(sdfg, dace.DataInstrumentationType.Save)
+
+    A = np.random.rand(20, 20)
+    with dace.config.set_temporary('instrumentation', 'data', 'format', value='chunked'):
+        with dace.config.set_temporary('instrumentation', 'data', 'chunk_size', value=512):
+            with dace.config.set_temporary('instrumentation', 'data', 'compression', value=compression):
+                result = sdfg(A)
+                assert np.allclose(result, A + 6)
+
+                # Verify instrumented data
+                dreport = sdfg.get_instrumented_data()
+                assert np.allclose(dreport['A'], A)
+                assert np.allclose(dreport['tmp'], A + 1)
+                if compression == 'none':
+                    assert isinstance(dreport.loaded_values['A', 0], np.memmap)
+
+                # Restore from chunked files
+                _instrument(sdfg, dace.DataInstrumentationType.Restore, ignore='return')
+                result = sdfg.call_with_instrumented_data(dreport, A=np.zeros_like(A))
+                assert np.allclose(result, A + 6)
+
+
 @pytest.mark.gpu
 def test_restore_gpu():
     @dace.program
@@ -165,6 +196,39 @@ def test_dinstr_in_loop():
     assert np.allclose(dreport['__return'][-1], result)
 
 
+@pytest.mark.datainstrument
+@pytest.mark.parametrize('policy', ('block', 'drop'))
+def test_dinstr_async(policy):
+    @dace.program
+    def dinstr(A: dace.float64[20]):
+        tmp = np.copy(A)
+        for i in range(20):
+            tmp[i] = np.sum(tmp)
+        return tmp
+
+    sdfg = dinstr.to_sdfg(simplify=True)
+    _instrument(sdfg, dace.DataInstrumentationType.Save)
+
+    A = np.random.rand(20)
+    with dace.config.set_temporary('instrumentation', 'data', 'asynchronous', value=True):
+        with dace.config.set_temporary('instrumentation', 'data', 'staging_buffer_size', value=1):
+            with dace.config.set_temporary('instrumentation', 'data', 'backpressure', value=policy):
+                csdfg = sdfg.compile()
+    result = csdfg(A=A)
+    csdfg.finalize()  # Writes all pending saves
+
+    dreport = sdfg.get_instrumented_data()
+    if policy == 'block':
+        assert len(dreport.files['__return']) == 1 + 2 * 20
+        assert np.allclose(dreport.get_first_version('__return'), A)
+        assert np.allclose(dreport['__return'][-1], result)
+    else:
+        # Only the first save (of ``A``) is guaranteed to find the staging buffer empty, any later save may be dropped.
+        # Skipped saves do not create versions.
+        assert np.allclose(dreport.get_first_version('A'), A)
+        assert len(dreport.files.get('__return', [])) <= 1 + 2 * 20
+
+
 @pytest.mark.datainstrument
 def test_dinstr_strided():
     @dace.program
@@ -375,10 +439,14 @@ if __name__ == '__main__':
     test_symbol_dump_conditional()
     test_dump_gpu()
     test_restore()
+    test_dump_chunked('none')
+    test_dump_chunked('zlib')
     test_symbol_restore()
     test_restore_gpu()
     test_dinstr_versioning()
     test_dinstr_in_loop()
+    test_dinstr_async('block')
+    test_dinstr_async('drop')
     test_dinstr_strided()
     test_dinstr_symbolic()
     test_dinstr_hooks()
@@ -0,0 +1,88 @@
+# Copyright 2019-2024 ETH Zurich and the DaCe authors. All rights reserved.
+""" Tests just-in-time specialization of compiled SDFGs to their symbol values. """
+import dace
+from dace.codegen.specialization import specializable_symbols
+import numpy as np
+
+N = dace.symbol('N')
+M = dace.symbol('M')
+
+
+@dace.program
+def scale_rows(A: dace.float64[N, M], x: dace.float64[N]):
+    for i, j in dace.map[0:N, 0:M]:
+        A[i, j] = A[i, j] * x[i]
+
+
+def test_specializable_symbols():
+    sdfg = scale_rows.to_sdfg()
+    assert specializable_symbols(sdfg) == {'N', 'M'}
+    sdfg.specialize({'M': 4})
+    assert specializable_symbols(sdfg) == {'N'}
+
+
+def test_specialization_sync():
+    sdfg = scale_rows.to_sdfg()
+    sdfg.name = 'scale_rows_sync'
+    csdfg = sdfg.compile()
+    specializer = csdfg.specialize_symbols(background=False)
+    assert specializer.symbols == ['M', 'N']
+
+    A = np.random.rand(20, 30)
+    x = np.random.rand(20)
+    expected = A * x[:, None]
+    csdfg(A=A, x=x, N=20, M=30)
+    assert np.allclose(A, expected)
+
+    variant = specializer.variants[(30, 20)]
+    assert variant.sdfg.constants['N'] == 20
+    assert 'N' not in variant.sdfg.free_symbols
+
+    # Same symbols reuse the variant
+    csdfg(A=A, x=x, N=20, M=30)
+    assert len(specializer.variants) == 1
+
+
+def test_specialization_background():
+    """ Calls use the generic program until the variant is compiled. """
+    sdfg = scale_rows.to_sdfg()
+    sdfg.name = 'scale_rows_background'
+    csdfg = sdfg.compile()
+    specializer = csdfg.specialize_symbols()
+
+    A = np.random.rand(10, 12)
+    x = np.random.rand(10)
+    expected = A * x[:, None]
+    csdfg(A=A, x=x, N=10, M=12)
+    assert np.allclose(A, expected)
+
+    specializer.wait()
+    A = np.random.rand(10, 12)
+    expected = A * x[:, None]
+    csdfg(A=A, x=x, N=10, M=12)
+    assert np.allclose(A, expected)
+    assert (12, 10) in specializer.variants
+
+
+def test_specialization_lru():
+    sdfg = scale_rows.to_sdfg()
+    sdfg.name = 'scale_rows_lru'
+    csdfg = sdfg.compile()
+    specializer = csdfg.specialize_symbols(cache_size=2, background=False)
+
+    for n in (4, 5, 6, 4):
+        A = np.random.rand(n, 3)
+        x = np.random.rand(n)
+        expected = A * x[:, None]
+        csdfg(A=A, x=x, N=n, M=3)
+        assert np.allclose(A, expected)
+
+    # (3, 5) was least recently used when (3, 4) was recompiled
+    assert list(specializer.variants.keys()) == [(3, 6), (3, 4)]
+
+
+if __name__ == '__main__':
+    test_specializable_symbols()
+    test_specialization_sync()
+    test_specialization_background()
+    test_specialization_lru()
@@ -0,0 +1,125 @@
+# Copyright 2019-2024 ETH Zurich and the DaCe authors. All rights reserved.
+""" Tests profile-guided optimization builds of SDFGs. """
+import os
+
+import dace
+from dace.codegen import compiler
+import numpy as np
+
+N = dace.symbol('N')
+
+
+@dace.program
+def branchy(A: dace.float64[N], B: dace.float64[N]):
+    for i in dace.map[0:N]:
+        with dace.tasklet:
+            a << A[i]
+            b >> B[i]
+            if a > 0.9:
+                b = a * a
+            elif a > 0.5:
+                b = a + 1
+            else:
+                b = -a
+
+
+def _reference(a: np.ndarray) -> np.ndarray:
+    return np.where(a > 0.9, a * a, np.where(a > 0.5, a + 1, -a))
+
+
+def _has_profile(sdfg: dace.SDFG) -> bool:
+    return os.path.isdir(os.path.join(sdfg.build_folder, 'build', 'pgo'))
+
+
+def test_pgo_callable(tmp_path):
+    sdfg = branchy.to_sdfg()
+    # Profiles persist in the build folder, so build into a fresh one
+    sdfg.build_folder = str(tmp_path)
+    assert not _has_profile(sdfg)
+    a = np.random.rand(1000)
+    invocations = []
+
+    def representative_run(csdfg):
+        invocations.append(csdfg)
+        csdfg(A=a, B=np.zeros_like(a), N=a.shape[0])
+
+    csdfg = sdfg.compile(pgo=representative_run)
+    assert len(invocations) == 1
+
+    profile_folder = compiler.get_pgo_profile_folder(sdfg.build_folder)
+    assert os.path.isdir(profile_folder)
+    assert len(os.listdir(profile_folder)) > 0
+
+    b = np.zeros_like(a)
+    csdfg(A=a, B=b, N=a.shape[0])
+    assert np.allclose(b, _reference(a))
+
+
+def test_pgo_profile_reuse(tmp_path):
+    """ A recorded profile is reused when the same SDFG is rebuilt. """
+    sdfg = branchy.to_sdfg()
+    sdfg.name = 'branchy_reuse'
+    sdfg.build_folder = str(tmp_path)
+    assert not _has_profile(sdfg)
+    a = np.random.rand(100)
+    invocations = []
+
+    def representative_run(csdfg):
+        invocations.append(csdfg)
+        csdfg(A=a, B=np.zeros_like(a), N=a.shape[0])
+
+    sdfg.compile(pgo=representative_run)
+    csdfg = sdfg.compile(pgo=representative_run)
+    assert len(invocations) == 1
+
+    b = np.zeros_like(a)
+    csdfg(A=a, B=b, N=a.shape[0])
+    assert np.allclose(b, _reference(a))
+
+
+def test_pgo_data_report(tmp_path, monkeypatch):
+    """ Replays arguments captured through data instrumentation. """
+    sdfg = branchy.to_sdfg()
+    sdfg.name = 'branchy_replay'
+    sdfg.build_folder = str(tmp_path)
+    for node, _ in sdfg.all_nodes_recursive():
+        if isinstance(node, dace.nodes.AccessNode) and node.data == 'A':
+            node.instrument = dace.DataInstrumentationType.Save
+    sdfg.start_state.symbol_instrument = dace.DataInstrumentationType.Save
+
+    a = np.random.rand(1000)
+    sdfg(A=a, B=np.zeros_like(a), N=a.shape[0])
+    dreport = sdfg.get_instrumented_data()
+    assert not _has_profile(sdfg)
+
+    # Record the replayed arguments
+    replayed = []
+    replay_arguments = compiler._pgo_replay_arguments
+
+    def record_replay(*args, **kwargs):
+        arguments = replay_arguments(*args, **kwargs)
+        replayed.append(arguments)
+        return arguments
+
+    monkeypatch.setattr(compiler, '_pgo_replay_arguments', record_replay)
+
+    csdfg = sdfg.compile(pgo=dreport)
+    assert len(replayed) == 1
+    assert np.allclose(replayed[0]['A'], a)
+    assert replayed[0]['N'] == a.shape[0]
+    assert len(os.listdir(compiler.get_pgo_profile_folder(sdfg.build_folder))) > 0
+
+    b = np.zeros_like(a)
+    csdfg(A=a, B=b, N=a.shape[0])
+    assert np.allclose(b, _reference(a))
+
+
+if __name__ == '__main__':
+    import tempfile
+    import pytest
+    with tempfile.TemporaryDirectory() as folder:
+        test_pgo_callable(folder)
+    with tempfile.TemporaryDirectory() as folder:
+        test_pgo_profile_reuse(folder)
+    with tempfile.TemporaryDirectory() as folder, pytest.MonkeyPatch.context() as monkeypatch:
+        test_pgo_data_report(folder, monkeypatch)
@@ -0,0 +1,59 @@
+# Copyright 2019-2024 ETH Zurich and the DaCe authors. All rights reserved.
+""" Tests splitting generated code into multiple translation units. """
+import dace
+from dace.codegen.targets.cpp import mangle_dace_state_struct_name
+import numpy as np
+
+N = dace.symbol('N')
+
+
+@dace.program
+def nested_a(A: dace.float64[N], B: dace.float64[N]):
+    for i in dace.map[0:N]:
+        B[i] = A[i] * 2
+
+
+@dace.program
+def nested_b(B: dace.float64[N], C: dace.float64[N]):
+    for i in dace.map[0:N]:
+        C[i] = B[i] + 1
+
+
+@dace.program
+def split_program(A: dace.float64[N], C: dace.float64[N]):
+    B = np.ndarray([N], dtype=np.float64)
+    nested_a(A, B)
+    nested_b(B, C)
+
+
+def test_split_translation_units():
+    sdfg = split_program.to_sdfg(simplify=False)
+    with dace.config.set_temporary('compiler', 'split_translation_units', value=1):
+        code_objects = sdfg.generate_code()
+        names = [obj.name for obj in code_objects]
+        assert f'{sdfg.name}_shared' in names
+        assert f'{sdfg.name}_0' in names and f'{sdfg.name}_1' in names
+
+        frame = next(obj for obj in code_objects if obj.name == sdfg.name and obj.language == 'cpp')
+        assert f'#include "{sdfg.name}_shared.h"' in frame.clean_code
+        # State struct is declared in the shared header
+        assert f'struct {mangle_dace_state_struct_name(sdfg)} {{' not in frame.clean_code
+
+        a = np.random.rand(20)
+        c = np.zeros(20)
+        sdfg(A=a, C=c, N=20)
+    assert np.allclose(c, a * 2 + 1)
+
+
+def test_split_translation_units_grouping():
+    """ Functions are grouped into units of the configured size. """
+    sdfg = split_program.to_sdfg(simplify=False)
+    with dace.config.set_temporary('compiler', 'split_translation_units', value=100000):
+        code_objects = sdfg.generate_code()
+    units = [obj for obj in code_objects if obj.name.startswith(f'{sdfg.name}_') and obj.language == 'cpp']
+    assert [obj.name for obj in units if obj.name != f'{sdfg.name}_main'] == [f'{sdfg.name}_0']
+
+
+if __name__ == '__main__':
+    test_split_translation_units()
+    test_split_translation_units_grouping()
@@ -0,0 +1,80 @@
+# Copyright 2019-2024 ETH Zurich and the DaCe authors. All rights reserved.
+""" Tests outlining and deduplication of tasklets into shared functions. """
+import dace
+import numpy as np
+
+N = dace.symbol('N')
+
+
+def _repeated_tasklets_sdfg(copies: int) -> dace.SDFG:
+    """ Creates an SDFG with the same computation in several states, using different connector names in each. """
+    sdfg = dace.SDFG('repeated_tasklets')
+    sdfg.add_array('A', [N], dace.float64)
+    sdfg.add_array('B', [N], dace.float64)
+    state = sdfg.add_state()
+    for k in range(copies):
+        if k > 0:
+            state = sdfg.add_state_after(state)
+        inp, out = f'inp{k}', f'out{k}'
+        state.add_mapped_tasklet(f'scale_{k}',
+                                 dict(i='0:N'), {inp: dace.Memlet('B[i]' if k > 0 else 'A[i]')},
+                                 f'{out} = {inp} * 2.0 + 1.0', {out: dace.Memlet('B[i]')},
+                                 external_edges=True)
+    return sdfg
+
+
+def test_tasklet_deduplication():
+    sdfg = _repeated_tasklets_sdfg(4)
+    with dace.config.set_temporary('compiler', 'cpu', 'outline_tasklets', value=True):
+        code = sdfg.generate_code()[0].clean_code
+        assert code.count('inline void __dace_tasklet_') == 1
+        funcname = code[code.find('__dace_tasklet_'):].split('(')[0]
+        assert code.count(f'{funcname}(') == 5  # Definition and four calls
+
+        a = np.random.rand(20)
+        b = np.zeros(20)
+        sdfg(A=a, B=b, N=20)
+    expected = a
+    for _ in range(4):
+        expected = expected * 2.0 + 1.0
+    assert np.allclose(b, expected)
+
+
+def test_tasklet_outlining_distinct():
+    """ Tasklets with different code or types are not merged. """
+
+    @dace.program
+    def distinct(A: dace.float64[N], B: dace.float64[N], C: dace.int32[N]):
+        for i in dace.map[0:N]:
+            with dace.tasklet:
+                a << A[i]
+                b >> B[i]
+                b = a * 2.0
+        for i in dace.map[0:N]:
+            with dace.tasklet:
+                a << A[i]
+                b >> B(1, lambda x, y: x + y)[i]
+                b = a * 3.0
+        for i in dace.map[0:N]:
+            with dace.tasklet:
+                c << C[i]
+                d >> C[i]
+                d = c * 2
+
+    sdfg = distinct.to_sdfg(simplify=False)
+    with dace.config.set_temporary('compiler', 'cpu', 'outline_tasklets', value=True):
+        code = sdfg.generate_code()[0].clean_code
+        assert code.count('inline void __dace_tasklet_') == 3
+
+        # Local names must not shadow the tasklet connectors
+        A = np.random.rand(20)
+        B = np.zeros(20)
+        C = np.arange(20, dtype=np.int32)
+        sdfg(A=A, B=B, C=C, N=20)
+    assert np.allclose(B, 5 * A)
+    assert np.array_equal(C, 2 * np.arange(20))
+
+
+if __name__ == '__main__':
+    test_tasklet_deduplication()
+    test_tasklet_outlining_distinct()
@@ -0,0 +1,80 @@
+# Copyright 2019-2024 ETH Zurich and the DaCe authors. All rights reserved.
+import os
+
+import numpy as np
+
+import dace
+from dace.cli import dacebench
+
+
+def test_detect_regressions():
+    history = [dict(results={'suite.kernel': dict(compile=100.0, runtime=10.0)}) for _ in range(3)]
+    history.append(dict(results={'suite.kernel': dict(compile=1000.0, runtime=10.0)}))
+    history.append(dict(results={'suite.other': dict(runtime=5.0)}))
+
+    # The outlier in the history does not affect the median baseline
+    results = {'suite.kernel': dict(compile=105.0, runtime=12.0), 'suite.new': dict(runtime=1.0)}
+    regressions = dacebench.detect_regressions(history, results, threshold=0.1)
+    assert regressions == [('suite.kernel', 'runtime', 10.0, 12.0)]
+
+    # Only the last run forms the baseline
+    regressions = dacebench.detect_regressions(history, results, threshold=0.1, window=1)
+    assert regressions == [('suite.kernel', 'runtime', 10.0, 12.0)]
+    assert dacebench.detect_regressions(history, results, threshold=0.5) == []
+
+
+def test_run_benchmark(tmp_path):
+    benchfile = os.path.join(tmp_path, 'suite.py')
+    with open(benchfile, 'w') as fp:
+        fp.write('''
+import dace
+import numpy as np
+
+N = dace.symbol('N')
+
+@dace.program
+def scale(A: dace.float64[N]):
+    A *= 2
+
+def bench_scale():
+    return scale, dict(A=np.random.rand(1000))
+
+def bench_jit():
+    def add(A, B):
+        return A + B
+    return add, dict(A=np.random.rand(20), B=np.random.rand(20))
+''')
+    benchmarks = dacebench.discover_benchmarks([str(tmp_path)])
+    assert sorted(benchmarks.keys()) == ['suite.jit', 'suite.scale']
+    assert list(dacebench.discover_benchmarks([benchfile], 'suite.s*').keys()) == ['suite.scale']
+
+    results = {name: dacebench.measure(factory, repetitions=3) for name, factory in benchmarks.items()}
+    for metrics in results.values():
+        assert set(metrics.keys()) == set(dacebench.METRICS)
+        assert all(np.isfinite(v) and v >= 0 for v in metrics.values())
+
+    # Store and reload history
+    history_file = os.path.join(tmp_path, 'history', 'history.json')
+    dacebench.save_history(history_file, [dacebench.make_run(results)])
+    history = dacebench.load_history(history_file)
+    assert len(history) == 1 and history[0]['results'] == results
+
+
+def test_compile_repeated():
+    """ Every run performs a full build, rather than reusing the build of the previous run. """
+
+    @dace.program
+    def dacebench_test_compile(A: dace.float64[20, 20], B: dace.float64[20, 20]):
+        return np.sin(A) * B + A
+
+    def factory():
+        return dacebench_test_compile, dict(A=np.random.rand(20, 20), B=np.random.rand(20, 20))
+
+    compile_times = [dacebench.measure(factory, repetitions=1, warmup=0)['compile'] for _ in range(3)]
+    # A cached build takes a small fraction of the time of a full build
+    assert min(compile_times) > 0.3 * max(compile_times)
+
+
+if __name__ == '__main__':
+    test_detect_regressions()
+    test_compile_repeated()
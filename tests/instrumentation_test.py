@@ -2,11 +2,13 @@
 """ Tests that generate various instrumentation reports with timers and
     performance counters. """
 
+import os
 import pytest
 import numpy as np
 import sys
 
 import dace
+from dace.codegen.instrumentation.report import InstrumentationReport
 from dace.sdfg import nodes
 from dace.transformation.interstate import GPUTransformSDFG
 
@@ -62,6 +64,195 @@ def test_timer():
     onetest(dace.InstrumentationType.Timer)
 
 
+def test_timer_multithreaded():
+    """ Events recorded concurrently by all threads of a parallel map are merged into one report. """
+    sdfg = dace.SDFG('instrumentation_test_multithreaded')
+    sdfg.add_array('A', [N], dace.float64)
+    state = sdfg.add_state()
+    tasklet, _, _ = state.add_mapped_tasklet('scale', dict(i='0:N'), dict(a=dace.Memlet('A[i]')),
+                                             'b = a * 2', dict(b=dace.Memlet('A[i]')),
+                                             external_edges=True)
+    tasklet.instrument = dace.InstrumentationType.Timer
+
+    size = 10000
+    A = np.random.rand(size)
+    expected = A * 2
+    sdfg.clear_instrumentation_reports()
+    sdfg(A=A, N=size)
+    assert np.allclose(A, expected)
+
+    report = sdfg.get_latest_report()
+    assert len(report.events) == size
+    timestamps = [event.timestamp for event in report.events]
+    assert timestamps == sorted(timestamps)
+
+
+def test_timer_binary_report():
+    """ Binary reports are streamed by the runtime and summarized like JSON reports. """
+    sdfg = dace.SDFG('instrumentation_test_binary')
+    sdfg.add_array('A', [N], dace.float64)
+    state = sdfg.add_state()
+    tasklet, _, _ = state.add_mapped_tasklet('scale', dict(i='0:N'), dict(a=dace.Memlet('A[i]')),
+                                             'b = a * 2', dict(b=dace.Memlet('A[i]')),
+                                             external_edges=True)
+    tasklet.instrument = dace.InstrumentationType.Timer
+    state.instrument = dace.InstrumentationType.Timer
+
+    size = 10000
+    A = np.random.rand(size)
+    sdfg.clear_instrumentation_reports()
+    with dace.config.set_temporary('instrumentation', 'report_format', value='binary'):
+        sdfg(A=A, N=size)
+
+    path = sdfg.get_latest_report_path()
+    assert path.endswith('.dacereport')
+    report = sdfg.get_latest_report()
+    assert report.sdfg_hash
+    assert len(report.columns['ts']) == size + 1
+
+    summary = report.summary(percentiles=(50, 99))
+    tasklet_stats = [stats for (uuid, _, _), stats in summary.items() if uuid[2] == state.node_id(tasklet)]
+    assert sum(stats['count'] for stats in tasklet_stats) == size
+    assert all(stats['min'] <= stats['p50'] <= stats['p99'] <= stats['max'] for stats in tasklet_stats)
+
+    # Export a small window to Chrome Tracing format
+    start = int(report.columns['ts'].min())
+    window = report.events_in_window(start, start + 1)
+    assert 0 < len(window) <= size + 1
+    window_path = os.path.join(sdfg.build_folder, 'window.json')
+    report.export_chrome_trace(window_path, start, start + 1)
+    exported = InstrumentationReport(window_path)
+    assert len(exported.events) == len(window)
+
+
+def _timed_tasklet_sdfg(name: str):
+    sdfg = dace.SDFG(name)
+    sdfg.add_array('A', [N], dace.float64)
+    state = sdfg.add_state()
+    tasklet, _, _ = state.add_mapped_tasklet('scale', dict(i='0:N'), dict(a=dace.Memlet('A[i]')),
+                                             'b = a * 2', dict(b=dace.Memlet('A[i]')),
+                                             schedule=dace.ScheduleType.Sequential,
+                                             external_edges=True)
+    tasklet.instrument = dace.InstrumentationType.Timer
+    return sdfg, state.node_id(tasklet)
+
+
+def test_timer_sampling_interval():
+    sdfg, tasklet_id = _timed_tasklet_sdfg('instrumentation_test_sampling_interval')
+    size = 1000
+    A = np.random.rand(size)
+    sdfg.clear_instrumentation_reports()
+    with dace.config.set_temporary('instrumentation', 'sampling', 'interval', value=10):
+        sdfg(A=A, N=size)
+
+    report = sdfg.get_latest_report()
+    assert report.sampling == {'Timer': 10}
+    stats = [stats for (uuid, _, _), stats in report.summary().items() if uuid[2] == tasklet_id]
+    assert len(stats) == 1
+    assert stats[0]['count'] == size // 10
+    assert stats[0]['estimated_count'] == size
+
+
+def test_timer_sampling_per_provider():
+    """ Per-provider settings override the global sampling configuration. """
+    sdfg, tasklet_id = _timed_tasklet_sdfg('instrumentation_test_sampling_provider')
+    size = 1000
+    A = np.random.rand(size)
+    sdfg.clear_instrumentation_reports()
+    with dace.config.set_temporary('instrumentation', 'sampling', 'providers', value="{'Timer': {'fraction': 0.25}}"):
+        sdfg(A=A, N=size)
+
+    report = sdfg.get_latest_report()
+    assert report.sampling == {'Timer': 4}
+    stats = [stats for (uuid, _, _), stats in report.summary().items() if uuid[2] == tasklet_id][0]
+    assert 0 < stats['count'] < size
+    assert stats['estimated_count'] == stats['count'] * 4
+
+
+def test_timer_sampling_budget():
+    """ The overhead budget caps the number of samples per call. """
+    sdfg, tasklet_id = _timed_tasklet_sdfg('instrumentation_test_sampling_budget')
+    size = 100000
+    A = np.random.rand(size)
+    sdfg.clear_instrumentation_reports()
+    with dace.config.set_temporary('instrumentation', 'sampling', 'budget', value=10.0):
+        sdfg(A=A, N=size)
+
+    report = sdfg.get_latest_report()
+    timer_events = [event for event in report.events if event.category == 'Timer' and event.uuid[2] == tasklet_id]
+    assert 0 < len(timer_events) < size
+    assert any(event.category == 'Sampling' for event in report.events)
+
+    # Executions skipped over budget are accounted for in the estimates
+    stats = [stats for (uuid, _, _), stats in report.summary().items() if uuid[2] == tasklet_id]
+    assert stats[0]['weight'] > 1
+    assert sum(s['estimated_count'] for s in stats) == pytest.approx(size)
+
+
+@pytest.mark.skipif(not sys.platform.startswith('linux'), reason='perf_event is only available on Linux')
+def test_perf_counters():
+    sdfg = dace.SDFG('instrumentation_test_perf_counters')
+    sdfg.add_array('A', [N], dace.float64)
+    state = sdfg.add_state()
+    _, me, _ = state.add_mapped_tasklet('work',
+                                        dict(i='0:N'),
+                                        dict(a=dace.Memlet('A[i]')),
+                                        'b = a * 2 + 1',
+                                        dict(b=dace.Memlet('A[i]')),
+                                        schedule=dace.ScheduleType.CPU_Multicore,
+                                        external_edges=True)
+    me.map.instrument = dace.InstrumentationType.Perf_Counters
+    state.instrument = dace.InstrumentationType.Perf_Counters
+
+    # Software counters are available even where hardware counters are not exposed (e.g., in virtual machines)
+    with dace.config.set_temporary('instrumentation', 'perf_event', 'counters', value="['task-clock', 'page-faults']"):
+        A = np.random.rand(100000)
+        expected = A * 2 + 1
+        sdfg(A=A, N=100000)
+    assert np.allclose(A, expected)
+
+    report = sdfg.get_latest_report()
+    map_uuid = (sdfg.cfg_id, sdfg.node_id(state), state.node_id(me))
+    state_uuid = (sdfg.cfg_id, sdfg.node_id(state), -1)
+    counters = report.counters[map_uuid]['Map work_map']
+    assert set(counters.keys()) == {'task-clock', 'page-faults'}
+    assert len(counters['task-clock']) >= 1  # One entry per thread
+    assert sum(sum(values) for values in counters['task-clock'].values()) > 0
+    assert 'task-clock' in report.counters[state_uuid]['State ' + state.label]
+
+
+def test_memory_usage():
+    sdfg = dace.SDFG('instrumentation_test_memory_usage')
+    sdfg.add_array('A', [N], dace.float64)
+    sdfg.add_array('B', [N], dace.float64)
+    sdfg.add_transient('tmp', [N], dace.float64)
+    state = sdfg.add_state()
+    state.add_mapped_tasklet('square',
+                             dict(i='0:N'),
+                             dict(a=dace.Memlet('A[i]')),
+                             'b = a * a',
+                             dict(b=dace.Memlet('tmp[i]')),
+                             external_edges=True)
+    tmp = next(n for n in state.data_nodes() if n.data == 'tmp')
+    state.add_nedge(tmp, state.add_write('B'), dace.Memlet('tmp[0:N]'))
+    state.instrument = dace.InstrumentationType.Memory_Usage
+    sdfg.instrument = dace.InstrumentationType.Memory_Usage
+
+    A = np.random.rand(1000)
+    B = np.zeros_like(A)
+    sdfg(A=A, B=B, N=1000)
+    assert np.allclose(B, A * A)
+
+    usage = sdfg.get_latest_report().memory_usage()
+    state_usage = usage[(sdfg.cfg_id, sdfg.node_id(state), -1)]['State ' + state.label]
+    assert state_usage['peak_bytes'] == 1000 * 8
+    assert state_usage['live_bytes'] == 0
+    assert state_usage['allocations'] == 1
+    assert state_usage['deallocations'] == 1
+    assert state_usage['allocated_bytes'] == 1000 * 8
+    assert usage[(sdfg.cfg_id, -1, -1)]['SDFG ' + sdfg.name]['peak_bytes'] == 1000 * 8
+
+
 #@pytest.mark.papi
 @pytest.mark.skip
 def test_papi():
@@ -76,6 +267,13 @@ def test_gpu_events():
 
 if __name__ == '__main__':
     test_timer()
+    test_timer_multithreaded()
+    test_timer_binary_report()
+    test_timer_sampling_interval()
+    test_timer_sampling_per_provider()
+    test_timer_sampling_budget()
+    test_perf_counters()
+    test_memory_usage()
     test_papi()
     if len(sys.argv) > 1 and sys.argv[1] == 'gpu':
         test_gpu_events()
@@ -5,6 +5,8 @@ Tests hooks that can be used to extend DaCe functionality.
 
 import dace
 import numpy as np
+import os
+import tempfile
 from contextlib import contextmanager
 
 
@@ -80,6 +82,43 @@ def test_profile():
     assert prof.times[1][0].name.endswith('test1')
 
 
+def test_latency_histograms():
+    @dace.program
+    def tester(A: dace.float64[20]):
+        return A + 1
+
+    A = np.random.rand(20)
+    csdfg = tester.to_sdfg().compile()
+    assert csdfg.stats() is None
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        filename = os.path.join(tmpdir, 'latency.prom')
+        with dace.latency_histograms(prometheus_file=filename) as recorder:
+            for _ in range(20):
+                result = csdfg(A=A)
+            # Arguments of fast calls are already marshalled
+            csdfg.fast_call(*csdfg._lastargs)
+
+        assert np.allclose(result, A + 1)
+        assert os.path.isfile(filename)
+        with open(filename, 'r') as fp:
+            contents = fp.read()
+
+    stats = csdfg.stats()
+    assert recorder.stats == [stats]
+    assert stats.marshal.count == 20
+    assert stats.native.count == 21
+    summary = stats.summary()
+    assert 0 < summary['native']['min'] <= summary['native']['p50'] <= summary['native']['p99'] <= summary['native']['max']
+    assert 'phase="native"} 21' in contents
+    assert 'phase="marshal",le="+Inf"} 20' in contents
+
+    # Calls outside the context are not recorded
+    csdfg(A=A)
+    assert stats.native.count == 21
+
+
 if __name__ == '__main__':
     test_hooks()
     test_profile()
+    test_latency_histograms()
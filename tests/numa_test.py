@@ -0,0 +1,80 @@
+# Copyright 2019-2024 ETH Zurich and the DaCe authors. All rights reserved.
+""" Tests NUMA page placement policies with a STREAM-like triad benchmark. """
+import time
+
+import dace
+import numpy as np
+
+N = dace.symbol('N')
+
+
+def _triad_sdfg(policy: dace.dtypes.NUMAPolicy) -> dace.SDFG:
+    """ STREAM triad (a = b + s * c) on transient arrays, which are initialized and consumed by parallel maps. """
+
+    @dace.program
+    def triad(result: dace.float64[N], scalar: dace.float64, repetitions: dace.int64):
+        a = np.ndarray([N], dtype=np.float64)
+        b = np.ndarray([N], dtype=np.float64)
+        c = np.ndarray([N], dtype=np.float64)
+        for i in dace.map[0:N]:
+            b[i] = 1.0
+            c[i] = 2.0
+        for _ in range(repetitions):
+            for i in dace.map[0:N]:
+                a[i] = b[i] + scalar * c[i]
+        result[:] = a
+
+    sdfg = triad.to_sdfg(simplify=True)
+    for name, desc in sdfg.arrays.items():
+        if desc.transient and isinstance(desc, dace.data.Array):
+            desc.storage = dace.StorageType.CPU_Heap
+            desc.lifetime = dace.AllocationLifetime.SDFG
+            desc.numa_policy = policy
+    for node, _ in sdfg.all_nodes_recursive():
+        if isinstance(node, dace.nodes.MapEntry):
+            node.map.schedule = dace.ScheduleType.CPU_Multicore
+            node.map.omp_schedule = dace.OMPScheduleType.Static
+            node.map.omp_proc_bind = dace.dtypes.OMPProcBindType.Spread
+    return sdfg
+
+
+def test_first_touch():
+    sdfg = _triad_sdfg(dace.dtypes.NUMAPolicy.FirstTouch)
+    code = sdfg.generate_code()[0].clean_code
+    assert '#pragma omp parallel for schedule(static) proc_bind(spread)' in code
+    assert '__dace_page' in code
+
+    result = np.zeros(1000)
+    sdfg(result=result, scalar=3.0, repetitions=2, N=1000)
+    assert np.allclose(result, 7.0)
+
+
+def test_interleave_and_bind():
+    for policy in (dace.dtypes.NUMAPolicy.Interleave, dace.dtypes.NUMAPolicy.Bind):
+        sdfg = _triad_sdfg(policy)
+        code = sdfg.generate_code()[0].clean_code
+        assert f'dace::numa::Policy::{policy.name}' in code
+        assert 'dace::numa::release' in code
+
+        result = np.zeros(1000)
+        sdfg(result=result, scalar=3.0, repetitions=1, N=1000)
+        assert np.allclose(result, 7.0)
+
+
+def benchmark(size: int = 2**25, repetitions: int = 20):
+    """ Prints the triad bandwidth for each NUMA policy. On multi-socket machines, first-touch should be fastest. """
+    for policy in dace.dtypes.NUMAPolicy:
+        csdfg = _triad_sdfg(policy).compile()
+        result = np.zeros(size)
+        csdfg(result=result, scalar=3.0, repetitions=1, N=size)  # Warmup
+        start = time.perf_counter()
+        csdfg(result=result, scalar=3.0, repetitions=repetitions, N=size)
+        elapsed = time.perf_counter() - start
+        # Triad reads two arrays and writes one
+        print(f'{policy.name:>12}: {3 * 8 * size * repetitions / elapsed / 1e9:.2f} GB/s')
+
+
+if __name__ == '__main__':
+    test_first_touch()
+    test_interleave_and_bind()
+    benchmark()
@@ -41,6 +41,7 @@ def test_lack_of_omp_props():
     assert (not key_exists(json, 'omp_num_threads'))
     assert (not key_exists(json, 'omp_schedule'))
     assert (not key_exists(json, 'omp_chunk_size'))
+    assert (not key_exists(json, 'omp_proc_bind'))
 
 
 def test_omp_props():
@@ -70,10 +71,15 @@ def test_omp_props():
     code = sdfg.generate_code()[0].clean_code
     assert ("#pragma omp parallel for schedule(guided, 5) num_threads(10)" in code)
 
+    mapnode.omp_proc_bind = dtypes.OMPProcBindType.Spread
+    code = sdfg.generate_code()[0].clean_code
+    assert ("#pragma omp parallel for schedule(guided, 5) num_threads(10) proc_bind(spread)" in code)
+
     json = sdfg.to_json()
     assert (key_exists(json, 'omp_num_threads'))
     assert (key_exists(json, 'omp_schedule'))
     assert (key_exists(json, 'omp_chunk_size'))
+    assert (key_exists(json, 'omp_proc_bind'))
 
 
 def test_omp_parallel():
@@ -174,6 +180,179 @@ def test_omp_get_ntid():
     assert np.allclose(a, 3)
 
 
+def _independent_states_sdfg():
+    sdfg = dace.SDFG('omp_tasks')
+    for name in 'ABCDE':
+        sdfg.add_array(name, [20], dace.float64)
+
+    # Two independent states, followed by one that depends on both
+    first = sdfg.add_state('first')
+    first.add_mapped_tasklet('inc', dict(i='0:20'), dict(a=dace.Memlet('A[i]')),
+                             'b = a + 1',
+                             dict(b=dace.Memlet('B[i]')),
+                             schedule=dace.ScheduleType.CPU_Multicore,
+                             external_edges=True)
+    second = sdfg.add_state_after(first, 'second')
+    second.add_mapped_tasklet('dbl', dict(i='0:20'), dict(c=dace.Memlet('C[i]')),
+                              'd = 2 * c',
+                              dict(d=dace.Memlet('D[i]')),
+                              schedule=dace.ScheduleType.CPU_Multicore,
+                              external_edges=True)
+    third = sdfg.add_state_after(second, 'third')
+    third.add_mapped_tasklet('add', dict(i='0:20'), dict(b=dace.Memlet('B[i]'), d=dace.Memlet('D[i]')),
+                             'e = b + d',
+                             dict(e=dace.Memlet('E[i]')),
+                             schedule=dace.ScheduleType.CPU_Multicore,
+                             external_edges=True)
+    return sdfg
+
+
+def test_omp_tasks():
+    sdfg = _independent_states_sdfg()
+    sdfg.openmp_tasks = True
+
+    code = sdfg.generate_code()[0].clean_code
+    assert code.count("#pragma omp single") == 1
+    assert "#pragma omp task default(shared) depend(in: A) depend(inout: B)" in code
+    assert "#pragma omp task default(shared) depend(in: C) depend(inout: D)" in code
+    assert "#pragma omp task default(shared) depend(in: B, D) depend(inout: E)" in code
+    assert "#pragma omp taskloop" in code
+    assert "#pragma omp parallel for" not in code
+
+    a, b, c, d, e = (np.random.rand(20) for _ in range(5))
+    sdfg(A=a, B=b, C=c, D=d, E=e)
+    assert np.allclose(b, a + 1)
+    assert np.allclose(d, 2 * c)
+    assert np.allclose(e, a + 1 + 2 * c)
+
+
+def test_omp_tasks_components():
+    """ Tests that independent components in a single state are executed as tasks. """
+
+    @dace.program
+    def tester(A: dace.float64[20], B: dace.float64[20], C: dace.float64[20], D: dace.float64[20]):
+        B[:] = A + 1
+        D[:] = C * 2
+
+    sdfg = tester.to_sdfg(simplify=True)
+    sdfg.openmp_tasks = True
+    assert len(sdfg.states()) == 1
+
+    code = sdfg.generate_code()[0].clean_code
+    assert code.count("#pragma omp task default(shared)") == 2
+
+    a, c = np.random.rand(20), np.random.rand(20)
+    b, d = np.zeros(20), np.zeros(20)
+    sdfg(A=a, B=b, C=c, D=d)
+    assert np.allclose(b, a + 1)
+    assert np.allclose(d, 2 * c)
+
+
+def test_omp_tasks_control_flow():
+    """ Tests that task regions are not formed across conditional transitions. """
+
+    @dace.program
+    def tester(A: dace.float64[20], B: dace.float64[20], cond: dace.int64):
+        B[:] = A + 1
+        if cond > 0:
+            B[:] = B * 2
+        A[:] = B + 1
+
+    sdfg = tester.to_sdfg(simplify=True)
+    sdfg.openmp_tasks = True
+    for sd in sdfg.all_sdfgs_recursive():
+        sd.openmp_tasks = True
+
+    a = np.random.rand(20)
+    b = np.zeros(20)
+    ref_b = (a + 1) * 2
+    ref_a = ref_b + 1
+    sdfg(A=a, B=b, cond=1)
+    assert np.allclose(b, ref_b)
+    assert np.allclose(a, ref_a)
+
+
+def test_omp_work_stealing():
+    """ Tests the work-stealing schedule on a map with skewed per-iteration work (sparse matrix-vector product). """
+
+    @dace.program
+    def spmv(A_row: dace.int32[21], A_col: dace.int32[N], A_val: dace.float64[N], x: dace.float64[20],
+             b: dace.float64[20]):
+        for i in dace.map[0:20]:
+            for j in range(A_row[i], A_row[i + 1]):
+                b[i] += A_val[j] * x[A_col[j]]
+
+    sdfg = spmv.to_sdfg(simplify=True)
+    me = next(n for n, s in sdfg.all_nodes_recursive() if isinstance(n, dace.nodes.MapEntry) and s.sdfg is sdfg)
+    me.map.schedule = dtypes.ScheduleType.CPU_Multicore
+    me.map.omp_schedule = dtypes.OMPScheduleType.WorkStealing
+    me.map.omp_chunk_size = 2
+
+    code = sdfg.generate_code()[0].clean_code
+    assert "dace::worksteal::parallel_for(20, 2, 0," in code
+    assert "#pragma omp parallel for" not in code
+
+    # All nonzeros are in the first rows
+    rows = np.array([0] + [min(20 * (i + 1), 100) for i in range(20)], dtype=np.int32)
+    cols = np.random.randint(0, 20, size=100).astype(np.int32)
+    vals = np.random.rand(100)
+    x = np.random.rand(20)
+    b = np.zeros(20)
+    sdfg(A_row=rows, A_col=cols, A_val=vals, x=x, b=b, N=100)
+
+    ref = np.zeros(20)
+    for i in range(20):
+        ref[i] = np.dot(vals[rows[i]:rows[i + 1]], x[cols[rows[i]:rows[i + 1]]])
+    assert np.allclose(b, ref)
+
+
+def test_omp_work_stealing_collapse():
+
+    @dace.program
+    def tester(A: dace.float64[10, 20], B: dace.float64[10, 20]):
+        for i, j in dace.map[1:10, 0:20:2]:
+            B[i, j] = A[i, j] + i * 100 + j
+
+    sdfg = tester.to_sdfg(simplify=True)
+    me = next(n for n, _ in sdfg.all_nodes_recursive() if isinstance(n, dace.nodes.MapEntry))
+    me.map.schedule = dtypes.ScheduleType.CPU_Multicore
+    me.map.omp_schedule = dtypes.OMPScheduleType.WorkStealing
+    me.map.collapse = 2
+
+    code = sdfg.generate_code()[0].clean_code
+    assert "dace::worksteal::parallel_for(90, 0, 0," in code
+
+    a = np.random.rand(10, 20)
+    b = np.zeros((10, 20))
+    sdfg(A=a, B=b)
+    ref = np.zeros((10, 20))
+    for i in range(1, 10):
+        for j in range(0, 20, 2):
+            ref[i, j] = a[i, j] + i * 100 + j
+    assert np.allclose(b, ref)
+
+
+def test_map_schedule_tuner_space():
+    from dace.optimization import MapScheduleTuner
+
+    sdfg = arrayop.to_sdfg(simplify=True)
+    me = next(n for n, _ in sdfg.all_nodes_recursive() if isinstance(n, dace.nodes.MapEntry))
+    me.map.schedule = dtypes.ScheduleType.CPU_Multicore
+
+    tuner = MapScheduleTuner(sdfg, chunk_sizes=[0, 8])
+    (cutout, label), = list(tuner.cutouts())
+    space = list(tuner.space(map_entry=me))
+    assert len(space) == 1 + 4 * 2
+    assert space[0] == (dtypes.OMPScheduleType.Default, 0)
+
+    # Keys round-trip to configurations that are applied on the original map
+    config = tuner.config_from_key("WorkStealing.8")
+    assert config == (dtypes.OMPScheduleType.WorkStealing, 8)
+    tuner.apply(config, label)
+    assert me.map.omp_schedule == dtypes.OMPScheduleType.WorkStealing
+    assert me.map.omp_chunk_size == 8
+
+
 if __name__ == "__main__":
     test_lack_of_omp_props()
     test_omp_props()
@@ -182,3 +361,9 @@ if __name__ == "__main__":
     test_omp_get_tid()
     test_omp_get_tid_elision()
     test_omp_get_ntid()
+    test_omp_tasks()
+    test_omp_tasks_components()
+    test_omp_tasks_control_flow()
+    test_omp_work_stealing()
+    test_omp_work_stealing_collapse()
+    test_map_schedule_tuner_space()
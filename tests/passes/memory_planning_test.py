@@ -0,0 +1,85 @@
+# Copyright 2019-2024 ETH Zurich and the DaCe authors. All rights reserved.
+import dace
+import numpy as np
+
+from dace.transformation.passes.memory_planning import ARENA_ALIGNMENT, MemoryPlanning, get_arena_size
+
+N = dace.symbol('N')
+
+# Two arrays of 100 doubles, each padded to the arena alignment
+ARENA_SIZE = 2 * ((800 + ARENA_ALIGNMENT - 1) // ARENA_ALIGNMENT) * ARENA_ALIGNMENT
+
+
+def _chain_sdfg():
+    """ Creates a chain of states, each reading one transient and writing the next. """
+    sdfg = dace.SDFG('memory_planning_chain')
+    sdfg.add_array('A', [N], dace.float64)
+    sdfg.add_array('B', [N], dace.float64)
+    for name in ('t1', 't2', 't3'):
+        sdfg.add_transient(name, [N], dace.float64)
+
+    prev = None
+    for i, (src, dst) in enumerate([('A', 't1'), ('t1', 't2'), ('t2', 't3'), ('t3', 'B')]):
+        state = sdfg.add_state(f's{i}')
+        state.add_mapped_tasklet(f'compute{i}',
+                                 dict(i='0:N'),
+                                 dict(a=dace.Memlet(f'{src}[i]')),
+                                 'b = a + 1',
+                                 dict(b=dace.Memlet(f'{dst}[i]')),
+                                 external_edges=True)
+        if prev is not None:
+            sdfg.add_edge(prev, state, dace.InterstateEdge())
+        prev = state
+    return sdfg
+
+
+def test_liveness_packing():
+    sdfg = _chain_sdfg()
+    offsets = MemoryPlanning().apply_pass(sdfg, {})
+    assert set(offsets.keys()) == {'t1', 't2', 't3'}
+
+    # t1 and t3 are never live at the same time
+    assert offsets['t1'] == offsets['t3'] == 0
+    assert offsets['t2'] != 0
+    size = get_arena_size(sdfg, dace.AllocationLifetime.Persistent)
+    assert dace.symbolic.evaluate(size, {N: 100}) == ARENA_SIZE
+
+    code = sdfg.generate_code()[0].clean_code
+    assert '__dace_memory_arena' in code
+    assert 'new double' not in code
+
+    A = np.random.rand(100)
+    B = np.zeros_like(A)
+    sdfg(A=A, B=B, N=100)
+    assert np.allclose(B, A + 4)
+
+
+def test_loop_liveness():
+    sdfg = _chain_sdfg()
+    # Repeat the chain: all transients are now live throughout the loop
+    sdfg.add_edge(sdfg.node(3), sdfg.node(0), dace.InterstateEdge(condition='False'))
+    offsets = MemoryPlanning().apply_pass(sdfg, {})
+    assert len(set(map(str, offsets.values()))) == 3
+
+
+def test_external_arena():
+    sdfg = _chain_sdfg()
+    MemoryPlanning(external=True).apply_pass(sdfg, {})
+
+    A = np.random.rand(100)
+    B = np.zeros_like(A)
+    csdfg = sdfg.compile()
+    csdfg.initialize(A=A, B=B, N=100)
+    sizes = csdfg.get_workspace_sizes()
+    assert sizes[dace.StorageType.CPU_Heap] == ARENA_SIZE
+
+    workspace = np.empty(sizes[dace.StorageType.CPU_Heap], dtype=np.uint8)
+    csdfg.set_workspace(dace.StorageType.CPU_Heap, workspace)
+    csdfg(A=A, B=B, N=100)
+    assert np.allclose(B, A + 4)
+
+
+if __name__ == '__main__':
+    test_liveness_packing()
+    test_loop_liveness()
+    test_external_arena()
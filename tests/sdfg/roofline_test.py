@@ -0,0 +1,65 @@
+# Copyright 2019-2024 ETH Zurich and the DaCe authors. All rights reserved.
+""" Tests rating instrumented maps against the roofline model. """
+import dace
+from dace.sdfg.performance_evaluation.roofline import RooflineEntry, format_roofline, roofline, static_costs
+import numpy as np
+
+N = dace.symbol('N')
+
+
+def _saxpy_sdfg() -> dace.SDFG:
+    sdfg = dace.SDFG('roofline_saxpy')
+    sdfg.add_array('x', [N], dace.float64)
+    sdfg.add_array('y', [N], dace.float64)
+    state = sdfg.add_state()
+    state.add_mapped_tasklet('saxpy',
+                             dict(i='0:N'),
+                             dict(a=dace.Memlet('x[i]'), b=dace.Memlet('y[i]')),
+                             'c = 2.0 * a + b',
+                             dict(c=dace.Memlet('y[i]')),
+                             external_edges=True)
+    return sdfg
+
+
+def test_static_costs():
+    sdfg = _saxpy_sdfg()
+    costs = static_costs(sdfg)
+    assert len(costs) == 1
+    cost = next(iter(costs.values()))
+    assert cost.label == 'Map saxpy_map'
+    assert dace.symbolic.evaluate(cost.flops, dict(N=100)) == 200
+    assert dace.symbolic.evaluate(cost.bytes, dict(N=100)) == 3 * 8 * 100
+
+
+def test_roofline_entry():
+    entry = RooflineEntry((0, 0, 0), 'Map test', runtime=1.0, flops=2e6, bytes=24e6, peak_gflops=100,
+                          peak_bandwidth=48)
+    assert np.isclose(entry.gflops, 2)
+    assert np.isclose(entry.bandwidth, 24)
+    assert entry.bound == 'memory'
+    assert np.isclose(entry.percent_of_peak, 50)
+
+
+def test_roofline():
+    sdfg = _saxpy_sdfg()
+    for node, _ in sdfg.all_nodes_recursive():
+        if isinstance(node, dace.nodes.MapEntry):
+            node.instrument = dace.InstrumentationType.Timer
+
+    x = np.random.rand(1000)
+    y = np.random.rand(1000)
+    sdfg(x=x, y=y, N=1000)
+    report = sdfg.get_latest_report()
+
+    entries = roofline(sdfg, report, dict(N=1000), peak_gflops=100, peak_bandwidth=50)
+    assert len(entries) == 1
+    assert entries[0].flops == 2000
+    assert entries[0].bytes == 24000
+    assert entries[0].gflops is not None and entries[0].percent_of_peak is not None
+    assert 'Map saxpy_map' in format_roofline(entries)
+
+
+if __name__ == '__main__':
+    test_static_costs()
+    test_roofline_entry()
+    test_roofline()
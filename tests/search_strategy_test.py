@@ -0,0 +1,103 @@
+# Copyright 2019-2024 ETH Zurich and the DaCe authors. All rights reserved.
+import itertools
+import math
+
+import dace
+from dace.optimization.map_tiling_tuner import MapTilingTuner
+from dace.optimization.search_strategy import ExhaustiveSearch, TPESearch
+
+TILE_SIZES = [1, 2, 4, 8, 16, 32, 64, 128]
+SPACE = list(itertools.product(TILE_SIZES, TILE_SIZES, [1, 2, 4, 8]))
+
+
+def _runtime(config):
+    # Synthetic runtime with a single optimum at (32, 8, 4)
+    return 1 + (math.log2(config[0]) - 5)**2 + (math.log2(config[1]) - 3)**2 + 0.1 * (config[2] - 4)**2
+
+
+def _features(config):
+    return tuple(math.log2(t) for t in config)
+
+
+def test_exhaustive():
+    results = ExhaustiveSearch().search(SPACE, _runtime, _features)
+    assert len(results) == len(SPACE)
+
+
+def test_tpe_budget():
+    num_evaluations = 0
+
+    def evaluate(config):
+        nonlocal num_evaluations
+        num_evaluations += 1
+        return _runtime(config)
+
+    results = TPESearch(budget=40).search(SPACE, evaluate, _features)
+    assert num_evaluations == len(results) == 40
+    # No configuration is evaluated twice
+    assert len(set(c for c, _ in results)) == 40
+    # The model finds the optimum within a fraction of the space
+    assert min(v for _, v in results) == 1
+
+
+def test_tpe_early_stopping():
+    results = TPESearch(budget=100, initial=4, patience=5).search(SPACE, lambda c: 1.0, _features)
+    # First evaluation sets the best value, then five evaluations without improvement
+    assert len(results) == 6
+
+
+def test_tpe_categorical():
+    space = list(itertools.permutations(['i', 'j', 'k', 'l']))
+    results = TPESearch(budget=12, initial=4).search(space, lambda c: c.index('l') + c.index('k'), lambda c: c)
+    assert len(results) == 12
+    assert min(v for _, v in results) == 1
+
+
+def test_initial_configurations():
+    initial = [SPACE[-1], SPACE[3]]
+    results = ExhaustiveSearch().search(SPACE, _runtime, _features, initial=initial)
+    assert [c for c, _ in results[:2]] == initial
+    assert len(results) == len(SPACE)
+
+    results = TPESearch(budget=10).search(SPACE, _runtime, _features, initial=initial)
+    assert [c for c, _ in results[:2]] == initial
+    assert len(results) == 10
+
+
+def test_search_budget():
+    initial = [SPACE[-1], SPACE[3]]
+    results = ExhaustiveSearch().search(SPACE, _runtime, _features, initial=initial, budget=3)
+    assert [c for c, _ in results[:2]] == initial
+    assert len(results) == 3
+
+    # The smaller of the two budgets applies
+    results = TPESearch(budget=10).search(SPACE, _runtime, _features, initial=initial, budget=5)
+    assert [c for c, _ in results[:2]] == initial
+    assert len(results) == 5
+    results = TPESearch(budget=4).search(SPACE, _runtime, _features, budget=5)
+    assert len(results) == 4
+
+
+def test_map_tiling_features():
+    """ The untiled configuration is described numerically, with one feature per map dimension. """
+    sdfg = dace.SDFG('search_strategy_test_map_tiling_features')
+    state = sdfg.add_state()
+    map_entry, _ = state.add_map('tiled', dict(i='0:1024', j='0:N'))
+    tuner = MapTilingTuner(sdfg, tile_sizes=[8, 32, 128])
+
+    space = list(tuner.space(map_entry=map_entry))
+    assert space[0] is None
+    points = [tuner.features(config, map_entry=map_entry) for config in space]
+    assert points[0] == (10, 8)
+    assert all(len(point) == 2 for point in points)
+    assert all(TPESearch._is_numeric([point[d] for point in points]) for d in range(2))
+
+
+if __name__ == '__main__':
+    test_exhaustive()
+    test_tpe_budget()
+    test_tpe_early_stopping()
+    test_tpe_categorical()
+    test_initial_configurations()
+    test_search_budget()
+    test_map_tiling_features()
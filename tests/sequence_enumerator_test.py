@@ -0,0 +1,108 @@
+# Copyright 2019-2024 ETH Zurich and the DaCe authors. All rights reserved.
+import copy
+import dace
+import numpy as np
+
+from dace.transformation.dataflow import MapFusion, MapTiling
+from dace.transformation.estimator import BeamSearchEnumerator, MCTSEnumerator
+from dace.transformation.estimator.enumeration import apply_transformation_sequence, data_movement_cost
+
+N = dace.symbol('N')
+
+
+@dace.program
+def two_maps(A: dace.float64[N], B: dace.float64[N]):
+    tmp = dace.define_local([N], dtype=dace.float64)
+    for i in dace.map[0:N]:
+        with dace.tasklet:
+            a << A[i]
+            b >> tmp[i]
+            b = a + 1
+    for i in dace.map[0:N]:
+        with dace.tasklet:
+            a << tmp[i]
+            b >> B[i]
+            b = a * 2
+
+
+def _sdfg():
+    sdfg = two_maps.to_sdfg()
+    sdfg.simplify()
+    return sdfg
+
+
+def test_data_movement_cost():
+    sdfg = _sdfg()
+    # A, tmp (twice) and B are each moved once
+    assert data_movement_cost(sdfg, {'N': 100}) == 4 * 100 * 8
+
+
+def test_beam_search():
+    sdfg = _sdfg()
+    orig_hash = sdfg.hash_sdfg()
+    cost_function = lambda sdfg: data_movement_cost(sdfg, {'N': 100})
+
+    enumerator = BeamSearchEnumerator(sdfg, patterns=[MapFusion], cost_function=cost_function)
+    enumerator.max_length = 2
+    results = enumerator.scores()
+
+    # The original SDFG is always evaluated first
+    assert len(results[0][0]) == 0
+    assert sdfg.hash_sdfg() == orig_hash
+
+    best_sequence, best_cost = min(results, key=lambda r: r[1])
+    assert len(best_sequence) == 1
+    assert best_sequence[0]['transformation'] == 'MapFusion'
+    assert best_cost < results[0][1]
+
+    # Replay the best sequence and run the result
+    fused = apply_transformation_sequence(copy.deepcopy(sdfg), best_sequence)
+    assert cost_function(fused) == best_cost
+
+    A = np.random.rand(20)
+    B = np.zeros_like(A)
+    fused(A=A, B=B, N=20)
+    assert np.allclose(B, (A + 1) * 2)
+
+
+def test_memoization():
+    sdfg = _sdfg()
+    evaluated_hashes = []
+
+    def counting_cost(sdfg):
+        evaluated_hashes.append(sdfg.hash_sdfg())
+        return data_movement_cost(sdfg, {'N': 100})
+
+    enumerator = MCTSEnumerator(sdfg, patterns=[MapFusion, MapTiling], cost_function=counting_cost)
+    enumerator.max_length = 2
+    enumerator.iterations = 20
+
+    # Count cost lookups, which include revisits of known SDFGs
+    num_lookups = 0
+    evaluate = enumerator.evaluate
+
+    def counting_evaluate(*args, **kwargs):
+        nonlocal num_lookups
+        num_lookups += 1
+        return evaluate(*args, **kwargs)
+
+    enumerator.evaluate = counting_evaluate
+    results = enumerator.scores()
+
+    # Every distinct SDFG is evaluated exactly once, even though MCTS revisits sequences
+    assert len(evaluated_hashes) == len(set(evaluated_hashes)) == enumerator.evaluations
+    assert num_lookups == enumerator.iterations + 1
+    assert len(results) == enumerator.evaluations
+    assert min(r[1] for r in results) < results[0][1]
+
+    # Revisiting known sequences is answered from the memoized costs
+    num_calls = len(evaluated_hashes)
+    for sequence, cost in results:
+        replayed = apply_transformation_sequence(copy.deepcopy(sdfg), sequence)
+        assert enumerator.evaluate(replayed) == cost
+    assert num_lookups > len(evaluated_hashes) == num_calls
+
+if __name__ == '__main__':
+    test_data_movement_cost()
+    test_beam_search()
+    test_memoization()
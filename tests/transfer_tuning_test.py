@@ -0,0 +1,151 @@
+# Copyright 2019-2024 ETH Zurich and the DaCe authors. All rights reserved.
+import os
+import dace
+
+from dace.optimization import ExhaustiveSearch, TPESearch, TransferTuningCache
+from dace.optimization.cutout_tuner import CutoutTuner
+
+
+def _make_cutout(size: int, outputs: int = 1) -> dace.SDFG:
+    sdfg = dace.SDFG('transfer_tuning_test')
+    sdfg.add_array('A', [size], dace.float64)
+    for j in range(outputs):
+        sdfg.add_array(f'B{j}', [size], dace.float64)
+    state = sdfg.add_state()
+    for j in range(outputs):
+        state.add_mapped_tasklet(f'scale{j}',
+                                 dict(i=f'0:{size}'),
+                                 dict(a=dace.Memlet('A[i]')),
+                                 'b = a * 2',
+                                 dict(b=dace.Memlet(f'B{j}[i]')),
+                                 external_edges=True)
+    return sdfg
+
+
+class _ListTuner(CutoutTuner):
+    """ Tuner over a fixed list of configurations, which records the evaluation order instead of running them. """
+
+    SPACE = ['a', 'b', 'c', 'd']
+
+    def __init__(self, sdfg: dace.SDFG) -> None:
+        super().__init__(task='Transfer', sdfg=sdfg)
+        self.evaluated = []
+
+    def space(self, **kwargs):
+        return list(self.SPACE)
+
+    def pre_evaluate(self, cutout: dace.SDFG, measurements: int, **kwargs):
+        return {'space_kwargs': {}, 'key': lambda config: config}
+
+    def evaluate(self, config, **kwargs) -> float:
+        self.evaluated.append(config)
+        return float(self.SPACE.index(config))
+
+
+def test_signature_across_sizes(tmp_path):
+    path = os.path.join(tmp_path, 'transfer.json')
+    cache = TransferTuningCache('Transfer', path=path)
+    assert TransferTuningCache.signature(_make_cutout(10)) == TransferTuningCache.signature(_make_cutout(20))
+    assert TransferTuningCache.signature(_make_cutout(10)) != TransferTuningCache.signature(_make_cutout(10, 2))
+
+    cache.add(_make_cutout(10), {'a': 2.0, 'b': 1.0, 'c': float('inf')})
+    assert cache.suggest(_make_cutout(20)) == ['b']
+    assert cache.suggest(_make_cutout(20, 2)) == []
+
+    # The cache is persistent
+    assert TransferTuningCache('Transfer', path=path).suggest(_make_cutout(20)) == ['b']
+
+
+def test_neighbor_ordering(tmp_path):
+    cache = TransferTuningCache('Transfer', path=os.path.join(tmp_path, 'transfer.json'), neighbors=2)
+    cache.add(_make_cutout(16), {'x': 1.0, 'w': 2.0})
+    cache.add(_make_cutout(1024), {'y': 1.0})
+    cache.add(_make_cutout(64), {'z': 1.0, 'x': 2.0})
+
+    # Nearest sizes first, on a logarithmic scale
+    assert cache.suggest(_make_cutout(48)) == ['z', 'x']
+    assert cache.suggest(_make_cutout(2048)) == ['y', 'z']
+
+    cache.neighbors = 3
+    cache.configs_per_neighbor = 2
+    assert cache.suggest(_make_cutout(48)) == ['z', 'x', 'w', 'y']
+
+
+def test_search_fallback(tmp_path):
+    cache = TransferTuningCache('Transfer', path=os.path.join(tmp_path, 'transfer.json'))
+    assert not cache.exclusive
+    cache.add(_make_cutout(10), {'c': 1.0})
+
+    # Suggestions are evaluated first, followed by the rest of the space if exploration is unlimited
+    cache.explore = None
+    tuner = _ListTuner(_make_cutout(20))
+    results = tuner.search(_make_cutout(20), measurements=1, transfer=cache)
+    assert tuner.evaluated == ['c', 'a', 'b', 'd']
+    assert set(results.keys()) == set(_ListTuner.SPACE)
+
+    # Exclusive caches only evaluate the suggestions
+    cache.exclusive = True
+    tuner = _ListTuner(_make_cutout(20))
+    tuner.search(_make_cutout(20), measurements=1, transfer=cache)
+    assert tuner.evaluated == ['c']
+
+    # Without matching suggestions, the whole space is evaluated
+    tuner = _ListTuner(_make_cutout(20, 2))
+    tuner.search(_make_cutout(20, 2), measurements=1, transfer=cache)
+    assert tuner.evaluated == _ListTuner.SPACE
+
+    cache.add(_make_cutout(10, 2), {'unknown': 1.0})
+    tuner = _ListTuner(_make_cutout(20, 2))
+    tuner.search(_make_cutout(20, 2), measurements=1, transfer=cache)
+    assert tuner.evaluated == _ListTuner.SPACE
+
+
+def test_search_savings(tmp_path):
+    cache = TransferTuningCache('Transfer', path=os.path.join(tmp_path, 'transfer.json'), explore=1)
+    cache.add(_make_cutout(10), {'c': 1.0})
+
+    # Without suggestions, the whole space is evaluated
+    tuner = _ListTuner(_make_cutout(20, 2))
+    tuner.search(_make_cutout(20, 2), measurements=1, transfer=cache)
+    assert tuner.evaluated == _ListTuner.SPACE
+
+    # With suggestions, the search stops after the suggestions and ``explore`` further configurations
+    tuner = _ListTuner(_make_cutout(20))
+    results = tuner.search(_make_cutout(20), measurements=1, transfer=cache)
+    assert tuner.evaluated == ['c', 'a']
+    assert set(results.keys()) == {'c', 'a'}
+
+    # The same limit applies to search strategies
+    tuner = _ListTuner(_make_cutout(20))
+    tuner.search(_make_cutout(20), measurements=1, strategy=ExhaustiveSearch(), transfer=cache)
+    assert tuner.evaluated == ['c', 'a']
+
+    tuner = _ListTuner(_make_cutout(20))
+    tuner.search(_make_cutout(20), measurements=1, strategy=TPESearch(initial=1), transfer=cache)
+    assert tuner.evaluated[0] == 'c'
+    assert len(tuner.evaluated) == 2
+
+    # By default, fewer configurations than the whole space are evaluated when suggestions exist
+    default = TransferTuningCache('Transfer', path=os.path.join(tmp_path, 'transfer.json'))
+    assert default.explore is not None
+    _ListTuner.SPACE = [str(i) for i in range(16)]
+    try:
+        default.add(_make_cutout(10), {'3': 1.0})
+        tuner = _ListTuner(_make_cutout(20))
+        tuner.search(_make_cutout(20), measurements=1, transfer=default)
+        assert tuner.evaluated[0] == '3'
+        assert len(tuner.evaluated) == 1 + default.explore < len(_ListTuner.SPACE)
+    finally:
+        _ListTuner.SPACE = ['a', 'b', 'c', 'd']
+
+
+if __name__ == '__main__':
+    import tempfile
+    with tempfile.TemporaryDirectory() as folder:
+        test_signature_across_sizes(folder)
+    with tempfile.TemporaryDirectory() as folder:
+        test_neighbor_ordering(folder)
+    with tempfile.TemporaryDirectory() as folder:
+        test_search_fallback(folder)
+    with tempfile.TemporaryDirectory() as folder:
+        test_search_savings(folder)
@@ -0,0 +1,174 @@
+# Copyright 2019-2024 ETH Zurich and the DaCe authors. All rights reserved.
+import os
+import dace
+import numpy as np
+
+from dace.optimization import TransformationDatabase
+from dace.optimization.transformation_database import structural_hash
+from dace.transformation.auto.auto_optimize import auto_optimize
+from dace.transformation.dataflow import MapFusion
+from dace.transformation.passes.pattern_matching import match_patterns
+
+
+def _make_program(size: int):
+
+    @dace.program
+    def two_maps(A: dace.float64[size], B: dace.float64[size]):
+        tmp = dace.define_local([size], dtype=dace.float64)
+        for i in dace.map[0:size]:
+            with dace.tasklet:
+                a << A[i]
+                b >> tmp[i]
+                b = a + 1
+        for i in dace.map[0:size]:
+            with dace.tasklet:
+                a << tmp[i]
+                b >> B[i]
+                b = a * 2
+
+    sdfg = two_maps.to_sdfg()
+    sdfg.simplify()
+    return sdfg
+
+
+def _fuse_maps(sdfg: dace.SDFG) -> MapFusion:
+    # Applies through ``apply_pattern`` so that the transformation is appended to the history
+    xform = next(match_patterns(sdfg, MapFusion))
+    xform.apply_pattern()
+    return xform
+
+
+def _num_maps(sdfg: dace.SDFG) -> int:
+    return len([n for n, _ in sdfg.all_nodes_recursive() if isinstance(n, dace.nodes.MapEntry)])
+
+
+def test_structural_hash():
+    small, large = _make_program(10), _make_program(20)
+    assert structural_hash(small) != structural_hash(large)
+    assert structural_hash(small, size_independent=True) == structural_hash(large, size_independent=True)
+
+
+def test_record_and_replay(tmp_path):
+    db = TransformationDatabase(os.path.join(tmp_path, 'transformations.db'))
+
+    sdfg = _make_program(10)
+    _fuse_maps(sdfg)
+    assert len(sdfg.transformation_hist) == 1
+    recipe = db.record_history(sdfg, baseline=2.0, runtime=1.0)
+    assert recipe.speedup == 2.0
+    assert db.best(_make_program(10)).sequence[0]['transformation'] == 'MapFusion'
+
+    # Exact match
+    new_sdfg = _make_program(10)
+    assert db.replay(new_sdfg) is not None
+    assert _num_maps(new_sdfg) == 1
+
+    # Structurally similar SDFG
+    similar_sdfg = _make_program(20)
+    assert db.replay(similar_sdfg, similar=False) is None
+    assert db.replay(similar_sdfg) is not None
+    assert _num_maps(similar_sdfg) == 1
+
+    A = np.random.rand(20)
+    B = np.zeros_like(A)
+    similar_sdfg(A=A, B=B)
+    assert np.allclose(B, (A + 1) * 2)
+
+
+def test_record_sequence(tmp_path):
+    db = TransformationDatabase(os.path.join(tmp_path, 'transformations.db'))
+
+    # Transformations applied through ``apply_transformations`` are not in the history, but can be recorded directly
+    sdfg = _make_program(10)
+    assert sdfg.apply_transformations(MapFusion) == 1
+    assert db.record_history(sdfg) is None
+
+    sdfg = _make_program(10)
+    xform = next(match_patterns(sdfg, MapFusion))
+    db.record(sdfg, [xform], baseline=2.0, runtime=1.0)
+
+    new_sdfg = _make_program(20)
+    assert db.replay(new_sdfg) is not None
+    assert _num_maps(new_sdfg) == 1
+
+
+def test_lookup_order(tmp_path):
+    db = TransformationDatabase(os.path.join(tmp_path, 'transformations.db'))
+    sdfg = _make_program(10)
+
+    db.record(sdfg, config={'task': 'MapTiling', 'key': 'None'}, baseline=1.0, runtime=1.0)
+    db.record(sdfg, config={'task': 'MapTiling', 'key': '64.8.1'}, baseline=1.0, runtime=0.5)
+    db.record(sdfg, config={'task': 'MapPermutation', 'key': 'i'}, baseline=1.0, runtime=0.1)
+
+    assert db.best(sdfg, task='MapTiling').config['key'] == '64.8.1'
+    assert db.best(sdfg).config['task'] == 'MapPermutation'
+    assert db.best(_make_program(20), similar=False) is None
+
+
+def test_auto_optimize_replay(tmp_path):
+    path = os.path.join(tmp_path, 'transformations.db')
+    sdfg = _make_program(10)
+    _fuse_maps(sdfg)
+    TransformationDatabase(path).record_history(sdfg, device=dace.DeviceType.CPU)
+
+    new_sdfg = _make_program(10)
+    with dace.config.set_temporary('optimizer', 'transformation_database', value=path):
+        with dace.config.set_temporary('optimizer', 'replay_transformations', value=True):
+            auto_optimize(new_sdfg, dace.DeviceType.CPU)
+
+    assert _num_maps(new_sdfg) == 1
+    assert len(new_sdfg.transformation_hist) == 1
+
+
+def _gpu_maps(sdfg: dace.SDFG) -> int:
+    return len([
+        n for n, _ in sdfg.all_nodes_recursive()
+        if isinstance(n, dace.nodes.MapEntry) and n.map.schedule == dace.ScheduleType.GPU_Device
+    ])
+
+
+def test_auto_optimize_replay_device(tmp_path):
+    path = os.path.join(tmp_path, 'transformations.db')
+    db = TransformationDatabase(path)
+    sdfg = _make_program(10)
+    _fuse_maps(sdfg)
+    db.record_history(sdfg, device=dace.DeviceType.CPU)
+
+    # Recipes are keyed by device
+    assert db.best(_make_program(10), device=dace.DeviceType.CPU) is not None
+    assert db.best(_make_program(10), device=dace.DeviceType.GPU) is None
+    assert db.replay(_make_program(10), device=dace.DeviceType.GPU) is None
+
+    with dace.config.set_temporary('optimizer', 'transformation_database', value=path):
+        with dace.config.set_temporary('optimizer', 'replay_transformations', value=True):
+            # The CPU recipe is not replayed, but the SDFG is still optimized for the GPU
+            new_sdfg = _make_program(10)
+            auto_optimize(new_sdfg, dace.DeviceType.GPU, use_gpu_storage=True)
+            assert _gpu_maps(new_sdfg) > 0
+            assert all(desc.storage == dace.StorageType.GPU_Global
+                       for desc in new_sdfg.arrays.values() if not desc.transient)
+
+            # A GPU recipe replaces the device-independent transformations, followed by the GPU transformations
+            db.record_history(sdfg, device=dace.DeviceType.GPU)
+            new_sdfg = _make_program(10)
+            auto_optimize(new_sdfg, dace.DeviceType.GPU, use_gpu_storage=True)
+            assert new_sdfg.transformation_hist[0].__class__ is MapFusion
+            assert _num_maps(new_sdfg) == 1
+            assert _gpu_maps(new_sdfg) == 1
+            assert all(desc.storage == dace.StorageType.GPU_Global
+                       for desc in new_sdfg.arrays.values() if not desc.transient)
+
+
+if __name__ == '__main__':
+    import tempfile
+    test_structural_hash()
+    with tempfile.TemporaryDirectory() as folder:
+        test_record_and_replay(folder)
+    with tempfile.TemporaryDirectory() as folder:
+        test_record_sequence(folder)
+    with tempfile.TemporaryDirectory() as folder:
+        test_lookup_order(folder)
+    with tempfile.TemporaryDirectory() as folder:
+        test_auto_optimize_replay(folder)
+    with tempfile.TemporaryDirectory() as folder:
+        test_auto_optimize_replay_device(folder)
@@ -0,0 +1,117 @@
+# Copyright 2019-2024 ETH Zurich and the DaCe authors. All rights reserved.
+import json
+import math
+import os
+import dace
+
+from dace.optimization.cutout_tuner import CutoutTuner
+from dace.optimization.worker_pool_tuner import WorkerPoolTuner, _available_cores
+
+
+def _scale_sdfg(factor: int) -> dace.SDFG:
+    sdfg = dace.SDFG(f'worker_pool_tuner_test_{factor}')
+    sdfg.add_array('A', [64], dace.float64)
+    sdfg.add_array('B', [64], dace.float64)
+    state = sdfg.add_state()
+    state.add_mapped_tasklet('scale',
+                             dict(i='0:64'),
+                             dict(a=dace.Memlet('A[i]')),
+                             f'b = a * {factor}',
+                             dict(b=dace.Memlet('B[i]')),
+                             external_edges=True)
+    sdfg.instrument = dace.InstrumentationType.Timer
+    return sdfg
+
+
+class _ScaleTuner(CutoutTuner):
+    """ Tunes the factor of a single map. Factor 3 is rejected without measuring. """
+
+    def __init__(self, folder: str) -> None:
+        super().__init__(task='WorkerPool', sdfg=_scale_sdfg(1))
+        self.folder = folder
+        self.evaluated = []
+
+    def file_name(self, label: str) -> str:
+        return os.path.join(self.folder, super().file_name(label))
+
+    def cutouts(self):
+        yield self._sdfg, 'scale'
+
+    def space(self, **kwargs):
+        return [1, 2, 3]
+
+    def pre_evaluate(self, cutout: dace.SDFG, measurements: int, **kwargs):
+        return {'space_kwargs': {}, 'key': str, 'measurements': measurements}
+
+    def evaluate(self, config: int, measurements: int, **kwargs) -> float:
+        self.evaluated.append(config)
+        if config == 3:
+            return math.inf
+        return self.measure(_scale_sdfg(config), None, measurements)
+
+
+def test_measurement_hook(tmp_path):
+    tuner = _ScaleTuner(str(tmp_path))
+    measured = []
+
+    def hook(cutout, data, repetitions):
+        measured.append((cutout.name, repetitions))
+        return 1.0
+
+    with tuner.intercept_measurements(hook):
+        assert tuner.evaluate(2, measurements=5) == 1.0
+    assert measured == [('worker_pool_tuner_test_2', 5)]
+    assert tuner._measurement_hook is None
+
+
+def test_worker_pool(tmp_path):
+    tuner = _ScaleTuner(str(tmp_path))
+    cores = _available_cores()
+    pool = WorkerPoolTuner(tuner, compile_workers=2, measure_cores=cores[-1:], build_folder=str(tmp_path))
+    if len(cores) > 1:
+        assert cores[-1] not in pool._compile_cores
+
+    report = pool.optimize(measurements=2)
+    results = report['scale']
+    assert sorted(results.keys()) == ['1', '2', '3']
+    assert 0 <= results['1'] < math.inf and 0 <= results['2'] < math.inf
+    assert results['3'] == math.inf
+    assert tuner.evaluated == [1, 2, 3]
+
+    # Results are stored and incremental results are removed once the cutout is tuned
+    with open(tuner.file_name('scale'), 'r') as fp:
+        assert json.load(fp) == results
+    assert not os.path.exists(pool.partial_file_name('scale'))
+
+
+def test_worker_pool_resume(tmp_path):
+    tuner = _ScaleTuner(str(tmp_path))
+    pool = WorkerPoolTuner(tuner, compile_workers=1, build_folder=str(tmp_path))
+
+    # Partial results of an interrupted run, ending in a truncated line
+    with open(pool.partial_file_name('scale'), 'w') as fp:
+        fp.write(json.dumps({'key': '1', 'runtime': 0.5}) + '\n')
+        fp.write('{"key": "2", "runt')
+
+    results = pool.search(tuner._sdfg, 'scale', measurements=2)
+    assert tuner.evaluated == [2, 3]
+    assert results['1'] == 0.5
+    assert 0 <= results['2'] < math.inf
+    assert results['3'] == math.inf
+    # New results are readable after the truncated line
+    assert pool._load_partial(pool.partial_file_name('scale')) == results
+
+    # Resuming a complete run does not evaluate any configuration again
+    assert pool.optimize(measurements=2)['scale'] == results
+    assert tuner.evaluated == [2, 3]
+    assert not os.path.exists(pool.partial_file_name('scale'))
+
+
+if __name__ == '__main__':
+    import tempfile
+    with tempfile.TemporaryDirectory() as folder:
+        test_measurement_hook(folder)
+    with tempfile.TemporaryDirectory() as folder:
+        test_worker_pool(folder)
+    with tempfile.TemporaryDirectory() as folder:
+        test_worker_pool_resume(folder)